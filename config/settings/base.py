@@ -287,6 +287,30 @@ MJML_TCPSERVERS = [
     ("mjml", 28101),  # the host and port of MJML TCP-Server
 ]
 
+# NEWSLETTER SENDING
+# ------------------------------------------------------------------------------
+# Fallback send rate (messages/second) when the ESP does not report its quota,
+# and the target duration of each send batch at that rate.
+NEWSLETTER_SEND_RATE = env.float("NEWSLETTER_SEND_RATE", default=14.0)
+NEWSLETTER_BATCH_SECONDS = env.int("NEWSLETTER_BATCH_SECONDS", default=10)
+
+# ANALYTICS
+# ------------------------------------------------------------------------------
+# Buffer AnalyticsEvent writes in Redis and bulk-insert them from Celery. Only
+# takes effect when the default cache is Redis-backed.
+ANALYTICS_BUFFERED_INGESTION = env.bool("ANALYTICS_BUFFERED_INGESTION", default=True)
+# "sql" splits ad-hoc visit scopes with window functions in Postgres; "python"
+# fetches every event row and sessionises in process.
+ANALYTICS_SESSIONISATION_ENGINE = env("ANALYTICS_SESSIONISATION_ENGINE", default="sql")
+
+# PAGE CACHE
+# ------------------------------------------------------------------------------
+# AnonymousCacheMixin: how long (seconds) a page's previous rendering may be
+# served past its timeout while one worker regenerates it, and how long that
+# worker's regeneration lock lives.
+ANONYMOUS_CACHE_STALE_GRACE = env.int("ANONYMOUS_CACHE_STALE_GRACE", default=120)
+ANONYMOUS_CACHE_LOCK_TIMEOUT = env.int("ANONYMOUS_CACHE_LOCK_TIMEOUT", default=15)
+
 # FILE UPLOAD
 # ------------------------------------------------------------------------------
 DATA_UPLOAD_MAX_MEMORY_SIZE = env.int("DJANGO_DATA_UPLOAD_MAX_MEMORY_SIZE", default=10_000_000)
@@ -317,7 +341,8 @@ PLANKA_DB_URL = env("PLANKA_DB_URL", default="")
 # PUBMED
 # ------------------------------------------------------------------------------
 PUBMED_TIMEOUT_SECONDS = env.int("PUBMED_TIMEOUT_SECONDS", default=30)
-PUBMED_PARALLEL_JOURNALS = env.int("PUBMED_PARALLEL_JOURNALS", default=3)
+# Requests the journal cache refresh may have outstanding at once, across PubMed and CrossRef.
+PUBMED_MAX_IN_FLIGHT = env.int("PUBMED_MAX_IN_FLIGHT", default=10)
 PUBMED_CREDENTIAL_ENCRYPTION_KEY = env("PUBMED_CREDENTIAL_ENCRYPTION_KEY", default="")
 
 # ADMIN
@@ -0,0 +1,263 @@
+"""Buffered ingestion for AnalyticsEvent rows and bot counters.
+
+Requests append a compact JSON record to a Redis list instead of INSERTing in
+the request cycle; ``drain_analytics_event_buffer_task`` moves them in batches
+to a processing list, writes them with ``bulk_create`` and only then drops
+them, so a worker crash leaves the batch to be retried. Each batch's id
+commits with its rows, so a retry never inserts a batch twice. A batch that
+keeps failing is parked on a dead-letter list instead of blocking the buffer.
+Rejected bot requests likewise only HINCRBY a per-day counter that
+``flush_automated_request_counts_task`` folds into AutomatedRequestCount.
+When Redis is not the cache backend, or buffering is disabled, both write
+synchronously as before.
+"""
+
+import datetime
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from redis.exceptions import LockError
+
+from spanza_journal_watch.utils.cache import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+EVENT_BUFFER_KEY = "analytics:event_buffer"
+# Ring-buffer bound: if the consumer stalls, the oldest events are dropped
+# rather than letting the list grow without limit.
+EVENT_BUFFER_MAX_LENGTH = 500_000
+DRAIN_BATCH_SIZE = 1000
+# The batch being written; left in place if the drain dies, and retried first.
+EVENT_PROCESSING_KEY = "analytics:event_buffer:processing"
+EVENT_PROCESSING_ATTEMPTS_KEY = "analytics:event_buffer:processing:attempts"
+# Identifies the processing batch; recorded with the rows it inserts.
+EVENT_PROCESSING_ID_KEY = "analytics:event_buffer:processing:id"
+# Batches that failed DRAIN_MAX_ATTEMPTS writes, kept for inspection and replay.
+EVENT_DEAD_LETTER_KEY = "analytics:event_buffer:dead"
+DRAIN_MAX_ATTEMPTS = 5
+# Only one drain runs at a time, since runs share the processing list. The
+# lock is renewed before each batch; a drain that lost it stops.
+DRAIN_LOCK_KEY = "analytics:event_buffer:drain_lock"
+DRAIN_LOCK_SECONDS = 300
+
+AUTOMATED_COUNTS_KEY = "analytics:automated_counts"
+AUTOMATED_COUNTS_FLUSHING_KEY = "analytics:automated_counts:flushing"
+# Identifies the hash being flushed; recorded with the counts it applies.
+AUTOMATED_COUNTS_FLUSH_ID_KEY = "analytics:automated_counts:flushing:id"
+
+
+def _buffer_client():
+    if not getattr(settings, "ANALYTICS_BUFFERED_INGESTION", False):
+        return None
+    return get_redis_client()
+
+
+def buffer_event(fields):
+    """Append an event record to the buffer. Returns False if it must be written directly."""
+    client = _buffer_client()
+    if client is None:
+        return False
+
+    record = dict(fields)
+    record["timestamp"] = timezone.now().isoformat()
+    if record.get("visitor_id") is not None:
+        record["visitor_id"] = str(record["visitor_id"])
+    try:
+        length = client.rpush(EVENT_BUFFER_KEY, json.dumps(record, default=str))
+        if length > EVENT_BUFFER_MAX_LENGTH:
+            client.ltrim(EVENT_BUFFER_KEY, -EVENT_BUFFER_MAX_LENGTH, -1)
+            logger.warning("Analytics event buffer over %d entries; oldest dropped", EVENT_BUFFER_MAX_LENGTH)
+    except Exception:
+        logger.warning("Analytics event buffer unavailable; writing directly", exc_info=True)
+        return False
+    return True
+
+
+def _claim_batch(client, batch_size):
+    """The batch to write: one left behind by an interrupted drain, or the next off the buffer."""
+    raw = client.lrange(EVENT_PROCESSING_KEY, 0, -1)
+    if raw:
+        return raw
+    pipe = client.pipeline(transaction=True)
+    for _ in range(batch_size):
+        pipe.lmove(EVENT_BUFFER_KEY, EVENT_PROCESSING_KEY, "LEFT", "RIGHT")
+    return [item for item in pipe.execute() if item is not None]
+
+
+def _finish_batch(client, dead_letter=()):
+    """Drop the processing batch, parking ``dead_letter`` entries first."""
+    pipe = client.pipeline(transaction=True)
+    if dead_letter:
+        pipe.rpush(EVENT_DEAD_LETTER_KEY, *dead_letter)
+    pipe.delete(EVENT_PROCESSING_KEY, EVENT_PROCESSING_ATTEMPTS_KEY, EVENT_PROCESSING_ID_KEY)
+    pipe.execute()
+
+
+def build_events(records):
+    """Turn buffered records into unsaved AnalyticsEvent instances.
+
+    Subscriber ids are validated in one query per batch (the request path no
+    longer looks them up), and human_confidence is derived from the result.
+    """
+    from spanza_journal_watch.analytics.models import AnalyticsEvent
+    from spanza_journal_watch.analytics.utils import classify_event_confidence
+    from spanza_journal_watch.newsletter.models import Subscriber
+
+    subscriber_ids = {r["subscriber_id"] for r in records if r.get("subscriber_id")}
+    valid_subscriber_ids = set(Subscriber.objects.filter(pk__in=subscriber_ids).values_list("pk", flat=True))
+
+    events = []
+    for record in records:
+        subscriber_id = record.pop("subscriber_id", None)
+        if subscriber_id not in valid_subscriber_ids:
+            subscriber_id = None
+        record["timestamp"] = parse_datetime(record["timestamp"])
+        record["human_confidence"] = classify_event_confidence(automated=False, subscriber=subscriber_id)
+        events.append(AnalyticsEvent(subscriber_id=subscriber_id, **record))
+    return events
+
+
+def drain_event_buffer(batch_size=DRAIN_BATCH_SIZE, max_batches=50):
+    """Write buffered events to the database. Returns the number written.
+
+    A batch is removed from Redis only after its insert commits, and its id
+    commits with the rows, so a batch left behind by a drain that died after
+    committing is dropped rather than inserted again. A failed write is
+    retried on the next run, up to DRAIN_MAX_ATTEMPTS times, after which the
+    batch moves to EVENT_DEAD_LETTER_KEY and draining carries on.
+    """
+    from spanza_journal_watch.analytics.models import AnalyticsEvent, AnalyticsRollupState
+
+    client = get_redis_client()
+    if client is None:
+        return 0
+    lock = client.lock(DRAIN_LOCK_KEY, timeout=DRAIN_LOCK_SECONDS, blocking=False)
+    if not lock.acquire():
+        return 0
+
+    AnalyticsRollupState.load()
+    written = 0
+    try:
+        for _ in range(max_batches):
+            try:
+                lock.reacquire()
+            except LockError:
+                logger.warning("Analytics event drain lost its lock after %d events; stopping", written)
+                return written
+            raw = _claim_batch(client, batch_size)
+            if not raw:
+                break
+            client.set(EVENT_PROCESSING_ID_KEY, uuid.uuid4().hex, nx=True)
+            batch_id = client.get(EVENT_PROCESSING_ID_KEY)
+            batch_id = batch_id.decode() if isinstance(batch_id, bytes) else batch_id
+            records = []
+            for item in raw:
+                try:
+                    records.append(json.loads(item))
+                except (TypeError, ValueError):
+                    logger.warning("Discarding malformed analytics buffer entry")
+            try:
+                with transaction.atomic():
+                    state = AnalyticsRollupState.objects.select_for_update().get(pk=1)
+                    # Otherwise a drain that died before dropping the batch already inserted it.
+                    inserted = state.event_batch_id != batch_id
+                    if inserted:
+                        AnalyticsEvent.objects.bulk_create(build_events(records), batch_size=500)
+                        state.event_batch_id = batch_id
+                        state.save(update_fields=["event_batch_id", "updated"])
+            except Exception:
+                attempts = client.incr(EVENT_PROCESSING_ATTEMPTS_KEY)
+                if attempts < DRAIN_MAX_ATTEMPTS:
+                    # Left on the processing list, so the next run retries it first.
+                    raise
+                logger.exception(
+                    "Analytics event batch of %d failed %d times; moved to %s",
+                    len(raw),
+                    attempts,
+                    EVENT_DEAD_LETTER_KEY,
+                )
+                _finish_batch(client, dead_letter=raw)
+                continue
+            _finish_batch(client)
+            if inserted:
+                written += len(records)
+            if len(raw) < batch_size:
+                break
+    finally:
+        try:
+            # Only deletes the lock if it is still this drain's.
+            lock.release()
+        except LockError:
+            pass
+    return written
+
+
+def buffer_automated_count(event_type, reason=""):
+    """Count a rejected bot request in Redis. Returns False if it must be written directly."""
+    client = _buffer_client()
+    if client is None:
+        return False
+    field = f"{timezone.localdate().isoformat()}|{event_type}|{reason}"
+    try:
+        client.hincrby(AUTOMATED_COUNTS_KEY, field, 1)
+    except Exception:
+        logger.warning("Automated request counter unavailable; writing directly", exc_info=True)
+        return False
+    return True
+
+
+def flush_automated_counts():
+    """Fold buffered bot counters into AutomatedRequestCount in one upsert.
+
+    The live hash is renamed before reading so increments arriving during the
+    flush start a fresh hash. A hash left behind by an interrupted flush is
+    processed first. The counts and the hash's flush id commit together, and
+    the hash is deleted only afterwards, so a flush that dies at any point is
+    applied exactly once when it is rerun. Returns the number of keys flushed.
+    """
+    from spanza_journal_watch.analytics.models import AnalyticsRollupState, AutomatedRequestCount
+
+    client = get_redis_client()
+    if client is None:
+        return 0
+
+    if not client.exists(AUTOMATED_COUNTS_FLUSHING_KEY):
+        if not client.exists(AUTOMATED_COUNTS_KEY):
+            return 0
+        client.rename(AUTOMATED_COUNTS_KEY, AUTOMATED_COUNTS_FLUSHING_KEY)
+    client.set(AUTOMATED_COUNTS_FLUSH_ID_KEY, uuid.uuid4().hex, nx=True)
+    flush_id = client.get(AUTOMATED_COUNTS_FLUSH_ID_KEY)
+    flush_id = flush_id.decode() if isinstance(flush_id, bytes) else flush_id
+
+    rows = []
+    for field, count in client.hgetall(AUTOMATED_COUNTS_FLUSHING_KEY).items():
+        field = field.decode() if isinstance(field, bytes) else field
+        day, event_type, reason = field.split("|", 2)
+        rows.append((datetime.date.fromisoformat(day), event_type, reason, int(count)))
+
+    AnalyticsRollupState.load()
+    with transaction.atomic():
+        state = AnalyticsRollupState.objects.select_for_update().get(pk=1)
+        # Otherwise this hash was applied by a flush that died before deleting it.
+        if state.automated_counts_flush_id != flush_id and rows:
+            qn = connection.ops.quote_name
+            table = qn(AutomatedRequestCount._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    INSERT INTO {table} (date, event_type, reason, count)
+                    VALUES {", ".join(["(%s, %s, %s, %s)"] * len(rows))}
+                    ON CONFLICT (date, event_type, reason) DO UPDATE SET count = {table}.count + EXCLUDED.count
+                    """,
+                    [value for row in rows for value in row],
+                )
+            state.automated_counts_flush_id = flush_id
+            state.save(update_fields=["automated_counts_flush_id", "updated"])
+
+    client.delete(AUTOMATED_COUNTS_FLUSHING_KEY, AUTOMATED_COUNTS_FLUSH_ID_KEY)
+    return len(rows)
@@ -0,0 +1,16 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0024_schedule_ua_cohort_downgrade"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="analyticsevent",
+            name="timestamp",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+TASK_NAME = "Drain analytics event buffer"
+TASK_PATH = "spanza_journal_watch.analytics.tasks.drain_analytics_event_buffer_task"
+
+
+def create_schedule(apps, schema_editor):
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Every 10 seconds: keeps dashboards near-real-time while each run still
+    # inserts buffered events in large batches.
+    schedule, _ = IntervalSchedule.objects.get_or_create(every=10, period="seconds")
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": TASK_PATH,
+            "interval": schedule,
+            "enabled": True,
+            "args": "[]",
+            "kwargs": "{}",
+        },
+    )
+
+
+def remove_schedule(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+        ("analytics", "0025_alter_analyticsevent_timestamp"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, remove_schedule),
+    ]
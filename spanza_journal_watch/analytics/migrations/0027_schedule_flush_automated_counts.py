@@ -0,0 +1,38 @@
+from django.db import migrations
+
+TASK_NAME = "Flush automated request counters"
+TASK_PATH = "spanza_journal_watch.analytics.tasks.flush_automated_request_counts_task"
+
+
+def create_schedule(apps, schema_editor):
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Every minute: the overview's "filtered as bot" card lags by at most this.
+    schedule, _ = IntervalSchedule.objects.get_or_create(every=60, period="seconds")
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": TASK_PATH,
+            "interval": schedule,
+            "enabled": True,
+            "args": "[]",
+            "kwargs": "{}",
+        },
+    )
+
+
+def remove_schedule(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+        ("analytics", "0026_schedule_drain_event_buffer"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, remove_schedule),
+    ]
@@ -0,0 +1,104 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+EVENT_TYPE_CHOICES = [
+    ("review_open", "Review open"),
+    ("review_engaged", "Review engaged"),
+    ("review_full_text_click", "Review full text click"),
+    ("review_related_click", "Review related-link click"),
+    ("review_share_copy_link", "Review shared via copy link"),
+    ("review_share_email", "Review shared via email"),
+    ("review_share_native", "Review shared via native share"),
+    ("review_share_bluesky", "Review shared via Bluesky"),
+    ("review_share_x", "Review shared via X"),
+    ("review_share_facebook", "Review shared via Facebook"),
+    ("search", "Search performed"),
+    ("search_result_click", "Search result clicked"),
+    ("page_visit", "Page visit"),
+    ("journal_browser_visit", "Journal browser visit"),
+    ("journal_article_interact", "Journal article interaction"),
+    ("journal_full_text_click", "Journal full text click"),
+    ("journal_star", "Journal article starred"),
+    ("journal_recommend", "Journal article recommended"),
+    ("journal_mark_read", "Journal article marked read"),
+    ("journal_archive", "Journal article archived"),
+    ("journal_search", "Journal browser search"),
+    ("journal_select", "Journal selected"),
+    ("newsletter_subscribe", "Newsletter subscribe"),
+    ("cpd_tracking_toggle", "CPD tracking toggled"),
+]
+
+REFERRER_CHOICES = [
+    ("newsletter", "Newsletter"),
+    ("search", "Search engine"),
+    ("social", "Social media"),
+    ("direct", "Direct"),
+    ("internal", "Internal"),
+    ("other", "Other"),
+]
+
+HUMAN_CONFIDENCE_CHOICES = [
+    ("suspected_automated", "Suspected automated"),
+    ("probable_human", "Probable human"),
+    ("known_subscriber_human", "Known subscriber human"),
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("analytics", "0027_schedule_flush_automated_counts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnalyticsRollupState",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("last_event_id", models.BigIntegerField(default=0)),
+                ("rebuild_from", models.DateField(blank=True, null=True)),
+                ("covered_through", models.DateField(blank=True, null=True)),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="AnalyticsDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("event_type", models.CharField(choices=EVENT_TYPE_CHOICES, max_length=48)),
+                ("object_id", models.PositiveIntegerField(blank=True, null=True)),
+                (
+                    "referrer_category",
+                    models.CharField(blank=True, choices=REFERRER_CHOICES, default="", max_length=16),
+                ),
+                ("automated", models.BooleanField(default=False)),
+                (
+                    "human_confidence",
+                    models.CharField(blank=True, choices=HUMAN_CONFIDENCE_CHOICES, default="", max_length=32),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("js_verified_count", models.PositiveIntegerField(default=0)),
+                ("duration_ms_sum", models.BigIntegerField(default=0)),
+                ("duration_count", models.PositiveIntegerField(default=0)),
+                ("scroll_depth_sum", models.BigIntegerField(default=0)),
+                ("scroll_depth_count", models.PositiveIntegerField(default=0)),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-date", "event_type"),
+                "indexes": [
+                    models.Index(fields=["date", "event_type"], name="analytics_rollup_date_type_idx"),
+                    models.Index(fields=["content_type", "object_id", "date"], name="analytics_rollup_object_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+TASK_NAME = "Refresh analytics daily rollups"
+TASK_PATH = "spanza_journal_watch.analytics.tasks.refresh_analytics_rollups_task"
+
+
+def create_schedule(apps, schema_editor):
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Every 5 minutes. Days after the rollup's coverage are read live, so this
+    # only bounds how much of the dashboard query hits the raw table.
+    schedule, _ = IntervalSchedule.objects.get_or_create(every=300, period="seconds")
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": TASK_PATH,
+            "interval": schedule,
+            "enabled": True,
+            "args": "[]",
+            "kwargs": "{}",
+        },
+    )
+
+
+def remove_schedule(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+        ("analytics", "0028_analytics_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, remove_schedule),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations, models
+
+REFERRER_CHOICES = [
+    ("newsletter", "Newsletter"),
+    ("search", "Search engine"),
+    ("social", "Social media"),
+    ("direct", "Direct"),
+    ("internal", "Internal"),
+    ("other", "Other"),
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0029_schedule_refresh_analytics_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analyticsrollupstate",
+            name="visits_last_event_id",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="DerivedVisit",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("visit_key", models.CharField(max_length=80)),
+                ("visitor_id", models.UUIDField(blank=True, null=True)),
+                (
+                    "referrer_category",
+                    models.CharField(blank=True, choices=REFERRER_CHOICES, default="", max_length=16),
+                ),
+                ("referrer_domain", models.CharField(blank=True, default="", max_length=255)),
+                ("landing_page", models.CharField(blank=True, default="", max_length=512)),
+                ("utm_source", models.CharField(blank=True, default="", max_length=128)),
+                ("utm_medium", models.CharField(blank=True, default="", max_length=128)),
+                ("utm_campaign", models.CharField(blank=True, default="", max_length=128)),
+                ("first_event", models.DateTimeField()),
+                ("last_event", models.DateTimeField()),
+                ("js_verified", models.BooleanField(default=False)),
+                ("event_count", models.PositiveIntegerField(default=0)),
+                ("event_types", models.JSONField(blank=True, default=list)),
+                ("sections", models.JSONField(blank=True, default=list)),
+                ("review_engaged", models.BooleanField(default=False)),
+                ("engaged", models.BooleanField(default=False)),
+                ("progressed", models.BooleanField(default=False)),
+                ("touched_journals", models.BooleanField(default=False)),
+            ],
+            options={
+                "ordering": ("-first_event",),
+                "indexes": [
+                    models.Index(fields=["first_event"], name="analytics_visit_first_idx"),
+                    models.Index(fields=["visit_key", "last_event"], name="analytics_visit_key_idx"),
+                    models.Index(fields=["visitor_id", "first_event"], name="analytics_visit_visitor_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0031_schedule_refresh_derived_visits"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analyticsrollupstate",
+            name="automated_counts_flush_id",
+            field=models.CharField(blank=True, default="", max_length=32),
+        ),
+    ]
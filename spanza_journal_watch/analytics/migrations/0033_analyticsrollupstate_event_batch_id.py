@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0032_analyticsrollupstate_automated_counts_flush_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="analyticsrollupstate",
+            name="event_batch_id",
+            field=models.CharField(blank=True, default="", max_length=32),
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import MultipleObjectsReturned
 from django.db import IntegrityError, models
 from django.db.models import F
+from django.db.models.functions import Coalesce, Least
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -134,7 +135,9 @@ class AnalyticsEvent(models.Model):
     object_id = models.PositiveIntegerField(blank=True, null=True)
     content_object = GenericForeignKey("content_type", "object_id")
     event_type = models.CharField(max_length=48, choices=EventType.choices)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set at record time rather than insert time, since buffered events are
+    # bulk-inserted later by the ingestion consumer.
+    timestamp = models.DateTimeField(default=timezone.now)
     source = models.CharField(max_length=64, blank=True, default="")
     duration_ms = models.PositiveIntegerField(blank=True, null=True)
     scroll_depth = models.PositiveSmallIntegerField(blank=True, null=True)
@@ -180,8 +183,11 @@ class AnalyticsEvent(models.Model):
         metadata=None,
         js_verified=False,
     ):
-        subscriber = _get_subscriber_for_analytics(subscriber_id, log_context="analytics event")
+        """Record an event, buffered for bulk insert when Redis is available.
 
+        Returns the created event on the synchronous path, or None when the
+        event was buffered or rejected as automated.
+        """
         user_agent = ""
         session_key = ""
         visitor_id = None
@@ -193,7 +199,7 @@ class AnalyticsEvent(models.Model):
         if request is not None:
             automated_reason = classify_automated_reason(request, event_type=event_type)
             if automated_reason is not None:
-                AutomatedRequestCount.bump(event_type, reason=automated_reason)
+                AutomatedRequestCount.bump_coalesced(event_type, reason=automated_reason)
                 return None
             user_agent = request.headers.get("user-agent", "")
             session_key = request.session.session_key or ""
@@ -202,37 +208,47 @@ class AnalyticsEvent(models.Model):
             referrer_domain = extract_referrer_domain(request)
             landing_page = request.session.get("analytics_landing_page", "")
             share_token = request.session.get("analytics_share_token", "")
-        human_confidence = classify_event_confidence(automated=False, subscriber=subscriber)
 
-        content_type = None
+        content_type_id = None
         object_id = None
         if content_object is not None:
-            content_type = ContentType.objects.get_for_model(content_object)
+            # get_for_model is served from ContentType's in-process cache.
+            content_type_id = ContentType.objects.get_for_model(content_object).pk
             object_id = content_object.pk
 
         scroll_depth = max(0, min(int(scroll_depth), 100)) if scroll_depth is not None else None
         duration_ms = max(0, int(duration_ms)) if duration_ms is not None else None
 
+        fields = {
+            "content_type_id": content_type_id,
+            "object_id": object_id,
+            "event_type": event_type,
+            "source": (source or "")[:64],
+            "duration_ms": duration_ms,
+            "scroll_depth": scroll_depth,
+            "metadata": metadata or {},
+            "user_agent": user_agent,
+            "automated": False,
+            "session_key": session_key,
+            "visitor_id": visitor_id,
+            "referrer_category": referrer_category,
+            "referrer_domain": referrer_domain,
+            "landing_page": landing_page,
+            "session_sequence": session_sequence,
+            "js_verified": js_verified,
+            "share_token": share_token,
+        }
+
+        from spanza_journal_watch.analytics.ingest import buffer_event
+
+        if buffer_event({**fields, "subscriber_id": subscriber_id}):
+            return None
+
+        subscriber = _get_subscriber_for_analytics(subscriber_id, log_context="analytics event")
         return cls.objects.create(
-            content_type=content_type,
-            object_id=object_id,
-            event_type=event_type,
-            source=(source or "")[:64],
-            duration_ms=duration_ms,
-            scroll_depth=scroll_depth,
-            metadata=metadata or {},
             subscriber=subscriber,
-            user_agent=user_agent,
-            automated=False,
-            session_key=session_key,
-            human_confidence=human_confidence,
-            visitor_id=visitor_id,
-            referrer_category=referrer_category,
-            referrer_domain=referrer_domain,
-            landing_page=landing_page,
-            session_sequence=session_sequence,
-            js_verified=js_verified,
-            share_token=share_token,
+            human_confidence=classify_event_confidence(automated=False, subscriber=subscriber),
+            **fields,
         )
 
     def __str__(self):
@@ -299,5 +315,128 @@ class AutomatedRequestCount(models.Model):
         except IntegrityError:
             cls.objects.filter(**lookup).update(count=F("count") + by)
 
+    @classmethod
+    def bump_coalesced(cls, event_type, *, reason=""):
+        """Count one rejected request, via a Redis counter flushed on a schedule when available."""
+        from spanza_journal_watch.analytics.ingest import buffer_automated_count
+
+        if not buffer_automated_count(event_type, reason=reason):
+            cls.bump(event_type, reason=reason)
+
+    def __str__(self):
+        return f"{self.date} {self.event_type}: {self.count}"
+
+
+class AnalyticsDailyRollup(models.Model):
+    """Per-day AnalyticsEvent totals, maintained by ``refresh_analytics_rollups_task``.
+
+    One row per (date, event type, content object, referrer category,
+    automated, human confidence). Dashboards sum these instead of scanning the
+    raw event table, so long date ranges cost the same as short ones.
+    """
+
+    date = models.DateField()
+    event_type = models.CharField(max_length=48, choices=AnalyticsEvent.EventType.choices)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, blank=True, null=True)
+    object_id = models.PositiveIntegerField(blank=True, null=True)
+    referrer_category = models.CharField(max_length=16, blank=True, default="", choices=REFERRER_CHOICES)
+    automated = models.BooleanField(default=False)
+    human_confidence = models.CharField(max_length=32, choices=HumanConfidence.choices, blank=True, default="")
+    count = models.PositiveIntegerField(default=0)
+    js_verified_count = models.PositiveIntegerField(default=0)
+    duration_ms_sum = models.BigIntegerField(default=0)
+    duration_count = models.PositiveIntegerField(default=0)
+    scroll_depth_sum = models.BigIntegerField(default=0)
+    scroll_depth_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "event_type"], name="analytics_rollup_date_type_idx"),
+            models.Index(fields=["content_type", "object_id", "date"], name="analytics_rollup_object_idx"),
+        ]
+        ordering = ("-date", "event_type")
+
     def __str__(self):
         return f"{self.date} {self.event_type}: {self.count}"
+
+
+class AnalyticsRollupState(models.Model):
+    """Singleton watermarks for the incremental rollups.
+
+    ``last_event_id`` is the highest AnalyticsEvent id already folded in.
+    ``rebuild_from`` is set when existing rows change (e.g. bot downgrades) so
+    the next run recomputes every day from that date. ``covered_through`` is the
+    last complete day the rollup is authoritative for; later days are read live.
+    ``visits_last_event_id`` is the equivalent watermark for DerivedVisit.
+    ``automated_counts_flush_id`` names the last Redis bot-counter flush
+    applied to AutomatedRequestCount, so a retried flush is not counted twice.
+    ``event_batch_id`` likewise names the last buffered event batch inserted.
+    """
+
+    last_event_id = models.BigIntegerField(default=0)
+    rebuild_from = models.DateField(blank=True, null=True)
+    covered_through = models.DateField(blank=True, null=True)
+    visits_last_event_id = models.BigIntegerField(default=0)
+    automated_counts_flush_id = models.CharField(max_length=32, blank=True, default="")
+    event_batch_id = models.CharField(max_length=32, blank=True, default="")
+    updated = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def load(cls):
+        state, _ = cls.objects.get_or_create(pk=1)
+        return state
+
+    @classmethod
+    def mark_dirty(cls, dates):
+        """Ask the next rollup run to recompute ``dates`` (and everything after the earliest)."""
+        dates = [d for d in dates if d is not None]
+        if not dates:
+            return
+        earliest = min(dates)
+        cls.load()
+        cls.objects.filter(pk=1).update(rebuild_from=Least(Coalesce(F("rebuild_from"), earliest), earliest))
+
+    def __str__(self):
+        return f"Rollup through {self.covered_through or '-'} (event {self.last_event_id})"
+
+
+class DerivedVisit(models.Model):
+    """A sessionised visit, maintained by ``refresh_derived_visits_task``.
+
+    Built from human events only, with the same 30-minute inactivity split as
+    the dashboards' live sessionisation (see ``analytics.visits``). Landing
+    page, referrer and UTM fields are first-touch; the flags summarise the
+    visit's events so panels never need the events themselves.
+    """
+
+    visit_key = models.CharField(max_length=80)
+    visitor_id = models.UUIDField(null=True, blank=True)
+    referrer_category = models.CharField(max_length=16, blank=True, default="", choices=REFERRER_CHOICES)
+    referrer_domain = models.CharField(max_length=255, blank=True, default="")
+    landing_page = models.CharField(max_length=512, blank=True, default="")
+    utm_source = models.CharField(max_length=128, blank=True, default="")
+    utm_medium = models.CharField(max_length=128, blank=True, default="")
+    utm_campaign = models.CharField(max_length=128, blank=True, default="")
+    first_event = models.DateTimeField()
+    last_event = models.DateTimeField()
+    js_verified = models.BooleanField(default=False)
+    event_count = models.PositiveIntegerField(default=0)
+    # The first few event types, in order, for the top-flows panel.
+    event_types = models.JSONField(blank=True, default=list)
+    sections = models.JSONField(blank=True, default=list)
+    review_engaged = models.BooleanField(default=False)
+    # Deliberate interaction or known subscriber, as for the engaged-humans KPI.
+    engaged = models.BooleanField(default=False)
+    progressed = models.BooleanField(default=False)
+    touched_journals = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["first_event"], name="analytics_visit_first_idx"),
+            models.Index(fields=["visit_key", "last_event"], name="analytics_visit_key_idx"),
+            models.Index(fields=["visitor_id", "first_event"], name="analytics_visit_visitor_idx"),
+        ]
+        ordering = ("-first_event",)
+
+    def __str__(self):
+        return f"{self.visit_key} @ {self.first_event:%Y-%m-%d %H:%M}"
@@ -0,0 +1,196 @@
+"""Daily AnalyticsEvent rollups and the readers that dashboards query.
+
+``refresh_rollups`` folds new events into AnalyticsDailyRollup. It only looks at
+events with an id above the stored watermark, plus today and yesterday (late
+commits and buffered inserts land there) and any range marked dirty by the bot
+sweepers. Each affected day is recomputed whole, so the rollup converges on what
+a raw GROUP BY would return. The per-tag engagement rows behind the tag scores
+(submissions.engagement) are rebuilt for the same days.
+
+``event_totals`` and ``event_breakdown`` read rollup rows for days the rollup
+covers and aggregate the raw table only for the remaining tail (normally just
+today), so the result is always current while long ranges stay cheap.
+"""
+
+import datetime
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from spanza_journal_watch.analytics.models import AnalyticsDailyRollup, AnalyticsEvent, AnalyticsRollupState
+from spanza_journal_watch.submissions.engagement import rebuild_tag_engagement_day, refresh_tag_scores
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_DIMENSIONS = (
+    "event_type",
+    "content_type_id",
+    "object_id",
+    "referrer_category",
+    "automated",
+    "human_confidence",
+)
+ROLLUP_MEASURES = (
+    "count",
+    "js_verified_count",
+    "duration_ms_sum",
+    "duration_count",
+    "scroll_depth_sum",
+    "scroll_depth_count",
+)
+# Bounds the work of one run, e.g. the initial backfill; the rest is picked up
+# by subsequent runs and read live until then.
+MAX_DAYS_PER_RUN = 31
+
+
+def _raw_measures():
+    return {
+        "count": Count("id"),
+        "js_verified_count": Count("id", filter=Q(js_verified=True)),
+        "duration_ms_sum": Sum("duration_ms"),
+        "duration_count": Count("duration_ms"),
+        "scroll_depth_sum": Sum("scroll_depth"),
+        "scroll_depth_count": Count("scroll_depth"),
+    }
+
+
+def _rollup_measures():
+    return {measure: Sum(measure) for measure in ROLLUP_MEASURES}
+
+
+def _day_bounds(start_date, end_date):
+    start_ts = timezone.make_aware(datetime.datetime.combine(start_date, datetime.time.min))
+    end_ts = timezone.make_aware(datetime.datetime.combine(end_date, datetime.time.max))
+    return start_ts, end_ts
+
+
+def rebuild_day(day):
+    """Replace the rollup rows for ``day`` with a fresh aggregate of the raw events."""
+    start_ts, end_ts = _day_bounds(day, day)
+    rows = (
+        AnalyticsEvent.objects.filter(timestamp__gte=start_ts, timestamp__lte=end_ts)
+        .values(*ROLLUP_DIMENSIONS)
+        .annotate(**_raw_measures())
+        .order_by()
+    )
+    rollups = [
+        AnalyticsDailyRollup(
+            date=day,
+            **{dimension: row[dimension] for dimension in ROLLUP_DIMENSIONS},
+            **{measure: row[measure] or 0 for measure in ROLLUP_MEASURES},
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        AnalyticsDailyRollup.objects.filter(date=day).delete()
+        AnalyticsDailyRollup.objects.bulk_create(rollups, batch_size=1000)
+        rebuild_tag_engagement_day(day)
+    return len(rollups)
+
+
+def refresh_rollups(max_days=MAX_DAYS_PER_RUN):
+    """Bring the rollup up to date. Returns a summary dict for the task result."""
+    today = timezone.localdate()
+    yesterday = today - datetime.timedelta(days=1)
+
+    state = AnalyticsRollupState.load()
+    rebuild_from = state.rebuild_from
+    last_event_id = state.last_event_id
+
+    high_water = AnalyticsEvent.objects.aggregate(m=Max("id"))["m"] or 0
+    days = set(
+        AnalyticsEvent.objects.filter(id__gt=last_event_id, id__lte=high_water)
+        .annotate(day=TruncDate("timestamp"))
+        .values_list("day", flat=True)
+        .distinct()
+        .order_by()
+    )
+    days.update({yesterday, today})
+    if rebuild_from is not None:
+        day = rebuild_from
+        while day <= today:
+            days.add(day)
+            day += datetime.timedelta(days=1)
+
+    pending = sorted(d for d in days if d <= today)
+    processed, remaining = pending[:max_days], pending[max_days:]
+    rows = sum(rebuild_day(day) for day in processed)
+    refresh_tag_scores()
+
+    # Clear the pending range unless a sweeper marked more days during this run.
+    AnalyticsRollupState.objects.filter(pk=state.pk, rebuild_from=rebuild_from).update(rebuild_from=None)
+    if remaining:
+        AnalyticsRollupState.mark_dirty(remaining)
+    AnalyticsRollupState.objects.filter(pk=state.pk).update(
+        last_event_id=max(high_water, last_event_id),
+        covered_through=(remaining[0] if remaining else today) - datetime.timedelta(days=1),
+        updated=timezone.now(),
+    )
+    logger.info(
+        "Analytics rollup: rebuilt %d day(s), %d row(s); %d day(s) pending", len(processed), rows, len(remaining)
+    )
+    return {"days": len(processed), "rows": rows, "pending": len(remaining)}
+
+
+def rollup_covered_through():
+    """Last day the rollup can answer for, or None if it has never run."""
+    state = AnalyticsRollupState.objects.filter(pk=1).values("covered_through", "rebuild_from").first()
+    if not state or state["covered_through"] is None:
+        return None
+    covered = state["covered_through"]
+    if state["rebuild_from"] is not None:
+        covered = min(covered, state["rebuild_from"] - datetime.timedelta(days=1))
+    return covered
+
+
+def _zero_row(group_by, key):
+    return {**dict(zip(group_by, key, strict=True)), **{measure: 0 for measure in ROLLUP_MEASURES}}
+
+
+def event_breakdown(start_date, end_date, group_by=(), **filters):
+    """Sum the rollup measures per ``group_by`` over ``start_date``..``end_date`` inclusive.
+
+    ``group_by`` and ``filters`` may use any rollup dimension plus ``date``;
+    rows are dicts holding the group fields and every name in ROLLUP_MEASURES.
+    """
+    group_by = tuple(group_by)
+    totals = {}
+
+    def _merge(rows):
+        for row in rows:
+            key = tuple(row[field] for field in group_by)
+            bucket = totals.setdefault(key, _zero_row(group_by, key))
+            for measure in ROLLUP_MEASURES:
+                bucket[measure] += row[measure] or 0
+
+    covered = rollup_covered_through()
+    raw_start = start_date
+    if covered is not None and covered >= start_date:
+        qs = AnalyticsDailyRollup.objects.filter(date__gte=start_date, date__lte=min(end_date, covered), **filters)
+        if group_by:
+            _merge(qs.values(*group_by).annotate(**_rollup_measures()).order_by())
+        else:
+            _merge([qs.aggregate(**_rollup_measures())])
+        raw_start = covered + datetime.timedelta(days=1)
+
+    if raw_start <= end_date:
+        start_ts, end_ts = _day_bounds(raw_start, end_date)
+        qs = AnalyticsEvent.objects.filter(timestamp__gte=start_ts, timestamp__lte=end_ts)
+        if "date" in group_by or any(lookup.split("__")[0] == "date" for lookup in filters):
+            qs = qs.annotate(date=TruncDate("timestamp"))
+        qs = qs.filter(**filters)
+        if group_by:
+            _merge(qs.values(*group_by).annotate(**_raw_measures()).order_by())
+        else:
+            _merge([qs.aggregate(**_raw_measures())])
+
+    return list(totals.values())
+
+
+def event_totals(start_date, end_date, **filters):
+    """Single-row form of :func:`event_breakdown`."""
+    rows = event_breakdown(start_date, end_date, **filters)
+    return rows[0] if rows else _zero_row((), ())
@@ -6,12 +6,16 @@ from django.db.models.functions import TruncDate
 from django.utils import timezone
 
 from config.celery_app import app as celery_app
+from spanza_journal_watch.analytics.ingest import drain_event_buffer, flush_automated_counts
 from spanza_journal_watch.analytics.models import (
     DELIBERATE_INTERACTION_EVENT_TYPES,
     AnalyticsEvent,
+    AnalyticsRollupState,
     AutomatedRequestCount,
     HumanConfidence,
 )
+from spanza_journal_watch.analytics.rollups import refresh_rollups
+from spanza_journal_watch.analytics.visits import partition_starts, rebuild_visit_partitions, refresh_derived_visits
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +32,7 @@ def _apply_downgrade(candidates, *, label, dry_run):
     bucket_counts = list(
         candidates.annotate(day=TruncDate("timestamp")).values("day", "event_type").annotate(n=Count("id"))
     )
+    visit_starts = partition_starts(candidates.values("id", "visitor_id", "session_key", "timestamp"))
 
     downgraded = candidates.update(
         automated=True,
@@ -36,6 +41,10 @@ def _apply_downgrade(candidates, *, label, dry_run):
 
     for bucket in bucket_counts:
         AutomatedRequestCount.bump(bucket["event_type"], reason=label[:32], date=bucket["day"], by=bucket["n"])
+    # The downgraded rows are already rolled up and sessionised as human
+    # traffic; recompute those days and re-split the affected visitors' visits.
+    AnalyticsRollupState.mark_dirty([bucket["day"] for bucket in bucket_counts])
+    rebuild_visit_partitions(visit_starts)
 
     logger.info("%s: downgraded %d event(s) to suspected_automated", label, downgraded)
     return {"downgraded": downgraded, "dry_run": False}
@@ -224,3 +233,39 @@ def prune_automated_events_task(retention_days=90, batch_size=5000, dry_run=Fals
         cutoff.date(),
     )
     return {"deleted": total_deleted, "dry_run": False}
+
+
+@celery_app.task
+def drain_analytics_event_buffer_task():
+    """Bulk-insert analytics events buffered by ``record_event``.
+
+    Runs every few seconds; a no-op when the cache is not Redis-backed.
+    """
+    written = drain_event_buffer()
+    if written:
+        logger.info("drain_analytics_event_buffer: wrote %d event(s)", written)
+    return {"written": written}
+
+
+@celery_app.task
+def flush_automated_request_counts_task():
+    """Fold Redis-coalesced bot counters into ``AutomatedRequestCount``."""
+    flushed = flush_automated_counts()
+    if flushed:
+        logger.info("flush_automated_request_counts: flushed %d counter(s)", flushed)
+    return {"flushed": flushed}
+
+
+@celery_app.task
+def refresh_analytics_rollups_task(max_days=31):
+    """Fold new analytics events into the daily rollup the dashboards read."""
+    return refresh_rollups(max_days=max_days)
+
+
+@celery_app.task
+def refresh_derived_visits_task(chunk_size=20_000):
+    """Sessionise newly recorded analytics events into ``DerivedVisit``."""
+    consumed = refresh_derived_visits(chunk_size=chunk_size)
+    if consumed:
+        logger.info("refresh_derived_visits: consumed %d event(s)", consumed)
+    return {"consumed": consumed}
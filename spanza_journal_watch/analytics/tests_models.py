@@ -5,15 +5,43 @@ Covers:
 1. AnalyticsEvent.record_event — creates events, clamps fields,
    and captures landing-page/share-token state
 2. Subscriber attachment for analytics events
+3. Buffered ingestion — events appended to Redis and bulk-inserted by the drain
+4. Coalesced bot counters — Redis HINCRBY flushed into AutomatedRequestCount
+5. Daily rollups — incremental refresh and rollup + live-tail reads
+6. Derived visits — incremental sessionisation and stored + live-tail reads
 """
 
+import datetime
+import uuid
+from unittest.mock import patch
+
 import pytest
 from django.test import RequestFactory
+from django.utils import timezone
 
-from spanza_journal_watch.analytics.models import AnalyticsEvent
+from spanza_journal_watch.analytics.ingest import (
+    DRAIN_LOCK_KEY,
+    DRAIN_MAX_ATTEMPTS,
+    EVENT_BUFFER_KEY,
+    EVENT_DEAD_LETTER_KEY,
+    EVENT_PROCESSING_KEY,
+    drain_event_buffer,
+    flush_automated_counts,
+)
+from spanza_journal_watch.analytics.models import (
+    AnalyticsDailyRollup,
+    AnalyticsEvent,
+    AnalyticsRollupState,
+    AutomatedRequestCount,
+    DerivedVisit,
+)
+from spanza_journal_watch.analytics.rollups import event_breakdown, event_totals, refresh_rollups
+from spanza_journal_watch.analytics.tasks import downgrade_singleton_visitors_task
+from spanza_journal_watch.analytics.visits import load_visits, refresh_derived_visits
 from spanza_journal_watch.backend.models import PubmedArticle
 from spanza_journal_watch.newsletter.models import Subscriber
 from spanza_journal_watch.submissions.models import Journal, Review
+from spanza_journal_watch.utils.tests.fake_redis import FakeRedis
 
 pytestmark = pytest.mark.django_db
 
@@ -152,3 +180,311 @@ class TestAnalyticsEventRecordEvent:
         )
         assert event.pk is not None
         assert event.subscriber is None
+
+
+class TestBufferedIngestion:
+    @pytest.fixture()
+    def redis_client(self, settings):
+        settings.ANALYTICS_BUFFERED_INGESTION = True
+        client = FakeRedis()
+        with patch("spanza_journal_watch.analytics.ingest.get_redis_client", return_value=client):
+            yield client
+
+    def test_record_event_buffers_instead_of_inserting(self, redis_client):
+        request = _request_with_session()
+
+        result = AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT, request=request)
+
+        assert result is None
+        assert AnalyticsEvent.objects.count() == 0
+        assert redis_client.llen(EVENT_BUFFER_KEY) == 1
+
+    def test_drain_bulk_inserts_buffered_events(self, redis_client):
+        review = _make_review()
+        subscriber = Subscriber.objects.create(email="buffered@example.com", subscribed=True)
+        request = _request_with_session()
+        request.session["analytics_landing_page"] = "/reviews/"
+        AnalyticsEvent.record_event(
+            event_type=AnalyticsEvent.EventType.REVIEW_OPEN,
+            request=request,
+            content_object=review,
+            subscriber_id=subscriber.pk,
+            metadata={"path": "/reviews/am-review/"},
+        )
+        AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT, subscriber_id=999999)
+
+        assert drain_event_buffer() == 2
+
+        events = {e.event_type: e for e in AnalyticsEvent.objects.all()}
+        opened = events[AnalyticsEvent.EventType.REVIEW_OPEN]
+        assert opened.content_object == review
+        assert opened.subscriber == subscriber
+        assert opened.human_confidence == "known_subscriber_human"
+        assert opened.landing_page == "/reviews/"
+        assert str(opened.visitor_id) == "aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee"
+        assert events[AnalyticsEvent.EventType.PAGE_VISIT].subscriber is None
+        assert redis_client.llen(EVENT_BUFFER_KEY) == 0
+
+    def test_drain_keeps_batch_until_write_commits(self, redis_client):
+        AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT)
+
+        with patch.object(AnalyticsEvent.objects, "bulk_create", side_effect=RuntimeError("db down")):
+            with pytest.raises(RuntimeError):
+                drain_event_buffer()
+
+        assert redis_client.llen(EVENT_PROCESSING_KEY) == 1
+        assert drain_event_buffer() == 1
+        assert AnalyticsEvent.objects.count() == 1
+        assert redis_client.llen(EVENT_PROCESSING_KEY) == 0
+
+    def test_batch_committed_by_a_dead_drain_is_not_inserted_again(self, redis_client):
+        AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT)
+
+        # The worker dies after the insert commits but before the batch leaves Redis.
+        with patch("spanza_journal_watch.analytics.ingest._finish_batch", side_effect=ConnectionError("worker lost")):
+            with pytest.raises(ConnectionError):
+                drain_event_buffer()
+        AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.REVIEW_OPEN)
+
+        assert drain_event_buffer() == 0
+        assert redis_client.llen(EVENT_PROCESSING_KEY) == 0
+        assert drain_event_buffer() == 1
+        assert sorted(AnalyticsEvent.objects.values_list("event_type", flat=True)) == sorted(
+            [AnalyticsEvent.EventType.PAGE_VISIT, AnalyticsEvent.EventType.REVIEW_OPEN]
+        )
+
+    def test_drain_parks_batch_that_keeps_failing(self, redis_client):
+        AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT)
+        real_bulk_create = AnalyticsEvent.objects.bulk_create
+
+        def fail_page_visits(events, **kwargs):
+            if events[0].event_type == AnalyticsEvent.EventType.PAGE_VISIT:
+                raise RuntimeError("bad row")
+            return real_bulk_create(events, **kwargs)
+
+        with patch.object(AnalyticsEvent.objects, "bulk_create", side_effect=fail_page_visits):
+            for _ in range(DRAIN_MAX_ATTEMPTS - 1):
+                with pytest.raises(RuntimeError):
+                    drain_event_buffer(batch_size=1)
+            AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.REVIEW_OPEN)
+
+            # The last attempt parks the failing batch and goes on to the event queued behind it.
+            assert drain_event_buffer(batch_size=1) == 1
+
+        assert redis_client.llen(EVENT_DEAD_LETTER_KEY) == 1
+        assert list(AnalyticsEvent.objects.values_list("event_type", flat=True)) == [
+            AnalyticsEvent.EventType.REVIEW_OPEN
+        ]
+
+    def test_drain_that_outlives_its_lock_leaves_the_next_one_alone(self, redis_client):
+        for _ in range(2):
+            AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT)
+        real_bulk_create = AnalyticsEvent.objects.bulk_create
+
+        def slow_bulk_create(events, **kwargs):
+            # The lock expires mid-batch and another drain takes it.
+            redis_client.data[DRAIN_LOCK_KEY] = b"next-drain"
+            return real_bulk_create(events, **kwargs)
+
+        with patch.object(AnalyticsEvent.objects, "bulk_create", side_effect=slow_bulk_create):
+            assert drain_event_buffer(batch_size=1) == 1
+
+        assert redis_client.get(DRAIN_LOCK_KEY) == b"next-drain"
+        assert redis_client.llen(EVENT_BUFFER_KEY) == 1
+
+    def test_falls_back_to_direct_insert_without_redis(self, settings):
+        settings.ANALYTICS_BUFFERED_INGESTION = True
+
+        event = AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT)
+
+        assert event.pk is not None
+
+
+class TestCoalescedAutomatedCounts:
+    @pytest.fixture()
+    def redis_client(self, settings):
+        settings.ANALYTICS_BUFFERED_INGESTION = True
+        client = FakeRedis()
+        with patch("spanza_journal_watch.analytics.ingest.get_redis_client", return_value=client):
+            yield client
+
+    def _bot_request(self):
+        return RequestFactory().get("/", HTTP_USER_AGENT="Gatus/1.0")
+
+    def test_bot_rejection_does_not_write_until_flush(self, redis_client):
+        for _ in range(3):
+            AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT, request=self._bot_request())
+
+        assert AutomatedRequestCount.objects.count() == 0
+
+        assert flush_automated_counts() == 1
+        counter = AutomatedRequestCount.objects.get(event_type=AnalyticsEvent.EventType.PAGE_VISIT, reason="ua_marker")
+        assert counter.count == 3
+
+    def test_flush_adds_to_existing_daily_total(self, redis_client):
+        AutomatedRequestCount.bump(AnalyticsEvent.EventType.PAGE_VISIT, reason="ua_marker", by=5)
+        AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT, request=self._bot_request())
+
+        flush_automated_counts()
+        flush_automated_counts()
+
+        counter = AutomatedRequestCount.objects.get(event_type=AnalyticsEvent.EventType.PAGE_VISIT, reason="ua_marker")
+        assert counter.count == 6
+
+    def test_interrupted_flush_is_applied_once_on_rerun(self, redis_client):
+        AutomatedRequestCount.bump(AnalyticsEvent.EventType.PAGE_VISIT, reason="ua_marker", by=5)
+        for _ in range(2):
+            AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT, request=self._bot_request())
+        AutomatedRequestCount.bump_coalesced(AnalyticsEvent.EventType.REVIEW_OPEN, reason="empty_ua")
+
+        # The worker dies after the counts commit but before the hash is deleted.
+        with patch.object(redis_client, "delete", side_effect=ConnectionError("worker lost")):
+            with pytest.raises(ConnectionError):
+                flush_automated_counts()
+        AnalyticsEvent.record_event(event_type=AnalyticsEvent.EventType.PAGE_VISIT, request=self._bot_request())
+
+        assert flush_automated_counts() == 2
+        assert flush_automated_counts() == 1
+
+        counts = dict(AutomatedRequestCount.objects.values_list("event_type", "count"))
+        assert counts == {AnalyticsEvent.EventType.PAGE_VISIT: 8, AnalyticsEvent.EventType.REVIEW_OPEN: 1}
+
+
+class TestDailyRollups:
+    def _event(self, days_ago=0, **kwargs):
+        kwargs.setdefault("event_type", AnalyticsEvent.EventType.PAGE_VISIT)
+        timestamp = timezone.now() - datetime.timedelta(days=days_ago)
+        return AnalyticsEvent.objects.create(timestamp=timestamp, **kwargs)
+
+    def _day(self, days_ago):
+        return timezone.localdate(timezone.now() - datetime.timedelta(days=days_ago))
+
+    def test_refresh_rolls_up_days_and_advances_watermark(self):
+        self._event(days_ago=3, js_verified=True)
+        self._event(days_ago=3, event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED, duration_ms=4000)
+        last = self._event(days_ago=3, event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED, duration_ms=2000)
+
+        result = refresh_rollups()
+
+        assert result["pending"] == 0
+        rows = AnalyticsDailyRollup.objects.filter(date=self._day(3))
+        engaged = rows.get(event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED)
+        assert engaged.count == 2
+        assert engaged.duration_ms_sum == 6000
+        assert engaged.duration_count == 2
+        assert rows.get(event_type=AnalyticsEvent.EventType.PAGE_VISIT).js_verified_count == 1
+        state = AnalyticsRollupState.load()
+        assert state.last_event_id == last.pk
+        assert state.covered_through == self._day(1)
+
+    def test_totals_combine_rollup_with_live_tail(self):
+        self._event(days_ago=2)
+        refresh_rollups()
+        self._event(days_ago=0)
+        self._event(days_ago=0)
+
+        totals = event_totals(self._day(7), self._day(0))
+
+        assert totals["count"] == 3
+        by_date = {
+            row["date"]: row["count"] for row in event_breakdown(self._day(7), self._day(0), group_by=("date",))
+        }
+        assert by_date == {self._day(2): 1, self._day(0): 2}
+
+    def test_late_event_for_old_day_is_picked_up(self):
+        self._event(days_ago=10)
+        refresh_rollups()
+
+        self._event(days_ago=10)
+        refresh_rollups()
+
+        assert AnalyticsDailyRollup.objects.get(date=self._day(10)).count == 2
+
+    def test_marked_dirty_days_are_recomputed(self):
+        event = self._event(days_ago=5)
+        refresh_rollups()
+
+        AnalyticsEvent.objects.filter(pk=event.pk).update(automated=True)
+        AnalyticsRollupState.mark_dirty([self._day(5)])
+        assert event_totals(self._day(5), self._day(5), automated=True)["count"] == 1
+
+        refresh_rollups()
+
+        row = AnalyticsDailyRollup.objects.get(date=self._day(5))
+        assert row.automated is True
+
+    def test_partial_backfill_reads_remaining_days_live(self):
+        for days_ago in (20, 15, 10):
+            self._event(days_ago=days_ago)
+
+        result = refresh_rollups(max_days=1)
+
+        assert result["pending"] > 0
+        assert AnalyticsDailyRollup.objects.filter(date=self._day(20)).exists()
+        assert not AnalyticsDailyRollup.objects.filter(date=self._day(10)).exists()
+        assert event_totals(self._day(30), self._day(0))["count"] == 3
+
+
+class TestDerivedVisits:
+    @pytest.fixture()
+    def visitor(self):
+        return uuid.uuid4()
+
+    def _event(self, visitor, minutes_ago, **kwargs):
+        kwargs.setdefault("event_type", AnalyticsEvent.EventType.PAGE_VISIT)
+        timestamp = timezone.now() - datetime.timedelta(minutes=minutes_ago)
+        return AnalyticsEvent.objects.create(visitor_id=visitor, timestamp=timestamp, **kwargs)
+
+    def _window(self):
+        now = timezone.now()
+        return now - datetime.timedelta(days=1), now
+
+    def test_refresh_persists_visits_split_on_inactivity(self, visitor):
+        self._event(visitor, 180, metadata={"page": "home"})
+        self._event(visitor, 175, event_type=AnalyticsEvent.EventType.REVIEW_FULL_TEXT_CLICK)
+        last = self._event(visitor, 60, metadata={"page": "search"})
+
+        refresh_derived_visits()
+
+        visits = DerivedVisit.objects.order_by("first_event")
+        assert [visit.event_count for visit in visits] == [2, 1]
+        assert visits[0].landing_page == "/"
+        assert visits[0].engaged is True
+        assert visits[1].engaged is False
+        assert AnalyticsRollupState.load().visits_last_event_id == last.pk
+
+    def test_live_tail_extends_latest_stored_visit(self, visitor):
+        self._event(visitor, 20)
+        refresh_derived_visits()
+        self._event(visitor, 10, event_type=AnalyticsEvent.EventType.JOURNAL_BROWSER_VISIT)
+
+        visits = load_visits(*self._window())
+
+        assert len(visits) == 1
+        assert visits[0]["event_count"] == 2
+        assert visits[0]["touched_journals"] is True
+        assert load_visits(*self._window(), journal_only=True) == visits
+
+        refresh_derived_visits()
+        assert DerivedVisit.objects.get().event_count == 2
+
+    def test_late_event_joins_stored_visits(self, visitor):
+        self._event(visitor, 100)
+        self._event(visitor, 50)
+        refresh_derived_visits()
+        assert DerivedVisit.objects.count() == 2
+
+        self._event(visitor, 75)
+        refresh_derived_visits()
+
+        assert DerivedVisit.objects.get().event_count == 3
+
+    def test_downgraded_visitor_loses_stored_visit(self, visitor):
+        self._event(visitor, 120)
+        refresh_derived_visits()
+        assert DerivedVisit.objects.filter(visitor_id=visitor).exists()
+
+        downgrade_singleton_visitors_task()
+
+        assert not DerivedVisit.objects.filter(visitor_id=visitor).exists()
+        assert load_visits(*self._window()) == []
@@ -19,7 +19,8 @@ from spanza_journal_watch.analytics.utils import (
 )
 from spanza_journal_watch.newsletter.cookies import set_subscribed_cookie
 from spanza_journal_watch.newsletter.models import Newsletter, Subscriber
-from spanza_journal_watch.submissions.models import Hit, Review
+from spanza_journal_watch.submissions.hits import record_hit
+from spanza_journal_watch.submissions.models import Review
 
 logger = logging.getLogger(__name__)
 
@@ -145,7 +146,7 @@ def page_view(request, model=None, slug=None):
                 viewed_key = "model_review_viewed"
                 viewed_objects = request.session.get(viewed_key, [])
                 if review.id not in viewed_objects:
-                    Hit.update_page_count(review)
+                    record_hit(review)
                     viewed_objects.append(review.id)
                     request.session[viewed_key] = viewed_objects
         except (Review.DoesNotExist, MultipleObjectsReturned) as e:
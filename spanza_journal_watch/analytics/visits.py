@@ -0,0 +1,600 @@
+"""Sessionisation of AnalyticsEvent rows into visits, and the DerivedVisit table.
+
+A visit is a run of events sharing a partition key (visitor id, else session
+key, else the event itself) with no gap longer than VISIT_INACTIVITY_GAP. Each
+visit is summarised as it is built: first-touch landing page, referrer and UTM
+fields, plus the flags the dashboards ask of it. Neither cached results nor
+DerivedVisit rows carry the underlying events.
+
+``refresh_derived_visits`` keeps DerivedVisit current from an event-id
+watermark, re-sessionising only the partitions that new events touch.
+``load_visits`` reads a period from it and sessionises the not-yet-persisted
+tail live, extending the latest stored visit of each partition.
+
+``sessionise_queryset`` serves arbitrary scopes. On Postgres it splits visits
+with window functions and fetches one row per visit; otherwise, or with
+ANALYTICS_SESSIONISATION_ENGINE = "python", it sessionises the rows in Python.
+"""
+
+import datetime
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connection, transaction
+from django.db.models import Q
+
+from spanza_journal_watch.analytics.models import (
+    DELIBERATE_INTERACTION_EVENT_TYPES,
+    AnalyticsEvent,
+    AnalyticsRollupState,
+    DerivedVisit,
+    HumanConfidence,
+)
+
+_LANDING_PAGE_EXACT_EXCLUSIONS = frozenset(
+    ["/manifest.json", "/sw.js", "/robots.txt", "/healthz", "/site.webmanifest", "/favicon.ico"]
+)
+_LANDING_PAGE_SUFFIX_EXCLUSIONS = (".png", ".svg", ".xml", ".ico", ".js", ".json", ".webmanifest")
+_LANDING_PAGE_PREFIX_EXCLUSIONS = ("/analytics/link/",)
+VISIT_INACTIVITY_GAP = datetime.timedelta(minutes=30)
+VISIT_PAGE_PATHS = {
+    "home": "/",
+    "issue": "/issues",
+    "tag": "/explore",
+    "journals": "/journals",
+    "search": "/search",
+}
+PAGE_SECTION_LABELS = {
+    "home": "Homepage",
+    "issue": "Issue pages",
+    "review": "Review pages",
+    "tag": "Tag pages",
+    "journals": "Journals browser",
+    "search": "Search",
+}
+JOURNAL_EVENT_TYPES = frozenset(
+    [
+        AnalyticsEvent.EventType.JOURNAL_BROWSER_VISIT,
+        AnalyticsEvent.EventType.JOURNAL_ARTICLE_INTERACT,
+        AnalyticsEvent.EventType.JOURNAL_FULL_TEXT_CLICK,
+        AnalyticsEvent.EventType.JOURNAL_STAR,
+        AnalyticsEvent.EventType.JOURNAL_RECOMMEND,
+        AnalyticsEvent.EventType.JOURNAL_MARK_READ,
+        AnalyticsEvent.EventType.JOURNAL_ARCHIVE,
+        AnalyticsEvent.EventType.JOURNAL_SEARCH,
+        AnalyticsEvent.EventType.JOURNAL_SELECT,
+    ]
+)
+VISIT_PROGRESSION_EVENT_TYPES = frozenset(
+    [
+        AnalyticsEvent.EventType.SEARCH_RESULT_CLICK,
+        AnalyticsEvent.EventType.REVIEW_ENGAGED,
+        AnalyticsEvent.EventType.REVIEW_FULL_TEXT_CLICK,
+        AnalyticsEvent.EventType.REVIEW_SHARE_COPY_LINK,
+        AnalyticsEvent.EventType.REVIEW_SHARE_EMAIL,
+        AnalyticsEvent.EventType.REVIEW_SHARE_NATIVE,
+        AnalyticsEvent.EventType.REVIEW_SHARE_BLUESKY,
+        AnalyticsEvent.EventType.REVIEW_SHARE_X,
+        AnalyticsEvent.EventType.REVIEW_SHARE_FACEBOOK,
+        AnalyticsEvent.EventType.JOURNAL_ARTICLE_INTERACT,
+        AnalyticsEvent.EventType.JOURNAL_FULL_TEXT_CLICK,
+        AnalyticsEvent.EventType.JOURNAL_STAR,
+        AnalyticsEvent.EventType.JOURNAL_RECOMMEND,
+        AnalyticsEvent.EventType.JOURNAL_MARK_READ,
+        AnalyticsEvent.EventType.JOURNAL_ARCHIVE,
+        AnalyticsEvent.EventType.JOURNAL_SELECT,
+        AnalyticsEvent.EventType.NEWSLETTER_SUBSCRIBE,
+    ]
+)
+
+
+def is_reportable_landing_page(path):
+    cleaned_path = ((path or "").split("?", 1)[0]).strip()
+    if not cleaned_path:
+        return False
+    if cleaned_path in _LANDING_PAGE_EXACT_EXCLUSIONS:
+        return False
+    if cleaned_path.startswith(_LANDING_PAGE_PREFIX_EXCLUSIONS):
+        return False
+    return not cleaned_path.endswith(_LANDING_PAGE_SUFFIX_EXCLUSIONS)
+
+
+def derive_visit_landing_page(row):
+    landing_page = row.get("landing_page") or ""
+    if is_reportable_landing_page(landing_page):
+        return landing_page
+
+    metadata = row.get("metadata") or {}
+    page = (metadata.get("page") or "").strip()
+    if page in VISIT_PAGE_PATHS:
+        return VISIT_PAGE_PATHS[page]
+
+    event_type = row.get("event_type")
+    if event_type in {
+        AnalyticsEvent.EventType.SEARCH,
+        AnalyticsEvent.EventType.SEARCH_RESULT_CLICK,
+    }:
+        return "/search"
+    if event_type in {
+        AnalyticsEvent.EventType.JOURNAL_BROWSER_VISIT,
+        AnalyticsEvent.EventType.JOURNAL_ARTICLE_INTERACT,
+        AnalyticsEvent.EventType.JOURNAL_FULL_TEXT_CLICK,
+        AnalyticsEvent.EventType.JOURNAL_STAR,
+        AnalyticsEvent.EventType.JOURNAL_RECOMMEND,
+        AnalyticsEvent.EventType.JOURNAL_MARK_READ,
+        AnalyticsEvent.EventType.JOURNAL_ARCHIVE,
+        AnalyticsEvent.EventType.JOURNAL_SEARCH,
+        AnalyticsEvent.EventType.JOURNAL_SELECT,
+    }:
+        return "/journals"
+    return ""
+
+
+def derive_page_section(row):
+    metadata = row.get("metadata") or {}
+    page = (metadata.get("page") or "").strip()
+    if page in PAGE_SECTION_LABELS:
+        return page
+
+    event_type = row.get("event_type")
+    if event_type in {
+        AnalyticsEvent.EventType.REVIEW_OPEN,
+        AnalyticsEvent.EventType.REVIEW_ENGAGED,
+        AnalyticsEvent.EventType.REVIEW_FULL_TEXT_CLICK,
+        AnalyticsEvent.EventType.REVIEW_SHARE_COPY_LINK,
+        AnalyticsEvent.EventType.REVIEW_SHARE_EMAIL,
+        AnalyticsEvent.EventType.REVIEW_SHARE_NATIVE,
+        AnalyticsEvent.EventType.REVIEW_SHARE_BLUESKY,
+        AnalyticsEvent.EventType.REVIEW_SHARE_X,
+        AnalyticsEvent.EventType.REVIEW_SHARE_FACEBOOK,
+    }:
+        return "review"
+    if event_type in {
+        AnalyticsEvent.EventType.SEARCH,
+        AnalyticsEvent.EventType.SEARCH_RESULT_CLICK,
+    }:
+        return "search"
+    if event_type in JOURNAL_EVENT_TYPES:
+        return "journals"
+    return ""
+
+
+def visit_partition_key(row):
+    visitor_id = row.get("visitor_id")
+    if visitor_id:
+        return f"visitor:{visitor_id}"
+    session_key = (row.get("session_key") or "").strip()
+    if session_key:
+        return f"session:{session_key}"
+    return f"event:{row['id']}"
+
+
+def _utm_field_from_metadata(row, key):
+    metadata = row.get("metadata") or {}
+    return (metadata.get(key) or "").strip()
+
+
+# Fields each event row needs for sessionisation.
+VISIT_EVENT_FIELDS = (
+    "id",
+    "event_type",
+    "timestamp",
+    "visitor_id",
+    "referrer_category",
+    "referrer_domain",
+    "landing_page",
+    "metadata",
+    "session_key",
+    "js_verified",
+    "human_confidence",
+)
+# Transitions are only read from the start of a visit; see _compute_top_flows.
+VISIT_EVENT_TYPES_KEPT = 10
+# DerivedVisit columns, which are also the keys of every visit dict.
+VISIT_FIELDS = (
+    "visit_key",
+    "visitor_id",
+    "referrer_category",
+    "referrer_domain",
+    "landing_page",
+    "utm_source",
+    "utm_medium",
+    "utm_campaign",
+    "first_event",
+    "last_event",
+    "js_verified",
+    "event_count",
+    "event_types",
+    "sections",
+    "review_engaged",
+    "engaged",
+    "progressed",
+    "touched_journals",
+)
+
+
+def _start_visit(row, visit_key):
+    return {
+        "visit_key": visit_key,
+        "visitor_id": row.get("visitor_id"),
+        "referrer_category": row.get("referrer_category") or "",
+        "referrer_domain": row.get("referrer_domain") or "",
+        "landing_page": derive_visit_landing_page(row),
+        "utm_source": _utm_field_from_metadata(row, "utm_source"),
+        "utm_medium": _utm_field_from_metadata(row, "utm_medium"),
+        "utm_campaign": _utm_field_from_metadata(row, "utm_campaign"),
+        "first_event": row["timestamp"],
+        "last_event": row["timestamp"],
+        "js_verified": False,
+        "event_count": 0,
+        "event_types": [],
+        "sections": set(),
+        "review_engaged": False,
+        "engaged": False,
+        "progressed": False,
+        "touched_journals": False,
+    }
+
+
+def _add_event(visit, row):
+    event_type = row["event_type"]
+    visit["last_event"] = max(visit["last_event"], row["timestamp"])
+    visit["event_count"] += 1
+    if len(visit["event_types"]) < VISIT_EVENT_TYPES_KEPT:
+        visit["event_types"].append(event_type)
+    section = derive_page_section(row)
+    if section:
+        visit["sections"].add(section)
+    visit["js_verified"] = visit["js_verified"] or bool(row.get("js_verified"))
+    visit["review_engaged"] = visit["review_engaged"] or event_type == AnalyticsEvent.EventType.REVIEW_ENGAGED
+    visit["engaged"] = visit["engaged"] or (
+        event_type in DELIBERATE_INTERACTION_EVENT_TYPES
+        or row.get("human_confidence") == HumanConfidence.KNOWN_SUBSCRIBER_HUMAN
+    )
+    visit["progressed"] = visit["progressed"] or event_type in VISIT_PROGRESSION_EVENT_TYPES
+    visit["touched_journals"] = visit["touched_journals"] or event_type in JOURNAL_EVENT_TYPES
+    if not visit["landing_page"]:
+        visit["landing_page"] = derive_visit_landing_page(row)
+    for field in ("referrer_category", "referrer_domain"):
+        if not visit[field] and row.get(field):
+            visit[field] = row[field]
+    for field in ("utm_source", "utm_medium", "utm_campaign"):
+        if not visit[field]:
+            visit[field] = _utm_field_from_metadata(row, field)
+
+
+def sessionise(rows, seeds=None):
+    """Split event rows (dicts of VISIT_EVENT_FIELDS) into summarised visits.
+
+    ``seeds`` maps a partition key to an existing visit that the partition's
+    first rows may extend, e.g. the latest persisted visit. Seeds are returned
+    (updated or not) alongside the new visits.
+    """
+    # Group by visit_key then timestamp. A single visitor_id can span multiple
+    # session_keys (e.g. when Django rotates the session cookie), so ordering
+    # in SQL by (visitor_id, session_key, timestamp) would zigzag timestamps
+    # within one visit and produce negative durations.
+    rows = sorted(rows, key=lambda r: (visit_partition_key(r), r["timestamp"], r["id"]))
+    seeds = seeds or {}
+    visits = list(seeds.values())
+
+    current_visit = None
+    for row in rows:
+        visit_key = visit_partition_key(row)
+        if current_visit is None or current_visit["visit_key"] != visit_key:
+            current_visit = seeds.get(visit_key)
+        if current_visit is None or row["timestamp"] - current_visit["last_event"] > VISIT_INACTIVITY_GAP:
+            current_visit = _start_visit(row, visit_key)
+            visits.append(current_visit)
+        _add_event(current_visit, row)
+
+    return visits
+
+
+def _visit_from_model(values):
+    visit = {field: values[field] for field in VISIT_FIELDS}
+    visit["event_types"] = list(visit["event_types"] or [])
+    visit["sections"] = set(visit["sections"] or [])
+    return visit
+
+
+def _model_from_visit(visit):
+    fields = {field: visit[field] for field in VISIT_FIELDS}
+    fields["sections"] = sorted(visit["sections"])
+    for field in ("utm_source", "utm_medium", "utm_campaign"):
+        fields[field] = fields[field][:128]
+    return DerivedVisit(**fields)
+
+
+def partition_starts(rows):
+    """Earliest timestamp per partition key among ``rows``."""
+    starts = {}
+    for row in rows:
+        key = visit_partition_key(row)
+        if key not in starts or row["timestamp"] < starts[key]:
+            starts[key] = row["timestamp"]
+    return starts
+
+
+def _partition_events(keys, since, max_id):
+    visitor_ids, session_keys, event_ids = [], [], []
+    for key in keys:
+        kind, _, value = key.partition(":")
+        if kind == "visitor":
+            visitor_ids.append(value)
+        elif kind == "session":
+            session_keys.append(value)
+        else:
+            event_ids.append(int(value))
+    scope = Q(pk__in=event_ids)
+    if visitor_ids:
+        scope |= Q(visitor_id__in=visitor_ids)
+    if session_keys:
+        scope |= Q(visitor_id__isnull=True, session_key__in=session_keys)
+    return AnalyticsEvent.objects.filter(scope, automated=False, timestamp__gte=since, id__lte=max_id).values(
+        *VISIT_EVENT_FIELDS
+    )
+
+
+def rebuild_visit_partitions(starts, max_id=None):
+    """Re-sessionise each partition in ``starts`` ({key: earliest changed timestamp}).
+
+    Stored visits that end within the inactivity gap of the change (or later)
+    are replaced; earlier visits of the partition cannot be affected. Only
+    events up to ``max_id`` (default: the watermark) are stored, since later
+    ones are still read as the live tail. Returns the number of visits written.
+    """
+    if not starts:
+        return 0
+    if max_id is None:
+        max_id = AnalyticsRollupState.load().visits_last_event_id
+    rebuild_from = dict(starts)
+    earliest = min(starts.values()) - VISIT_INACTIVITY_GAP
+    with transaction.atomic():
+        stale = [
+            visit
+            for visit in DerivedVisit.objects.filter(visit_key__in=list(starts), last_event__gte=earliest).values(
+                "pk", "visit_key", "first_event", "last_event"
+            )
+            if visit["last_event"] >= starts[visit["visit_key"]] - VISIT_INACTIVITY_GAP
+        ]
+        for visit in stale:
+            key = visit["visit_key"]
+            rebuild_from[key] = min(rebuild_from[key], visit["first_event"])
+        DerivedVisit.objects.filter(pk__in=[visit["pk"] for visit in stale]).delete()
+
+        rows = [
+            row
+            for row in _partition_events(rebuild_from, min(rebuild_from.values()), max_id)
+            if row["timestamp"] >= rebuild_from[visit_partition_key(row)]
+        ]
+        visits = sessionise(rows)
+        DerivedVisit.objects.bulk_create([_model_from_visit(visit) for visit in visits], batch_size=1000)
+    return len(visits)
+
+
+def refresh_derived_visits(chunk_size=20_000):
+    """Fold events past the watermark into DerivedVisit. Returns the number of events consumed."""
+    state = AnalyticsRollupState.load()
+    rows = list(
+        AnalyticsEvent.objects.filter(id__gt=state.visits_last_event_id)
+        .order_by("id")
+        .values("id", "visitor_id", "session_key", "timestamp", "automated")[:chunk_size]
+    )
+    if not rows:
+        return 0
+    max_id = rows[-1]["id"]
+    rebuild_visit_partitions(partition_starts(row for row in rows if not row["automated"]), max_id=max_id)
+    AnalyticsRollupState.objects.filter(pk=state.pk).update(visits_last_event_id=max_id)
+    return len(rows)
+
+
+def load_visits(start_ts, end_ts, *, visitor_id=None, journal_only=False):
+    """Visits starting within ``start_ts``..``end_ts``, from DerivedVisit plus the live tail.
+
+    ``journal_only`` keeps visits that touched the journals browser;
+    ``visitor_id`` restricts to one visitor. Before the first refresh the whole
+    period is sessionised live.
+    """
+    watermark = AnalyticsRollupState.objects.filter(pk=1).values_list("visits_last_event_id", flat=True).first() or 0
+
+    stored = DerivedVisit.objects.filter(first_event__gte=start_ts, first_event__lte=end_ts)
+    tail = AnalyticsEvent.objects.filter(
+        id__gt=watermark, automated=False, timestamp__gte=start_ts, timestamp__lte=end_ts
+    )
+    if visitor_id is not None:
+        stored = stored.filter(visitor_id=visitor_id)
+        tail = tail.filter(visitor_id=visitor_id)
+    if journal_only:
+        stored = stored.filter(touched_journals=True)
+
+    tail_rows = list(tail.values(*VISIT_EVENT_FIELDS))
+    if not watermark:
+        return [visit for visit in sessionise(tail_rows) if visit["touched_journals"] or not journal_only]
+
+    seeds = {}
+    if tail_rows:
+        tail_keys = {visit_partition_key(row) for row in tail_rows}
+        latest = (
+            DerivedVisit.objects.filter(visit_key__in=tail_keys)
+            .order_by("visit_key", "-last_event")
+            .distinct("visit_key")
+            .values("pk", *VISIT_FIELDS)
+        )
+        seeds = {row["visit_key"]: (row["pk"], _visit_from_model(row)) for row in latest}
+    seed_pks = {pk for pk, _ in seeds.values()}
+
+    visits = [_visit_from_model(row) for row in stored.exclude(pk__in=seed_pks).values(*VISIT_FIELDS)]
+    visits.extend(sessionise(tail_rows, seeds={key: visit for key, (_, visit) in seeds.items()}))
+    return [
+        visit
+        for visit in visits
+        if start_ts <= visit["first_event"] <= end_ts and (visit["touched_journals"] or not journal_only)
+    ]
+
+
+# ── Window-function engine ─────────────────────────────────────────
+# The per-row derivations below are generated from the same constants as
+# derive_visit_landing_page and visit_partition_key, so both engines agree.
+
+_SEARCH_EVENT_TYPES = [AnalyticsEvent.EventType.SEARCH, AnalyticsEvent.EventType.SEARCH_RESULT_CLICK]
+
+
+def _like_escape(value):
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _landing_candidate_sql():
+    """SQL for derive_visit_landing_page over one row of ``e``, with its params."""
+    path = "btrim(split_part(e.landing_page, '?', 1))"
+    page = "btrim(e.metadata ->> 'page')"
+    page_cases = " ".join("WHEN %s THEN %s" for _ in VISIT_PAGE_PATHS)
+    sql = (
+        "CASE"
+        f" WHEN {path} <> '' AND NOT ({path} = ANY(%s))"
+        f" AND NOT ({path} LIKE ANY(%s)) AND NOT ({path} LIKE ANY(%s)) THEN e.landing_page"
+        f" WHEN {page} = ANY(%s) THEN CASE {page} {page_cases} END"
+        " WHEN e.event_type = ANY(%s) THEN '/search'"
+        " WHEN e.event_type = ANY(%s) THEN '/journals'"
+        " ELSE '' END"
+    )
+    params = [
+        list(_LANDING_PAGE_EXACT_EXCLUSIONS),
+        [_like_escape(prefix) + "%" for prefix in _LANDING_PAGE_PREFIX_EXCLUSIONS],
+        ["%" + _like_escape(suffix) for suffix in _LANDING_PAGE_SUFFIX_EXCLUSIONS],
+        list(VISIT_PAGE_PATHS),
+        *[value for item in VISIT_PAGE_PATHS.items() for value in item],
+        [str(event_type) for event_type in _SEARCH_EVENT_TYPES],
+        [str(event_type) for event_type in JOURNAL_EVENT_TYPES],
+    ]
+    return sql, params
+
+
+def _first_nonempty_sql(expression):
+    return f"(ARRAY_AGG({expression} ORDER BY ts, id) FILTER (WHERE {expression} <> ''))[1]"
+
+
+def _visits_sql(events_qs):
+    id_sql, id_params = events_qs.order_by().values("id").query.sql_with_params()
+    landing_sql, landing_params = _landing_candidate_sql()
+    table = AnalyticsEvent._meta.db_table
+    utm = {field: f"btrim(metadata ->> '{field}')" for field in ("utm_source", "utm_medium", "utm_campaign")}
+    sql = f"""
+        WITH keyed AS (
+            SELECT e.id, e.event_type, e."timestamp" AS ts, e.visitor_id, e.js_verified, e.human_confidence,
+                   e.referrer_category, e.referrer_domain, e.metadata,
+                   CASE WHEN e.visitor_id IS NOT NULL THEN 'visitor:' || e.visitor_id::text
+                        WHEN btrim(e.session_key) <> '' THEN 'session:' || btrim(e.session_key)
+                        ELSE 'event:' || e.id::text END AS visit_key,
+                   {landing_sql} AS landing_candidate
+            FROM {table} e
+            WHERE e.id IN ({id_sql})
+        ),
+        marked AS (
+            SELECT keyed.*,
+                   CASE WHEN ts - LAG(ts) OVER (PARTITION BY visit_key ORDER BY ts, id) <= %s
+                        THEN 0 ELSE 1 END AS is_start
+            FROM keyed
+        ),
+        numbered AS (
+            SELECT marked.*,
+                   SUM(is_start) OVER (PARTITION BY visit_key ORDER BY ts, id ROWS UNBOUNDED PRECEDING) AS visit_no
+            FROM marked
+        )
+        SELECT visit_key,
+               (ARRAY_AGG(visitor_id ORDER BY ts, id))[1],
+               MIN(ts),
+               MAX(ts),
+               COUNT(*),
+               BOOL_OR(js_verified),
+               BOOL_OR(human_confidence = %s),
+               {_first_nonempty_sql("referrer_category")},
+               {_first_nonempty_sql("referrer_domain")},
+               {_first_nonempty_sql("landing_candidate")},
+               {_first_nonempty_sql(utm["utm_source"])},
+               {_first_nonempty_sql(utm["utm_medium"])},
+               {_first_nonempty_sql(utm["utm_campaign"])},
+               (ARRAY_AGG(event_type ORDER BY ts, id))[1:{VISIT_EVENT_TYPES_KEPT}],
+               ARRAY_AGG(DISTINCT COALESCE(btrim(metadata ->> 'page'), '') || '|' || event_type)
+        FROM numbered
+        GROUP BY visit_key, visit_no
+    """
+    params = [*landing_params, *id_params, VISIT_INACTIVITY_GAP, str(HumanConfidence.KNOWN_SUBSCRIBER_HUMAN)]
+    return sql, params
+
+
+def _visit_from_sql_row(row):
+    (
+        visit_key,
+        visitor_id,
+        first_event,
+        last_event,
+        event_count,
+        js_verified,
+        known_subscriber,
+        referrer_category,
+        referrer_domain,
+        landing_page,
+        utm_source,
+        utm_medium,
+        utm_campaign,
+        event_types,
+        page_event_pairs,
+    ) = row
+    sections = set()
+    seen_types = set()
+    for pair in page_event_pairs:
+        page, _, event_type = pair.rpartition("|")
+        seen_types.add(event_type)
+        section = derive_page_section({"metadata": {"page": page}, "event_type": event_type})
+        if section:
+            sections.add(section)
+    return {
+        "visit_key": visit_key,
+        "visitor_id": visitor_id,
+        "referrer_category": referrer_category or "",
+        "referrer_domain": referrer_domain or "",
+        "landing_page": landing_page or "",
+        "utm_source": utm_source or "",
+        "utm_medium": utm_medium or "",
+        "utm_campaign": utm_campaign or "",
+        "first_event": first_event,
+        "last_event": last_event,
+        "js_verified": js_verified,
+        "event_count": event_count,
+        "event_types": list(event_types),
+        "sections": sections,
+        "review_engaged": AnalyticsEvent.EventType.REVIEW_ENGAGED in seen_types,
+        "engaged": known_subscriber or bool(seen_types & DELIBERATE_INTERACTION_EVENT_TYPES),
+        "progressed": bool(seen_types & VISIT_PROGRESSION_EVENT_TYPES),
+        "touched_journals": bool(seen_types & JOURNAL_EVENT_TYPES),
+    }
+
+
+def _sessionise_sql(events_qs):
+    try:
+        sql, params = _visits_sql(events_qs)
+    except EmptyResultSet:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [_visit_from_sql_row(row) for row in cursor.fetchall()]
+
+
+def sessionisation_engine():
+    engine = getattr(settings, "ANALYTICS_SESSIONISATION_ENGINE", "sql")
+    if engine == "sql" and connection.vendor != "postgresql":
+        return "python"
+    return engine
+
+
+def sessionise_queryset(events_qs, engine=None):
+    """Sessionise an arbitrary AnalyticsEvent queryset into visit dicts.
+
+    The "sql" engine partitions and splits visits in Postgres (LAG over each
+    partition, a running sum of visit starts) and returns only per-visit
+    aggregates; "python" fetches every row and runs :func:`sessionise`.
+    """
+    if (engine or sessionisation_engine()) == "sql":
+        return _sessionise_sql(events_qs)
+    return sessionise(events_qs.values(*VISIT_EVENT_FIELDS))
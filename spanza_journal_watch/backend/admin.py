@@ -218,7 +218,7 @@ class WatchedJournalAdmin(admin.ModelAdmin):
     list_filter = ("active", "source")
     search_fields = ("name", "issn_print", "issn_electronic", "journal__name")
     autocomplete_fields = ["journal"]
-    readonly_fields = ("modified",)
+    readonly_fields = ("modified", "cache_synced_at", "cache_synced_from_month", "cache_synced_to_month")
 
 
 # ---------------------------------------------------------------------------
@@ -32,6 +32,15 @@ from spanza_journal_watch.analytics.models import (
     NewsletterClick,
     NewsletterOpen,
 )
+from spanza_journal_watch.analytics.rollups import event_breakdown, event_totals
+from spanza_journal_watch.analytics.visits import (
+    JOURNAL_EVENT_TYPES,
+    PAGE_SECTION_LABELS,
+    VISIT_INACTIVITY_GAP,
+    VISIT_PAGE_PATHS,
+    load_visits,
+    sessionise_queryset,
+)
 from spanza_journal_watch.backend.models import SubscriberCSV
 from spanza_journal_watch.backend.views import (
     _build_rate_row,
@@ -55,61 +64,16 @@ VIEW_SITE_ANALYTICS = "backend.view_site_analytics"
 VIEW_NEWSLETTER_STATS = "backend.view_newsletter_stats"
 
 _PLACEHOLDER_SEARCH_QUERIES = frozenset(["{search_term_string}", "search_term_string"])
-_LANDING_PAGE_EXACT_EXCLUSIONS = frozenset(
-    ["/manifest.json", "/sw.js", "/robots.txt", "/healthz", "/site.webmanifest", "/favicon.ico"]
-)
-_LANDING_PAGE_SUFFIX_EXCLUSIONS = (".png", ".svg", ".xml", ".ico", ".js", ".json", ".webmanifest")
-_LANDING_PAGE_PREFIX_EXCLUSIONS = ("/analytics/link/",)
-_VISIT_INACTIVITY_GAP = datetime.timedelta(minutes=30)
 _LOW_SAMPLE_THRESHOLD = 5
-_VISIT_PAGE_PATHS = {
-    "home": "/",
-    "issue": "/issues",
-    "tag": "/explore",
-    "journals": "/journals",
-    "search": "/search",
-}
-_PAGE_SECTION_LABELS = {
-    "home": "Homepage",
-    "issue": "Issue pages",
-    "review": "Review pages",
-    "tag": "Tag pages",
-    "journals": "Journals browser",
-    "search": "Search",
-}
-_JOURNAL_EVENT_TYPES = frozenset(
-    [
-        AnalyticsEvent.EventType.JOURNAL_BROWSER_VISIT,
-        AnalyticsEvent.EventType.JOURNAL_ARTICLE_INTERACT,
-        AnalyticsEvent.EventType.JOURNAL_FULL_TEXT_CLICK,
-        AnalyticsEvent.EventType.JOURNAL_STAR,
-        AnalyticsEvent.EventType.JOURNAL_RECOMMEND,
-        AnalyticsEvent.EventType.JOURNAL_MARK_READ,
-        AnalyticsEvent.EventType.JOURNAL_ARCHIVE,
-        AnalyticsEvent.EventType.JOURNAL_SEARCH,
-        AnalyticsEvent.EventType.JOURNAL_SELECT,
-    ]
-)
-_VISIT_PROGRESSION_EVENT_TYPES = frozenset(
-    [
-        AnalyticsEvent.EventType.SEARCH_RESULT_CLICK,
-        AnalyticsEvent.EventType.REVIEW_ENGAGED,
-        AnalyticsEvent.EventType.REVIEW_FULL_TEXT_CLICK,
-        AnalyticsEvent.EventType.REVIEW_SHARE_COPY_LINK,
-        AnalyticsEvent.EventType.REVIEW_SHARE_EMAIL,
-        AnalyticsEvent.EventType.REVIEW_SHARE_NATIVE,
-        AnalyticsEvent.EventType.REVIEW_SHARE_BLUESKY,
-        AnalyticsEvent.EventType.REVIEW_SHARE_X,
-        AnalyticsEvent.EventType.REVIEW_SHARE_FACEBOOK,
-        AnalyticsEvent.EventType.JOURNAL_ARTICLE_INTERACT,
-        AnalyticsEvent.EventType.JOURNAL_FULL_TEXT_CLICK,
-        AnalyticsEvent.EventType.JOURNAL_STAR,
-        AnalyticsEvent.EventType.JOURNAL_RECOMMEND,
-        AnalyticsEvent.EventType.JOURNAL_MARK_READ,
-        AnalyticsEvent.EventType.JOURNAL_ARCHIVE,
-        AnalyticsEvent.EventType.JOURNAL_SELECT,
-        AnalyticsEvent.EventType.NEWSLETTER_SUBSCRIBE,
-    ]
+# Large text columns the analytics tables never display.
+_REVIEW_ROW_DEFERRED_FIELDS = (
+    "body",
+    "body_html",
+    "body_text",
+    "search_vector",
+    "article__abstract",
+    "article__metadata_json",
+    "article__tags_string",
 )
 
 
@@ -194,165 +158,19 @@ def _normalise_search_query(raw_query):
     return query
 
 
-def _is_reportable_landing_page(path):
-    cleaned_path = ((path or "").split("?", 1)[0]).strip()
-    if not cleaned_path:
-        return False
-    if cleaned_path in _LANDING_PAGE_EXACT_EXCLUSIONS:
-        return False
-    if cleaned_path.startswith(_LANDING_PAGE_PREFIX_EXCLUSIONS):
-        return False
-    return not cleaned_path.endswith(_LANDING_PAGE_SUFFIX_EXCLUSIONS)
-
-
-def _derive_visit_landing_page(row):
-    landing_page = row.get("landing_page") or ""
-    if _is_reportable_landing_page(landing_page):
-        return landing_page
-
-    metadata = row.get("metadata") or {}
-    page = (metadata.get("page") or "").strip()
-    if page in _VISIT_PAGE_PATHS:
-        return _VISIT_PAGE_PATHS[page]
-
-    event_type = row.get("event_type")
-    if event_type in {
-        AnalyticsEvent.EventType.SEARCH,
-        AnalyticsEvent.EventType.SEARCH_RESULT_CLICK,
-    }:
-        return "/search"
-    if event_type in {
-        AnalyticsEvent.EventType.JOURNAL_BROWSER_VISIT,
-        AnalyticsEvent.EventType.JOURNAL_ARTICLE_INTERACT,
-        AnalyticsEvent.EventType.JOURNAL_FULL_TEXT_CLICK,
-        AnalyticsEvent.EventType.JOURNAL_STAR,
-        AnalyticsEvent.EventType.JOURNAL_RECOMMEND,
-        AnalyticsEvent.EventType.JOURNAL_MARK_READ,
-        AnalyticsEvent.EventType.JOURNAL_ARCHIVE,
-        AnalyticsEvent.EventType.JOURNAL_SEARCH,
-        AnalyticsEvent.EventType.JOURNAL_SELECT,
-    }:
-        return "/journals"
-    return ""
-
-
-def _derive_page_section(row):
-    metadata = row.get("metadata") or {}
-    page = (metadata.get("page") or "").strip()
-    if page in _PAGE_SECTION_LABELS:
-        return page
-
-    event_type = row.get("event_type")
-    if event_type in {
-        AnalyticsEvent.EventType.REVIEW_OPEN,
-        AnalyticsEvent.EventType.REVIEW_ENGAGED,
-        AnalyticsEvent.EventType.REVIEW_FULL_TEXT_CLICK,
-        AnalyticsEvent.EventType.REVIEW_SHARE_COPY_LINK,
-        AnalyticsEvent.EventType.REVIEW_SHARE_EMAIL,
-        AnalyticsEvent.EventType.REVIEW_SHARE_NATIVE,
-        AnalyticsEvent.EventType.REVIEW_SHARE_BLUESKY,
-        AnalyticsEvent.EventType.REVIEW_SHARE_X,
-        AnalyticsEvent.EventType.REVIEW_SHARE_FACEBOOK,
-    }:
-        return "review"
-    if event_type in {
-        AnalyticsEvent.EventType.SEARCH,
-        AnalyticsEvent.EventType.SEARCH_RESULT_CLICK,
-    }:
-        return "search"
-    if event_type in _JOURNAL_EVENT_TYPES:
-        return "journals"
-    return ""
-
-
-def _visit_partition_key(row):
-    visitor_id = row.get("visitor_id")
-    if visitor_id:
-        return f"visitor:{visitor_id}"
-    session_key = (row.get("session_key") or "").strip()
-    if session_key:
-        return f"session:{session_key}"
-    return f"event:{row['id']}"
-
-
-def _utm_field_from_metadata(row, key):
-    metadata = row.get("metadata") or {}
-    return (metadata.get(key) or "").strip()
-
-
 def _build_derived_visits(events_qs):
-    rows = list(
-        events_qs.values(
-            "id",
-            "event_type",
-            "timestamp",
-            "visitor_id",
-            "referrer_category",
-            "referrer_domain",
-            "landing_page",
-            "metadata",
-            "session_key",
-            "js_verified",
-            "human_confidence",
-        )
-    )
-    # Group by visit_key then timestamp. A single visitor_id can span multiple
-    # session_keys (e.g. when Django rotates the session cookie), so ordering
-    # in SQL by (visitor_id, session_key, timestamp) would zigzag timestamps
-    # within one visit and produce negative durations.
-    rows.sort(key=lambda r: (_visit_partition_key(r), r["timestamp"], r["id"]))
-
-    visits = []
-    current_visit = None
-    for row in rows:
-        visit_key = _visit_partition_key(row)
-        timestamp = row["timestamp"]
-        should_start_new_visit = (
-            current_visit is None
-            or current_visit["visit_key"] != visit_key
-            or timestamp - current_visit["last_event"] > _VISIT_INACTIVITY_GAP
-        )
-        if should_start_new_visit:
-            current_visit = {
-                "visit_key": visit_key,
-                "visitor_id": row.get("visitor_id"),
-                "referrer_category": row.get("referrer_category") or "",
-                "referrer_domain": row.get("referrer_domain") or "",
-                "landing_page": _derive_visit_landing_page(row),
-                "first_event": timestamp,
-                "last_event": timestamp,
-                "js_verified": bool(row.get("js_verified")),
-                "utm_source": _utm_field_from_metadata(row, "utm_source"),
-                "utm_medium": _utm_field_from_metadata(row, "utm_medium"),
-                "utm_campaign": _utm_field_from_metadata(row, "utm_campaign"),
-                "events": [row],
-            }
-            visits.append(current_visit)
-            continue
-
-        current_visit["last_event"] = timestamp
-        current_visit["events"].append(row)
-        current_visit["js_verified"] = current_visit["js_verified"] or bool(row.get("js_verified"))
-        if not current_visit["landing_page"]:
-            current_visit["landing_page"] = _derive_visit_landing_page(row)
-        if not current_visit["referrer_category"] and row.get("referrer_category"):
-            current_visit["referrer_category"] = row["referrer_category"]
-        if not current_visit["referrer_domain"] and row.get("referrer_domain"):
-            current_visit["referrer_domain"] = row["referrer_domain"]
-        if not current_visit["utm_source"]:
-            current_visit["utm_source"] = _utm_field_from_metadata(row, "utm_source")
-        if not current_visit["utm_medium"]:
-            current_visit["utm_medium"] = _utm_field_from_metadata(row, "utm_medium")
-        if not current_visit["utm_campaign"]:
-            current_visit["utm_campaign"] = _utm_field_from_metadata(row, "utm_campaign")
+    """Sessionise an arbitrary event queryset live.
 
-    return visits
+    The dashboard panels read persisted visits via ``load_visits``; this is for
+    scopes DerivedVisit cannot answer. On Postgres the split runs in SQL and
+    only one row per visit is fetched (see ``sessionise_queryset``).
+    """
+    return sessionise_queryset(events_qs)
 
 
-# Sessionising a 90-day window pulls ~17k rows into Python and spends ~1.7s
-# building visits (the SQL itself is <0.4s). The dashboard panels each rebuild
-# this from the same base queryset, so cache the result briefly and let every
-# panel for a given date-range/scope share it. Analytics tolerate minutes of
+# Sessionising a 90-day window in Python pulls ~17k rows and spends ~1.7s
+# building visits (the SQL itself is <0.4s). Cache the result briefly so
+# repeat builds of the same scope share it. Analytics tolerate minutes of
 # staleness; production uses Redis (a fresh copy per get, so no aliasing) and
 # fails open, while local dev uses DummyCache (this is a transparent no-op).
 _DERIVED_VISITS_CACHE_PREFIX = "analytics:derived_visits:"
@@ -573,14 +391,18 @@ def _benchmark_verdict(first_week_opens, median):
 
 
 def _is_one_step_visit(visit):
-    sections_seen = {section for section in (_derive_page_section(row) for row in visit["events"]) if section}
-    progressed = any(row["event_type"] in _VISIT_PROGRESSION_EVENT_TYPES for row in visit["events"])
-    return len(sections_seen) <= 1 and not progressed
+    return len(visit["sections"]) <= 1 and not visit["progressed"]
+
 
+def _confidence_summary(events_qs, start_date, end_date):
+    """Return confidence metrics for the human events of ``start_date``..``end_date``.
 
-def _confidence_summary(events_qs):
-    """Return confidence metrics for a queryset of AnalyticsEvent."""
-    total = events_qs.count()
+    Event counts come from the daily rollup; engaged humans are distinct
+    visitors, which the rollup does not keep, so they are counted from
+    ``events_qs`` (the period's ``_base_event_qs``).
+    """
+    rows = event_breakdown(start_date, end_date, group_by=("human_confidence",), automated=False)
+    total = sum(row["count"] for row in rows)
     if not total:
         return {
             "conf_total": 0,
@@ -588,8 +410,8 @@ def _confidence_summary(events_qs):
             "conf_subscriber_rate": "—",
             "conf_engaged_humans": 0,
         }
-    js = events_qs.filter(js_verified=True).count()
-    subs = events_qs.filter(human_confidence="known_subscriber_human").count()
+    js = sum(row["js_verified_count"] for row in rows)
+    subs = sum(row["count"] for row in rows if row["human_confidence"] == "known_subscriber_human")
     return {
         "conf_total": total,
         "conf_js_rate": _safe_percentage(js, total),
@@ -620,6 +442,139 @@ def _render_analytics(request, template, context, panel_template=None):
     return render(request, template, context)
 
 
+def _review_event_summary(start_date, end_date, review_ct, share_event_types):
+    """Human review KPIs for a date range, read from the daily rollup."""
+    E = AnalyticsEvent.EventType
+    by_type = {
+        row["event_type"]: row
+        for row in event_breakdown(
+            start_date, end_date, group_by=("event_type",), content_type=review_ct, automated=False
+        )
+    }
+    engaged = by_type.get(E.REVIEW_ENGAGED, {})
+    share_counts = {
+        event_type: by_type[event_type]["count"] for event_type in share_event_types if event_type in by_type
+    }
+    return {
+        "total_opens": by_type.get(E.REVIEW_OPEN, {}).get("count", 0),
+        "total_engaged": engaged.get("count", 0),
+        "total_full_text": by_type.get(E.REVIEW_FULL_TEXT_CLICK, {}).get("count", 0),
+        "total_shares": sum(share_counts.values()),
+        "avg_dwell": engaged["duration_ms_sum"] / engaged["duration_count"] if engaged.get("duration_count") else None,
+        "avg_scroll": (
+            engaged["scroll_depth_sum"] / engaged["scroll_depth_count"] if engaged.get("scroll_depth_count") else None
+        ),
+        "share_counts": share_counts,
+    }
+
+
+def _review_object_summary(start_date, end_date, review_ct, share_event_types):
+    """Per-review open/engaged/full-text/share counts, busiest first."""
+    E = AnalyticsEvent.EventType
+    summary = defaultdict(lambda: {"opens": 0, "engaged_views": 0, "full_text_clicks": 0, "total_shares": 0})
+    field_for_type = {
+        E.REVIEW_OPEN: "opens",
+        E.REVIEW_ENGAGED: "engaged_views",
+        E.REVIEW_FULL_TEXT_CLICK: "full_text_clicks",
+        **{event_type: "total_shares" for event_type in share_event_types},
+    }
+    for row in event_breakdown(
+        start_date, end_date, group_by=("object_id", "event_type"), content_type=review_ct, automated=False
+    ):
+        field = field_for_type.get(row["event_type"])
+        if field:
+            summary[row["object_id"]][field] += row["count"]
+    rows = [{"object_id": object_id, **counts} for object_id, counts in summary.items()]
+    rows.sort(key=lambda row: (row["opens"], row["engaged_views"], row["full_text_clicks"]), reverse=True)
+    return rows
+
+
+def _weekly_rollup_buckets(weeks=26, start_date=None, end_date=None, **filters):
+    """Rollup-backed equivalent of :func:`_weekly_buckets` for AnalyticsEvent counts.
+
+    ``start_date``/``end_date`` limit the counted days, like passing
+    :func:`_weekly_buckets` a period-scoped queryset.
+    """
+    today = timezone.localdate()
+    cutoff_date = today - datetime.timedelta(days=today.weekday() + 7 * (weeks - 1))
+    first_day = max(cutoff_date, start_date) if start_date else cutoff_date
+    last_day = min(today, end_date) if end_date else today
+    week_counts = Counter()
+    for row in event_breakdown(first_day, last_day, group_by=("date",), **filters):
+        week_counts[row["date"] - datetime.timedelta(days=row["date"].weekday())] += row["count"]
+
+    return [
+        {
+            "label": (week_start := today - datetime.timedelta(days=today.weekday() + 7 * i)).strftime("%-d %b"),
+            "count": week_counts.get(week_start, 0),
+            "week_start": week_start.isoformat(),
+        }
+        for i in range(weeks - 1, -1, -1)
+    ]
+
+
+def _event_count_between(start_ts, end_ts, **filters):
+    """AnalyticsEvent count in ``[start_ts, end_ts)``.
+
+    Whole days are read from the daily rollup; only the partial days at either
+    end of the window are counted from the raw table.
+    """
+    start_local = timezone.localtime(start_ts)
+    first_day = start_local.date()
+    if start_local.time() != datetime.time.min:
+        first_day += datetime.timedelta(days=1)
+    last_day = timezone.localtime(end_ts).date() - datetime.timedelta(days=1)
+    raw_qs = AnalyticsEvent.objects.filter(**filters)
+    if first_day > last_day:
+        return raw_qs.filter(timestamp__gte=start_ts, timestamp__lt=end_ts).count()
+
+    first_ts = timezone.make_aware(datetime.datetime.combine(first_day, datetime.time.min))
+    after_ts = timezone.make_aware(datetime.datetime.combine(last_day + datetime.timedelta(days=1), datetime.time.min))
+    edges = raw_qs.filter(
+        Q(timestamp__gte=start_ts, timestamp__lt=first_ts) | Q(timestamp__gte=after_ts, timestamp__lt=end_ts)
+    ).count()
+    return edges + event_totals(first_day, last_day, **filters)["count"]
+
+
+def _engaged_views_between(start_ts, end_ts):
+    return _event_count_between(start_ts, end_ts, event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED, automated=False)
+
+
+def _newsletter_lift(newsletters):
+    """Human engaged review views in the week before and the week after each send."""
+    newsletter_lift = []
+    for nl in newsletters:
+        if not nl.send_date:
+            continue
+        if _newsletter_predates_site_analytics(nl):
+            newsletter_lift.append(
+                {
+                    "newsletter": nl,
+                    "before": None,
+                    "after": None,
+                    "lift_pct": None,
+                    "site_analytics_partial": True,
+                }
+            )
+            continue
+        send_dt = nl.send_date
+        before_count = _engaged_views_between(send_dt - datetime.timedelta(days=7), send_dt)
+        after_count = _engaged_views_between(send_dt, send_dt + datetime.timedelta(days=7))
+        lift_pct = None
+        if before_count:
+            lift_pct = round((after_count - before_count) / before_count * 100)
+        newsletter_lift.append(
+            {
+                "newsletter": nl,
+                "before": before_count,
+                "after": after_count,
+                "lift_pct": lift_pct,
+                "site_analytics_partial": False,
+            }
+        )
+    return newsletter_lift
+
+
 def _weekly_buckets(qs, timestamp_field="timestamp", weeks=26):
     from django.db.models.functions import TruncWeek
 
@@ -697,11 +652,7 @@ def _visit_is_engaged(visit):
     session duration — the June 2026 bot audit found JS-executing bots game both,
     so counting them here would let the Audience explorer contradict the KPI.
     """
-    return any(
-        row["event_type"] in DELIBERATE_INTERACTION_EVENT_TYPES
-        or row.get("human_confidence") == AnalyticsEvent.HumanConfidence.KNOWN_SUBSCRIBER_HUMAN
-        for row in visit["events"]
-    )
+    return visit["engaged"]
 
 
 def _resolve_content_titles(event_ids):
@@ -813,7 +764,7 @@ def _format_event_detail(event_row, extra, title):
         else:
             page = metadata.get("page")
             if page:
-                parts.append(_VISIT_PAGE_PATHS.get(page, str(page)))
+                parts.append(VISIT_PAGE_PATHS.get(page, str(page)))
     return " · ".join(parts)
 
 
@@ -826,7 +777,7 @@ def _compute_top_flows(visits):
     transition_counter = Counter()
     total_visits_with_transition = 0
     for visit in visits:
-        event_types = [row["event_type"] for row in visit["events"][:10]]
+        event_types = visit["event_types"][:10]
         seen = set()
         had_transition = False
         for i in range(len(event_types) - 1):
@@ -858,7 +809,6 @@ def analytics_overview(request):
 
     human_events = _base_event_qs(request, start_ts, end_ts)
     review_ct = ContentType.objects.get_for_model(Review)
-    review_events = human_events.filter(content_type=review_ct)
 
     share_event_types = [
         AnalyticsEvent.EventType.REVIEW_SHARE_COPY_LINK,
@@ -870,14 +820,7 @@ def analytics_overview(request):
     ]
 
     E = AnalyticsEvent.EventType
-    period_agg = review_events.aggregate(
-        total_opens=Count("id", filter=Q(event_type=E.REVIEW_OPEN)),
-        total_engaged=Count("id", filter=Q(event_type=E.REVIEW_ENGAGED)),
-        total_full_text=Count("id", filter=Q(event_type=E.REVIEW_FULL_TEXT_CLICK)),
-        total_shares=Count("id", filter=Q(event_type__in=share_event_types)),
-        avg_dwell=Avg("duration_ms", filter=Q(event_type=E.REVIEW_ENGAGED)),
-        avg_scroll=Avg("scroll_depth", filter=Q(event_type=E.REVIEW_ENGAGED, scroll_depth__isnull=False)),
-    )
+    period_agg = _review_event_summary(start_date, end_date, review_ct, share_event_types)
     total_opens = period_agg["total_opens"]
     total_engaged = period_agg["total_engaged"]
     total_full_text = period_agg["total_full_text"]
@@ -912,15 +855,7 @@ def analytics_overview(request):
     prev_human = AnalyticsEvent.objects.filter(
         timestamp__gte=prev_start_ts, timestamp__lte=prev_end_ts, automated=False
     )
-    prev_review = prev_human.filter(content_type=review_ct)
-    prev_agg = prev_review.aggregate(
-        total_opens=Count("id", filter=Q(event_type=E.REVIEW_OPEN)),
-        total_engaged=Count("id", filter=Q(event_type=E.REVIEW_ENGAGED)),
-        total_full_text=Count("id", filter=Q(event_type=E.REVIEW_FULL_TEXT_CLICK)),
-        total_shares=Count("id", filter=Q(event_type__in=share_event_types)),
-        avg_dwell=Avg("duration_ms", filter=Q(event_type=E.REVIEW_ENGAGED)),
-        avg_scroll=Avg("scroll_depth", filter=Q(event_type=E.REVIEW_ENGAGED, scroll_depth__isnull=False)),
-    )
+    prev_agg = _review_event_summary(prev_start, prev_end, review_ct, share_event_types)
     prev_opens = prev_agg["total_opens"]
     prev_engaged = prev_agg["total_engaged"]
     prev_full_text = prev_agg["total_full_text"]
@@ -935,46 +870,13 @@ def analytics_overview(request):
         .count()
     )
 
-    engaged_qs = AnalyticsEvent.objects.filter(event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED, automated=False)
-    weekly_trend = _weekly_buckets(engaged_qs)
+    weekly_trend = _weekly_rollup_buckets(event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED, automated=False)
     newsletter_sends = _newsletter_send_weeks(weeks=26)
 
     recent_newsletters = list(Newsletter.objects.filter(is_sent=True).order_by("-send_date")[:4])
-    newsletter_lift = []
-    for nl in recent_newsletters:
-        if not nl.send_date:
-            continue
-        if _newsletter_predates_site_analytics(nl):
-            newsletter_lift.append(
-                {
-                    "newsletter": nl,
-                    "before": None,
-                    "after": None,
-                    "lift_pct": None,
-                    "site_analytics_partial": True,
-                }
-            )
-            continue
-        send_dt = nl.send_date
-        before_start = send_dt - datetime.timedelta(days=7)
-        after_end = send_dt + datetime.timedelta(days=7)
-        lift_qs = AnalyticsEvent.objects.filter(event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED, automated=False)
-        before_count = lift_qs.filter(timestamp__gte=before_start, timestamp__lt=send_dt).count()
-        after_count = lift_qs.filter(timestamp__gte=send_dt, timestamp__lte=after_end).count()
-        lift_pct = None
-        if before_count:
-            lift_pct = round((after_count - before_count) / before_count * 100)
-        newsletter_lift.append(
-            {
-                "newsletter": nl,
-                "before": before_count,
-                "after": after_count,
-                "lift_pct": lift_pct,
-                "site_analytics_partial": False,
-            }
-        )
+    newsletter_lift = _newsletter_lift(recent_newsletters)
 
-    visits = _build_derived_visits_cached(human_events)
+    visits = load_visits(start_ts, end_ts)
 
     # Unique visitors and visits
     unique_visitors = len({v["visitor_id"] for v in visits if v["visitor_id"]})
@@ -986,22 +888,16 @@ def analytics_overview(request):
     # session_key climbs when they slip through the UA filter.
     unique_session_keys = human_events.exclude(session_key="").values("session_key").distinct().count()
 
-    human_agg = human_events.aggregate(
-        human_event_count=Count("id"),
-        subscriber_events=Count(
-            "id", filter=Q(human_confidence=AnalyticsEvent.HumanConfidence.KNOWN_SUBSCRIBER_HUMAN)
-        ),
-    )
-    human_event_count = human_agg["human_event_count"]
-    subscriber_events = human_agg["subscriber_events"]
-
     # Data quality — always across ALL events regardless of filter toggle
-    all_period = AnalyticsEvent.objects.filter(timestamp__gte=start_ts, timestamp__lte=end_ts)
-    all_agg = all_period.aggregate(
-        total_all_events=Count("id"),
-        js_verified_count=Count("id", filter=Q(js_verified=True)),
+    quality_rows = event_breakdown(start_date, end_date, group_by=("automated", "human_confidence"))
+    human_rows = [row for row in quality_rows if not row["automated"]]
+    human_event_count = sum(row["count"] for row in human_rows)
+    subscriber_events = sum(
+        row["count"]
+        for row in human_rows
+        if row["human_confidence"] == AnalyticsEvent.HumanConfidence.KNOWN_SUBSCRIBER_HUMAN
     )
-    total_all_events = all_agg["total_all_events"]
+    total_all_events = sum(row["count"] for row in quality_rows)
     # Automated requests are no longer persisted per-row; read from the daily
     # aggregate counter bumped by record_event's bot short-circuit.
     automated_counter_qs = AutomatedRequestCount.objects.filter(
@@ -1016,25 +912,21 @@ def analytics_overview(request):
         automated_counter_qs.values("reason").annotate(total=Sum("count")).order_by("-total")
     )
     total_attempted_events = total_all_events + automated_count
-    js_verified_count = all_agg["js_verified_count"]
-    confidence_breakdown = list(all_period.values("human_confidence").annotate(count=Count("id")).order_by("-count"))
+    js_verified_count = sum(row["js_verified_count"] for row in quality_rows)
+    confidence_counts = Counter()
+    for row in quality_rows:
+        confidence_counts[row["human_confidence"]] += row["count"]
+    confidence_breakdown = [
+        {"human_confidence": confidence, "count": count} for confidence, count in confidence_counts.most_common()
+    ]
 
-    review_summary_rows = list(
-        review_events.values("object_id")
-        .annotate(
-            opens=Count("id", filter=Q(event_type=E.REVIEW_OPEN)),
-            engaged_views=Count("id", filter=Q(event_type=E.REVIEW_ENGAGED)),
-            full_text_clicks=Count("id", filter=Q(event_type=E.REVIEW_FULL_TEXT_CLICK)),
-            total_shares=Count("id", filter=Q(event_type__in=share_event_types)),
-        )
-        .order_by("-opens", "-engaged_views", "-full_text_clicks")
-    )
+    review_summary_rows = _review_object_summary(start_date, end_date, review_ct, share_event_types)
     review_ids = [row["object_id"] for row in review_summary_rows if row["object_id"]]
     reviews_by_id = {
         review.id: review
         for review in Review.objects.filter(id__in=review_ids)
         .select_related("article__journal")
-        .defer("body", "search_vector", "article__abstract", "article__metadata_json", "article__tags_string")
+        .defer(*_REVIEW_ROW_DEFERRED_FIELDS)
     }
     review_rows = []
     for row in review_summary_rows:
@@ -1062,12 +954,7 @@ def analytics_overview(request):
     best_full_text_review = _rank_rows(review_rows, ("full_text_clicks", "full_text_ctr_value", "opens"), limit=1)
     most_shared_review = _rank_rows(review_rows, ("total_shares", "share_rate_value", "opens"), limit=1)
 
-    share_count_map = dict(
-        review_events.filter(event_type__in=share_event_types)
-        .values_list("event_type")
-        .annotate(count=Count("id"))
-        .values_list("event_type", "count")
-    )
+    share_count_map = period_agg["share_counts"]
     share_counts = {
         "Copy link": share_count_map.get(E.REVIEW_SHARE_COPY_LINK, 0),
         "Email": share_count_map.get(E.REVIEW_SHARE_EMAIL, 0),
@@ -1142,7 +1029,7 @@ def analytics_overview(request):
     section_summary = defaultdict(lambda: {"visits": 0, "engaged_visits": 0, "one_step_visits": 0})
     source_summary = defaultdict(int)
     for visit in visits:
-        engaged_visit = any(row["event_type"] == AnalyticsEvent.EventType.REVIEW_ENGAGED for row in visit["events"])
+        engaged_visit = visit["review_engaged"]
         one_step_visit = _is_one_step_visit(visit)
         source_summary[visit["referrer_category"] or ""] += 1
         if visit["landing_page"]:
@@ -1152,7 +1039,7 @@ def analytics_overview(request):
                 landing["engaged_visits"] += 1
             if one_step_visit:
                 landing["one_step_visits"] += 1
-        sections_seen = {section for section in (_derive_page_section(row) for row in visit["events"]) if section}
+        sections_seen = visit["sections"]
         for section in sections_seen:
             summary = section_summary[section]
             summary["visits"] += 1
@@ -1192,7 +1079,7 @@ def analytics_overview(request):
         one_step_rate_value = summary["one_step_visits"] / summary["visits"]
         section_candidates.append(
             {
-                "label": _PAGE_SECTION_LABELS.get(section, section),
+                "label": PAGE_SECTION_LABELS.get(section, section),
                 "visits": summary["visits"],
                 "engaged_rate": _safe_percentage(summary["engaged_visits"], summary["visits"]),
                 "one_step_rate": _safe_percentage(summary["one_step_visits"], summary["visits"]),
@@ -1414,7 +1301,7 @@ def analytics_overview(request):
         "overview_confidence_items": overview_confidence_items,
         "active_tab": "overview",
     }
-    context.update(_confidence_summary(human_events))
+    context.update(_confidence_summary(human_events, start_date, end_date))
     return _render_analytics(
         request, "backend/analytics/overview.html", context, "backend/analytics/_overview_panel.html"
     )
@@ -1478,7 +1365,7 @@ def analytics_editorial(request):
         for r in Review.objects.filter(id__in=review_ids)
         .select_related("article__journal", "author")
         .prefetch_related("article__tags")
-        .defer("body", "search_vector", "article__abstract", "article__metadata_json", "article__tags_string")
+        .defer(*_REVIEW_ROW_DEFERRED_FIELDS)
     }
 
     top_reviews = []
@@ -1794,7 +1681,7 @@ def analytics_editorial(request):
         "top_related_destinations": top_related_destinations,
         "active_tab": "content",
     }
-    context.update(_confidence_summary(human_events))
+    context.update(_confidence_summary(human_events, start_date, end_date))
     return _render_analytics(
         request, "backend/analytics/content.html", context, "backend/analytics/_content_panel.html"
     )
@@ -1805,7 +1692,7 @@ def analytics_editorial(request):
 def analytics_traffic(request):
     start_date, end_date, start_ts, end_ts = _date_range_from_request(request)
     human_events = _base_event_qs(request, start_ts, end_ts)
-    visits = _build_derived_visits_cached(human_events)
+    visits = load_visits(start_ts, end_ts)
 
     referrer_labels = {
         "newsletter": "Newsletter",
@@ -1830,7 +1717,7 @@ def analytics_traffic(request):
         summary["visits"] += 1
         if visit["visitor_id"]:
             summary["visitor_ids"].add(visit["visitor_id"])
-        if any(row["event_type"] == AnalyticsEvent.EventType.REVIEW_ENGAGED for row in visit["events"]):
+        if visit["review_engaged"]:
             summary["engaged_visits"] += 1
         if visit["js_verified"]:
             summary["js_verified_visits"] += 1
@@ -1887,9 +1774,9 @@ def analytics_traffic(request):
     section_summary = defaultdict(lambda: {"visits": 0, "engaged_visits": 0, "single_event_visits": 0})
     landing_summary = defaultdict(lambda: {"visits": 0, "engaged_visits": 0, "single_event_visits": 0})
     for visit in visits:
-        engaged_visit = any(row["event_type"] == AnalyticsEvent.EventType.REVIEW_ENGAGED for row in visit["events"])
+        engaged_visit = visit["review_engaged"]
         single_event_visit = _is_one_step_visit(visit)
-        sections_seen = {section for section in (_derive_page_section(row) for row in visit["events"]) if section}
+        sections_seen = visit["sections"]
         for section in sections_seen:
             page_counts[section] += 1
             summary = section_summary[section]
@@ -1907,7 +1794,7 @@ def analytics_traffic(request):
                 summary["single_event_visits"] += 1
     page_breakdown = [
         {
-            "label": _PAGE_SECTION_LABELS.get(page, page),
+            "label": PAGE_SECTION_LABELS.get(page, page),
             "visits": section_summary[page]["visits"],
             "engaged_rate": _safe_percentage(section_summary[page]["engaged_visits"], section_summary[page]["visits"]),
             "one_step_rate": _safe_percentage(
@@ -1918,9 +1805,7 @@ def analytics_traffic(request):
         for page, _count in page_counts.most_common()
     ]
 
-    journal_visits = sum(
-        1 for visit in visits if any(row["event_type"] in _JOURNAL_EVENT_TYPES for row in visit["events"])
-    )
+    journal_visits = sum(1 for visit in visits if visit["touched_journals"])
 
     traffic_categories = ["newsletter", "search", "social", "direct", "other"]
     traffic_chart_labels, traffic_chart_series = _weekly_visits_by_referrer(visits, categories=traffic_categories)
@@ -2016,8 +1901,7 @@ def analytics_traffic(request):
 
     recent_sessions = []
     for visit in recent_visit_rows:
-        events = visit["events"]
-        if len(events) > 1:
+        if visit["event_count"] > 1:
             duration_s = max(0.0, (visit["last_event"] - visit["first_event"]).total_seconds())
             duration_label = f"{int(duration_s)}s" if duration_s < 120 else f"{int(duration_s / 60)}m"
         else:
@@ -2033,7 +1917,7 @@ def analytics_traffic(request):
                 "referrer": referrer_labels.get(visit["referrer_category"], visit["referrer_category"] or "Unknown"),
                 "referrer_domain": visit["referrer_domain"] or "",
                 "landing_page": visit["landing_page"] or "—",
-                "event_count": len(events),
+                "event_count": visit["event_count"],
                 "first_event": visit["first_event"],
                 "last_event": visit["last_event"],
                 "duration": duration_label,
@@ -2087,10 +1971,10 @@ def analytics_traffic(request):
         "recent_session_has_prev": page > 1,
         "recent_session_has_next": page < total_pages,
         "engaged_only": engaged_only,
-        "visit_timeout_minutes": int(_VISIT_INACTIVITY_GAP.total_seconds() // 60),
+        "visit_timeout_minutes": int(VISIT_INACTIVITY_GAP.total_seconds() // 60),
         "active_tab": "traffic",
     }
-    context.update(_confidence_summary(human_events))
+    context.update(_confidence_summary(human_events, start_date, end_date))
     return _render_analytics(
         request, "backend/analytics/traffic.html", context, "backend/analytics/_traffic_panel.html"
     )
@@ -2218,12 +2102,7 @@ def analytics_email(request):
 
         post_traffic = None if site_analytics_partial else 0
         if nl.send_date and not site_analytics_partial:
-            post_traffic = AnalyticsEvent.objects.filter(
-                event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED,
-                automated=False,
-                timestamp__gte=nl.send_date,
-                timestamp__lte=nl.send_date + datetime.timedelta(days=7),
-            ).count()
+            post_traffic = _engaged_views_between(nl.send_date, nl.send_date + datetime.timedelta(days=7))
 
         newsletter_rows.append(
             {
@@ -2285,39 +2164,7 @@ def analytics_email(request):
                 segment_counts["dormant"] += 1
 
     # Newsletter lift — engaged views before/after each send
-    newsletter_lift = []
-    for nl in newsletters:
-        if not nl.send_date:
-            continue
-        if _newsletter_predates_site_analytics(nl):
-            newsletter_lift.append(
-                {
-                    "newsletter": nl,
-                    "before": None,
-                    "after": None,
-                    "lift_pct": None,
-                    "site_analytics_partial": True,
-                }
-            )
-            continue
-        send_dt = nl.send_date
-        before_start = send_dt - datetime.timedelta(days=7)
-        after_end = send_dt + datetime.timedelta(days=7)
-        lift_qs = AnalyticsEvent.objects.filter(event_type=AnalyticsEvent.EventType.REVIEW_ENGAGED, automated=False)
-        before_count = lift_qs.filter(timestamp__gte=before_start, timestamp__lt=send_dt).count()
-        after_count = lift_qs.filter(timestamp__gte=send_dt, timestamp__lte=after_end).count()
-        lift_pct = None
-        if before_count:
-            lift_pct = round((after_count - before_count) / before_count * 100)
-        newsletter_lift.append(
-            {
-                "newsletter": nl,
-                "before": before_count,
-                "after": after_count,
-                "lift_pct": lift_pct,
-                "site_analytics_partial": False,
-            }
-        )
+    newsletter_lift = _newsletter_lift(newsletters)
 
     # Trend chart data — serialise for Chart.js
     trend_labels = json.dumps([row["newsletter"].send_date.strftime("%-d %b %Y") for row in newsletter_rows if row])
@@ -2370,8 +2217,7 @@ def analytics_journals(request):
     start_date, end_date, start_ts, end_ts = _date_range_from_request(request)
 
     human_events = _base_event_qs(request, start_ts, end_ts)
-    journal_events = human_events.filter(event_type__in=_JOURNAL_EVENT_TYPES)
-    journal_visits = _build_derived_visits_cached(journal_events)
+    journal_visits = load_visits(start_ts, end_ts, journal_only=True)
 
     # ── Headline metrics ────────────────────────────────────────────
     total_visits = len(journal_visits)
@@ -2379,7 +2225,7 @@ def analytics_journals(request):
     unique_visitors = len(visitor_ids_in_period)
     returning_visitors = (
         AnalyticsEvent.objects.filter(
-            event_type__in=_JOURNAL_EVENT_TYPES,
+            event_type__in=JOURNAL_EVENT_TYPES,
             visitor_id__in=visitor_ids_in_period,
             timestamp__lt=start_ts,
         )
@@ -2451,9 +2297,10 @@ def analytics_journals(request):
     active_users = list(active_users_qs)
 
     # ── Weekly trend ────────────────────────────────────────────────
-    star_events = human_events.filter(event_type=AnalyticsEvent.EventType.JOURNAL_STAR)
     visit_buckets = _weekly_visit_buckets(journal_visits)
-    star_buckets = _weekly_buckets(star_events)
+    star_buckets = _weekly_rollup_buckets(
+        start_date=start_date, end_date=end_date, event_type=AnalyticsEvent.EventType.JOURNAL_STAR, automated=False
+    )
     trend_labels = json.dumps([b["label"] for b in visit_buckets])
     trend_visits = json.dumps([b["count"] for b in visit_buckets])
     trend_stars = json.dumps([b["count"] for b in star_buckets])
@@ -2483,7 +2330,7 @@ def analytics_journals(request):
     def _delta(current, previous):
         return _pct_change(current, previous) if comparison_reliable else None
 
-    prev_visits = len(_build_derived_visits(prev_events.filter(event_type__in=_JOURNAL_EVENT_TYPES)))
+    prev_visits = len(load_visits(prev_start_ts, prev_end_ts, journal_only=True))
     prev_stars = states_in_range.filter(starred_at__gte=prev_start_ts, starred_at__lte=prev_end_ts).count()
     prev_searches = (
         prev_events.filter(event_type=AnalyticsEvent.EventType.SEARCH)
@@ -2500,8 +2347,8 @@ def analytics_journals(request):
         AnalyticsEvent.EventType.REVIEW_SHARE_X,
         AnalyticsEvent.EventType.REVIEW_SHARE_FACEBOOK,
     ]
-    total_shares = human_events.filter(event_type__in=share_event_types).count()
-    prev_shares = prev_events.filter(event_type__in=share_event_types).count()
+    total_shares = event_totals(start_date, end_date, event_type__in=share_event_types, automated=False)["count"]
+    prev_shares = event_totals(prev_start, prev_end, event_type__in=share_event_types, automated=False)["count"]
 
     total_searches = (
         human_events.filter(event_type=AnalyticsEvent.EventType.SEARCH)
@@ -2509,7 +2356,9 @@ def analytics_journals(request):
         .exclude(metadata__query__isnull=True)
         .count()
     )
-    search_clicks = human_events.filter(event_type=AnalyticsEvent.EventType.SEARCH_RESULT_CLICK).count()
+    search_clicks = event_totals(
+        start_date, end_date, event_type=AnalyticsEvent.EventType.SEARCH_RESULT_CLICK, automated=False
+    )["count"]
     search_ctr = _safe_percentage(search_clicks, total_searches) if total_searches else "–"
 
     prev_cpd = CPDReport.objects.filter(created__gte=prev_start_ts, created__lte=prev_end_ts).count()
@@ -2572,11 +2421,11 @@ def analytics_journals(request):
         "total_reading_list_users": total_reading_list_users,
         "avg_items_per_user": avg_items_per_user,
         "feature_scorecard": feature_scorecard,
-        "visit_timeout_minutes": int(_VISIT_INACTIVITY_GAP.total_seconds() // 60),
+        "visit_timeout_minutes": int(VISIT_INACTIVITY_GAP.total_seconds() // 60),
         "comparison_label": comparison_label,
         "active_tab": "journals",
     }
-    context.update(_confidence_summary(human_events))
+    context.update(_confidence_summary(human_events, start_date, end_date))
     return _render_analytics(
         request, "backend/analytics/journals.html", context, "backend/analytics/_journals_panel.html"
     )
@@ -2596,7 +2445,7 @@ def analytics_visitor(request, visitor_id):
     events_qs = AnalyticsEvent.objects.filter(
         visitor_id=visitor_id, timestamp__gte=start_ts, timestamp__lte=end_ts, automated=False
     )
-    visits = sorted(_build_derived_visits_cached(events_qs), key=lambda v: v["last_event"], reverse=True)
+    visits = sorted(load_visits(start_ts, end_ts, visitor_id=visitor_id), key=lambda v: v["last_event"], reverse=True)
 
     referrer_labels = {
         "newsletter": "Newsletter",
@@ -2610,7 +2459,7 @@ def analytics_visitor(request, visitor_id):
 
     visit_rows = []
     for visit in visits:
-        if len(visit["events"]) > 1:
+        if visit["event_count"] > 1:
             duration_s = max(0.0, (visit["last_event"] - visit["first_event"]).total_seconds())
             duration_label = f"{int(duration_s)}s" if duration_s < 120 else f"{int(duration_s / 60)}m"
         else:
@@ -2620,7 +2469,7 @@ def analytics_visitor(request, visitor_id):
                 "first_event": visit["first_event"],
                 "last_event": visit["last_event"],
                 "duration": duration_label,
-                "event_count": len(visit["events"]),
+                "event_count": visit["event_count"],
                 "referrer": referrer_labels.get(visit["referrer_category"], visit["referrer_category"] or "Unknown"),
                 "referrer_domain": visit["referrer_domain"] or "",
                 "landing_page": visit["landing_page"] or "—",
@@ -2837,7 +2686,7 @@ def analytics_issues(request):
         "tracked_issue_count": tracked_issue_count,
         "active_tab": "issues",
     }
-    context.update(_confidence_summary(human_events))
+    context.update(_confidence_summary(human_events, start_date, end_date))
     return _render_analytics(request, "backend/analytics/issues.html", context, "backend/analytics/_issues_panel.html")
 
 
@@ -2879,10 +2728,7 @@ def analytics_issue_detail(request, issue_pk):
         )
     }
     reviews_by_id = {
-        r.id: r
-        for r in issue.reviews.select_related("article__journal", "author").defer(
-            "body", "search_vector", "article__abstract", "article__metadata_json", "article__tags_string"
-        )
+        r.id: r for r in issue.reviews.select_related("article__journal", "author").defer(*_REVIEW_ROW_DEFERRED_FIELDS)
     }
     review_rows = []
     for rid, review in reviews_by_id.items():
@@ -2967,7 +2813,7 @@ def analytics_content_search(request):
                 | Q(author__name__icontains=query)
             )
             .select_related("article__journal", "author")
-            .defer("body", "search_vector", "article__abstract", "article__metadata_json", "article__tags_string")
+            .defer(*_REVIEW_ROW_DEFERRED_FIELDS)
             .order_by("-publish_date", "-id")[: _CONTENT_SEARCH_LIMIT + 1]
         )
         reviews_truncated = len(matched) > _CONTENT_SEARCH_LIMIT
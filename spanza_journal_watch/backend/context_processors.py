@@ -1,6 +1,14 @@
 from django.conf import settings
 
 from spanza_journal_watch.submissions.models import Issue
+from spanza_journal_watch.utils.cache import (
+    CACHE_TAG_INBOX,
+    CACHE_TAG_ISSUE_CONTRIBUTORS,
+    CACHE_TAG_ISSUES,
+    CACHE_TAG_PERMISSIONS,
+    CACHE_TAG_PREFERENCES,
+    cached_context_value,
+)
 
 ISSUE_PAGE_URL_NAMES = frozenset(
     [
@@ -48,38 +56,68 @@ ISSUE_PAGE_URL_NAMES = frozenset(
 )
 
 
-def selected_issue(request):
-    """Inject the session-persisted selected issue, issue list, and inbox badge into every template context."""
-    if not hasattr(request, "user") or not request.user.is_authenticated:
-        return {}
-
-    is_coordinator_only = request.user.has_perm("submissions.regional_coordinator") and not request.user.has_perm(
-        "submissions.chief_editor"
+def _editorial_permissions(user):
+    """Return (is_regional_coordinator, is_chief_editor), cached per user."""
+    # Superuser/active flags are part of the key because has_perm() depends on
+    # them and saving a User does not invalidate the permissions tag.
+    return cached_context_value(
+        f"editorial_perms:{user.pk}:{int(user.is_superuser)}:{int(user.is_active)}",
+        [CACHE_TAG_PERMISSIONS],
+        lambda: (user.has_perm("submissions.regional_coordinator"), user.has_perm("submissions.chief_editor")),
     )
 
-    issues = list(Issue.objects.only("pk", "name", "date", "active").order_by("-modified"))
 
-    if is_coordinator_only:
-        from spanza_journal_watch.backend.models import IssueContributor
+def _coordinator_issue_ids(user):
+    from spanza_journal_watch.backend.models import IssueContributor
 
-        assigned_ids = set(
+    return cached_context_value(
+        f"coordinator_issue_ids:{user.pk}",
+        [CACHE_TAG_ISSUE_CONTRIBUTORS],
+        lambda: set(
             IssueContributor.objects.filter(
-                user=request.user,
+                user=user,
                 role=IssueContributor.Role.COORDINATOR,
                 status=IssueContributor.Status.ACTIVE,
             ).values_list("issue_id", flat=True)
-        )
+        ),
+    )
+
+
+def _inbox_unread_count():
+    from spanza_journal_watch.backend.models import EmailThread
+
+    return cached_context_value(
+        "inbox_unread_count", [CACHE_TAG_INBOX], lambda: EmailThread.objects.filter(has_unread=True).count()
+    )
+
+
+def selected_issue(request):
+    """Inject the session-persisted selected issue, issue list, and inbox badge into every template context.
+
+    The lookups are cached per user and invalidated by the saves that change
+    them (see backend/signals.py), so HTMX partials do not repeat them.
+    """
+    if not hasattr(request, "user") or not request.user.is_authenticated:
+        return {}
+
+    is_coordinator, is_chief_editor = _editorial_permissions(request.user)
+    is_coordinator_only = is_coordinator and not is_chief_editor
+
+    issues = cached_context_value(
+        "sidebar_issues",
+        [CACHE_TAG_ISSUES],
+        lambda: list(Issue.objects.only("pk", "name", "date", "active").order_by("-modified")),
+    )
+
+    if is_coordinator_only:
+        assigned_ids = _coordinator_issue_ids(request.user)
         issues = [i for i in issues if i.pk in assigned_ids]
 
     planka_url = getattr(settings, "PLANKA_EXTERNAL_URL", "") or getattr(settings, "PLANKA_BASE_URL", "")
     issue_id = request.session.get("selected_issue_id")
 
     url_name = getattr(getattr(request, "resolver_match", None), "url_name", None)
-    inbox_unread_count = 0
-    if request.user.has_perm("submissions.chief_editor"):
-        from spanza_journal_watch.backend.models import EmailThread
-
-        inbox_unread_count = EmailThread.objects.filter(has_unread=True).count()
+    inbox_unread_count = _inbox_unread_count() if is_chief_editor else 0
 
     result = {
         "issues_for_sidebar": issues,
@@ -103,7 +141,10 @@ def selected_issue(request):
 def frontend_banner(_request):
     from spanza_journal_watch.backend.models import BackendPreference
 
-    preference = BackendPreference.get_solo()
+    def get_banner():
+        preference = BackendPreference.get_solo()
+        return preference.get_frontend_banner() if preference else None
+
     return {
-        "frontend_banner": preference.get_frontend_banner() if preference else None,
+        "frontend_banner": cached_context_value("frontend_banner", [CACHE_TAG_PREFERENCES], get_banner),
     }
@@ -0,0 +1,307 @@
+"""asyncio engine for fetching journal articles from PubMed and CrossRef.
+
+Every journal's requests are issued from one event loop, paced by a rate
+limiter per upstream (see backend.rate_limit): NCBI allows 10 requests/second
+with an API key and 3 without, and CrossRef's polite pool (requests carrying
+a ``mailto``) 10 per second with at most 3 at once. Up to ``max_in_flight``
+requests can be outstanding, so slow responses overlap instead of holding up
+the next request, and throughput is bounded by the quotas rather than by a
+number of threads.
+
+The engine only talks HTTP and parses responses. ``run_fetches`` drives it
+on a background thread and hands the fetched pages to the calling thread
+through a bounded queue, so the database work stays on the caller's
+connection and fetching pauses whenever writes fall behind.
+"""
+
+import asyncio
+import collections
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import httpx
+
+from .pubmed import (
+    CROSSREF_MIN_INTERVAL_SECONDS,
+    CROSSREF_WORKS_URL,
+    ArticleEventReader,
+    PubmedAPIError,
+    crossref_item_payload,
+    crossref_journal_params,
+    crossref_next_cursor,
+)
+from .rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+CROSSREF_MAX_IN_FLIGHT = 3
+# efetch pages requested ahead of the one being consumed, per journal.
+PAGE_PREFETCH = 2
+# Fetched pages waiting for the database writer before fetching pauses.
+MAX_QUEUED_PAGES = 8
+
+
+class Upstream:
+    """A rate-limited remote API: the limiter and lane its requests draw from, and a cap on concurrent requests."""
+
+    def __init__(self, label, rate_limiter, priority, max_in_flight):
+        self.label = label
+        self.rate_limiter = rate_limiter
+        self.priority = priority
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def acquire(self):
+        """Wait for a slot without blocking the loop. Returns the seconds spent waiting."""
+        waited = 0.0
+        # The limiter may make a Redis round trip, so ask from a worker thread.
+        while (delay := await asyncio.to_thread(self.rate_limiter.try_acquire, self.priority)) > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+
+class FetchEngine:
+    """Async PubMed and CrossRef fetches sharing one HTTP connection pool.
+
+    ``client`` is the configured PubmedClient; the engine uses its
+    credentials, rate limiter and lane, retry and timeout settings, request
+    parameters and parsers, and adds its request counts to ``client.metrics``.
+    CrossRef requests draw from ``crossref_rate_limiter``. Use the engine as an
+    async context manager on the loop that runs the fetches.
+    """
+
+    def __init__(self, client, max_in_flight=10, crossref_rate_limiter=None, transport=None):
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self.crossref_rate_limiter = crossref_rate_limiter or RateLimiter("crossref", CROSSREF_MIN_INTERVAL_SECONDS)
+        self.transport = transport
+        self.http = None
+
+    async def __aenter__(self):
+        self.in_flight = asyncio.Semaphore(self.max_in_flight)
+        self.ncbi = Upstream("PubMed", self.client.rate_limiter, self.client.priority, self.max_in_flight)
+        self.crossref = Upstream("CrossRef", self.crossref_rate_limiter, self.client.priority, CROSSREF_MAX_IN_FLIGHT)
+        self.http = httpx.AsyncClient(
+            headers={"User-Agent": "spanza-journal-watch/1.0"},
+            timeout=self.client.timeout,
+            limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight),
+            follow_redirects=True,
+            transport=self.transport,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.http.aclose()
+        self.http = None
+
+    async def _get(self, upstream, url, params, read):
+        """GET ``url`` within ``upstream``'s limits, with retries, returning ``await read(response)``."""
+        last_error = None
+        for attempt in range(self.client.max_retries + 1):
+            if attempt:
+                self.client._record_metrics(retries=1)
+            delay = None
+            # Queue for the upstream and its rate slot before taking a global slot, so requests
+            # waiting on one upstream never hold slots another upstream could be using.
+            async with upstream.in_flight:
+                waited = await upstream.acquire()
+                started = time.monotonic()
+                try:
+                    async with self.in_flight, self.http.stream("GET", url, params=params) as response:
+                        if response.status_code < 400:
+                            result = await read(response)
+                            self.client._record_metrics(
+                                requests=1,
+                                bytes_sent=len(str(response.request.url))
+                                + sum(len(name) + len(value) for name, value in response.request.headers.items()),
+                                bytes_received=response.num_bytes_downloaded,
+                                wait_seconds=waited,
+                                seconds=time.monotonic() - started,
+                            )
+                            return result
+                        last_error = f"HTTP Error {response.status_code}: {response.reason_phrase}"
+                        if response.status_code == 429 and attempt < self.client.max_retries:
+                            retry_after = self.client._parse_retry_after(response.headers.get("Retry-After"))
+                            delay = retry_after if retry_after is not None else min(2**attempt, 8)
+                except httpx.HTTPError as error:
+                    # Transient network failures (read timeout, connection reset, DNS blip).
+                    last_error = error
+                    if attempt < self.client.max_retries:
+                        delay = min(2**attempt, 8)
+            if delay is None:
+                break
+            # Back off outside the concurrency limits so other requests keep flowing.
+            await asyncio.sleep(delay)
+
+        raise PubmedAPIError(f"{upstream.label} request failed: {last_error}")
+
+    async def _read_json(self, response):
+        body = await response.aread()
+        self.client._record_metrics(bytes_decoded=len(body))
+        try:
+            return json.loads(body)
+        except json.JSONDecodeError as error:
+            raise PubmedAPIError(f"{response.url.host} returned invalid JSON: {error}") from error
+
+    async def _read_articles(self, response):
+        """Parse efetch XML as it arrives, keeping only the finished payloads."""
+        articles = ArticleEventReader(self.client._parse_article)
+        parser = ET.XMLPullParser(events=("start", "end"))
+        payloads = []
+        try:
+            async for chunk in response.aiter_bytes():
+                self.client._record_metrics(bytes_decoded=len(chunk))
+                parser.feed(chunk)
+                payloads.extend(articles.payloads(parser.read_events()))
+            parser.close()
+            payloads.extend(articles.payloads(parser.read_events()))
+        except ET.ParseError as error:
+            raise PubmedAPIError(f"PubMed returned invalid XML: {error}") from error
+        return payloads
+
+    async def _ncbi(self, endpoint, params, read):
+        url = f"{self.client.BASE_URL}/{endpoint}"
+        return await self._get(self.ncbi, url, self.client._with_credentials(params), read)
+
+    async def search_pubmed_history(self, term, from_month, to_month):
+        params = self.client._search_history_params(term, from_month, to_month)
+        data = await self._ncbi("esearch.fcgi", params, self._read_json)
+        return self.client._parse_search_history(data)
+
+    async def pubmed_history_pages(self, webenv, query_key, count, batch_size=200):
+        """Yield the parsed payloads of a history-server result set, a page at a time.
+
+        Up to ``PAGE_PREFETCH`` further pages are requested while the caller
+        handles the current one.
+        """
+        if not webenv or not query_key or count <= 0:
+            return
+
+        def fetch(retstart):
+            params = self.client._fetch_history_params(webenv, query_key, retstart, batch_size)
+            return asyncio.create_task(self._ncbi("efetch.fcgi", params, self._read_articles))
+
+        starts = iter(range(0, count, batch_size))
+        pending = collections.deque(fetch(retstart) for retstart in itertools.islice(starts, PAGE_PREFETCH + 1))
+        try:
+            while pending:
+                page = await pending.popleft()
+                retstart = next(starts, None)
+                if retstart is not None:
+                    pending.append(fetch(retstart))
+                yield page
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def pubmed_journal_pages(self, term, from_month, to_month, batch_size=200):
+        """Search PubMed for ``term`` and yield its articles a page at a time."""
+        history = await self.search_pubmed_history(term, from_month, to_month)
+        async for page in self.pubmed_history_pages(
+            history["webenv"], history["query_key"], history["count"], batch_size
+        ):
+            yield page
+
+    async def crossref_journal_pages(self, issn, from_date, to_date, rows_per_page=100, indexed_since=None):
+        """Yield a CrossRef journal's articles a page at a time.
+
+        With ``indexed_since``, only works indexed on or after that date. A
+        failed request raises PubmedAPIError; callers that want CrossRef
+        failures to leave other journals running catch it around the iteration.
+        """
+        cursor = "*"
+        while cursor is not None:
+            params = crossref_journal_params(issn, from_date, to_date, rows_per_page, cursor, indexed_since)
+            if self.client.email:
+                # Identifies the request for CrossRef's polite pool.
+                params["mailto"] = self.client.email
+            data = await self._get(self.crossref, CROSSREF_WORKS_URL, params, self._read_json)
+
+            msg = data.get("message") or {}
+            items = msg.get("items") or []
+            if not items:
+                return
+            yield [payload for payload in map(crossref_item_payload, items) if payload is not None]
+            cursor = crossref_next_cursor(msg, cursor, rows_per_page)
+
+
+class _CallerStopped(Exception):
+    pass
+
+
+_FINISHED = object()
+
+
+def run_fetches(engine, sources, max_queued_pages=MAX_QUEUED_PAGES):
+    """Run ``sources`` concurrently on ``engine``, yielding ``(key, page)`` as pages arrive.
+
+    ``sources`` maps a key to an async iterable of pages, e.g. from
+    ``engine.pubmed_journal_pages``. A ``(key, None)`` pair follows the last
+    page of each source. The fetches run on an event loop in a background
+    thread; at most ``max_queued_pages`` pages wait for the caller, after which
+    the fetchers pause. The first error from any source stops the others and
+    is raised here.
+    """
+    handoff = queue.Queue(maxsize=1)
+    stopped = threading.Event()
+
+    def hand_over(item):
+        # Wait for the caller to take the previous item, unless it has stopped consuming.
+        while not stopped.is_set():
+            try:
+                handoff.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    async def fetch_all():
+        pages = asyncio.Queue(maxsize=max_queued_pages)
+
+        async def drain(key, source):
+            async for page in source:
+                await pages.put((key, page))
+            await pages.put((key, None))
+
+        async def forward(remaining):
+            # The only coroutine that waits on the caller, so it ties up a single worker thread.
+            while remaining:
+                key, page = await pages.get()
+                if page is None:
+                    remaining -= 1
+                if not await asyncio.to_thread(hand_over, (key, page)):
+                    raise _CallerStopped
+
+        async with engine, asyncio.TaskGroup() as group:
+            for key, source in sources.items():
+                group.create_task(drain(key, source))
+            group.create_task(forward(len(sources)))
+
+    def run():
+        try:
+            asyncio.run(fetch_all())
+        except BaseException as error:
+            while isinstance(error, BaseExceptionGroup):
+                error = error.exceptions[0]
+            hand_over((_FINISHED, error))
+        else:
+            hand_over((_FINISHED, None))
+
+    thread = threading.Thread(target=run, name="fetch-engine", daemon=True)
+    thread.start()
+    try:
+        while True:
+            key, page = handoff.get()
+            if key is _FINISHED:
+                if page is not None:
+                    raise page
+                return
+            yield key, page
+    finally:
+        stopped.set()
+        thread.join()
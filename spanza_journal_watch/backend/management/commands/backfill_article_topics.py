@@ -0,0 +1,58 @@
+"""
+Classify PubMed articles into the precomputed topic columns.
+
+Usage:
+    # Classify articles not yet classified by the current classifier version
+    python manage.py backfill_article_topics
+
+    # Reclassify every article
+    python manage.py backfill_article_topics --all
+"""
+
+from django.core.management.base import BaseCommand
+
+from spanza_journal_watch.backend.models import PubmedArticle
+from spanza_journal_watch.backend.topics import TOPIC_CLASSIFIER_VERSION, TOPIC_FIELDS, apply_article_topics
+
+UPDATE_FIELDS = [*TOPIC_FIELDS.values(), "topics_version"]
+
+
+class Command(BaseCommand):
+    help = "Store topic classification (paediatric, ICU, trial, ...) on PubMed articles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            default=False,
+            help="Reclassify every article, not only those behind the current classifier version.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of articles to update per query (default 1000).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = PubmedArticle.objects.only("id", "title", "abstract", "metadata_json", *UPDATE_FIELDS)
+        if not options["all"]:
+            queryset = queryset.filter(topics_version__lt=TOPIC_CLASSIFIER_VERSION)
+
+        checked = 0
+        updated = 0
+        pending = []
+        for article in queryset.order_by("pk").iterator(chunk_size=batch_size):
+            checked += 1
+            if apply_article_topics(article):
+                pending.append(article)
+            if len(pending) >= batch_size:
+                PubmedArticle.objects.bulk_update(pending, UPDATE_FIELDS)
+                updated += len(pending)
+                pending = []
+        if pending:
+            PubmedArticle.objects.bulk_update(pending, UPDATE_FIELDS)
+            updated += len(pending)
+
+        self.stdout.write(self.style.SUCCESS(f"Checked {checked} articles: {updated} updated."))
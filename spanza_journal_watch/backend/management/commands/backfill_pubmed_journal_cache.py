@@ -19,6 +19,11 @@ class Command(BaseCommand):
             default=[],
             help="Optional watched journal id to backfill. Can be passed multiple times.",
         )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Fetch the whole window instead of only records changed since each journal's last fetch.",
+        )
 
     @staticmethod
     def _parse_month(value, label):
@@ -48,11 +53,13 @@ class Command(BaseCommand):
             watched_journals=list(watched_journals),
             from_month=from_month_value,
             to_month=to_month_value,
+            full=options["full"],
         )
         self.stdout.write(
             self.style.SUCCESS(
                 "Cached PubMed articles for "
                 f"{stats['journal_count']} journals, touching {stats['touched_links']} journal/article links "
-                f"({stats['created_links']} new) from {from_month_value:%Y-%m} to {to_month_value:%Y-%m}."
+                f"({stats['created_links']} new) from {from_month_value:%Y-%m} to {to_month_value:%Y-%m}; "
+                f"{stats['incremental_count']} journal(s) fetched incrementally."
             )
         )
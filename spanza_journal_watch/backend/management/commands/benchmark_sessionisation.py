@@ -0,0 +1,110 @@
+"""
+Compare the SQL and Python visit sessionisation engines on synthetic events.
+
+Usage:
+    # Default sizes: 10k, 100k and 1M events
+    python manage.py benchmark_sessionisation
+
+    # Custom sizes
+    python manage.py benchmark_sessionisation --sizes 5000 50000
+
+Events are inserted inside a transaction that is rolled back afterwards, so the
+command leaves the database unchanged. It needs Postgres for the SQL engine.
+"""
+
+import datetime
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from spanza_journal_watch.analytics.models import AnalyticsEvent
+from spanza_journal_watch.analytics.visits import sessionise_queryset
+
+EVENT_TYPES = [
+    AnalyticsEvent.EventType.PAGE_VISIT,
+    AnalyticsEvent.EventType.REVIEW_OPEN,
+    AnalyticsEvent.EventType.REVIEW_ENGAGED,
+    AnalyticsEvent.EventType.SEARCH,
+    AnalyticsEvent.EventType.SEARCH_RESULT_CLICK,
+    AnalyticsEvent.EventType.JOURNAL_BROWSER_VISIT,
+]
+PAGES = ["home", "issue", "tag", "journals", "search", ""]
+EVENTS_PER_VISITOR = 40
+
+
+class Command(BaseCommand):
+    help = "Benchmark SQL vs Python sessionisation of analytics events."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000, 1_000_000],
+            help="Event counts to benchmark.",
+        )
+        parser.add_argument("--seed", type=int, default=1, help="Random seed for the synthetic events.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The SQL engine needs Postgres.")
+
+        self.stdout.write(f"{'events':>10} {'visits':>8} {'sql (s)':>9} {'python (s)':>11} {'speed-up':>9}")
+        for size in options["sizes"]:
+            with transaction.atomic():
+                self._benchmark(size, random.Random(options["seed"]))
+                transaction.set_rollback(True)
+        self.stdout.write(self.style.SUCCESS("Done; synthetic events rolled back."))
+
+    def _benchmark(self, size, rng):
+        start = timezone.now() - datetime.timedelta(days=90)
+        first_id = None
+        for batch_start in range(0, size, 5000):
+            events = AnalyticsEvent.objects.bulk_create(
+                self._events(min(5000, size - batch_start), start, rng), batch_size=5000
+            )
+            if first_id is None and events:
+                first_id = min(event.pk for event in events)
+        events_qs = AnalyticsEvent.objects.filter(id__gte=first_id)
+
+        timings = {}
+        visit_counts = {}
+        for engine in ("sql", "python"):
+            started = time.perf_counter()
+            visits = sessionise_queryset(events_qs, engine=engine)
+            timings[engine] = time.perf_counter() - started
+            visit_counts[engine] = len(visits)
+        if visit_counts["sql"] != visit_counts["python"]:
+            self.stderr.write(f"Visit counts differ at {size}: {visit_counts}")
+
+        self.stdout.write(
+            f"{size:>10,} {visit_counts['sql']:>8,} {timings['sql']:>9.2f} {timings['python']:>11.2f} "
+            f"{timings['python'] / max(timings['sql'], 1e-9):>8.1f}x"
+        )
+
+    def _events(self, count, start, rng):
+        visitor_id = None
+        timestamp = start
+        for index in range(count):
+            if index % EVENTS_PER_VISITOR == 0:
+                visitor_id = uuid.UUID(int=rng.getrandbits(128)) if rng.random() < 0.8 else None
+                session_key = uuid.UUID(int=rng.getrandbits(128)).hex if rng.random() < 0.9 else ""
+                timestamp = start + datetime.timedelta(minutes=rng.randrange(90 * 24 * 60))
+            # Mostly short gaps, with the occasional break that starts a new visit.
+            gap = rng.randrange(45, 90) if rng.random() < 0.15 else rng.randrange(0, 5)
+            timestamp += datetime.timedelta(minutes=gap, seconds=rng.randrange(60))
+            page = rng.choice(PAGES)
+            yield AnalyticsEvent(
+                event_type=rng.choice(EVENT_TYPES),
+                timestamp=timestamp,
+                visitor_id=visitor_id,
+                session_key=session_key,
+                metadata={"page": page} if page else {},
+                landing_page=f"/{page}" if page and rng.random() < 0.3 else "",
+                referrer_category=rng.choice(["", "direct", "search", "social"]),
+                js_verified=rng.random() < 0.7,
+            )
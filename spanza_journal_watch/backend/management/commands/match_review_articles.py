@@ -31,6 +31,7 @@ from spanza_journal_watch.backend.pubmed import fetch_crossref_metadata
 from spanza_journal_watch.backend.pubmed_cache import (
     _search_article_on_pubmed,
     build_pubmed_client,
+    crossref_rate_limiter,
     fill_missing_article_metadata,
 )
 from spanza_journal_watch.submissions.models import Comment, Review
@@ -206,7 +207,7 @@ class Command(BaseCommand):
             )
             for doi in unresolved_dois:
                 try:
-                    payload = fetch_crossref_metadata(doi)
+                    payload = fetch_crossref_metadata(doi, rate_limiter=crossref_rate_limiter())
                 except Exception:
                     logger.exception("CrossRef lookup failed for DOI %s", doi)
                     continue
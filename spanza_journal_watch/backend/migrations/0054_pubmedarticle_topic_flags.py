@@ -0,0 +1,62 @@
+# Generated by Django 6.0.4 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0053_pubmedimportbatch_last_pubmed_fetched_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topic_paediatric',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topic_humans',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topic_review',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topic_trial',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topic_pain',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topic_icu',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topic_cardiac',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topic_neonatal',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pubmedarticle',
+            name='topics_version',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='pubmedarticle',
+            index=models.Index(fields=['topics_version'], name='backend_pa_topics_ver_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+
+def _metadata_texts(path):
+    return models.Func(
+        models.F("metadata_json"),
+        template=f"jsonb_path_query_array(%(expressions)s, '{path}')::text",
+        output_field=models.TextField(),
+    )
+
+
+def populate_search_vector(apps, schema_editor):
+    # Mirrors backend.models.article_search_vector() as of this migration.
+    PubmedArticle = apps.get_model("backend", "PubmedArticle")
+    PubmedArticle.objects.update(
+        search_vector=(
+            SearchVector("title", weight="A")
+            + SearchVector(_metadata_texts("$.mesh_terms[*]"), _metadata_texts("$.keywords[*]"), weight="B")
+            + SearchVector("abstract", weight="C")
+            + SearchVector(_metadata_texts("$.authors[*].last_name"), weight="D")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("backend", "0054_pubmedarticle_topic_flags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pubmedarticle",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="pubmedarticle",
+            index=django.contrib.postgres.indexes.GinIndex(fields=["search_vector"], name="backend_pa_search_gin"),
+        ),
+        migrations.RunPython(populate_search_vector, migrations.RunPython.noop),
+    ]
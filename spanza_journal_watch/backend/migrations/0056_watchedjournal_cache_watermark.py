@@ -0,0 +1,60 @@
+from django.db import migrations, models
+
+TASK_NAME = "Reconcile PubMed journal cache"
+TASK_PATH = "spanza_journal_watch.backend.tasks.refresh_pubmed_journal_cache_task"
+
+
+def create_schedule(apps, schema_editor):
+    CrontabSchedule = apps.get_model("django_celery_beat", "CrontabSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    # Weekly full-window refresh on Sunday at 02:00 UTC; the twice-daily refresh only fetches changes.
+    schedule, _ = CrontabSchedule.objects.get_or_create(
+        minute="0",
+        hour="2",
+        day_of_week="0",
+        day_of_month="*",
+        month_of_year="*",
+        timezone="UTC",
+    )
+    PeriodicTask.objects.get_or_create(
+        name=TASK_NAME,
+        defaults={
+            "task": TASK_PATH,
+            "crontab": schedule,
+            "enabled": True,
+            "args": "[]",
+            "kwargs": '{"full": true}',
+        },
+    )
+
+
+def remove_schedule(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name=TASK_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+        ("backend", "0055_pubmedarticle_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="watchedjournal",
+            name="cache_synced_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="watchedjournal",
+            name="cache_synced_from_month",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="watchedjournal",
+            name="cache_synced_to_month",
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_schedule, remove_schedule),
+    ]
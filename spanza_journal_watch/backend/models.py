@@ -7,10 +7,12 @@ from email.utils import formataddr
 from cryptography.fernet import Fernet, InvalidToken
 from django.conf import settings
 from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.utils import timezone
 from django.utils.html import escape, strip_tags
 
+from spanza_journal_watch.backend.topics import apply_article_topics
 from spanza_journal_watch.utils.modelmethods import name_csv
 from spanza_journal_watch.utils.models import TimeStampedModel
 
@@ -712,6 +714,14 @@ class WatchedJournal(TimeStampedModel):
     source = models.CharField(max_length=16, choices=Source.choices, default=Source.PUBMED)
     active = models.BooleanField(default=True)
     visible_on_frontend = models.BooleanField(default=True)
+    # Watermark for incremental cache refreshes: when the last successful fetch
+    # started, and the publication window its last full fetch covered.
+    cache_synced_at = models.DateTimeField(null=True, blank=True, editable=False)
+    cache_synced_from_month = models.DateField(null=True, blank=True, editable=False)
+    cache_synced_to_month = models.DateField(null=True, blank=True, editable=False)
+
+    # Fields that decide which records a cache fetch finds.
+    SEARCH_FIELDS = ("name", "medline_ta", "issn_print", "issn_electronic", "source")
 
     class Meta:
         ordering = ("name",)
@@ -726,6 +736,12 @@ class WatchedJournal(TimeStampedModel):
         if self.display_name:
             self.display_name = self.display_name.strip()
 
+        if self.pk and self.cache_synced_at and kwargs.get("update_fields") is None:
+            previous = WatchedJournal.objects.filter(pk=self.pk).values(*self.SEARCH_FIELDS).first()
+            if previous and any(previous[field] != getattr(self, field) for field in self.SEARCH_FIELDS):
+                # The watermark was for a different search; the next refresh fetches the whole window.
+                self.cache_synced_at = self.cache_synced_from_month = self.cache_synced_to_month = None
+
         super().save(*args, **kwargs)
 
         if self.journal_id or not self.name:
@@ -899,6 +915,28 @@ class PubmedImportBatch(TimeStampedModel):
         return f"PubMed import {self.from_month:%Y-%m} → {self.to_month:%Y-%m}"
 
 
+def _metadata_texts(path):
+    """``metadata_json`` values at a jsonpath, as text for to_tsvector."""
+    return models.Func(
+        models.F("metadata_json"),
+        template=f"jsonb_path_query_array(%(expressions)s, '{path}')::text",
+        output_field=models.TextField(),
+    )
+
+
+def article_search_vector():
+    """Weighted tsvector over an article's own columns, usable in bulk UPDATEs."""
+    return (
+        SearchVector("title", weight="A")
+        + SearchVector(_metadata_texts("$.mesh_terms[*]"), _metadata_texts("$.keywords[*]"), weight="B")
+        + SearchVector("abstract", weight="C")
+        + SearchVector(_metadata_texts("$.authors[*].last_name"), weight="D")
+    )
+
+
+SEARCH_VECTOR_SOURCE_FIELDS = {"title", "abstract", "metadata_json"}
+
+
 class PubmedArticle(TimeStampedModel):
     TRUNCATED_NAME_LENGTH = 50
 
@@ -923,11 +961,27 @@ class PubmedArticle(TimeStampedModel):
     active = models.BooleanField(default=False)
     recommendation_hidden = models.BooleanField(default=False)
 
+    # Topic classification (see backend.topics), refreshed on every save
+    topic_paediatric = models.BooleanField(default=False)
+    topic_humans = models.BooleanField(default=False)
+    topic_review = models.BooleanField(default=False)
+    topic_trial = models.BooleanField(default=False)
+    topic_pain = models.BooleanField(default=False)
+    topic_icu = models.BooleanField(default=False)
+    topic_cardiac = models.BooleanField(default=False)
+    topic_neonatal = models.BooleanField(default=False)
+    topics_version = models.PositiveSmallIntegerField(default=0)
+
+    # Maintained from article_search_vector() on save and bulk ingest
+    search_vector = SearchVectorField(null=True, blank=True)
+
     class Meta:
         ordering = ("-publication_date", "-created")
         indexes = [
             models.Index(fields=["pmid"], name="backend_pa_pmid_idx"),
             GinIndex(fields=["title"], name="backend_pa_title_trgm", opclasses=["gin_trgm_ops"]),
+            models.Index(fields=["topics_version"], name="backend_pa_topics_ver_idx"),
+            GinIndex(fields=["search_vector"], name="backend_pa_search_gin"),
         ]
 
     def save(self, *args, **kwargs):
@@ -936,7 +990,11 @@ class PubmedArticle(TimeStampedModel):
         # Normalise empty pmid to None for unique constraint
         if not self.pmid:
             self.pmid = None
+        apply_article_topics(self)
         super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or SEARCH_VECTOR_SOURCE_FIELDS.intersection(update_fields):
+            PubmedArticle.objects.filter(pk=self.pk).update(search_vector=article_search_vector())
         if self.tags_string:
             current_tags = self.create_tag_objects()
             self.prune_tag_objects(current_tags)
@@ -1033,32 +1091,10 @@ class PubmedArticle(TimeStampedModel):
         if tag_pks:
             self.tags.add(*tag_pks)
 
-    def get_related_reviews(self, limit=4, min_shared=1):
-        from django.db.models import Count, Exists, IntegerField, OuterRef, Subquery
+    def get_related_reviews(self, limit=4):
+        from spanza_journal_watch.submissions.related import related_reviews_by_article
 
-        from spanza_journal_watch.submissions.models import Review, Tag
-
-        tag_ids = list(self.tags.filter(curated=True).values_list("id", flat=True))
-        if not tag_ids:
-            return Review.objects.none()
-
-        TagArticle = Tag.articles.through
-        shared_count_sq = Subquery(
-            TagArticle.objects.filter(pubmedarticle_id=OuterRef("article_id"), tag_id__in=tag_ids)
-            .values("pubmedarticle_id")
-            .annotate(cnt=Count("tag_id"))
-            .values("cnt"),
-            output_field=IntegerField(),
-        )
-        return (
-            Review.objects.filter(active=True)
-            .filter(Exists(TagArticle.objects.filter(pubmedarticle_id=OuterRef("article_id"), tag_id__in=tag_ids)))
-            .exclude(article=self)
-            .annotate(shared_tag_count=shared_count_sq)
-            .filter(shared_tag_count__gte=min_shared)
-            .order_by("-shared_tag_count", "-created")
-            .select_related("article__journal", "author")[:limit]
-        )
+        return related_reviews_by_article([self.pk], limit)[self.pk]
 
 
 class PubmedBatchArticle(TimeStampedModel):
@@ -2,7 +2,6 @@ import calendar
 import datetime
 import email.utils
 import json
-import socket
 import threading
 import time
 import urllib.error
@@ -10,34 +9,125 @@ import urllib.parse
 import urllib.request
 import xml.etree.ElementTree as ET
 
+import requests
+import urllib3
+
+from .rate_limit import BACKGROUND, RateLimiter, ncbi_limiter_name
+
+CROSSREF_WORKS_URL = "https://api.crossref.org/works"
+# CrossRef's polite pool (requests identifying a contact) allows 10 requests/second.
+CROSSREF_MIN_INTERVAL_SECONDS = 0.1
+
+
+def ncbi_min_interval(api_key):
+    """Seconds between requests that keep under NCBI's 10/s limit with an API key, or 3/s without."""
+    return 0.11 if api_key else 0.34
+
 
 class PubmedAPIError(Exception):
     pass
 
 
+class _CountingReader:
+    """File-like wrapper over a decoded response body that counts the bytes read."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = self.raw.read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class ArticleEventReader:
+    """Turns ``(event, node)`` pairs from an iterparse-style parser into article payloads.
+
+    The pairs may arrive in several batches (as from ``XMLPullParser``); each
+    finished record is parsed and then dropped from the tree, so the tree never
+    holds more than one.
+    """
+
+    def __init__(self, parse_article):
+        self.parse_article = parse_article
+        self.root = None
+        self.depth = 0
+
+    def payloads(self, events):
+        for event, node in events:
+            if event == "start":
+                if self.root is None:
+                    self.root = node
+                self.depth += 1
+                continue
+            self.depth -= 1
+            if self.depth == 1:
+                if node.tag == "PubmedArticle":
+                    yield self.parse_article(node)
+                self.root.clear()
+
+
 class PubmedClient:
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
-
-    def __init__(self, api_key="", timeout=30, max_retries=3, tool="spanza-journal-watch", email=""):
+    METRIC_NAMES = ("requests", "retries", "bytes_sent", "bytes_received", "bytes_decoded", "wait_seconds", "seconds")
+
+    def __init__(
+        self,
+        api_key="",
+        timeout=30,
+        max_retries=3,
+        tool="spanza-journal-watch",
+        email="",
+        pool_size=10,
+        rate_limiter=None,
+        priority=BACKGROUND,
+    ):
         self.api_key = (api_key or "").strip()
         self.timeout = timeout
         self.max_retries = max_retries
         self.tool = (tool or "").strip()
         self.email = (email or "").strip()
-        self.min_interval_seconds = 0.11 if self.api_key else 0.34
-        self._next_request_at = 0.0
-        # Held while computing the next-allowed-fire-time, so concurrent threads
-        # pace their request issuance correctly. Released before urlopen() so
-        # responses can return in parallel.
-        self._rate_lock = threading.Lock()
+        self.min_interval_seconds = ncbi_min_interval(self.api_key)
+        # Shared with other clients (and, through Redis, other processes) when
+        # given; otherwise this client paces only itself.
+        self.rate_limiter = rate_limiter or RateLimiter(ncbi_limiter_name(self.api_key), self.min_interval_seconds)
+        self.priority = priority
+
+        # One keep-alive connection pool shared by every thread using this
+        # client, so requests after the first skip the TCP and TLS handshakes.
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "spanza-journal-watch/1.0", "Accept-Encoding": "gzip"})
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+
+        self.metrics = dict.fromkeys(self.METRIC_NAMES, 0)
+        self._metrics_lock = threading.Lock()
+
+    def _record_metrics(self, **values):
+        with self._metrics_lock:
+            for name, value in values.items():
+                self.metrics[name] += value
+
+    def metrics_summary(self):
+        """One-line summary of the traffic so far, for logs."""
+        with self._metrics_lock:
+            metrics = dict(self.metrics)
+        requests_made = metrics["requests"] or 1
+        return (
+            f"{metrics['requests']} request(s), {metrics['retries']} retry(ies), "
+            f"{metrics['bytes_sent'] / 1024:.0f} KiB sent, {metrics['bytes_received'] / 1024:.0f} KiB received "
+            f"({metrics['bytes_decoded'] / 1024:.0f} KiB decompressed), "
+            f"{metrics['seconds'] / requests_made * 1000:.0f} ms mean latency, "
+            f"{metrics['wait_seconds']:.1f}s waiting for rate-limit slots"
+        )
+
+    def close(self):
+        self.session.close()
 
     def _claim_request_slot(self):
-        """Block until we're allowed to fire the next request, then reserve the next slot."""
-        with self._rate_lock:
-            delay = self._next_request_at - time.monotonic()
-            if delay > 0:
-                time.sleep(delay)
-            self._next_request_at = time.monotonic() + self.min_interval_seconds
+        """Block until the rate limiter grants this client's lane a request."""
+        self.rate_limiter.acquire(self.priority)
 
     def _parse_retry_after(self, value):
         if not value:
@@ -62,7 +152,8 @@ class PubmedClient:
         seconds = (retry_at - datetime.datetime.now(datetime.UTC)).total_seconds()
         return max(int(seconds), 0)
 
-    def _request_text(self, endpoint, params):
+    def _with_credentials(self, params):
+        """``params`` plus the api_key, tool and email NCBI asks callers to identify with."""
         query = dict(params or {})
         if self.api_key:
             query["api_key"] = self.api_key
@@ -70,23 +161,48 @@ class PubmedClient:
             query["tool"] = self.tool
         if self.email:
             query["email"] = self.email
-        url = f"{self.BASE_URL}/{endpoint}?{urllib.parse.urlencode(query)}"
-        request = urllib.request.Request(url=url, headers={"User-Agent": "spanza-journal-watch/1.0"})
+        return query
+
+    def _request(self, endpoint, params, read):
+        """GET ``endpoint`` with retries, returning ``read(body)``.
+
+        ``body`` is a file-like view of the decompressed response, so ``read``
+        can parse it incrementally. A connection dropped mid-body is retried
+        like one that failed to open.
+        """
+        query = self._with_credentials(params)
+        url = f"{self.BASE_URL}/{endpoint}"
 
         last_error = None
         for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._record_metrics(retries=1)
+            waited_from = time.monotonic()
             self._claim_request_slot()
+            started = time.monotonic()
             try:
-                with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                    return response.read().decode("utf-8")
-            except urllib.error.HTTPError as error:
-                last_error = error
-                if error.code == 429 and attempt < self.max_retries:
-                    retry_after = self._parse_retry_after(error.headers.get("Retry-After"))
-                    time.sleep(retry_after if retry_after is not None else min(2**attempt, 8))
-                    continue
-                break
-            except (socket.timeout, urllib.error.URLError, TimeoutError) as error:
+                with self.session.get(url, params=query, timeout=self.timeout, stream=True) as response:
+                    if response.status_code >= 400:
+                        last_error = f"HTTP Error {response.status_code}: {response.reason}"
+                        if response.status_code == 429 and attempt < self.max_retries:
+                            retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                            time.sleep(retry_after if retry_after is not None else min(2**attempt, 8))
+                            continue
+                        break
+                    response.raw.decode_content = True
+                    body = _CountingReader(response.raw)
+                    result = read(body)
+                    self._record_metrics(
+                        requests=1,
+                        bytes_sent=len(response.request.url)
+                        + sum(len(name) + len(value) for name, value in response.request.headers.items()),
+                        bytes_received=response.raw.tell(),
+                        bytes_decoded=body.bytes_read,
+                        wait_seconds=started - waited_from,
+                        seconds=time.monotonic() - started,
+                    )
+                    return result
+            except (requests.RequestException, urllib3.exceptions.HTTPError, TimeoutError) as error:
                 # Transient network failures (read timeout, connection reset, DNS blip).
                 last_error = error
                 if attempt < self.max_retries:
@@ -96,6 +212,9 @@ class PubmedClient:
 
         raise PubmedAPIError(f"PubMed request failed: {last_error}")
 
+    def _request_text(self, endpoint, params):
+        return self._request(endpoint, params, lambda response: response.read().decode("utf-8"))
+
     def _request_json(self, endpoint, params):
         payload = self._request_text(endpoint, params)
 
@@ -233,21 +352,25 @@ class PubmedClient:
         return history["pmids"][:retmax]
 
     def search_pmids_history(self, term, from_month, to_month):
+        data = self._request_json("esearch.fcgi", self._search_history_params(term, from_month, to_month))
+        return self._parse_search_history(data)
+
+    def _search_history_params(self, term, from_month, to_month):
         start, end = self.month_to_bounds(from_month, to_month)
-        data = self._request_json(
-            "esearch.fcgi",
-            {
-                "db": "pubmed",
-                "retmode": "json",
-                "retmax": 0,
-                "term": term,
-                "datetype": "pdat",
-                "mindate": start.strftime("%Y/%m/%d"),
-                "maxdate": end.strftime("%Y/%m/%d"),
-                "sort": "pub date",
-                "usehistory": "y",
-            },
-        )
+        return {
+            "db": "pubmed",
+            "retmode": "json",
+            "retmax": 0,
+            "term": term,
+            "datetype": "pdat",
+            "mindate": start.strftime("%Y/%m/%d"),
+            "maxdate": end.strftime("%Y/%m/%d"),
+            "sort": "pub date",
+            "usehistory": "y",
+        }
+
+    @staticmethod
+    def _parse_search_history(data):
         result = data.get("esearchresult", {}) or {}
         count = int(result.get("count") or 0)
         return {
@@ -261,36 +384,36 @@ class PubmedClient:
         if not pmids:
             return []
 
-        root = self._request_xml(
-            "efetch.fcgi",
+        return self._request_articles(
             {
                 "db": "pubmed",
                 "retmode": "xml",
                 "id": ",".join(pmids),
-            },
+            }
         )
-        return [self._parse_article(node) for node in root.findall(".//PubmedArticle")]
 
-    def fetch_articles_history(self, webenv, query_key, count, batch_size=200):
-        if not webenv or not query_key or count <= 0:
-            return []
+    @staticmethod
+    def _fetch_history_params(webenv, query_key, retstart, batch_size):
+        return {
+            "db": "pubmed",
+            "retmode": "xml",
+            "query_key": query_key,
+            "WebEnv": webenv,
+            "retstart": retstart,
+            "retmax": batch_size,
+        }
 
-        articles = []
-        for retstart in range(0, count, batch_size):
-            root = self._request_xml(
-                "efetch.fcgi",
-                {
-                    "db": "pubmed",
-                    "retmode": "xml",
-                    "query_key": query_key,
-                    "WebEnv": webenv,
-                    "retstart": retstart,
-                    "retmax": batch_size,
-                },
-            )
-            articles.extend(self._parse_article(node) for node in root.findall(".//PubmedArticle"))
+    def _request_articles(self, params):
+        """Run an efetch request, parsing the XML from the response stream into payloads."""
+        return self._request("efetch.fcgi", params, lambda response: list(self._iter_article_payloads(response)))
 
-        return articles
+    def _iter_article_payloads(self, stream):
+        """Parse ``PubmedArticle`` elements from ``stream`` as they complete, then discard them."""
+        articles = ArticleEventReader(self._parse_article)
+        try:
+            yield from articles.payloads(ET.iterparse(stream, events=("start", "end")))
+        except ET.ParseError as error:
+            raise PubmedAPIError(f"PubMed returned invalid XML: {error}") from error
 
     def _parse_article(self, node):
         medline = node.find("MedlineCitation")
@@ -514,14 +637,16 @@ class PubmedClient:
         return month_map.get(lower)
 
 
-def fetch_crossref_metadata(doi, timeout=15):
+def fetch_crossref_metadata(doi, timeout=15, rate_limiter=None, priority=BACKGROUND):
     """Fetch article metadata from CrossRef by DOI.
 
     Returns a dict compatible with our PubMed article payload shape,
     or None if the DOI is not found.
     """
-    url = f"https://api.crossref.org/works/{urllib.parse.quote(doi, safe='')}"
+    url = f"{CROSSREF_WORKS_URL}/{urllib.parse.quote(doi, safe='')}"
     req = urllib.request.Request(url, headers={"User-Agent": "spanza-journal-watch/1.0"})
+    if rate_limiter is not None:
+        rate_limiter.acquire(priority)
     try:
         with urllib.request.urlopen(req, timeout=timeout) as resp:
             data = json.loads(resp.read().decode("utf-8"))
@@ -576,88 +701,74 @@ def fetch_crossref_metadata(doi, timeout=15):
     }
 
 
-def fetch_crossref_journal_articles(issn, from_date, to_date, timeout=20, rows_per_page=100):
-    """Fetch articles from CrossRef by ISSN and date range.
+def crossref_journal_params(issn, from_date, to_date, rows_per_page, cursor, indexed_since=None):
+    filters = f"issn:{issn},from-pub-date:{from_date:%Y-%m},until-pub-date:{to_date:%Y-%m}"
+    if indexed_since is not None:
+        # Only works CrossRef (re)indexed since then: new deposits and metadata updates.
+        filters += f",from-index-date:{indexed_since:%Y-%m-%d}"
+    return {
+        "filter": filters,
+        "rows": rows_per_page,
+        "cursor": cursor,
+        "sort": "published",
+        "order": "desc",
+    }
 
-    Yields payload dicts compatible with upsert_pubmed_article().
-    """
+
+def crossref_next_cursor(message, cursor, rows_per_page):
+    """The cursor for the page after ``message``, or None when it was the last."""
+    next_cursor = message.get("next-cursor")
+    if not next_cursor or next_cursor == cursor or len(message.get("items") or []) < rows_per_page:
+        return None
+    return next_cursor
+
+
+def crossref_item_payload(item):
+    """Convert a CrossRef works item to an article payload, or None if it has no DOI."""
     import html as html_mod
 
-    cursor = "*"
-    total_yielded = 0
+    doi = (item.get("DOI") or "").strip()
+    if not doi:
+        return None
 
-    while True:
-        params = urllib.parse.urlencode(
-            {
-                "filter": f"issn:{issn},from-pub-date:{from_date:%Y-%m},until-pub-date:{to_date:%Y-%m}",
-                "rows": rows_per_page,
-                "cursor": cursor,
-                "sort": "published",
-                "order": "desc",
-            }
-        )
-        url = f"https://api.crossref.org/works?{params}"
-        req = urllib.request.Request(url, headers={"User-Agent": "spanza-journal-watch/1.0"})
-        try:
-            with urllib.request.urlopen(req, timeout=timeout) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-        except (urllib.error.URLError, urllib.error.HTTPError, json.JSONDecodeError):
-            return
-
-        msg = data.get("message") or {}
-        items = msg.get("items") or []
-        if not items:
-            return
-
-        for item in items:
-            doi = (item.get("DOI") or "").strip()
-            if not doi:
-                continue
+    title = html_mod.unescape((item.get("title") or [""])[0].strip())
+    journal_name = html_mod.unescape((item.get("container-title") or [""])[0].strip())
+    short_journal = html_mod.unescape((item.get("short-container-title") or [""])[0].strip())
+    volume = str(item.get("volume") or "").strip()
+    issue = str(item.get("issue") or "").strip()
+    pages = str(item.get("page") or "").strip()
 
-            title = html_mod.unescape((item.get("title") or [""])[0].strip())
-            journal_name = html_mod.unescape((item.get("container-title") or [""])[0].strip())
-            short_journal = html_mod.unescape((item.get("short-container-title") or [""])[0].strip())
-            volume = str(item.get("volume") or "").strip()
-            issue = str(item.get("issue") or "").strip()
-            pages = str(item.get("page") or "").strip()
-
-            authors = []
-            for a in item.get("author") or []:
-                family = (a.get("family") or "").strip()
-                given = (a.get("given") or "").strip()
-                if family:
-                    initials = "".join(part[0].upper() for part in given.split() if part) if given else ""
-                    authors.append({"last_name": family, "initials": initials})
-
-            pub_date = None
-            date_parts = (
-                item.get("published") or item.get("published-print") or item.get("published-online") or {}
-            ).get("date-parts", [[]])[0]
-            if date_parts:
-                year = date_parts[0] if len(date_parts) > 0 else None
-                month = date_parts[1] if len(date_parts) > 1 else 1
-                day = date_parts[2] if len(date_parts) > 2 else 1
-                if year:
-                    pub_date = datetime.date(year, month, day)
-
-            yield {
-                "doi": doi.lower(),
-                "title": title,
-                "source_journal_name": journal_name,
-                "publication_date": pub_date,
-                "publication_month": pub_date.replace(day=1) if pub_date else None,
-                "article_url": f"https://doi.org/{doi}",
-                "metadata_json": {
-                    "authors": authors,
-                    "volume": volume,
-                    "issue": issue,
-                    "pages": pages,
-                    "iso_abbreviation": short_journal or journal_name,
-                },
-            }
-            total_yielded += 1
+    authors = []
+    for a in item.get("author") or []:
+        family = (a.get("family") or "").strip()
+        given = (a.get("given") or "").strip()
+        if family:
+            initials = "".join(part[0].upper() for part in given.split() if part) if given else ""
+            authors.append({"last_name": family, "initials": initials})
 
-        next_cursor = msg.get("next-cursor")
-        if not next_cursor or next_cursor == cursor or len(items) < rows_per_page:
-            return
-        cursor = next_cursor
+    pub_date = None
+    date_parts = (item.get("published") or item.get("published-print") or item.get("published-online") or {}).get(
+        "date-parts", [[]]
+    )[0]
+    if date_parts:
+        year = date_parts[0] if len(date_parts) > 0 else None
+        month = date_parts[1] if len(date_parts) > 1 else 1
+        day = date_parts[2] if len(date_parts) > 2 else 1
+        if year:
+            pub_date = datetime.date(year, month, day)
+
+    return {
+        "doi": doi.lower(),
+        "title": title,
+        "source_journal_name": journal_name,
+        "publication_date": pub_date,
+        "publication_month": pub_date.replace(day=1) if pub_date else None,
+        "article_url": f"https://doi.org/{doi}",
+        "metadata_json": {
+            "authors": authors,
+            "volume": volume,
+            "issue": issue,
+            "pages": pages,
+            "iso_abbreviation": short_journal or journal_name,
+        },
+    }
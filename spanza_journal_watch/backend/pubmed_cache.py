@@ -1,24 +1,47 @@
+import contextlib
 import datetime
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from django.conf import settings
 from django.db import IntegrityError, transaction
 from django.db.models import F
 from django.utils import timezone
 
-from ..submissions.models import Journal
+from ..submissions.models import Journal, Review
+from ..utils.cache import (
+    CACHE_TAG_ARTICLES,
+    CACHE_TAG_REVIEWS,
+    CACHE_TAG_TAGS,
+    get_redis_client,
+    invalidate_cache_tags,
+)
+from .fetch_engine import FetchEngine, run_fetches
 from .models import (
     PubmedArticle,
     PubmedBatchArticle,
     PubmedIntegrationCredential,
     WatchedJournal,
     WatchedJournalArticle,
+    article_search_vector,
+)
+from .pubmed import (
+    CROSSREF_MIN_INTERVAL_SECONDS,
+    PubmedAPIError,
+    PubmedClient,
+    fetch_crossref_metadata,
+    ncbi_min_interval,
 )
-from .pubmed import PubmedClient, fetch_crossref_journal_articles, fetch_crossref_metadata
+from .rate_limit import BACKGROUND, get_rate_limiter, ncbi_limiter_name
+from .topics import TOPIC_FIELDS, apply_article_topics
 
 logger = logging.getLogger(__name__)
 
+# Payloads per set-based ingest round (see bulk_upsert_pubmed_articles).
+INGEST_PAGE_SIZE = 200
+# How far before a journal's watermark an incremental refresh starts looking, to cover
+# day-granular entry dates and records indexed while the previous refresh ran.
+WATERMARK_OVERLAP = datetime.timedelta(days=1)
+
 
 def ensure_article_journal_link(article):
     """Set article.journal from source_journal_name when FK is missing.
@@ -36,13 +59,29 @@ def ensure_article_journal_link(article):
     return True
 
 
-def build_pubmed_client(api_key=""):
+def ncbi_rate_limiter(api_key):
+    """The limiter shared by every client using ``api_key``, across processes when the cache is Redis."""
+    return get_rate_limiter(ncbi_limiter_name(api_key), ncbi_min_interval(api_key), get_redis_client())
+
+
+def crossref_rate_limiter():
+    return get_rate_limiter("crossref", CROSSREF_MIN_INTERVAL_SECONDS, get_redis_client())
+
+
+def build_pubmed_client(api_key="", priority=BACKGROUND):
+    """A PubmedClient with the stored API key, drawing from the shared NCBI quota.
+
+    Pass ``priority=INTERACTIVE`` for lookups someone is waiting on, so they go
+    ahead of background refreshes and backfills.
+    """
     key = (api_key or "").strip()
     if not key:
         credential = PubmedIntegrationCredential.get_solo()
         key = credential.get_api_key() if credential else ""
     return PubmedClient(
         api_key=key,
+        rate_limiter=ncbi_rate_limiter(key),
+        priority=priority,
         timeout=int(getattr(settings, "PUBMED_TIMEOUT_SECONDS", 20)),
         tool=str(getattr(settings, "PUBMED_TOOL_NAME", "spanza-journal-watch")),
         email=str(
@@ -55,7 +94,20 @@ def build_pubmed_client(api_key=""):
     )
 
 
-def build_pubmed_term(watched_journal):
+def build_pubmed_term(watched_journal, changed_since=None):
+    """The PubMed search for ``watched_journal``'s articles.
+
+    With ``changed_since`` (a date), only records entered into or modified in
+    PubMed on or after that day match.
+    """
+    term = _journal_term(watched_journal)
+    if changed_since is None:
+        return term
+    since = f"{changed_since:%Y/%m/%d}"
+    return f'{term} AND ("{since}"[EDAT] : "3000"[EDAT] OR "{since}"[MDAT] : "3000"[MDAT])'
+
+
+def _journal_term(watched_journal):
     # Prefer MedlineTA with [ta] tag — most reliable PubMed journal identifier
     if watched_journal.medline_ta:
         return f'"{watched_journal.medline_ta.strip()}"[ta]'
@@ -70,6 +122,23 @@ def build_pubmed_term(watched_journal):
     return f'"{watched_journal.name.strip()}"[Journal]'
 
 
+def changed_since(watched_journal, from_month, to_month):
+    """The day an incremental refresh of ``watched_journal`` over the window can start from.
+
+    None when the journal needs a full fetch: it has never been fetched in
+    full, or the window reaches outside the one its last full fetch covered.
+    """
+    if (
+        watched_journal.cache_synced_at is None
+        or watched_journal.cache_synced_from_month is None
+        or watched_journal.cache_synced_to_month is None
+        or from_month < watched_journal.cache_synced_from_month
+        or to_month > watched_journal.cache_synced_to_month
+    ):
+        return None
+    return (watched_journal.cache_synced_at - WATERMARK_OVERLAP).date()
+
+
 def build_accepted_journal_names(watched_journal):
     """Build a set of accepted journal name variants for post-fetch validation."""
     names = set()
@@ -106,39 +175,8 @@ def default_pubmed_cache_window(anchor_date=None):
     return shift_month(anchor, -2), shift_month(anchor, 2)
 
 
-def article_metadata_list(article, key):
-    data = article.metadata_json or {}
-    values = data.get(key) or []
-    if not isinstance(values, list):
-        return []
-    return [str(value).strip() for value in values if str(value or "").strip()]
-
-
-def article_matches_metadata(article, key, accepted_values):
-    accepted_lower = {item.lower() for item in accepted_values}
-    values_lower = {item.lower() for item in article_metadata_list(article, key)}
-    return bool(values_lower.intersection(accepted_lower))
-
-
-def article_matches_text(article, accepted_terms):
-    text = " ".join(
-        [
-            (article.title or ""),
-            (article.abstract or ""),
-            " ".join(article_metadata_list(article, "keywords")),
-            " ".join(article_metadata_list(article, "mesh_terms")),
-        ]
-    ).lower()
-    return any(term.lower() in text for term in accepted_terms)
-
-
-def article_matches_topic(article, *, mesh_terms=None, text_terms=None):
-    mesh_terms = mesh_terms or set()
-    text_terms = text_terms or set()
-    return article_matches_metadata(article, "mesh_terms", mesh_terms) or article_matches_text(article, text_terms)
-
-
-def fill_missing_article_metadata(article, payload):
+def _fill_missing_fields(article, payload):
+    """Apply ``payload`` to ``article`` in memory. Returns True if anything changed."""
     changed = False
     fields = (
         "title",
@@ -182,7 +220,11 @@ def fill_missing_article_metadata(article, payload):
                 changed = True
         if changed:
             article.metadata_json = existing_metadata
+    return changed
+
 
+def fill_missing_article_metadata(article, payload):
+    changed = _fill_missing_fields(article, payload)
     if ensure_article_journal_link(article):
         changed = True
 
@@ -235,118 +277,268 @@ def upsert_pubmed_article(payload):
     return article
 
 
-def refresh_watched_journal_cache(watched_journal, from_month, to_month, *, client=None, seen_pmids=None):
-    client = client or build_pubmed_client()
-    seen_pmids = seen_pmids if seen_pmids is not None else set()
-    accepted_names = build_accepted_journal_names(watched_journal)
-    history = client.search_pmids_history(build_pubmed_term(watched_journal), from_month, to_month)
+def _payload_keys(payload):
+    pmid = (payload.get("pmid") or "").strip() or None
+    doi = (payload.get("doi") or "").strip().lower() or None
+    return pmid, doi
+
+
+def _new_article_from_payload(payload, pmid, doi):
+    article = PubmedArticle(
+        pmid=pmid,
+        doi=doi,
+        title=payload.get("title") or "",
+        abstract=payload.get("abstract") or "",
+        source_journal_name=payload.get("source_journal_name") or "",
+        publication_date=payload.get("publication_date"),
+        publication_month=payload.get("publication_month"),
+        article_url=payload.get("article_url") or "",
+        pubmed_url=payload.get("pubmed_url") or "",
+        metadata_json=payload.get("metadata_json") or {},
+    )
+    apply_article_topics(article)
+    return article
+
+
+def _resolve_articles(keys):
+    """Find existing articles for (pmid, doi) keys in two queries, matching DOI first like upsert_pubmed_article."""
+    dois = {doi for _, doi in keys if doi}
+    pmids = {pmid for pmid, _ in keys if pmid}
+    by_doi = {article.doi: article for article in PubmedArticle.objects.filter(doi__in=dois)} if dois else {}
+    by_pmid = {article.pmid: article for article in PubmedArticle.objects.filter(pmid__in=pmids)} if pmids else {}
+    # One instance per row, so an article matched both ways is only updated once.
+    instances = {article.pk: article for article in [*by_pmid.values(), *by_doi.values()]}
+    resolved = {}
+    for pmid, doi in keys:
+        article = by_doi.get(doi) if doi else None
+        if article is None and pmid:
+            article = by_pmid.get(pmid)
+        if article is not None:
+            resolved[(pmid, doi)] = instances[article.pk]
+    return resolved
+
+
+def _link_article_journals(articles):
+    """Bulk form of ensure_article_journal_link. Returns the articles whose journal was set."""
+    pending = [article for article in articles if not article.journal_id and article.source_journal_name.strip()]
+    names = {article.source_journal_name.strip() for article in pending}
+    if not names:
+        return []
+    journals = {}
+    for journal in Journal.objects.filter(name__in=names).order_by("pk"):
+        journals.setdefault(journal.name, journal)
+    for name in names - journals.keys():
+        journals[name], _ = Journal.objects.get_or_create(name=name)
+    for article in pending:
+        article.journal = journals[article.source_journal_name.strip()]
+    return pending
+
+
+def _auto_tag_articles(articles):
+    """Bulk form of PubmedArticle.auto_tag_from_mesh: one mapping query, one insert."""
+    from ..submissions.models import MeshTagMapping, Tag
+    from ..submissions.related import refresh_related_reviews
+
+    mesh_terms = {article.pk: (article.metadata_json or {}).get("mesh_terms") or [] for article in articles}
+    all_terms = {term for terms in mesh_terms.values() for term in terms}
+    if not all_terms:
+        return
+    tags_by_term = {}
+    for term, tag_id in MeshTagMapping.objects.filter(mesh_term__in=all_terms).values_list("mesh_term", "tag_id"):
+        tags_by_term.setdefault(term, set()).add(tag_id)
+    TagArticle = Tag.articles.through
+    pairs = {
+        (tag_id, article_id)
+        for article_id, terms in mesh_terms.items()
+        for term in terms
+        for tag_id in tags_by_term.get(term, ())
+    }
+    TagArticle.objects.bulk_create(
+        [TagArticle(tag_id=tag_id, pubmedarticle_id=article_id) for tag_id, article_id in pairs],
+        ignore_conflicts=True,
+    )
+    # bulk_create skips the m2m_changed signal that keeps related reviews current.
+    refresh_related_reviews(article_ids={article_id for _, article_id in pairs})
+
+
+BULK_UPDATE_ARTICLE_FIELDS = [
+    "title",
+    "abstract",
+    "source_journal_name",
+    "publication_date",
+    "publication_month",
+    "article_url",
+    "pubmed_url",
+    "doi",
+    "metadata_json",
+    "journal",
+    *TOPIC_FIELDS.values(),
+    "topics_version",
+    "modified",
+]
+
+
+def bulk_upsert_pubmed_articles(payloads):
+    """Set-based :func:`upsert_pubmed_article` for a page of payloads.
+
+    Existing rows are resolved by DOI and PMID in two queries; new rows are
+    inserted with ON CONFLICT DO NOTHING (a concurrent refresh may insert the
+    same article) and re-read, changed rows are written with one bulk UPDATE.
+    Topic flags, journal links, MeSH auto-tags and the search vector are
+    applied as save() would.
+    Returns ``[(payload, article)]`` for every payload with a PMID or DOI.
+    """
+    keyed = [(payload, _payload_keys(payload)) for payload in payloads]
+    keyed = [(payload, key) for payload, key in keyed if key[0] or key[1]]
+    if not keyed:
+        return []
+    keys = [key for _, key in keyed]
     now = timezone.now()
-    created_links = 0
-    touched_links = 0
-    rejected = 0
 
-    for payload in client.fetch_articles_history(history["webenv"], history["query_key"], history["count"]):
-        pmid = (payload.get("pmid") or "").strip()
-        if not pmid or pmid in seen_pmids:
-            continue
-        seen_pmids.add(pmid)
+    with transaction.atomic():
+        resolved = _resolve_articles(keys)
+
+        new_articles = {}
+        for payload, key in keyed:
+            if key not in resolved and key not in new_articles:
+                new_articles[key] = _new_article_from_payload(payload, *key)
+        if new_articles:
+            _link_article_journals(new_articles.values())
+            PubmedArticle.objects.bulk_create(new_articles.values(), batch_size=500, ignore_conflicts=True)
+            resolved.update(_resolve_articles(list(new_articles)))
+
+        changed = {}
+        for payload, key in keyed:
+            if key in new_articles:
+                continue
+            article = resolved.get(key)
+            if article is not None and _fill_missing_fields(article, payload):
+                article.doi = (article.doi or "").strip().lower() or None
+                changed[article.pk] = article
+        existing = [resolved[key] for key in keys if key in resolved and key not in new_articles]
+        for article in _link_article_journals(existing):
+            changed[article.pk] = article
+        for article in changed.values():
+            apply_article_topics(article)
+            article.modified = now
+        if changed:
+            PubmedArticle.objects.bulk_update(changed.values(), BULK_UPDATE_ARTICLE_FIELDS, batch_size=500)
 
-        if not article_matches_journal(payload, accepted_names):
-            rejected += 1
-            continue
+        written = [resolved[key] for key in new_articles if key in resolved] + list(changed.values())
+        _auto_tag_articles(written)
+        if written:
+            PubmedArticle.objects.filter(pk__in=[article.pk for article in written]).update(
+                search_vector=article_search_vector()
+            )
 
-        article = upsert_pubmed_article(payload)
-        if article is None:
-            continue
+    if new_articles or changed:
+        # Bulk writes skip the post_save signal that normally does this.
+        if changed and Review.objects.filter(article__in=list(changed.values())).exists():
+            invalidate_cache_tags(CACHE_TAG_ARTICLES, CACHE_TAG_REVIEWS, CACHE_TAG_TAGS)
+        else:
+            invalidate_cache_tags(CACHE_TAG_ARTICLES)
+    return [(payload, resolved[key]) for payload, key in keyed if key in resolved]
 
-        link, created = WatchedJournalArticle.objects.get_or_create(
-            watched_journal=watched_journal,
-            article=article,
-            defaults={
-                "publication_month": payload.get("publication_month") or article.publication_month,
-                "first_seen_at": now,
-                "last_seen_at": now,
-            },
-        )
-        touched_links += 1
-        if created:
-            created_links += 1
-            continue
 
-        update_fields = ["last_seen_at", "modified"]
+def bulk_link_watched_journal_articles(watched_journal, pairs, now):
+    """Create or touch WatchedJournalArticle rows for ``[(payload, article)]``.
+
+    One query reads the existing links, one bulk UPDATE touches them and one
+    INSERT ... ON CONFLICT DO NOTHING adds the rest. Returns (created, touched).
+    """
+    months = {}
+    for payload, article in pairs:
+        months[article.pk] = payload.get("publication_month") or article.publication_month
+    if not months:
+        return 0, 0
+
+    existing = {
+        link.article_id: link
+        for link in WatchedJournalArticle.objects.filter(watched_journal=watched_journal, article_id__in=months)
+    }
+    for article_id, link in existing.items():
         link.last_seen_at = now
-        publication_month = payload.get("publication_month") or article.publication_month
-        if publication_month and link.publication_month != publication_month:
-            link.publication_month = publication_month
-            update_fields.append("publication_month")
-        link.save(update_fields=update_fields)
+        link.modified = now
+        if months[article_id]:
+            link.publication_month = months[article_id]
+    if existing:
+        WatchedJournalArticle.objects.bulk_update(
+            existing.values(), ["last_seen_at", "modified", "publication_month"], batch_size=500
+        )
 
-    if rejected:
-        logger.info(
-            "Watched journal %s: rejected %d article(s) that didn't match accepted names",
-            watched_journal,
-            rejected,
+    new_links = [
+        WatchedJournalArticle(
+            watched_journal=watched_journal,
+            article_id=article_id,
+            publication_month=month,
+            first_seen_at=now,
+            last_seen_at=now,
         )
-    return {"created_links": created_links, "touched_links": touched_links, "rejected": rejected}
+        for article_id, month in months.items()
+        if article_id not in existing
+    ]
+    WatchedJournalArticle.objects.bulk_create(new_links, batch_size=500, ignore_conflicts=True)
+    return len(new_links), len(months)
 
 
-def refresh_crossref_journal_cache(watched_journal, from_month, to_month, *, seen_dois=None):
-    """Refresh cached articles for a CrossRef-sourced journal."""
-    seen_dois = seen_dois if seen_dois is not None else set()
-    accepted_names = build_accepted_journal_names(watched_journal)
-    issn = watched_journal.issn_electronic or watched_journal.issn_print
-    if not issn:
-        logger.warning("CrossRef journal %s has no ISSN — skipping", watched_journal.name)
-        return {"created_links": 0, "touched_links": 0, "rejected": 0}
+class _JournalIngest:
+    """Writes one watched journal's fetched pages to the cache, a page at a time.
 
-    now = timezone.now()
-    created_links = 0
-    touched_links = 0
-    rejected = 0
+    ``key`` extracts the identifier used to skip payloads already seen in this
+    refresh (the PMID for PubMed journals, the DOI for CrossRef ones).
+    """
 
-    for payload in fetch_crossref_journal_articles(issn, from_month, to_month):
-        doi = (payload.get("doi") or "").strip().lower()
-        if not doi or doi in seen_dois:
-            continue
-        seen_dois.add(doi)
+    def __init__(self, watched_journal, key, now):
+        self.watched_journal = watched_journal
+        self.key = key
+        self.now = now
+        self.seen = set()
+        self.accepted_names = build_accepted_journal_names(watched_journal)
+        self.stats = {"created_links": 0, "touched_links": 0, "rejected": 0}
 
-        if not article_matches_journal(payload, accepted_names):
-            rejected += 1
-            continue
+    def write_page(self, payloads):
+        accepted = []
+        for payload in payloads:
+            key = self.key(payload)
+            if not key or key in self.seen:
+                continue
+            self.seen.add(key)
 
-        article = upsert_pubmed_article(payload)
-        if article is None:
-            continue
+            if not article_matches_journal(payload, self.accepted_names):
+                self.stats["rejected"] += 1
+                continue
+            accepted.append(payload)
 
-        link, created = WatchedJournalArticle.objects.get_or_create(
-            watched_journal=watched_journal,
-            article=article,
-            defaults={
-                "publication_month": payload.get("publication_month") or article.publication_month,
-                "first_seen_at": now,
-                "last_seen_at": now,
-            },
+        created, touched = bulk_link_watched_journal_articles(
+            self.watched_journal, bulk_upsert_pubmed_articles(accepted), self.now
         )
-        touched_links += 1
-        if created:
-            created_links += 1
-            continue
+        self.stats["created_links"] += created
+        self.stats["touched_links"] += touched
+
+    def finish(self, source_label):
+        if self.stats["rejected"]:
+            logger.info(
+                "%s journal %s: rejected %d article(s) that didn't match accepted names",
+                source_label,
+                self.watched_journal,
+                self.stats["rejected"],
+            )
+        return self.stats
 
-        update_fields = ["last_seen_at", "modified"]
-        link.last_seen_at = now
-        publication_month = payload.get("publication_month") or article.publication_month
-        if publication_month and link.publication_month != publication_month:
-            link.publication_month = publication_month
-            update_fields.append("publication_month")
-        link.save(update_fields=update_fields)
 
-    if rejected:
-        logger.info(
-            "CrossRef journal %s: rejected %d article(s) that didn't match accepted names",
-            watched_journal,
-            rejected,
-        )
-    return {"created_links": created_links, "touched_links": touched_links, "rejected": rejected}
+def _payload_pmid(payload):
+    return (payload.get("pmid") or "").strip()
+
+
+def _payload_doi(payload):
+    return (payload.get("doi") or "").strip().lower()
+
+
+def _crossref_issn(watched_journal):
+    issn = watched_journal.issn_electronic or watched_journal.issn_print
+    if not issn:
+        logger.warning("CrossRef journal %s has no ISSN — skipping", watched_journal.name)
+    return issn
 
 
 def refresh_pubmed_journal_cache(
@@ -356,66 +548,121 @@ def refresh_pubmed_journal_cache(
     to_month=None,
     client=None,
     progress_callback=None,
-    max_workers=None,
+    max_in_flight=None,
+    full=False,
 ):
     """Refresh cached articles across watched journals.
 
     progress_callback(done_count, total_count, journal_name) is invoked once a
-    journal completes (success or skipped). It runs on whichever worker thread
-    finishes the journal, so callers should be tolerant of cross-thread calls.
-
-    Fetches run in parallel up to `max_workers` (default
-    settings.PUBMED_PARALLEL_JOURNALS). The shared PubmedClient enforces
-    NCBI's request-per-second cap via an internal lock, so concurrent workers
-    still pace correctly.
+    journal completes (success or skipped), on the calling thread.
+
+    Every journal is fetched at once by a FetchEngine (see backend.fetch_engine)
+    on a background event loop, paced by a rate limiter per upstream, with up
+    to `max_in_flight` requests outstanding (default
+    settings.PUBMED_MAX_IN_FLIGHT). Fetched pages are written to the database
+    on the calling thread as they arrive.
+
+    Journals whose last full fetch covered the window are refreshed
+    incrementally: only records added or modified since their watermark
+    (WatchedJournal.cache_synced_at) are fetched. `full=True` fetches the whole
+    window for every journal, reconciling the cache with upstream.
     """
-    from django.db import connection
-
     watched_journals = list(watched_journals or WatchedJournal.objects.filter(active=True).order_by("name", "pk"))
     if from_month is None or to_month is None:
         from_month, to_month = default_pubmed_cache_window()
     client = client or build_pubmed_client()
-    if max_workers is None:
-        max_workers = int(getattr(settings, "PUBMED_PARALLEL_JOURNALS", 3))
-    max_workers = max(1, min(max_workers, len(watched_journals) or 1))
+    if max_in_flight is None:
+        max_in_flight = int(getattr(settings, "PUBMED_MAX_IN_FLIGHT", 10))
+    engine = FetchEngine(client, max_in_flight=max_in_flight, crossref_rate_limiter=crossref_rate_limiter())
 
     total = len(watched_journals)
-    totals = {"journal_count": total, "created_links": 0, "touched_links": 0}
-
-    def _process(journal):
+    totals = {"journal_count": total, "incremental_count": 0, "created_links": 0, "touched_links": 0}
+    done = 0
+    failed = set()
+
+    def _journal_done(ingest, source_label, since=None):
+        nonlocal done
+        stats = ingest.finish(source_label)
+        if ingest.watched_journal.pk not in failed:
+            _advance_watermark(ingest.watched_journal, now, from_month, to_month, incremental=since is not None)
+        totals["created_links"] += stats["created_links"]
+        totals["touched_links"] += stats["touched_links"]
+        done += 1
+        if progress_callback is not None:
+            progress_callback(done, total, ingest.watched_journal.name)
+
+    async def _crossref_pages(journal, pages):
+        # A failed CrossRef fetch ends that journal's refresh, leaving its watermark alone, without failing the rest.
         try:
-            if journal.source == WatchedJournal.Source.CROSSREF:
-                return refresh_crossref_journal_cache(journal, from_month, to_month)
-            return refresh_watched_journal_cache(journal, from_month, to_month, client=client)
-        finally:
-            # Each thread gets a thread-local Django DB connection; release it
-            # so we don't leak persistent connections from the worker pool.
-            connection.close()
-
-    if max_workers == 1:
-        for idx, journal in enumerate(watched_journals, start=1):
-            stats = _process(journal)
-            totals["created_links"] += stats["created_links"]
-            totals["touched_links"] += stats["touched_links"]
-            if progress_callback is not None:
-                progress_callback(idx, total, journal.name)
-        return totals
+            async for page in pages:
+                yield page
+        except PubmedAPIError as error:
+            logger.warning("CrossRef journal %s: fetch stopped: %s", journal, error)
+            failed.add(journal.pk)
 
-    done = 0
-    with ThreadPoolExecutor(max_workers=max_workers) as pool:
-        future_to_journal = {pool.submit(_process, j): j for j in watched_journals}
-        for future in as_completed(future_to_journal):
-            journal = future_to_journal[future]
-            stats = future.result()
-            totals["created_links"] += stats["created_links"]
-            totals["touched_links"] += stats["touched_links"]
-            done += 1
-            if progress_callback is not None:
-                progress_callback(done, total, journal.name)
+    # Also the new watermark: records entered while this refresh runs are picked up by the next one.
+    now = timezone.now()
+    ingests = {}
+    since_by_journal = {}
+    sources = {}
+    for journal in watched_journals:
+        since = None if full else changed_since(journal, from_month, to_month)
+        if since is not None:
+            totals["incremental_count"] += 1
+        since_by_journal[journal.pk] = since
+        if journal.source == WatchedJournal.Source.CROSSREF:
+            ingest = _JournalIngest(journal, _payload_doi, now)
+            issn = _crossref_issn(journal)
+            if not issn:
+                failed.add(journal.pk)
+                _journal_done(ingest, "CrossRef")
+                continue
+            sources[journal.pk] = _crossref_pages(
+                journal,
+                engine.crossref_journal_pages(issn, from_month, to_month, INGEST_PAGE_SIZE, indexed_since=since),
+            )
+        else:
+            ingest = _JournalIngest(journal, _payload_pmid, now)
+            sources[journal.pk] = engine.pubmed_journal_pages(
+                build_pubmed_term(journal, changed_since=since), from_month, to_month, INGEST_PAGE_SIZE
+            )
+        ingests[journal.pk] = ingest
+
+    # Closing the generator on a write error stops the fetches still running.
+    with contextlib.closing(run_fetches(engine, sources)) as fetched:
+        for journal_id, page in fetched:
+            ingest = ingests[journal_id]
+            if page is not None:
+                ingest.write_page(page)
+            else:
+                source = ingest.watched_journal.source
+                _journal_done(
+                    ingest,
+                    "CrossRef" if source == WatchedJournal.Source.CROSSREF else "Watched",
+                    since_by_journal[journal_id],
+                )
 
+    if isinstance(client, PubmedClient):
+        logger.info(
+            "PubMed refresh of %d journal(s), %d incremental: %s",
+            total,
+            totals["incremental_count"],
+            client.metrics_summary(),
+        )
     return totals
 
 
+def _advance_watermark(watched_journal, synced_at, from_month, to_month, *, incremental):
+    """Record a completed fetch of ``watched_journal``; a full fetch also records the window it covered."""
+    fields = {"cache_synced_at": synced_at}
+    if not incremental:
+        fields.update(cache_synced_from_month=from_month, cache_synced_to_month=to_month)
+    # update() rather than save(): save() clears the watermark when the journal's search fields change.
+    WatchedJournal.objects.filter(pk=watched_journal.pk).update(**fields)
+    for name, value in fields.items():
+        setattr(watched_journal, name, value)
+
+
 def populate_pubmed_batch_from_cache(batch, watched_journals):
     """Add cache articles missing from this batch, preserving existing rows.
 
@@ -643,7 +890,7 @@ def backfill_article_metadata(*, queryset=None, client=None, batch_size=50, dry_
             continue
 
         try:
-            payload = fetch_crossref_metadata(doi)
+            payload = fetch_crossref_metadata(doi, rate_limiter=crossref_rate_limiter())
         except Exception:
             logger.exception("CrossRef lookup failed for article %d (DOI %s)", article.pk, doi)
             stats["failed"] += 1
@@ -0,0 +1,135 @@
+"""Request pacing shared by every PubMed and CrossRef client.
+
+Each upstream quota is a GCRA (generic cell rate algorithm) limiter: it keeps
+the theoretical arrival time of the next request and grants a slot only once
+that time has come, moving it on by one interval. ``RedisRateLimiter`` keeps
+that time in Redis, so Celery workers, web processes and management commands
+all draw from one quota; ``RateLimiter`` keeps it in process memory and is
+the fallback when the cache is not Redis.
+
+Callers take a lane. A waiting ``INTERACTIVE`` caller (a person waiting on a
+page) raises a short-lived flag that holds ``BACKGROUND`` callers back, so
+lookups go ahead of backfills without the lanes together exceeding the quota.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+# How long past its expected wait an interactive caller keeps background callers back.
+INTERACTIVE_HOLD_SECONDS = 0.05
+
+# KEYS: the arrival-time key, the interactive-waiting flag.
+# ARGV: interval (µs), lane, interactive hold (µs). Returns 0 or the µs to wait.
+_ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000000 + tonumber(now_parts[2])
+local interval = tonumber(ARGV[1])
+local tat = math.max(tonumber(redis.call('GET', KEYS[1]) or now), now)
+local wait = tat - now
+if ARGV[2] == 'background' then
+    wait = math.max(wait, redis.call('PTTL', KEYS[2]) * 1000)
+end
+if wait > 0 then
+    if ARGV[2] == 'interactive' then
+        local hold = math.ceil((wait + tonumber(ARGV[3])) / 1000)
+        if redis.call('PTTL', KEYS[2]) < hold then
+            redis.call('SET', KEYS[2], 1, 'PX', hold)
+        end
+    end
+    return wait
+end
+tat = tat + interval
+-- %.0f: the default number format would round microseconds away.
+redis.call('SET', KEYS[1], string.format('%.0f', tat), 'PX', math.ceil((tat - now) / 1000) + 1000)
+return 0
+"""
+
+
+class RateLimiter:
+    """Paces ``name``'s requests to one per ``interval`` seconds within this process."""
+
+    def __init__(self, name, interval):
+        self.name = name
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+        self._interactive_until = 0.0
+
+    def try_acquire(self, priority=BACKGROUND):
+        """Take a slot if one is free now. Returns 0, or the seconds to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            next_at = max(self._next_at, now)
+            wait = next_at - now
+            if priority == BACKGROUND:
+                wait = max(wait, self._interactive_until - now)
+            if wait > 0:
+                if priority == INTERACTIVE:
+                    self._interactive_until = max(self._interactive_until, now + wait + INTERACTIVE_HOLD_SECONDS)
+                return wait
+            self._next_at = next_at + self.interval
+            return 0.0
+
+    def acquire(self, priority=BACKGROUND):
+        """Block until a slot is granted. Returns the seconds spent waiting."""
+        waited = 0.0
+        while (delay := self.try_acquire(priority)) > 0:
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+
+class RedisRateLimiter(RateLimiter):
+    """A RateLimiter whose state lives in Redis, shared by every process using ``name``.
+
+    The script reads Redis' clock, so workers on different hosts agree on the
+    time. If Redis is unreachable the limiter paces this process on its own
+    until it comes back.
+    """
+
+    def __init__(self, name, interval, client):
+        super().__init__(name, interval)
+        self.keys = [f"ratelimit:{name}", f"ratelimit:{name}:interactive"]
+        self.script = client.register_script(_ACQUIRE_SCRIPT)
+
+    def try_acquire(self, priority=BACKGROUND):
+        try:
+            wait = self.script(
+                keys=self.keys,
+                args=[round(self.interval * 1_000_000), priority, round(INTERACTIVE_HOLD_SECONDS * 1_000_000)],
+            )
+        except redis.RedisError:
+            logger.warning("Rate limiter %s: Redis unavailable, pacing locally", self.name, exc_info=True)
+            return super().try_acquire(priority)
+        return int(wait) / 1_000_000
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name, interval, redis_client=None):
+    """The process-wide limiter for ``name``, backed by ``redis_client`` when one is given."""
+    key = (name, interval, redis_client is not None)
+    with _limiters_lock:
+        if key not in _limiters:
+            if redis_client is not None:
+                _limiters[key] = RedisRateLimiter(name, interval, redis_client)
+            else:
+                _limiters[key] = RateLimiter(name, interval)
+        return _limiters[key]
+
+
+def ncbi_limiter_name(api_key):
+    """NCBI counts requests per API key (or per IP without one); never put the key itself in Redis."""
+    if not api_key:
+        return "ncbi:anonymous"
+    return f"ncbi:{hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]}"
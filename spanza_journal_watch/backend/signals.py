@@ -2,10 +2,61 @@ import logging
 import re
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from django.utils import timezone
 
+from spanza_journal_watch.utils.cache import (
+    CACHE_TAG_INBOX,
+    CACHE_TAG_ISSUE_CONTRIBUTORS,
+    CACHE_TAG_PERMISSIONS,
+    CACHE_TAG_PREFERENCES,
+    invalidate_cache_tags,
+)
+
+from .models import BackendPreference, EmailThread, IssueContributor
+
 logger = logging.getLogger(__name__)
 
+User = get_user_model()
+
+
+# Context processor caches (see backend/context_processors.py)
+# ------------------------------------------------------------------------------
+
+
+@receiver(post_save, sender=EmailThread)
+@receiver(post_delete, sender=EmailThread)
+def invalidate_inbox_cache(sender, **kwargs):
+    invalidate_cache_tags(CACHE_TAG_INBOX)
+
+
+@receiver(post_save, sender=IssueContributor)
+@receiver(post_delete, sender=IssueContributor)
+def invalidate_issue_contributor_cache(sender, **kwargs):
+    invalidate_cache_tags(CACHE_TAG_ISSUE_CONTRIBUTORS)
+
+
+@receiver(post_save, sender=BackendPreference)
+@receiver(post_delete, sender=BackendPreference)
+def invalidate_preferences_cache(sender, **kwargs):
+    invalidate_cache_tags(CACHE_TAG_PREFERENCES)
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_permissions_cache_on_m2m_change(sender, action, **kwargs):
+    if action in {"post_add", "post_remove", "post_clear"}:
+        invalidate_cache_tags(CACHE_TAG_PERMISSIONS)
+
+
+@receiver(post_delete, sender=Group)
+def invalidate_permissions_cache_on_group_delete(sender, **kwargs):
+    invalidate_cache_tags(CACHE_TAG_PERMISSIONS)
+
 
 def _normalize_subject(subject):
     """Strip Re:/Fwd: prefixes for thread grouping."""
@@ -15,7 +66,6 @@ def _normalize_subject(subject):
 if not settings.DEBUG:  # Anymail only available in production
     try:
         from anymail.signals import inbound  # type: ignore[import-not-found]
-        from django.dispatch import receiver
     except ModuleNotFoundError:
         inbound = None
 
@@ -23,7 +73,7 @@ if not settings.DEBUG:  # Anymail only available in production
 
         @receiver(inbound)
         def handle_inbound_email(sender, event, esp_name, **kwargs):
-            from .models import EmailThread, InboundEmail, SentEmail
+            from .models import InboundEmail, SentEmail
 
             message = event.message
             msg_id = (getattr(message, "message_id", None) or "").strip()
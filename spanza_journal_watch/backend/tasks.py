@@ -368,7 +368,8 @@ def check_batch_for_new_articles_task(self, batch_id):
 
 
 @celery_app.task(bind=True)
-def refresh_pubmed_journal_cache_task(self, from_month=None, to_month=None):
+def refresh_pubmed_journal_cache_task(self, from_month=None, to_month=None, full=False):
+    """Refresh the PubMed journal cache; `full` re-fetches the whole window instead of changes since each watermark."""
     from .models import FetchLog
     from .pubmed_cache import default_pubmed_cache_window, refresh_pubmed_journal_cache
 
@@ -381,11 +382,11 @@ def refresh_pubmed_journal_cache_task(self, from_month=None, to_month=None):
     fetch_log = FetchLog.objects.create(
         task_type=FetchLog.TASK_CACHE_REFRESH,
         celery_task_id=self.request.id or "",
-        details={"from_month": from_month_value.isoformat(), "to_month": to_month_value.isoformat()},
+        details={"from_month": from_month_value.isoformat(), "to_month": to_month_value.isoformat(), "full": full},
     )
 
     try:
-        stats = refresh_pubmed_journal_cache(from_month=from_month_value, to_month=to_month_value)
+        stats = refresh_pubmed_journal_cache(from_month=from_month_value, to_month=to_month_value, full=full)
         logger.info(
             "Refreshed PubMed journal cache for %s to %s across %s journals",
             from_month_value,
@@ -400,6 +401,7 @@ def refresh_pubmed_journal_cache_task(self, from_month=None, to_month=None):
             details={
                 "from_month": from_month_value.isoformat(),
                 "to_month": to_month_value.isoformat(),
+                "full": full,
                 **stats,
             },
         )
@@ -488,55 +490,11 @@ def refresh_mesh_terms_task(self):
 @celery_app.task
 def compute_tag_clusters_task():
     """Recompute tag co-occurrence clusters and cache the result."""
-    from collections import defaultdict
-    from itertools import combinations
+    from spanza_journal_watch.submissions.tag_clusters import compute_tag_clusters
 
-    from django.core.cache import cache
-
-    from spanza_journal_watch.submissions.management.commands.compute_tag_clusters import (
-        CACHE_KEY,
-        CACHE_TIMEOUT,
-        SIMILARITY_THRESHOLD,
-    )
-    from spanza_journal_watch.submissions.models import Tag
-
-    tag_articles = {}
-    for tag in Tag.objects.filter(active=True, curated=True):
-        article_ids = set(tag.articles.values_list("id", flat=True))
-        if article_ids:
-            tag_articles[tag.id] = article_ids
-
-    adjacency = defaultdict(set)
-    for (a_id, a_articles), (b_id, b_articles) in combinations(tag_articles.items(), 2):
-        overlap = len(a_articles & b_articles)
-        if overlap == 0:
-            continue
-        min_size = min(len(a_articles), len(b_articles))
-        if overlap / min_size >= SIMILARITY_THRESHOLD:
-            adjacency[a_id].add(b_id)
-            adjacency[b_id].add(a_id)
-
-    visited = set()
-    clusters = []
-    for tag_id in tag_articles:
-        if tag_id in visited:
-            continue
-        component = set()
-        queue = [tag_id]
-        while queue:
-            current = queue.pop()
-            if current in visited:
-                continue
-            visited.add(current)
-            component.add(current)
-            queue.extend(adjacency.get(current, set()) - visited)
-        if len(component) > 1:
-            clusters.append(sorted(component))
-
-    clusters.sort(key=len, reverse=True)
-    cache.set(CACHE_KEY, clusters, CACHE_TIMEOUT)
-    logger.info("Tag clusters recomputed: %d clusters from %d tags", len(clusters), len(tag_articles))
-    return {"clusters": len(clusters), "tags": len(tag_articles)}
+    tag_sizes, _, clusters = compute_tag_clusters()
+    logger.info("Tag clusters recomputed: %d clusters from %d tags", len(clusters), len(tag_sizes))
+    return {"clusters": len(clusters), "tags": len(tag_sizes)}
 
 
 @celery_app.task(bind=True)
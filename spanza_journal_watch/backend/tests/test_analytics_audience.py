@@ -8,7 +8,8 @@ from django.db import connection
 from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from spanza_journal_watch.analytics.models import AnalyticsEvent
+from spanza_journal_watch.analytics.models import AnalyticsEvent, HumanConfidence
+from spanza_journal_watch.analytics.visits import sessionise_queryset
 from spanza_journal_watch.backend.analytics_views import (
     _build_derived_visits_cached,
     _engaged_human_count,
@@ -148,6 +149,63 @@ def test_derived_visits_cache_keyed_by_queryset_scope(settings):
     assert len(everyone) == 2
 
 
+# ---- sessionise_queryset engines ----
+
+
+def _visit_event(when, event_type=AnalyticsEvent.EventType.PAGE_VISIT, **fields):
+    event = AnalyticsEvent.objects.create(event_type=event_type, **fields)
+    AnalyticsEvent.objects.filter(pk=event.pk).update(timestamp=_aware(when))
+    return event
+
+
+def _sorted_visits(visits):
+    return sorted(visits, key=lambda visit: (visit["visit_key"], visit["first_event"]))
+
+
+def test_sql_engine_matches_python_engine():
+    base = timezone.now() - datetime.timedelta(days=1)
+    reader = uuid.uuid4()
+    # Two visits for one visitor, split by the inactivity gap; the first lands
+    # on an excluded asset path and takes its landing page from later events.
+    _visit_event(base, landing_page="/robots.txt", referrer_category="", session_key="rotating-1")
+    _visit_event(
+        base + datetime.timedelta(minutes=5),
+        AnalyticsEvent.EventType.SEARCH,
+        visitor_id=reader,
+        metadata={"page": " search ", "utm_source": " bulletin "},
+        referrer_category="newsletter",
+    )
+    for minute in range(12):  # more events than VISIT_EVENT_TYPES_KEPT
+        _visit_event(
+            base + datetime.timedelta(minutes=6 + minute),
+            AnalyticsEvent.EventType.REVIEW_ENGAGED if minute % 2 else AnalyticsEvent.EventType.REVIEW_OPEN,
+            visitor_id=reader,
+            js_verified=minute == 3,
+        )
+    _visit_event(
+        base + datetime.timedelta(hours=2),
+        AnalyticsEvent.EventType.JOURNAL_STAR,
+        visitor_id=reader,
+        landing_page="/analytics/link/abc",
+        human_confidence=HumanConfidence.KNOWN_SUBSCRIBER_HUMAN,
+    )
+    # Session-only and keyless events.
+    _visit_event(base, session_key=" anon ", landing_page="/reviews/1/?utm_source=x", metadata={"page": "issue"})
+    _visit_event(base + datetime.timedelta(minutes=40), session_key="anon", metadata={"page": "home"})
+    _visit_event(base, AnalyticsEvent.EventType.JOURNAL_SEARCH)
+    qs = AnalyticsEvent.objects.all()
+
+    sql_visits = _sorted_visits(sessionise_queryset(qs, engine="sql"))
+    python_visits = _sorted_visits(sessionise_queryset(qs, engine="python"))
+
+    assert len(sql_visits) == 6
+    assert sql_visits == python_visits
+
+
+def test_sql_engine_handles_empty_scope():
+    assert sessionise_queryset(AnalyticsEvent.objects.none(), engine="sql") == []
+
+
 # ---- _engaged_human_count ----
 
 
@@ -0,0 +1,96 @@
+"""Rollup-backed dashboard panels must report what a raw AnalyticsEvent scan would."""
+
+import datetime
+
+import pytest
+from django.utils import timezone
+
+from spanza_journal_watch.analytics.models import AnalyticsEvent
+from spanza_journal_watch.analytics.rollups import refresh_rollups
+from spanza_journal_watch.backend.analytics_views import (
+    _base_event_qs,
+    _confidence_summary,
+    _event_count_between,
+    _newsletter_lift,
+    _weekly_buckets,
+    _weekly_rollup_buckets,
+)
+from spanza_journal_watch.backend.views import _safe_percentage
+from spanza_journal_watch.newsletter.models import Newsletter
+from spanza_journal_watch.submissions.models import Issue
+
+pytestmark = pytest.mark.django_db
+
+E = AnalyticsEvent.EventType
+
+
+def _event(when, event_type=E.REVIEW_ENGAGED, **fields):
+    return AnalyticsEvent.objects.create(event_type=event_type, timestamp=when, **fields)
+
+
+@pytest.fixture()
+def events():
+    """Events spread over three weeks at awkward times of day, rolled up, plus a live tail."""
+    now = timezone.now()
+    for hours_ago in range(5, 21 * 24, 17):
+        when = now - datetime.timedelta(hours=hours_ago)
+        _event(when, js_verified=hours_ago % 2 == 0)
+        _event(when, event_type=E.JOURNAL_STAR, human_confidence="known_subscriber_human")
+        _event(when, automated=True)
+    refresh_rollups()
+    _event(now - datetime.timedelta(minutes=5))
+    _event(now - datetime.timedelta(minutes=5), event_type=E.JOURNAL_STAR)
+    return now
+
+
+def test_event_count_between_matches_raw_count(events):
+    start_ts = events - datetime.timedelta(days=9, hours=7)
+    for end_ts in (events, events - datetime.timedelta(days=2, hours=3), start_ts + datetime.timedelta(hours=6)):
+        raw = AnalyticsEvent.objects.filter(
+            event_type=E.REVIEW_ENGAGED, automated=False, timestamp__gte=start_ts, timestamp__lt=end_ts
+        ).count()
+
+        assert _event_count_between(start_ts, end_ts, event_type=E.REVIEW_ENGAGED, automated=False) == raw
+
+
+def test_newsletter_lift_matches_raw_windows(events):
+    issue = Issue.objects.create(name="Lift Issue", body="body", active=True)
+    send_dt = events - datetime.timedelta(days=8, hours=13)
+    newsletter = Newsletter.objects.create(issue=issue, subject="Lift", send_date=send_dt, is_sent=True)
+    engaged = AnalyticsEvent.objects.filter(event_type=E.REVIEW_ENGAGED, automated=False)
+
+    [lift] = _newsletter_lift([newsletter])
+
+    week = datetime.timedelta(days=7)
+    assert lift["before"] == engaged.filter(timestamp__gte=send_dt - week, timestamp__lt=send_dt).count()
+    assert lift["after"] == engaged.filter(timestamp__gte=send_dt, timestamp__lt=send_dt + week).count()
+
+
+def test_confidence_summary_matches_raw_counts(events):
+    end_date = timezone.localdate(events)
+    start_date = end_date - datetime.timedelta(days=10)
+    start_ts = timezone.make_aware(datetime.datetime.combine(start_date, datetime.time.min))
+    end_ts = timezone.make_aware(datetime.datetime.combine(end_date, datetime.time.max))
+    human_events = _base_event_qs(None, start_ts, end_ts)
+
+    summary = _confidence_summary(human_events, start_date, end_date)
+
+    total = human_events.count()
+    assert summary["conf_total"] == total
+    subscribers = human_events.filter(human_confidence="known_subscriber_human").count()
+    assert summary["conf_subscriber_rate"] == _safe_percentage(subscribers, total)
+    assert summary["conf_js_rate"] == _safe_percentage(human_events.filter(js_verified=True).count(), total)
+
+
+def test_weekly_star_trend_matches_raw_buckets(events):
+    end_date = timezone.localdate(events)
+    start_date = end_date - datetime.timedelta(days=12)
+    start_ts = timezone.make_aware(datetime.datetime.combine(start_date, datetime.time.min))
+    end_ts = timezone.make_aware(datetime.datetime.combine(end_date, datetime.time.max))
+    star_events = _base_event_qs(None, start_ts, end_ts).filter(event_type=E.JOURNAL_STAR)
+
+    rollup = _weekly_rollup_buckets(
+        start_date=start_date, end_date=end_date, event_type=E.JOURNAL_STAR, automated=False
+    )
+
+    assert rollup == _weekly_buckets(star_events)
@@ -11,6 +11,7 @@ Covers:
 7. planka_url injected from settings
 8. session_selected_issue resolved correctly
 9. Stale session_selected_issue cleared when issue is inaccessible
+10. Cached lookups: repeat renders run no queries; saves invalidate them
 """
 
 import pytest
@@ -256,3 +257,47 @@ class TestFrontendBanner:
         ctx = frontend_banner(request)
         assert ctx["frontend_banner"]["title"] == "New journals browser"
         assert ctx["frontend_banner"]["link_url"] == "/journals"
+
+
+class TestContextCaching:
+    def test_repeat_call_runs_no_queries(self, django_assert_num_queries):
+        make_issue("Cached")
+        user = UserFactory()
+        _grant(user, "submissions.chief_editor")
+        selected_issue(make_request(user))
+        frontend_banner(make_request(user))
+
+        with django_assert_num_queries(0):
+            ctx = selected_issue(make_request(user))
+            frontend_banner(make_request(user))
+        assert [i.name for i in ctx["issues_for_sidebar"]] == ["Cached"]
+
+    def test_new_issue_invalidates_sidebar_issues(self):
+        user = UserFactory()
+        _grant(user, "submissions.chief_editor")
+        selected_issue(make_request(user))
+
+        issue = make_issue("Later")
+
+        ctx = selected_issue(make_request(user))
+        assert issue.pk in {i.pk for i in ctx["issues_for_sidebar"]}
+
+    def test_permission_grant_invalidates_flags(self):
+        user = UserFactory()
+        _grant(user, "submissions.regional_coordinator")
+        assert selected_issue(make_request(user))["is_coordinator_only"] is True
+
+        _grant(user, "submissions.chief_editor")
+        user = type(user).objects.get(pk=user.pk)  # drop Django's per-instance perm cache
+
+        assert selected_issue(make_request(user))["is_coordinator_only"] is False
+
+    def test_preference_save_invalidates_banner(self):
+        preference = BackendPreference.objects.create(frontend_banner_enabled=False)
+        assert frontend_banner(make_request(UserFactory())) == {"frontend_banner": None}
+
+        preference.frontend_banner_enabled = True
+        preference.frontend_banner_title = "Now live"
+        preference.save()
+
+        assert frontend_banner(make_request(UserFactory()))["frontend_banner"]["title"] == "Now live"
@@ -53,3 +53,45 @@ class TestSetupPlankaOidcCommand:
         assert app.allowed_origins == "https://planka.staging.journalwatch.org.au"
         assert app.algorithm == "RS256"
         assert app.skip_authorization is True
+
+
+class TestBackfillArticleTopicsCommand:
+    def _article(self, **kwargs):
+        from spanza_journal_watch.backend.models import PubmedArticle
+        from spanza_journal_watch.backend.topics import TOPIC_FIELDS
+
+        article = PubmedArticle.objects.create(pmid="424242", **kwargs)
+        # Simulate a row written before the topic columns existed.
+        PubmedArticle.objects.filter(pk=article.pk).update(
+            **dict.fromkeys(TOPIC_FIELDS.values(), False), topics_version=0
+        )
+        return article
+
+    def test_classifies_unclassified_articles(self):
+        article = self._article(
+            title="Caudal block in preterm infants",
+            metadata_json={"publication_types": ["Randomized Controlled Trial"]},
+        )
+
+        call_command("backfill_article_topics", no_color=True)
+
+        article.refresh_from_db()
+        assert article.topic_paediatric is True
+        assert article.topic_neonatal is True
+        assert article.topic_trial is True
+        assert article.topic_cardiac is False
+        assert article.topics_version >= 1
+
+    def test_skips_current_version_unless_all(self):
+        from spanza_journal_watch.backend.models import PubmedArticle
+
+        article = self._article(title="Paediatric sedation")
+        PubmedArticle.objects.filter(pk=article.pk).update(topics_version=999)
+
+        call_command("backfill_article_topics", no_color=True)
+        article.refresh_from_db()
+        assert article.topic_paediatric is False
+
+        call_command("backfill_article_topics", "--all", no_color=True)
+        article.refresh_from_db()
+        assert article.topic_paediatric is True
@@ -1,18 +1,41 @@
+import asyncio
+import datetime
+import gzip
+import io
 import json
-import urllib.error
+import time
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
+import httpx
 import pytest
+import redis
 
+from spanza_journal_watch.backend.fetch_engine import FetchEngine, run_fetches
 from spanza_journal_watch.backend.pubmed import PubmedAPIError, PubmedClient
+from spanza_journal_watch.backend.rate_limit import BACKGROUND, INTERACTIVE, RateLimiter, RedisRateLimiter
 
 
-class _FakeResponse:
-    def __init__(self, payload):
-        self.payload = payload
+class _FakeRaw:
+    def __init__(self, payload, gzipped):
+        self.wire = io.BytesIO(gzip.compress(payload) if gzipped else payload)
+        self.body = gzip.GzipFile(fileobj=self.wire) if gzipped else self.wire
+        self.decode_content = False
+
+    def read(self, size=-1):
+        return self.body.read(size)
+
+    def tell(self):
+        return self.wire.tell()
 
-    def read(self):
-        return self.payload.encode("utf-8")
+
+class _FakeResponse:
+    def __init__(self, payload="", status_code=200, reason="OK", headers=None, url="", gzipped=False):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers or {}
+        self.raw = _FakeRaw(payload.encode("utf-8"), gzipped)
+        self.request = SimpleNamespace(url=url, headers={"Accept-Encoding": "gzip"})
 
     def __enter__(self):
         return self
@@ -26,47 +49,50 @@ def test_request_json_retries_after_429(monkeypatch):
     sleep_calls = []
     attempts = {"count": 0}
 
-    def fake_urlopen(request, timeout):
+    def fake_get(url, params, timeout, stream):
         attempts["count"] += 1
         if attempts["count"] == 1:
-            raise urllib.error.HTTPError(
-                request.full_url,
-                429,
-                "Too Many Requests",
-                {"Retry-After": "1"},
-                None,
-            )
+            return _FakeResponse(status_code=429, reason="Too Many Requests", headers={"Retry-After": "1"})
         return _FakeResponse(json.dumps({"ok": True}))
 
     monkeypatch.setattr("spanza_journal_watch.backend.pubmed.time.sleep", sleep_calls.append)
-    monkeypatch.setattr("spanza_journal_watch.backend.pubmed.urllib.request.urlopen", fake_urlopen)
+    monkeypatch.setattr(client.session, "get", fake_get)
 
     assert client._request_json("einfo.fcgi", {"db": "pubmed"}) == {"ok": True}
     assert attempts["count"] == 2
     assert 1 in sleep_calls
+    assert client.metrics["requests"] == 1
+    assert client.metrics["retries"] == 1
 
 
 def test_request_json_raises_after_exhausting_429_retries(monkeypatch):
     client = PubmedClient(api_key="", timeout=5, max_retries=1)
-    response_headers = MagicMock()
-    response_headers.get.return_value = None
-
-    def fake_urlopen(request, timeout):
-        raise urllib.error.HTTPError(
-            request.full_url,
-            429,
-            "Too Many Requests",
-            response_headers,
-            None,
-        )
 
     monkeypatch.setattr("spanza_journal_watch.backend.pubmed.time.sleep", lambda _: None)
-    monkeypatch.setattr("spanza_journal_watch.backend.pubmed.urllib.request.urlopen", fake_urlopen)
+    monkeypatch.setattr(
+        client.session,
+        "get",
+        lambda url, params, timeout, stream: _FakeResponse(status_code=429, reason="Too Many Requests"),
+    )
 
     with pytest.raises(PubmedAPIError, match="429"):
         client._request_json("einfo.fcgi", {"db": "pubmed"})
 
 
+def test_request_decodes_gzip_and_counts_bytes(monkeypatch):
+    client = PubmedClient(api_key="", timeout=5)
+    payload = json.dumps({"ids": list(range(500))})
+    monkeypatch.setattr(client, "_claim_request_slot", lambda: None)
+    monkeypatch.setattr(
+        client.session, "get", lambda url, params, timeout, stream: _FakeResponse(payload, gzipped=True)
+    )
+
+    assert client._request_json("esearch.fcgi", {"db": "pubmed"}) == json.loads(payload)
+    assert client.metrics["bytes_decoded"] == len(payload)
+    assert 0 < client.metrics["bytes_received"] < len(payload)
+    assert client.session.headers["Accept-Encoding"] == "gzip"
+
+
 def test_search_pmids_history_uses_history_server(monkeypatch):
     client = PubmedClient(api_key="abc123", timeout=5, tool="jw", email="queries@example.com")
 
@@ -95,3 +121,294 @@ def test_search_pmids_history_uses_history_server(monkeypatch):
         "query_key": "1",
         "pmids": [],
     }
+
+
+def _efetch_xml(pmids, journal="Engine Journal"):
+    articles = "".join(
+        f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article><Journal><Title>{journal}</Title></Journal>"
+        f"<ArticleTitle>Title {pmid}</ArticleTitle></Article></MedlineCitation><PubmedData><ArticleIdList>"
+        f'<ArticleId IdType="doi">10.1/{pmid}</ArticleId></ArticleIdList></PubmedData></PubmedArticle>'
+        for pmid in pmids
+    )
+    return (
+        '<?xml version="1.0" ?>\n<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2025//EN"'
+        ' "https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_250101.dtd">\n'
+        f"<PubmedArticleSet>{articles}<PubmedBookArticle /></PubmedArticleSet>"
+    )
+
+
+def test_fetch_articles_parses_efetch_stream(monkeypatch):
+    client = PubmedClient(api_key="", timeout=5)
+    monkeypatch.setattr(client, "_claim_request_slot", lambda: None)
+    monkeypatch.setattr(
+        client.session, "get", lambda url, params, timeout, stream: _FakeResponse(_efetch_xml(["101", "102"]))
+    )
+
+    payloads = client.fetch_articles(["101", "102"])
+
+    assert [(payload["pmid"], payload["doi"], payload["title"]) for payload in payloads] == [
+        ("101", "10.1/101", "Title 101"),
+        ("102", "10.1/102", "Title 102"),
+    ]
+
+
+def test_fetch_articles_rejects_invalid_xml(monkeypatch):
+    client = PubmedClient(api_key="", timeout=5)
+    monkeypatch.setattr(client, "_claim_request_slot", lambda: None)
+    monkeypatch.setattr(
+        client.session, "get", lambda url, params, timeout, stream: _FakeResponse("<PubmedArticleSet><PubmedArticle>")
+    )
+
+    with pytest.raises(PubmedAPIError, match="invalid XML"):
+        client.fetch_articles(["1"])
+
+
+# ---- set-based cache ingest ----
+
+
+def _cache_payload(pmid, **overrides):
+    payload = {
+        "pmid": pmid,
+        "doi": f"10.1234/Bulk.{pmid}",
+        "title": f"Paediatric airway study {pmid}",
+        "abstract": "",
+        "source_journal_name": "Bulk Journal",
+        "publication_date": None,
+        "publication_month": None,
+        "article_url": "",
+        "pubmed_url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+        "metadata_json": {"mesh_terms": ["Airway Management"]},
+    }
+    payload.update(overrides)
+    return payload
+
+
+@pytest.mark.django_db
+def test_bulk_upsert_creates_then_fills_existing_articles():
+    from spanza_journal_watch.backend.pubmed_cache import bulk_upsert_pubmed_articles
+    from spanza_journal_watch.submissions.models import MeshTagMapping, Tag
+
+    tag = Tag.objects.create(text="Airway")
+    MeshTagMapping.objects.create(mesh_term="Airway Management", tag=tag)
+
+    first = bulk_upsert_pubmed_articles([_cache_payload("9001"), _cache_payload("9002"), {"title": "no ids"}])
+    assert len(first) == 2
+    article = first[0][1]
+    article.refresh_from_db()
+    assert article.doi == "10.1234/bulk.9001"
+    assert article.journal.name == "Bulk Journal"
+    assert article.topic_paediatric is True
+    assert list(article.tags.all()) == [tag]
+
+    second = bulk_upsert_pubmed_articles([_cache_payload("9001", abstract="Filled in later.")])
+    assert second[0][1].pk == article.pk
+    article.refresh_from_db()
+    assert article.abstract == "Filled in later."
+
+
+def _eutils_transport(count, requested=None, terms=None):
+    """Answer esearch with a ``count``-article history set and efetch with the requested slice of it."""
+
+    def handler(request):
+        if request.url.path.endswith("esearch.fcgi"):
+            if terms is not None:
+                terms.append(request.url.params["term"])
+            return httpx.Response(
+                200, json={"esearchresult": {"count": str(count), "webenv": "w", "querykey": "1", "idlist": []}}
+            )
+        retstart, retmax = int(request.url.params["retstart"]), int(request.url.params["retmax"])
+        if requested is not None:
+            requested.append(retstart)
+        pmids = [str(9000 + pmid) for pmid in range(retstart, min(retstart + retmax, count))]
+        return httpx.Response(200, content=_efetch_xml(pmids).encode("utf-8"))
+
+    return httpx.MockTransport(handler)
+
+
+def test_rate_limiter_paces_requests():
+    limiter = RateLimiter("test", interval=0.02)
+    started = time.monotonic()
+
+    waits = [limiter.acquire() for _ in range(5)]
+
+    # The first slot is free; each later one comes 20ms after the last.
+    assert time.monotonic() - started >= 0.075
+    assert waits[0] == 0
+
+
+def test_rate_limiter_serves_interactive_lane_first():
+    limiter = RateLimiter("test", interval=0.05)
+    assert limiter.try_acquire(BACKGROUND) == 0
+
+    interactive_wait = limiter.try_acquire(INTERACTIVE)
+    assert 0 < interactive_wait <= 0.05
+    # The waiting interactive caller holds background callers back past its own slot.
+    assert limiter.try_acquire(BACKGROUND) > interactive_wait
+
+    time.sleep(interactive_wait)
+    assert limiter.try_acquire(INTERACTIVE) == 0
+    assert limiter.try_acquire(BACKGROUND) > 0
+
+
+def test_redis_rate_limiter_falls_back_to_local_pacing():
+    redis_client = MagicMock()
+    redis_client.register_script.return_value.side_effect = redis.ConnectionError("down")
+    limiter = RedisRateLimiter("test", 0.05, redis_client)
+
+    assert limiter.try_acquire() == 0
+    assert limiter.try_acquire() > 0
+
+
+def test_run_fetches_pages_every_journal():
+    client = PubmedClient(api_key="abc123", timeout=5)
+    requested = []
+    engine = FetchEngine(client, max_in_flight=4, transport=_eutils_transport(5, requested))
+    month = datetime.date(2026, 1, 1)
+
+    sources = {key: engine.pubmed_journal_pages(f"journal {key}", month, month, batch_size=2) for key in ("a", "b")}
+    pages = {"a": [], "b": []}
+    finished = []
+    for key, page in run_fetches(engine, sources, max_queued_pages=1):
+        if page is None:
+            finished.append(key)
+        else:
+            pages[key].append([payload["pmid"] for payload in page])
+
+    expected = [["9000", "9001"], ["9002", "9003"], ["9004"]]
+    assert pages == {"a": expected, "b": expected}
+    assert sorted(finished) == ["a", "b"]
+    assert sorted(requested) == [0, 0, 2, 2, 4, 4]
+    assert client.metrics["requests"] == 8
+
+
+def test_slow_crossref_does_not_hold_up_pubmed():
+    eutils = _eutils_transport(1)
+
+    async def handler(request):
+        if request.url.host == "api.crossref.org":
+            await asyncio.sleep(0.5)
+            return httpx.Response(200, json={"message": {"items": [{"DOI": f"10.1/{request.url.params['filter']}"}]}})
+        return eutils.handler(request)
+
+    client = PubmedClient(api_key="abc123", timeout=5)
+    engine = FetchEngine(client, max_in_flight=4, transport=httpx.MockTransport(handler))
+    month = datetime.date(2026, 1, 1)
+    sources = {f"crossref-{n}": engine.crossref_journal_pages(f"0000-000{n}", month, month) for n in range(6)}
+    sources["pubmed"] = engine.pubmed_journal_pages("journal", month, month)
+
+    started = time.monotonic()
+    finished = {}
+    for key, page in run_fetches(engine, sources):
+        if page is None:
+            finished[key] = time.monotonic() - started
+
+    # CrossRef takes its three slots; the fourth stays free for PubMed instead of being held by a queued request.
+    assert finished["pubmed"] < 0.4
+    assert min(seconds for key, seconds in finished.items() if key != "pubmed") >= 0.5
+
+
+def test_run_fetches_raises_source_errors():
+    client = PubmedClient(api_key="", timeout=5, max_retries=0)
+    engine = FetchEngine(client, transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+    month = datetime.date(2026, 1, 1)
+
+    with pytest.raises(PubmedAPIError, match="500"):
+        list(run_fetches(engine, {"a": engine.pubmed_journal_pages("journal", month, month)}))
+
+
+@pytest.mark.django_db
+def test_refresh_pubmed_journal_cache_writes_fetched_pages(monkeypatch):
+    from spanza_journal_watch.backend import pubmed_cache
+    from spanza_journal_watch.backend.models import WatchedJournal, WatchedJournalArticle
+
+    journals = [
+        WatchedJournal.objects.create(name="Engine Journal"),
+        WatchedJournal.objects.create(name="Engine Journal (print)", display_name="Engine Journal"),
+    ]
+    transport = _eutils_transport(3)
+    monkeypatch.setattr(
+        pubmed_cache,
+        "FetchEngine",
+        lambda client, **kwargs: FetchEngine(client, transport=transport, **kwargs),
+    )
+    progress = []
+
+    totals = pubmed_cache.refresh_pubmed_journal_cache(
+        watched_journals=journals,
+        client=PubmedClient(api_key="abc123", timeout=5),
+        progress_callback=lambda done, total, name: progress.append((done, total)),
+    )
+
+    assert totals == {"journal_count": 2, "incremental_count": 0, "created_links": 6, "touched_links": 6}
+    assert progress == [(1, 2), (2, 2)]
+    assert WatchedJournalArticle.objects.filter(watched_journal__in=journals).count() == 6
+
+
+@pytest.mark.django_db
+def test_refresh_pubmed_journal_cache_touches_existing_links(monkeypatch):
+    from spanza_journal_watch.backend import pubmed_cache
+    from spanza_journal_watch.backend.models import WatchedJournal, WatchedJournalArticle
+
+    journal = WatchedJournal.objects.create(name="Engine Journal")
+    transport = _eutils_transport(2)
+    monkeypatch.setattr(
+        pubmed_cache,
+        "FetchEngine",
+        lambda client, **kwargs: FetchEngine(client, transport=transport, **kwargs),
+    )
+
+    def refresh():
+        return pubmed_cache.refresh_pubmed_journal_cache(
+            watched_journals=[journal], client=PubmedClient(api_key="abc123", timeout=5), full=True
+        )
+
+    first = refresh()
+    second = refresh()
+
+    assert (first["created_links"], first["touched_links"]) == (2, 2)
+    assert (second["created_links"], second["touched_links"]) == (0, 2)
+    assert WatchedJournalArticle.objects.filter(watched_journal=journal).count() == 2
+
+
+@pytest.mark.django_db
+def test_refresh_pubmed_journal_cache_fetches_changes_since_watermark(monkeypatch):
+    from spanza_journal_watch.backend import pubmed_cache
+    from spanza_journal_watch.backend.models import WatchedJournal
+
+    journal = WatchedJournal.objects.create(name="Engine Journal")
+    terms = []
+    transport = _eutils_transport(2, terms=terms)
+    monkeypatch.setattr(
+        pubmed_cache,
+        "FetchEngine",
+        lambda client, **kwargs: FetchEngine(client, transport=transport, **kwargs),
+    )
+
+    def refresh(**kwargs):
+        return pubmed_cache.refresh_pubmed_journal_cache(
+            watched_journals=[WatchedJournal.objects.get(pk=journal.pk)],
+            client=PubmedClient(api_key="abc123", timeout=5),
+            **kwargs,
+        )
+
+    # No watermark yet: the whole window, after which the watermark covers it.
+    assert refresh()["incremental_count"] == 0
+    journal.refresh_from_db()
+    synced_at = journal.cache_synced_at
+    assert synced_at is not None
+    window = (journal.cache_synced_from_month, journal.cache_synced_to_month)
+    assert window == pubmed_cache.default_pubmed_cache_window()
+
+    assert refresh()["incremental_count"] == 1
+    since = (synced_at - pubmed_cache.WATERMARK_OVERLAP).date()
+    assert f'"{since:%Y/%m/%d}"[EDAT]' in terms[1]
+    assert f'"{since:%Y/%m/%d}"[MDAT]' in terms[1]
+
+    assert refresh(full=True)["incremental_count"] == 0
+    assert "[EDAT]" not in terms[2]
+
+    # A different search starts over from a full fetch.
+    journal.refresh_from_db()
+    journal.medline_ta = "Engine J"
+    journal.save()
+    assert journal.cache_synced_at is None
@@ -13,11 +13,13 @@ from unittest.mock import patch
 
 import pytest
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 
 from spanza_journal_watch.backend.models import FetchLog, PubmedImportBatch, SubscriberCSV, WatchedJournal
 from spanza_journal_watch.newsletter.models import Subscriber
 from spanza_journal_watch.submissions.models import Issue
+from spanza_journal_watch.submissions.tag_clusters import CACHE_KEY, compute_tag_clusters
 
 User = get_user_model()
 pytestmark = pytest.mark.django_db
@@ -271,7 +273,7 @@ class TestRefreshPubmedJournalCacheTask:
 
 
 class TestComputeTagClustersTask:
-    @patch("django.core.cache.cache")
+    @patch("spanza_journal_watch.submissions.tag_clusters.cache")
     def test_returns_cluster_counts(self, mock_cache):
         from spanza_journal_watch.backend.models import PubmedArticle
         from spanza_journal_watch.backend.tasks import compute_tag_clusters_task
@@ -290,9 +292,9 @@ class TestComputeTagClustersTask:
         result = compute_tag_clusters_task()
         assert result["tags"] >= 2
         assert result["clusters"] >= 1
-        mock_cache.set.assert_called_once()
+        assert CACHE_KEY in [call.args[0] for call in mock_cache.set.call_args_list]
 
-    @patch("django.core.cache.cache")
+    @patch("spanza_journal_watch.submissions.tag_clusters.cache")
     def test_no_overlap_no_clusters(self, mock_cache):
         from spanza_journal_watch.backend.models import PubmedArticle
         from spanza_journal_watch.backend.tasks import compute_tag_clusters_task
@@ -312,11 +314,57 @@ class TestComputeTagClustersTask:
         # Zero overlap → zero clusters (from these tags at least)
         assert isinstance(result["clusters"], int)
 
-    @patch("django.core.cache.cache")
+    @patch("spanza_journal_watch.submissions.tag_clusters.cache")
     def test_caches_result(self, mock_cache):
         from spanza_journal_watch.backend.tasks import compute_tag_clusters_task
 
         compute_tag_clusters_task()
-        mock_cache.set.assert_called_once()
-        args = mock_cache.set.call_args[0]
-        assert isinstance(args[1], list)  # clusters list
+        cached = {call.args[0]: call.args[1] for call in mock_cache.set.call_args_list}
+        assert isinstance(cached[CACHE_KEY], list)  # clusters list
+
+
+class TestComputeTagClusters:
+    def _tags_with_articles(self, article_counts, shared):
+        """Create curated tags over a shared article pool; the first ``shared`` articles go on every tag."""
+        from spanza_journal_watch.backend.models import PubmedArticle
+        from spanza_journal_watch.submissions.models import Tag
+
+        pool = [PubmedArticle.objects.create(title=f"Pool Art {i}") for i in range(max(article_counts) * 3)]
+        tags = []
+        offset = shared
+        for index, count in enumerate(article_counts):
+            tag = Tag.objects.create(text=f"pool-tag-{index}", active=True, curated=True)
+            own = pool[offset : offset + count - shared]
+            offset += count - shared
+            tag.articles.set(pool[:shared] + own)
+            tags.append(tag)
+        return tags
+
+    def test_engines_agree(self):
+        self._tags_with_articles([5, 5, 10], shared=3)
+
+        _, sql_pairs, sql_clusters = compute_tag_clusters(engine="sql", store=False)
+        _, python_pairs, python_clusters = compute_tag_clusters(engine="python", store=False)
+
+        assert sql_pairs == pytest.approx(python_pairs)
+        assert sql_clusters == python_clusters
+
+    def test_similarity_is_overlap_over_smaller_tag(self):
+        small, large, other = self._tags_with_articles([5, 10, 4], shared=3)
+
+        _, pairs, clusters = compute_tag_clusters(store=False)
+
+        assert pairs[(small.pk, large.pk)] == pytest.approx(3 / 5)
+        assert clusters == [sorted(tag.pk for tag in (small, large, other))]
+
+    def test_incremental_recompute_rescores_changed_tags(self):
+        tag_a, tag_b = self._tags_with_articles([4, 4], shared=3)
+        compute_tag_clusters()
+        assert len(cache.get(CACHE_KEY)) == 1
+
+        tag_b.articles.set(tag_b.articles.exclude(pk__in=tag_a.articles.all()))
+        _, pairs, clusters = compute_tag_clusters(changed_tag_ids=[tag_b.pk])
+
+        assert pairs == {}
+        assert clusters == []
+        assert cache.get(CACHE_KEY) == []
@@ -0,0 +1,143 @@
+"""Topic classification for PubMed articles.
+
+Articles are classified once when saved and the result is stored in the
+``topic_*`` boolean columns on PubmedArticle, so intake and journal-browser
+filters are plain WHERE clauses. Bump TOPIC_CLASSIFIER_VERSION whenever the
+term lists change and run ``manage.py backfill_article_topics``.
+"""
+
+TOPIC_CLASSIFIER_VERSION = 1
+
+PAEDIATRIC_MESH_TERMS = {
+    "Pediatrics",
+    "Infant",
+    "Infant, Newborn",
+    "Child",
+    "Child, Preschool",
+    "Adolescent",
+}
+PAEDIATRIC_TEXT_TERMS = {
+    "pediatric",
+    "paediatric",
+    "child",
+    "children",
+    "infant",
+    "newborn",
+    "neonat",
+    "adolescent",
+}
+HUMANS_MESH_TERM = "Humans"
+REVIEW_PUBLICATION_TYPES = {"Review", "Systematic Review", "Meta-Analysis"}
+TRIAL_PUBLICATION_TYPES = {"Clinical Trial", "Randomized Controlled Trial"}
+
+PAIN_TEXT_TERMS = {
+    "pain",
+    "analgesia",
+    "analgesic",
+    "opioid",
+    "nocicept",
+    "regional anaesthesia",
+    "regional anesthesia",
+}
+PAIN_MESH_TERMS = {"Pain", "Pain Management", "Analgesia"}
+
+ICU_TEXT_TERMS = {"intensive care", "critical care", "icu", "ventilat", "sepsis"}
+ICU_MESH_TERMS = {"Critical Care", "Intensive Care Units", "Respiration, Artificial", "Sepsis"}
+
+CARDIAC_TEXT_TERMS = {
+    "cardiac anaesthesia",
+    "cardiac anesthesia",
+    "cardiothoracic",
+    "cardiac surgery",
+    "cardiopulmonary bypass",
+    "heart surgery",
+}
+CARDIAC_MESH_TERMS = {"Anesthesia, Cardiovascular", "Cardiac Surgical Procedures", "Cardiopulmonary Bypass"}
+
+NEONATAL_TEXT_TERMS = {"neonat", "newborn", "preterm", "premature"}
+NEONATAL_MESH_TERMS = {"Infant, Newborn", "Premature Birth", "Infant, Premature"}
+
+# Topic key → PubmedArticle field. The keys match the intake "<topic>_only" params.
+TOPIC_FIELDS = {
+    "paediatric": "topic_paediatric",
+    "humans": "topic_humans",
+    "review": "topic_review",
+    "trial": "topic_trial",
+    "pain": "topic_pain",
+    "icu": "topic_icu",
+    "cardiac": "topic_cardiac",
+    "neonatal": "topic_neonatal",
+}
+
+
+def article_metadata_list(article, key):
+    data = article.metadata_json or {}
+    values = data.get(key) or []
+    if not isinstance(values, list):
+        return []
+    return [str(value).strip() for value in values if str(value or "").strip()]
+
+
+def article_matches_metadata(article, key, accepted_values):
+    accepted_lower = {item.lower() for item in accepted_values}
+    values_lower = {item.lower() for item in article_metadata_list(article, key)}
+    return bool(values_lower.intersection(accepted_lower))
+
+
+def _article_text(article):
+    return " ".join(
+        [
+            (article.title or ""),
+            (article.abstract or ""),
+            " ".join(article_metadata_list(article, "keywords")),
+            " ".join(article_metadata_list(article, "mesh_terms")),
+        ]
+    ).lower()
+
+
+def article_matches_text(article, accepted_terms, *, text=None):
+    text = _article_text(article) if text is None else text
+    return any(term.lower() in text for term in accepted_terms)
+
+
+def article_matches_topic(article, *, mesh_terms=None, text_terms=None, text=None):
+    mesh_terms = mesh_terms or set()
+    text_terms = text_terms or set()
+    return article_matches_metadata(article, "mesh_terms", mesh_terms) or article_matches_text(
+        article, text_terms, text=text
+    )
+
+
+def classify_article_topics(article):
+    """Return ``{field: bool}`` for every TOPIC_FIELDS column."""
+    text = _article_text(article)
+    return {
+        "topic_paediatric": article_matches_topic(
+            article, mesh_terms=PAEDIATRIC_MESH_TERMS, text_terms=PAEDIATRIC_TEXT_TERMS, text=text
+        ),
+        "topic_humans": article_matches_metadata(article, "mesh_terms", {HUMANS_MESH_TERM}),
+        "topic_review": article_matches_metadata(article, "publication_types", REVIEW_PUBLICATION_TYPES),
+        "topic_trial": article_matches_metadata(article, "publication_types", TRIAL_PUBLICATION_TYPES),
+        "topic_pain": article_matches_topic(
+            article, mesh_terms=PAIN_MESH_TERMS, text_terms=PAIN_TEXT_TERMS, text=text
+        ),
+        "topic_icu": article_matches_topic(article, mesh_terms=ICU_MESH_TERMS, text_terms=ICU_TEXT_TERMS, text=text),
+        "topic_cardiac": article_matches_topic(
+            article, mesh_terms=CARDIAC_MESH_TERMS, text_terms=CARDIAC_TEXT_TERMS, text=text
+        ),
+        "topic_neonatal": article_matches_topic(
+            article, mesh_terms=NEONATAL_MESH_TERMS, text_terms=NEONATAL_TEXT_TERMS, text=text
+        ),
+    }
+
+
+def apply_article_topics(article):
+    """Set the topic columns on ``article`` (unsaved). Returns True if any changed."""
+    flags = classify_article_topics(article)
+    flags["topics_version"] = TOPIC_CLASSIFIER_VERSION
+    changed = False
+    for field, value in flags.items():
+        if getattr(article, field) != value:
+            setattr(article, field, value)
+            changed = True
+    return changed
@@ -45,7 +45,7 @@ from spanza_journal_watch.submissions.models import (
     Review,
     Tag,
 )
-from spanza_journal_watch.utils.cache import bump_content_cache_version
+from spanza_journal_watch.utils.cache import CACHE_TAG_INBOX, PUBLIC_PAGE_CACHE_TAGS, invalidate_cache_tags
 
 from .forms import (
     ArticleIntakeAssignIssueForm,
@@ -91,12 +91,6 @@ from .models import (
 )
 from .planka import PlankaAPIError, PlankaClient
 from .pubmed import PubmedAPIError
-from .pubmed_cache import (
-    article_matches_metadata as _article_matches_metadata,
-)
-from .pubmed_cache import (
-    article_matches_topic as _article_matches_topic,
-)
 from .pubmed_cache import (
     build_pubmed_client as _build_pubmed_client,
 )
@@ -109,11 +103,13 @@ from .pubmed_cache import (
 from .pubmed_cache import (
     upsert_pubmed_article as _upsert_pubmed_article,
 )
+from .rate_limit import INTERACTIVE
 from .tasks import (
     check_batch_for_new_articles_task,
     process_subscriber_csv,
     run_pubmed_batch_push_task,
 )
+from .topics import TOPIC_FIELDS
 
 logger = logging.getLogger(__name__)
 
@@ -851,54 +847,8 @@ def _build_backend_settings_context(request, *, inbox_settings_form=None, fronte
     }
 
 
-PAEDIATRIC_MESH_TERMS = {
-    "Pediatrics",
-    "Infant",
-    "Infant, Newborn",
-    "Child",
-    "Child, Preschool",
-    "Adolescent",
-}
-PAEDIATRIC_TEXT_TERMS = {
-    "pediatric",
-    "paediatric",
-    "child",
-    "children",
-    "infant",
-    "newborn",
-    "neonat",
-    "adolescent",
-}
-HUMANS_MESH_TERM = "Humans"
-REVIEW_PUBLICATION_TYPES = {"Review", "Systematic Review", "Meta-Analysis"}
-TRIAL_PUBLICATION_TYPES = {"Clinical Trial", "Randomized Controlled Trial"}
-
-PAIN_TEXT_TERMS = {
-    "pain",
-    "analgesia",
-    "analgesic",
-    "opioid",
-    "nocicept",
-    "regional anaesthesia",
-    "regional anesthesia",
-}
-PAIN_MESH_TERMS = {"Pain", "Pain Management", "Analgesia"}
-
-ICU_TEXT_TERMS = {"intensive care", "critical care", "icu", "ventilat", "sepsis"}
-ICU_MESH_TERMS = {"Critical Care", "Intensive Care Units", "Respiration, Artificial", "Sepsis"}
-
-CARDIAC_TEXT_TERMS = {
-    "cardiac anaesthesia",
-    "cardiac anesthesia",
-    "cardiothoracic",
-    "cardiac surgery",
-    "cardiopulmonary bypass",
-    "heart surgery",
-}
-CARDIAC_MESH_TERMS = {"Anesthesia, Cardiovascular", "Cardiac Surgical Procedures", "Cardiopulmonary Bypass"}
-
-NEONATAL_TEXT_TERMS = {"neonat", "newborn", "preterm", "premature"}
-NEONATAL_MESH_TERMS = {"Infant, Newborn", "Premature Birth", "Infant, Premature"}
+# Intake topic filters: "<topic>_only" param → precomputed PubmedArticle column.
+INTAKE_TOPIC_FILTERS = {f"{topic}_only": field for topic, field in TOPIC_FIELDS.items()}
 
 
 def _param_enabled(params, key, default=False):
@@ -936,20 +886,13 @@ def _import_pubmed_batch(batch, watched_journals):
 def _build_article_intake_queryset(batch, params):
     """Return (rows, tab_rows, flags) where tab_rows ignores the journal filter.
 
-    `rows` and `tab_rows` are either lists (when Python-side topic filters force
-    materialization) or QuerySets (the fast path, letting Paginator use SQL COUNT).
+    Both are QuerySets: topic filters read the precomputed ``topic_*`` columns,
+    so Paginator and the journal tabs count in SQL.
     """
     query = (params.get("q") or "").strip()
     watched_journal_id = (params.get("journal") or "").strip()
     selected = (params.get("filter_selected") or params.get("selected") or "").strip().lower()
-    paediatric_only = _param_enabled(params, "paediatric_only", default=False)
-    humans_only = _param_enabled(params, "humans_only", default=False)
-    review_only = _param_enabled(params, "review_only", default=False)
-    trial_only = _param_enabled(params, "trial_only", default=False)
-    pain_only = _param_enabled(params, "pain_only", default=False)
-    icu_only = _param_enabled(params, "icu_only", default=False)
-    cardiac_only = _param_enabled(params, "cardiac_only", default=False)
-    neonatal_only = _param_enabled(params, "neonatal_only", default=False)
+    topic_flags = {param: _param_enabled(params, param, default=False) for param in INTAKE_TOPIC_FILTERS}
 
     base = (
         batch.batch_articles.select_related("article", "watched_journal", "issue")
@@ -973,92 +916,21 @@ def _build_article_intake_queryset(batch, params):
     if selected in {"true", "false"}:
         base = base.filter(is_selected=(selected == "true"))
 
-    has_python_filter = any(
-        [paediatric_only, humans_only, review_only, trial_only, pain_only, icu_only, cardiac_only, neonatal_only]
-    )
-
-    if has_python_filter:
-        # Materialize once (without journal filter) so rows and tab_rows share a pass.
-        materialized = list(base)
-
-        def _apply_python_filters(rows_list):
-            if paediatric_only:
-                rows_list = [
-                    r
-                    for r in rows_list
-                    if _article_matches_topic(
-                        r.article, mesh_terms=PAEDIATRIC_MESH_TERMS, text_terms=PAEDIATRIC_TEXT_TERMS
-                    )
-                ]
-            if humans_only:
-                rows_list = [
-                    r for r in rows_list if _article_matches_metadata(r.article, "mesh_terms", {HUMANS_MESH_TERM})
-                ]
-            if review_only:
-                rows_list = [
-                    r
-                    for r in rows_list
-                    if _article_matches_metadata(r.article, "publication_types", REVIEW_PUBLICATION_TYPES)
-                ]
-            if trial_only:
-                rows_list = [
-                    r
-                    for r in rows_list
-                    if _article_matches_metadata(r.article, "publication_types", TRIAL_PUBLICATION_TYPES)
-                ]
-            if pain_only:
-                rows_list = [
-                    r
-                    for r in rows_list
-                    if _article_matches_topic(r.article, mesh_terms=PAIN_MESH_TERMS, text_terms=PAIN_TEXT_TERMS)
-                ]
-            if icu_only:
-                rows_list = [
-                    r
-                    for r in rows_list
-                    if _article_matches_topic(r.article, mesh_terms=ICU_MESH_TERMS, text_terms=ICU_TEXT_TERMS)
-                ]
-            if cardiac_only:
-                rows_list = [
-                    r
-                    for r in rows_list
-                    if _article_matches_topic(r.article, mesh_terms=CARDIAC_MESH_TERMS, text_terms=CARDIAC_TEXT_TERMS)
-                ]
-            if neonatal_only:
-                rows_list = [
-                    r
-                    for r in rows_list
-                    if _article_matches_topic(
-                        r.article, mesh_terms=NEONATAL_MESH_TERMS, text_terms=NEONATAL_TEXT_TERMS
-                    )
-                ]
-            return rows_list
+    topic_filters = {f"article__{INTAKE_TOPIC_FILTERS[param]}": True for param, on in topic_flags.items() if on}
+    if topic_filters:
+        base = base.filter(**topic_filters)
 
-        tab_rows = _apply_python_filters(materialized)
-        if watched_journal_id.isdigit():
-            wj = int(watched_journal_id)
-            rows = [r for r in tab_rows if r.watched_journal_id == wj]
-        else:
-            rows = tab_rows
+    tab_rows = base
+    if watched_journal_id.isdigit():
+        rows = base.filter(watched_journal_id=int(watched_journal_id))
     else:
-        tab_rows = base
-        if watched_journal_id.isdigit():
-            rows = base.filter(watched_journal_id=int(watched_journal_id))
-        else:
-            rows = base
+        rows = base
 
     flags = {
         "query": query,
         "watched_journal_id": watched_journal_id,
         "selected": selected,
-        "paediatric_only": paediatric_only,
-        "humans_only": humans_only,
-        "review_only": review_only,
-        "trial_only": trial_only,
-        "pain_only": pain_only,
-        "icu_only": icu_only,
-        "cardiac_only": cardiac_only,
-        "neonatal_only": neonatal_only,
+        **topic_flags,
     }
     return rows, tab_rows, flags
 
@@ -1078,35 +950,21 @@ def _article_intake_results_context(batch, params, user=None):
             return False
         return row.created > seen_baseline and row.pk not in seen_ids
 
-    if isinstance(tab_rows, list):
-        journal_counts = Counter(r.watched_journal_id for r in tab_rows)
-        all_journals_count = len(tab_rows)
-    else:
-        journal_counts = dict(
-            tab_rows.order_by()
-            .values("watched_journal_id")
-            .annotate(c=Count("id"))
-            .values_list("watched_journal_id", "c")
-        )
-        all_journals_count = tab_rows.count()
+    journal_counts = dict(
+        tab_rows.order_by().values("watched_journal_id").annotate(c=Count("id")).values_list("watched_journal_id", "c")
+    )
+    all_journals_count = sum(journal_counts.values())
 
     new_count = 0
     if seen_baseline is not None:
-        if isinstance(tab_rows, list):
-            new_count = sum(1 for r in tab_rows if _row_is_new(r))
-        else:
-            new_count = sum(
-                1
-                for pk, created in tab_rows.values_list("id", "created").iterator()
-                if created > seen_baseline and pk not in seen_ids
-            )
+        new_count = sum(
+            1
+            for pk, created in tab_rows.values_list("id", "created").iterator()
+            if created > seen_baseline and pk not in seen_ids
+        )
 
     if new_only and seen_baseline is not None:
-        if isinstance(rows, list):
-            rows = [r for r in rows if _row_is_new(r)]
-        else:
-            rows = list(rows)
-            rows = [r for r in rows if _row_is_new(r)]
+        rows = [r for r in rows if _row_is_new(r)]
 
     watched_journal_tabs = [
         {"journal": watched, "count": journal_counts.get(watched.pk, 0)} for watched in watched_options
@@ -1766,7 +1624,7 @@ def pubmed_save_api_key(request):
 
     api_key = form.cleaned_data["api_key"]
     try:
-        validator = _build_pubmed_client(api_key=api_key)
+        validator = _build_pubmed_client(api_key=api_key, priority=INTERACTIVE)
         validator.ping()
         credential = _get_pubmed_integration_credential() or PubmedIntegrationCredential(singleton=1)
         credential.set_api_key(api_key)
@@ -1807,7 +1665,7 @@ def article_intake_find_article(request, batch_id):
 
     if query:
         try:
-            articles = _build_pubmed_client().find_articles(query, retmax=8)
+            articles = _build_pubmed_client(priority=INTERACTIVE).find_articles(query, retmax=8)
         except PubmedAPIError as exc:
             error = _safe_planka_error(exc)
 
@@ -1862,7 +1720,7 @@ def article_intake_add_article(request, batch_id):
             messages.info(request, f"\u201c{article.title}\u201d removed from staging.")
     else:
         try:
-            payloads = _build_pubmed_client().fetch_articles([pmid])
+            payloads = _build_pubmed_client(priority=INTERACTIVE).fetch_articles([pmid])
         except PubmedAPIError as exc:
             messages.error(request, f"PubMed lookup failed: {_safe_planka_error(exc)}")
             return _render_article_intake_results_response(request, batch, request.POST)
@@ -1902,7 +1760,7 @@ def article_intake_add_article(request, batch_id):
 
     # OOB: re-run the search so the find panel reflects the new staging state
     try:
-        find_articles_raw = _build_pubmed_client().find_articles(query, retmax=8)
+        find_articles_raw = _build_pubmed_client(priority=INTERACTIVE).find_articles(query, retmax=8)
     except PubmedAPIError:
         find_articles_raw = []
 
@@ -2694,7 +2552,7 @@ def watched_journal_search(request):
         return JsonResponse({"results": []})
 
     try:
-        journals = _build_pubmed_client().search_journals(query=query, retmax=20)
+        journals = _build_pubmed_client(priority=INTERACTIVE).search_journals(query=query, retmax=20)
     except PubmedAPIError as error:
         return JsonResponse({"results": [], "error": _safe_planka_error(error)})
 
@@ -4392,7 +4250,9 @@ def fetch_monitoring(request):
     try:
         from django_celery_beat.models import PeriodicTask
 
+        # The routine refresh, not the weekly full reconciliation that runs the same task.
         task = PeriodicTask.objects.filter(
+            name="Refresh PubMed journal cache",
             task="spanza_journal_watch.backend.tasks.refresh_pubmed_journal_cache_task",
             enabled=True,
         ).first()
@@ -5069,7 +4929,7 @@ def review_pubmed_search(request, issue_id):
     error = None
     if query:
         try:
-            articles = _build_pubmed_client().find_articles(query, retmax=8)
+            articles = _build_pubmed_client(priority=INTERACTIVE).find_articles(query, retmax=8)
         except PubmedAPIError as exc:
             error = str(exc)
     # Mark articles that already exist locally
@@ -5098,7 +4958,7 @@ def review_pubmed_select(request, issue_id):
         return HttpResponseBadRequest("No PMID provided.")
 
     try:
-        payloads = _build_pubmed_client().fetch_articles([pmid])
+        payloads = _build_pubmed_client(priority=INTERACTIVE).fetch_articles([pmid])
     except PubmedAPIError as exc:
         return render(
             request,
@@ -5711,7 +5571,7 @@ def publish_issue_bundle(request, issue_id):
                 review.active = True
                 review.save()
 
-        transaction.on_commit(bump_content_cache_version)
+        transaction.on_commit(lambda: invalidate_cache_tags(*PUBLIC_PAGE_CACHE_TAGS))
 
     messages.success(request, "Issue, reviews, and articles are now live.")
     return redirect(f"{reverse('backend:issue_publish')}?issue={issue.pk}")
@@ -6805,6 +6665,7 @@ def inbox_mark_all_read(request):
     if thread_ids:
         InboundEmail.objects.filter(thread_id__in=thread_ids, read=False).update(read=True)
         EmailThread.objects.filter(id__in=thread_ids).update(has_unread=False)
+        invalidate_cache_tags(CACHE_TAG_INBOX)
 
     if request.headers.get("HX-Request") == "true":
         mutable_get = request.GET.copy()
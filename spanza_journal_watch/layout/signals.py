@@ -1,7 +1,7 @@
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from spanza_journal_watch.utils.cache import bump_content_cache_version
+from spanza_journal_watch.utils.cache import CACHE_TAG_LAYOUT, invalidate_cache_tags
 
 from .models import FeatureArticle, Homepage, PageHeader
 
@@ -15,4 +15,4 @@ from .models import FeatureArticle, Homepage, PageHeader
 def invalidate_content_cache_on_layout_change(sender, **kwargs):
     if kwargs.get("raw"):
         return
-    bump_content_cache_version()
+    invalidate_cache_tags(CACHE_TAG_LAYOUT)
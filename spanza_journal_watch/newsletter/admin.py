@@ -20,3 +20,12 @@ class NewsletterAdmin(admin.ModelAdmin):
     date_hierarchy = "send_date"
     autocomplete_fields = ["issue"]
     readonly_fields = ("emails_sent", "email_token", "header_image_processed")
+
+
+@admin.register(models.NewsletterDelivery)
+class NewsletterDeliveryAdmin(admin.ModelAdmin):
+    list_display = ("newsletter", "subscriber", "status", "attempts", "sent_at")
+    list_filter = ("status", "newsletter")
+    search_fields = ("subscriber__email", "message_id")
+    raw_id_fields = ("newsletter", "subscriber")
+    readonly_fields = ("created",)
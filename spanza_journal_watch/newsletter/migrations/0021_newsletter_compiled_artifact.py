@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("newsletter", "0020_subscriber_newsletter_sub_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletter",
+            name="compiled_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="newsletter",
+            name="compiled_txt",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="newsletter",
+            name="compiled_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
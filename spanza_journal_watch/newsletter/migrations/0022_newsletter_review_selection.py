@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("newsletter", "0021_newsletter_compiled_artifact"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletter",
+            name="review_selection",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
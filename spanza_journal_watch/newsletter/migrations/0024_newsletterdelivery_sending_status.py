@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("newsletter", "0023_newsletterdelivery"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="newsletterdelivery",
+            name="status",
+            field=models.CharField(
+                choices=[("pending", "Pending"), ("sending", "Sending"), ("sent", "Sent"), ("failed", "Failed")],
+                default="pending",
+                max_length=16,
+            ),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("newsletter", "0024_newsletterdelivery_sending_status"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newsletterdelivery",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,15 +1,18 @@
 import base64
+import datetime
 import uuid
 from urllib.parse import quote
 
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core import mail
-from django.db import models
+from django.db import models, transaction
 from django.db.models.functions import Upper
 from django.template.loader import render_to_string
 from django.templatetags.static import static
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import conditional_escape
 
 from spanza_journal_watch.analytics.utils import click_tracker
 from spanza_journal_watch.backend.models import SubscriberCSV
@@ -168,6 +171,24 @@ class Subscriber(models.Model):
         return f"Subscriber: {self.email}"
 
 
+# Per-subscriber placeholders rendered into the compiled send artifact. They are
+# plain word characters so neither template autoescaping nor MJML minification
+# alters them, and are stamped with the real values for each recipient.
+PLACEHOLDER_EMAIL = "JWSUBSCRIBEREMAILPLACEHOLDER"
+PLACEHOLDER_UNSUBSCRIBE = "JWSUBSCRIBERUNSUBSCRIBEPLACEHOLDER"
+PLACEHOLDER_TRACKER = "JWSUBSCRIBERTRACKERPLACEHOLDER"
+PLACEHOLDER_PIXEL = "JWSUBSCRIBERPIXELPLACEHOLDER"
+
+
+class _PlaceholderSubscriber:
+    """Stands in for a Subscriber while the newsletter body is compiled."""
+
+    email = PLACEHOLDER_EMAIL
+
+    def get_unsubscribe_link(self, absolute=True):
+        return PLACEHOLDER_UNSUBSCRIBE
+
+
 class Newsletter(models.Model):
     subject = models.CharField(max_length=255)
     content_heading = models.CharField(
@@ -190,6 +211,15 @@ class Newsletter(models.Model):
     email_token = models.CharField(max_length=64, default="", editable=False, unique=True)
     emails_sent = models.PositiveIntegerField(default=0, editable=False)
 
+    # Compiled send artifact: the body rendered (and MJML-compiled) once with
+    # per-subscriber placeholders, stamped for each recipient at send time.
+    compiled_html = models.TextField(blank=True, default="", editable=False)
+    compiled_txt = models.TextField(blank=True, default="", editable=False)
+    compiled_at = models.DateTimeField(blank=True, null=True, editable=False)
+    # Ordered review pks frozen for the send, so every batch and the test send
+    # show the same reviews: {"featured": [...], "non_featured": [...]}.
+    review_selection = models.JSONField(blank=True, default=dict, editable=False)
+
     # Newsletter stats
     def get_stats_absolute_url(self):
         return reverse("backend:newsletter_stats_detail", kwargs={"pk": self.pk})
@@ -206,6 +236,27 @@ class Newsletter(models.Model):
     def get_non_featured_reviews(self, count=None):
         return Review.objects.filter(issues=self.issue, is_featured=False, active=True).order_by("?")[:count]
 
+    def resolve_review_selection(self):
+        """Pick the featured/non-featured reviews and persist them as an ordered snapshot."""
+        self.review_selection = {
+            "featured": list(self.get_featured_reviews().values_list("pk", flat=True)),
+            "non_featured": list(
+                self.get_non_featured_reviews(count=self.non_featured_review_count).values_list("pk", flat=True)
+            ),
+        }
+        Newsletter.objects.filter(pk=self.pk).update(review_selection=self.review_selection)
+        return self.review_selection
+
+    def get_selected_reviews(self, key):
+        if not self.review_selection:
+            self.resolve_review_selection()
+        pks = self.review_selection.get(key, [])
+        # Drop reviews deactivated or taken off the issue since the snapshot was taken.
+        reviews = (
+            Review.objects.filter(issues=self.issue, active=True).select_related("article", "author").in_bulk(pks)
+        )
+        return [reviews[pk] for pk in pks if pk in reviews]
+
     @staticmethod
     def get_domain():
         if settings.DEBUG:
@@ -221,8 +272,8 @@ class Newsletter(models.Model):
 
         context = {
             "newsletter": self,
-            "featured_reviews": self.get_featured_reviews(),
-            "non_featured_reviews": self.get_non_featured_reviews(count=self.non_featured_review_count),
+            "featured_reviews": self.get_selected_reviews("featured"),
+            "non_featured_reviews": self.get_selected_reviews("non_featured"),
             "domain": domain,
             "image_domain": image_domain,
             "email_up_chevron_url": f"{domain}{static('images/email/chevron-up.png')}",
@@ -241,33 +292,64 @@ class Newsletter(models.Model):
         template = "newsletter/email_newsletter.txt"
         return render_to_string(template, context)
 
-    def generate_emails(self, subscribers):
-        emails = []
+    def compile_send_artifact(self):
+        """Render and MJML-compile the body once, leaving subscriber placeholders."""
         context = self.get_email_context()
-        token = self.email_token
+        context["subscriber"] = _PlaceholderSubscriber()
+        context["pixel"] = PLACEHOLDER_PIXEL
+        context["tracker"] = PLACEHOLDER_TRACKER
+
+        self.compiled_html = self.generate_html_content(context)
+        self.compiled_txt = self.generate_txt_content(context)
+        self.compiled_at = timezone.now()
+        Newsletter.objects.filter(pk=self.pk).update(
+            compiled_html=self.compiled_html,
+            compiled_txt=self.compiled_txt,
+            compiled_at=self.compiled_at,
+        )
+
+    def get_subscriber_fields(self, subscriber):
         from spanza_journal_watch.analytics.models import NewsletterClick, NewsletterOpen
 
-        for subscriber in subscribers:
-            context["subscriber"] = subscriber
-            context["pixel"] = NewsletterOpen.render_tracking_pixel(subscriber.email, token)
-            context["tracker"] = NewsletterClick.generate_tracking_link(subscriber.email, token)
-            headers = subscriber.get_list_unsubscribe_headers()
-            email = mail.EmailMultiAlternatives(
-                subject=self.subject,
-                body=self.generate_txt_content(context),
-                from_email=settings.NEWSLETTER_FROM_EMAIL,
-                to=[subscriber.email],
-                headers=headers,
-                reply_to=[settings.NEWSLETTER_REPLY_TO],
-            )
-            email.attach_alternative(self.generate_html_content(context), "text/html")
+        return {
+            PLACEHOLDER_EMAIL: subscriber.email,
+            PLACEHOLDER_UNSUBSCRIBE: subscriber.get_unsubscribe_link(),
+            PLACEHOLDER_TRACKER: NewsletterClick.generate_tracking_link(subscriber.email, self.email_token),
+            PLACEHOLDER_PIXEL: NewsletterOpen.render_tracking_pixel(subscriber.email, self.email_token),
+        }
 
-            # Attach token to identify instigating email for bounces/complaints
-            email.metadata = {"email_token": self.email_token, "type": "newsletter"}
-            email.tags = ["newsletter"]
+    @staticmethod
+    def stamp_content(content, fields, escape=False):
+        """Substitute subscriber placeholders, escaping as the template would have."""
+        for placeholder, value in fields.items():
+            if escape and placeholder != PLACEHOLDER_PIXEL:
+                value = conditional_escape(value)
+            content = content.replace(placeholder, str(value))
+        return content
+
+    def generate_email(self, subscriber):
+        if not self.compiled_at:
+            self.compile_send_artifact()
+
+        fields = self.get_subscriber_fields(subscriber)
+        headers = subscriber.get_list_unsubscribe_headers()
+        email = mail.EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.stamp_content(self.compiled_txt, fields),
+            from_email=settings.NEWSLETTER_FROM_EMAIL,
+            to=[subscriber.email],
+            headers=headers,
+            reply_to=[settings.NEWSLETTER_REPLY_TO],
+        )
+        email.attach_alternative(self.stamp_content(self.compiled_html, fields, escape=True), "text/html")
 
-            emails.append(email)
-        return emails
+        # Attach token to identify instigating email for bounces/complaints
+        email.metadata = {"email_token": self.email_token, "type": "newsletter"}
+        email.tags = ["newsletter"]
+        return email
+
+    def generate_emails(self, subscribers):
+        return [self.generate_email(subscriber) for subscriber in subscribers]
 
     # Send emails
     def is_ready_to_send(self):
@@ -315,6 +397,8 @@ class Newsletter(models.Model):
 
             if content_changed:
                 self.is_test_sent = False
+                self.compiled_at = None
+                self.review_selection = {}
 
         super().save(*args, **kwargs)
 
@@ -324,3 +408,83 @@ class Newsletter(models.Model):
 
     def __str__(self):
         return self.subject
+
+
+class NewsletterDelivery(models.Model):
+    """Per-recipient delivery state, so retries and resends skip delivered mail."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        # Claimed by a batch that is sending it; other batches leave it alone.
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    # How long a claim stays with its batch. A batch takes well under this, so an
+    # older claim belongs to a worker that died mid-batch and is taken back.
+    CLAIM_LEASE = datetime.timedelta(minutes=30)
+
+    newsletter = models.ForeignKey(Newsletter, on_delete=models.CASCADE, related_name="deliveries")
+    subscriber = models.ForeignKey(Subscriber, on_delete=models.CASCADE, related_name="newsletter_deliveries")
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    message_id = models.CharField(max_length=255, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+    sent_at = models.DateTimeField(blank=True, null=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["newsletter", "subscriber"], name="uniq_newsletter_delivery"),
+        ]
+        indexes = [
+            models.Index(fields=["newsletter", "status"], name="newsletter_delivery_status_idx"),
+        ]
+
+    @classmethod
+    def queue_for(cls, newsletter, subscriber_pks):
+        """Create pending rows for any recipients not yet tracked; existing rows are kept."""
+        cls.objects.bulk_create(
+            [cls(newsletter=newsletter, subscriber_id=pk) for pk in subscriber_pks],
+            ignore_conflicts=True,
+            batch_size=1000,
+        )
+
+    @classmethod
+    def claim_pending(cls, newsletter, subscriber_pks):
+        """Mark the recipients' pending rows as sending and return their pks.
+
+        Rows locked or already claimed by an overlapping batch are skipped, so
+        each recipient is sent by exactly one batch. Claims past their lease
+        are taken over.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            claimed = list(
+                cls.objects.select_for_update(skip_locked=True)
+                .filter(newsletter=newsletter, subscriber_id__in=subscriber_pks)
+                .filter(models.Q(status=cls.Status.PENDING) | cls._stale_claims(now))
+                .order_by("pk")
+                .values_list("pk", flat=True)
+            )
+            cls.objects.filter(pk__in=claimed).update(status=cls.Status.SENDING, claimed_at=now)
+        return claimed
+
+    @classmethod
+    def release_stale_claims(cls, newsletter):
+        """Return rows claimed by batches that never finished to pending; returns how many."""
+        return (
+            cls.objects.filter(newsletter=newsletter)
+            .filter(cls._stale_claims(timezone.now()))
+            .update(status=cls.Status.PENDING, claimed_at=None)
+        )
+
+    @classmethod
+    def _stale_claims(cls, now):
+        return models.Q(status=cls.Status.SENDING) & (
+            models.Q(claimed_at__lt=now - cls.CLAIM_LEASE) | models.Q(claimed_at__isnull=True)
+        )
+
+    def __str__(self):
+        return f"{self.newsletter_id} -> {self.subscriber_id}: {self.status}"
@@ -2,14 +2,24 @@ import json
 import logging
 
 from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from spanza_journal_watch.newsletter.models import Newsletter
+from spanza_journal_watch.utils.cache import CACHE_TAG_SUBSCRIBERS, invalidate_cache_tags
 
 from .models import Subscriber
 
 logger = logging.getLogger(__name__)
 
 
+@receiver(post_save, sender=Subscriber)
+@receiver(post_delete, sender=Subscriber)
+def invalidate_subscriber_cache(sender, **kwargs):
+    # Cached "user_is_subscribed" flags in users.context_processors.
+    invalidate_cache_tags(CACHE_TAG_SUBSCRIBERS)
+
+
 def _get_subscribers(email):
     return list(Subscriber.by_email(email))
 
@@ -203,7 +213,6 @@ def get_metadata(event):
 if not settings.DEBUG:  # Anymail only available in production
     try:
         from anymail.signals import tracking  # type: ignore[import-not-found]
-        from django.dispatch import receiver
     except ModuleNotFoundError:
         tracking = None
 
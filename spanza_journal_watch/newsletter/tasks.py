@@ -1,11 +1,16 @@
 import base64
 import logging
+import time
 import uuid
 
+from celery.signals import worker_process_init
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.cache import cache
 from django.core.mail import send_mail
-from django.db.models import F, Q
+from django.db.models import Count, F, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -47,7 +52,81 @@ def send_newsletter_stats(newsletter_pk, subscriber_count, batch_count, recipien
         send_mail(subject, body, None, [email])
 
 
-BATCH_SIZE = 50  # Adjust this batch size as needed
+# Batches are sized to roughly NEWSLETTER_BATCH_SECONDS of sending at the
+# current send rate, within these bounds.
+MIN_BATCH_SIZE = 10
+MAX_BATCH_SIZE = 500
+MIN_SEND_RATE = 1.0
+SEND_RATE_CACHE_KEY = "newsletter:send_rate"
+SEND_RATE_CACHE_TIMEOUT = 60 * 60 * 6
+THROTTLE_RETRY_SECONDS = 30
+
+# One ESP connection per worker process, opened lazily and reused across
+# batches. Only enabled inside a Celery worker; eager/direct calls get a fresh
+# connection per batch.
+_worker_connection = None
+_reuse_worker_connection = False
+
+
+@worker_process_init.connect
+def _enable_worker_connection_reuse(**kwargs):
+    global _reuse_worker_connection
+    _reuse_worker_connection = True
+
+
+def get_worker_connection():
+    global _worker_connection
+    if not _reuse_worker_connection:
+        return mail.get_connection()
+    if _worker_connection is None:
+        _worker_connection = mail.get_connection()
+        _worker_connection.open()
+    return _worker_connection
+
+
+def discard_worker_connection():
+    """Drop the shared connection after an error so the next batch reconnects."""
+    global _worker_connection
+    if _worker_connection is not None:
+        try:
+            _worker_connection.close()
+        except Exception:
+            logger.debug("Error closing newsletter email connection", exc_info=True)
+    _worker_connection = None
+
+
+def is_throttling_error(exc):
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    message = str(exc).lower()
+    return any(marker in message for marker in ("throttl", "too many requests", "maximum sending rate exceeded"))
+
+
+def get_provider_send_rate(connection):
+    """Return the ESP's max send rate (messages/second) where it exposes one."""
+    # Anymail's Amazon SES backend holds an SES v2 client once opened.
+    if hasattr(connection, "client"):
+        try:
+            connection.open()
+            return float(connection.client.get_account()["SendQuota"]["MaxSendRate"])
+        except Exception:
+            logger.warning("Unable to read SES send quota; using NEWSLETTER_SEND_RATE", exc_info=True)
+    return float(settings.NEWSLETTER_SEND_RATE)
+
+
+def get_send_rate():
+    return cache.get(SEND_RATE_CACHE_KEY) or float(settings.NEWSLETTER_SEND_RATE)
+
+
+def record_throttled():
+    rate = max(MIN_SEND_RATE, get_send_rate() / 2)
+    cache.set(SEND_RATE_CACHE_KEY, rate, SEND_RATE_CACHE_TIMEOUT)
+    return rate
+
+
+def get_batch_size(send_rate):
+    size = int(send_rate * settings.NEWSLETTER_BATCH_SECONDS)
+    return max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, size))
 
 
 def _generate_token():
@@ -63,37 +142,99 @@ def get_subscriber_batches(subscriber_pks, batch_size):
         yield subscriber_pks[start : start + batch_size]
 
 
-@celery_app.task()
-def send_newsletter_batch(newsletter_pk, subscriber_pks, test_email):
-    # Get newsletter object
-    from .models import Newsletter, Subscriber
+def _refresh_emails_sent(newsletter_pk):
+    """Set emails_sent to the exact number of delivered recipients in one statement."""
+    from .models import Newsletter, NewsletterDelivery
 
-    newsletter_queryset = Newsletter.objects.filter(pk=newsletter_pk)
-    newsletter = newsletter_queryset.get()
+    delivered = (
+        NewsletterDelivery.objects.filter(newsletter_id=newsletter_pk, status=NewsletterDelivery.Status.SENT)
+        .values("newsletter_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Newsletter.objects.filter(pk=newsletter_pk).update(emails_sent=Coalesce(Subquery(delivered), 0))
 
-    # Get subscribers queryset
-    subscribers = Subscriber.objects.filter(pk__in=subscriber_pks)
 
-    # Send emails for this batch of subscribers
-    connection = mail.get_connection()
-    messages = newsletter.generate_emails(subscribers)
+def _send_test_batch(newsletter, subscribers):
+    connection = get_worker_connection()
     try:
-        successful = connection.send_messages(messages)
+        return connection.send_messages(newsletter.generate_emails(subscribers))
     except Exception:
+        discard_worker_connection()
+        raise
+
+
+@celery_app.task(bind=True, max_retries=5, default_retry_delay=60)
+def send_newsletter_batch(self, newsletter_pk, subscriber_pks, test_email):
+    from .models import Newsletter, NewsletterDelivery, Subscriber
+
+    newsletter = Newsletter.objects.get(pk=newsletter_pk)
+
+    if test_email:
+        _send_test_batch(newsletter, Subscriber.objects.filter(pk__in=subscriber_pks))
+        return
+
+    # Only pending recipients this batch claims are sent: a retried or resumed
+    # batch skips anyone already delivered, and an overlapping batch for the
+    # same recipients (a resend, a retry) skips anyone this one is sending.
+    NewsletterDelivery.queue_for(newsletter, subscriber_pks)
+    claimed = NewsletterDelivery.claim_pending(newsletter, subscriber_pks)
+    sending = NewsletterDelivery.objects.filter(pk__in=claimed, status=NewsletterDelivery.Status.SENDING)
+
+    connection = get_worker_connection()
+    started = time.monotonic()
+    sent = 0
+    try:
+        # Messages are built one at a time as they are sent, not all up front.
+        for delivery in sending.select_related("subscriber").order_by("pk"):
+            message = newsletter.generate_email(delivery.subscriber)
+            try:
+                delivered = connection.send_messages([message])
+            except Exception as exc:
+                NewsletterDelivery.objects.filter(pk=delivery.pk).update(
+                    attempts=F("attempts") + 1, error=str(exc)[:1000]
+                )
+                raise
+            status = getattr(message, "anymail_status", None)
+            NewsletterDelivery.objects.filter(pk=delivery.pk).update(
+                status=NewsletterDelivery.Status.SENT if delivered else NewsletterDelivery.Status.FAILED,
+                attempts=F("attempts") + 1,
+                message_id=(getattr(status, "message_id", None) or "")[:255],
+                sent_at=timezone.now(),
+            )
+            sent += delivered
+    except Exception as exc:
+        discard_worker_connection()
+        # Release the claimed recipients not yet sent for the retry to claim again.
+        sending.update(status=NewsletterDelivery.Status.PENDING)
+        _refresh_emails_sent(newsletter_pk)
+        if is_throttling_error(exc):
+            rate = record_throttled()
+            logger.warning(
+                "Newsletter %s throttled after %d sends; send rate lowered to %.1f/s", newsletter_pk, sent, rate
+            )
+            raise self.retry(exc=exc, countdown=THROTTLE_RETRY_SECONDS)
         logger.exception(
             "Newsletter batch send failed for newsletter %s (%d recipients)",
             newsletter_pk,
             len(subscriber_pks),
         )
-        raise
+        if self.request.retries >= self.max_retries:
+            NewsletterDelivery.objects.filter(pk__in=claimed, status=NewsletterDelivery.Status.PENDING).update(
+                status=NewsletterDelivery.Status.FAILED
+            )
+            raise
+        raise self.retry(exc=exc)
 
-    if not test_email:
-        newsletter_queryset.update(emails_sent=F("emails_sent") + successful)
+    _refresh_emails_sent(newsletter_pk)
+    elapsed = time.monotonic() - started
+    if sent and elapsed:
+        logger.info("Newsletter %s batch sent %d emails at %.1f/s", newsletter_pk, sent, sent / elapsed)
 
 
 @celery_app.task()
 def send_newsletter(newsletter_pk, sender_email=None):
-    from .models import Newsletter, Subscriber
+    from .models import Newsletter, NewsletterDelivery, Subscriber
 
     newsletter = Newsletter.objects.get(pk=newsletter_pk)
 
@@ -116,12 +257,42 @@ def send_newsletter(newsletter_pk, sender_email=None):
             f"Newsletter {newsletter} already sent to {newsletter.emails_sent} recipients; sending aborted"
         )
 
+    # Keep the reviews frozen by the last test send so recipients get what the
+    # testers saw; only pick fresh ones if no snapshot survived a content edit.
+    if not newsletter.review_selection:
+        newsletter.resolve_review_selection()
+
+    # Render and MJML-compile the body once; every batch stamps this artifact
+    # with per-subscriber fields instead of re-rendering per recipient.
+    newsletter.compile_send_artifact()
+
+    # Track every recipient. A resend resumes: recipients already delivered
+    # stay SENT and are skipped, failed ones are retried, new subscribers added.
+    # Rows still SENDING belong to a batch in flight and are left to it, unless
+    # the claim outlived its lease because the worker died mid-batch.
     subscribers = Subscriber.get_valid_subscribers(test_email=False)
-    subscriber_pks = list(subscribers.values_list("pk", flat=True))
+    NewsletterDelivery.queue_for(newsletter, subscribers.values_list("pk", flat=True))
+    released = NewsletterDelivery.release_stale_claims(newsletter)
+    if released:
+        logger.warning("Newsletter %s: %d recipient(s) left claimed by a dead batch requeued", newsletter_pk, released)
+    newsletter.deliveries.filter(status=NewsletterDelivery.Status.FAILED).update(
+        status=NewsletterDelivery.Status.PENDING
+    )
+    subscriber_pks = list(
+        newsletter.deliveries.filter(status=NewsletterDelivery.Status.PENDING)
+        .order_by("pk")
+        .values_list("subscriber_id", flat=True)
+    )
+
+    # Size batches to the provider's send rate and stagger them so the fan-out
+    # as a whole stays within it rather than bursting into throttling.
+    send_rate = min(get_send_rate(), get_provider_send_rate(get_worker_connection()))
+    batch_size = get_batch_size(send_rate)
 
     batch_count = 0
-    for batch_pks in get_subscriber_batches(subscriber_pks, BATCH_SIZE):
-        send_newsletter_batch.delay(newsletter_pk, batch_pks, False)
+    for batch_pks in get_subscriber_batches(subscriber_pks, batch_size):
+        countdown = int(batch_count * batch_size / send_rate)
+        send_newsletter_batch.apply_async((newsletter_pk, batch_pks, False), countdown=countdown)
         batch_count += 1
 
     send_newsletter_stats.delay(newsletter_pk, len(subscriber_pks), batch_count, sender_email)
@@ -136,6 +307,10 @@ def send_newsletter_test_email(newsletter_pk, recipient_email):
 
     # Create a lightweight in-memory subscriber instance for rendering templates
     subscriber = Subscriber(email=recipient_email, unsubscribe_token=_generate_token())
+    # Always re-pick and recompile so the test send reflects the current issue;
+    # the final send reuses this review selection.
+    newsletter.resolve_review_selection()
+    newsletter.compile_send_artifact()
     connection = mail.get_connection()
     messages = newsletter.generate_emails([subscriber])
     successful = connection.send_messages(messages)
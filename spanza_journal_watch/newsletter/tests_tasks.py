@@ -7,17 +7,22 @@ Covers:
 3. send_newsletter_stats — sends stats email to sender (or all staff as fallback)
 4. send_newsletter — orchestration, validation guards, batching
 5. get_subscriber_batches — batch slicing helper
+6. compiled send artifact — body rendered once, stamped per subscriber
+7. review selection — frozen, ordered snapshot shared by test and final sends
+8. delivery tracking — per-recipient state, resumable sends, adaptive batching
 """
 
-from unittest.mock import patch
+import datetime
+from unittest.mock import MagicMock, patch
 
 import pytest
 from django.contrib.auth import get_user_model
 from django.core import mail
 from django.utils import timezone
 
-from spanza_journal_watch.newsletter.models import Newsletter, Subscriber
-from spanza_journal_watch.submissions.models import Issue
+from spanza_journal_watch.backend.models import PubmedArticle
+from spanza_journal_watch.newsletter.models import Newsletter, NewsletterDelivery, Subscriber
+from spanza_journal_watch.submissions.models import Issue, Review
 
 User = get_user_model()
 pytestmark = pytest.mark.django_db
@@ -258,3 +263,324 @@ class TestGetSubscriberBatches:
 
         batches = list(get_subscriber_batches([], batch_size=10))
         assert len(batches) == 0
+
+
+# ---------------------------------------------------------------------------
+# 6. Compiled send artifact
+# ---------------------------------------------------------------------------
+
+
+class TestCompiledSendArtifact:
+    def _patch_render(self):
+        from spanza_journal_watch.newsletter import models as newsletter_models
+
+        html = (
+            f'<a href="{newsletter_models.PLACEHOLDER_TRACKER}/review/">Read</a>'
+            f'<a href="{newsletter_models.PLACEHOLDER_UNSUBSCRIBE}">Unsubscribe</a>'
+            f"{newsletter_models.PLACEHOLDER_PIXEL}"
+        )
+        txt = f"Sent to {newsletter_models.PLACEHOLDER_EMAIL}"
+        return (
+            patch.object(Newsletter, "generate_html_content", return_value=html),
+            patch.object(Newsletter, "generate_txt_content", return_value=txt),
+        )
+
+    def test_batch_renders_body_once(self, newsletter):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter_batch
+
+        subscribers = [Subscriber.objects.create(email=f"artifact-{i}@example.com") for i in range(3)]
+        html_patch, txt_patch = self._patch_render()
+        with html_patch as mock_html, txt_patch as mock_txt:
+            send_newsletter_batch(newsletter.pk, [s.pk for s in subscribers], test_email=True)
+
+        assert mock_html.call_count == 1
+        assert mock_txt.call_count == 1
+        assert len(mail.outbox) == 3
+
+    def test_stamps_subscriber_fields(self, newsletter, subscriber):
+        html_patch, txt_patch = self._patch_render()
+        with html_patch, txt_patch:
+            (message,) = newsletter.generate_emails([subscriber])
+
+        html = message.alternatives[0][0]
+        assert message.body == "Sent to task-sub@example.com"
+        assert subscriber.get_unsubscribe_link() in html
+        assert "email=task-sub@example.com&next=" in html
+        assert "PLACEHOLDER" not in html
+
+    def test_content_change_discards_artifact(self, newsletter):
+        html_patch, txt_patch = self._patch_render()
+        with html_patch, txt_patch:
+            newsletter.compile_send_artifact()
+
+        newsletter.subject = "Changed subject"
+        newsletter.save()
+        newsletter.refresh_from_db()
+        assert newsletter.compiled_at is None
+
+    @patch("spanza_journal_watch.newsletter.tasks.send_newsletter_batch")
+    @patch("spanza_journal_watch.newsletter.tasks.send_newsletter_stats")
+    def test_send_newsletter_compiles_before_dispatch(self, mock_stats, mock_batch, newsletter):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter
+
+        newsletter.is_test_sent = True
+        newsletter.ready_to_send = True
+        newsletter.save(update_fields=["is_test_sent", "ready_to_send"])
+
+        html_patch, txt_patch = self._patch_render()
+        with html_patch, txt_patch:
+            send_newsletter(newsletter.pk)
+
+        newsletter.refresh_from_db()
+        assert newsletter.compiled_at is not None
+        assert newsletter.compiled_html
+
+
+# ---------------------------------------------------------------------------
+# 7. Review selection snapshot
+# ---------------------------------------------------------------------------
+
+
+class TestReviewSelection:
+    @pytest.fixture()
+    def issue_reviews(self, newsletter_issue):
+        reviews = []
+        for i in range(4):
+            article = PubmedArticle.objects.create(title=f"Selection article {i}", active=True)
+            review = Review.objects.create(article=article, body="Body", active=True, is_featured=i == 0)
+            newsletter_issue.reviews.add(review)
+            reviews.append(review)
+        return reviews
+
+    def test_resolve_persists_ordered_snapshot(self, newsletter, issue_reviews):
+        newsletter.non_featured_review_count = 2
+        newsletter.save()
+
+        selection = newsletter.resolve_review_selection()
+
+        newsletter.refresh_from_db()
+        assert newsletter.review_selection == selection
+        assert selection["featured"] == [issue_reviews[0].pk]
+        assert len(selection["non_featured"]) == 2
+
+    def test_selected_reviews_follow_snapshot_order(self, newsletter, issue_reviews):
+        newsletter.review_selection = {"featured": [], "non_featured": [issue_reviews[3].pk, issue_reviews[1].pk]}
+
+        reviews = newsletter.get_selected_reviews("non_featured")
+
+        assert reviews == [issue_reviews[3], issue_reviews[1]]
+
+    def test_selected_reviews_skip_reviews_withdrawn_since_snapshot(self, newsletter, newsletter_issue, issue_reviews):
+        newsletter.review_selection = {
+            "featured": [],
+            "non_featured": [issue_reviews[1].pk, issue_reviews[2].pk, issue_reviews[3].pk],
+        }
+        Review.objects.filter(pk=issue_reviews[1].pk).update(active=False)
+        newsletter_issue.reviews.remove(issue_reviews[3])
+
+        reviews = newsletter.get_selected_reviews("non_featured")
+
+        assert reviews == [issue_reviews[2]]
+
+    @patch("spanza_journal_watch.newsletter.tasks.send_newsletter_batch")
+    @patch("spanza_journal_watch.newsletter.tasks.send_newsletter_stats")
+    def test_final_send_reuses_test_send_selection(self, mock_stats, mock_batch, newsletter, issue_reviews):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter
+
+        snapshot = {"featured": [issue_reviews[0].pk], "non_featured": [issue_reviews[2].pk]}
+        Newsletter.objects.filter(pk=newsletter.pk).update(
+            review_selection=snapshot, is_test_sent=True, ready_to_send=True
+        )
+
+        with (
+            patch.object(Newsletter, "generate_html_content", return_value=""),
+            patch.object(Newsletter, "generate_txt_content", return_value=""),
+        ):
+            send_newsletter(newsletter.pk)
+
+        newsletter.refresh_from_db()
+        assert newsletter.review_selection == snapshot
+
+    def test_content_change_clears_selection(self, newsletter, issue_reviews):
+        newsletter.resolve_review_selection()
+
+        newsletter.non_featured_review_count = 1
+        newsletter.save()
+        newsletter.refresh_from_db()
+
+        assert newsletter.review_selection == {}
+
+
+# ---------------------------------------------------------------------------
+# 8. Delivery tracking
+# ---------------------------------------------------------------------------
+
+
+class TestNewsletterDelivery:
+    @pytest.fixture(autouse=True)
+    def _bypass_render(self):
+        with (
+            patch.object(Newsletter, "generate_html_content", return_value="<html></html>"),
+            patch.object(Newsletter, "generate_txt_content", return_value="Newsletter"),
+        ):
+            yield
+
+    def test_batch_records_delivery_and_exact_count(self, newsletter, subscriber):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter_batch
+
+        send_newsletter_batch(newsletter.pk, [subscriber.pk], test_email=False)
+        send_newsletter_batch(newsletter.pk, [subscriber.pk], test_email=False)
+
+        delivery = NewsletterDelivery.objects.get(newsletter=newsletter, subscriber=subscriber)
+        newsletter.refresh_from_db()
+        assert delivery.status == NewsletterDelivery.Status.SENT
+        assert len(mail.outbox) == 1
+        assert newsletter.emails_sent == 1
+
+    def test_failed_batch_leaves_unsent_recipients_pending(self, newsletter):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter_batch
+
+        subscribers = [Subscriber.objects.create(email=f"partial-{i}@example.com") for i in range(3)]
+        connection = MagicMock()
+        connection.send_messages.side_effect = [1, RuntimeError("SMTP down"), 1]
+
+        with patch("spanza_journal_watch.newsletter.tasks.mail.get_connection", return_value=connection):
+            with pytest.raises(RuntimeError):
+                send_newsletter_batch(newsletter.pk, [s.pk for s in subscribers], test_email=False)
+
+        statuses = dict(
+            NewsletterDelivery.objects.filter(newsletter=newsletter).values_list("subscriber_id", "status")
+        )
+        assert statuses[subscribers[0].pk] == NewsletterDelivery.Status.SENT
+        assert statuses[subscribers[1].pk] == NewsletterDelivery.Status.PENDING
+        assert statuses[subscribers[2].pk] == NewsletterDelivery.Status.PENDING
+        newsletter.refresh_from_db()
+        assert newsletter.emails_sent == 1
+
+    def test_overlapping_batches_send_each_recipient_once(self, newsletter):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter_batch
+
+        subscribers = [Subscriber.objects.create(email=f"overlap-{i}@example.com") for i in range(3)]
+        subscriber_pks = [s.pk for s in subscribers]
+        sent_to = []
+
+        def send_messages(messages):
+            if not sent_to:
+                # A second batch for the same recipients starts while the first is mid-send.
+                send_newsletter_batch(newsletter.pk, subscriber_pks, test_email=False)
+            sent_to.extend(address for message in messages for address in message.to)
+            return len(messages)
+
+        connection = MagicMock()
+        connection.send_messages.side_effect = send_messages
+
+        with patch("spanza_journal_watch.newsletter.tasks.mail.get_connection", return_value=connection):
+            send_newsletter_batch(newsletter.pk, subscriber_pks, test_email=False)
+
+        assert sorted(sent_to) == sorted(s.email for s in subscribers)
+        statuses = set(NewsletterDelivery.objects.filter(newsletter=newsletter).values_list("status", flat=True))
+        assert statuses == {NewsletterDelivery.Status.SENT}
+
+    def test_throttling_lowers_send_rate(self, newsletter, subscriber, settings):
+        from spanza_journal_watch.newsletter.tasks import get_send_rate, send_newsletter_batch
+
+        settings.NEWSLETTER_SEND_RATE = 10.0
+        connection = MagicMock()
+        connection.send_messages.side_effect = RuntimeError("Throttling: Maximum sending rate exceeded.")
+
+        with patch("spanza_journal_watch.newsletter.tasks.mail.get_connection", return_value=connection):
+            with pytest.raises(RuntimeError):
+                send_newsletter_batch(newsletter.pk, [subscriber.pk], test_email=False)
+
+        assert get_send_rate() == 5.0
+
+    @patch("spanza_journal_watch.newsletter.tasks.send_newsletter_stats")
+    @patch("spanza_journal_watch.newsletter.tasks.send_newsletter_batch")
+    def test_resend_dispatches_only_undelivered(self, mock_batch, mock_stats, newsletter):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter
+
+        delivered = Subscriber.objects.create(email="delivered@example.com")
+        failed = Subscriber.objects.create(email="failed@example.com")
+        fresh = Subscriber.objects.create(email="fresh@example.com")
+        NewsletterDelivery.objects.create(
+            newsletter=newsletter, subscriber=delivered, status=NewsletterDelivery.Status.SENT
+        )
+        NewsletterDelivery.objects.create(
+            newsletter=newsletter, subscriber=failed, status=NewsletterDelivery.Status.FAILED
+        )
+        Newsletter.objects.filter(pk=newsletter.pk).update(
+            is_test_sent=True, ready_to_send=True, is_sent=True, resend_enabled=True
+        )
+
+        send_newsletter(newsletter.pk)
+
+        dispatched = [pk for call in mock_batch.apply_async.call_args_list for pk in call.args[0][1]]
+        assert sorted(dispatched) == sorted([failed.pk, fresh.pk])
+
+    @patch("spanza_journal_watch.newsletter.tasks.send_newsletter_stats")
+    @patch("spanza_journal_watch.newsletter.tasks.send_newsletter_batch")
+    def test_resend_requeues_claims_of_dead_batches(self, mock_batch, mock_stats, newsletter):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter
+
+        orphaned = Subscriber.objects.create(email="orphaned@example.com")
+        in_flight = Subscriber.objects.create(email="in-flight@example.com")
+        # A worker killed mid-batch left this claim behind; the other batch is still sending.
+        NewsletterDelivery.objects.create(
+            newsletter=newsletter,
+            subscriber=orphaned,
+            status=NewsletterDelivery.Status.SENDING,
+            claimed_at=timezone.now() - NewsletterDelivery.CLAIM_LEASE - datetime.timedelta(minutes=1),
+        )
+        NewsletterDelivery.objects.create(
+            newsletter=newsletter,
+            subscriber=in_flight,
+            status=NewsletterDelivery.Status.SENDING,
+            claimed_at=timezone.now(),
+        )
+        Newsletter.objects.filter(pk=newsletter.pk).update(
+            is_test_sent=True, ready_to_send=True, is_sent=True, resend_enabled=True
+        )
+
+        send_newsletter(newsletter.pk)
+
+        dispatched = [pk for call in mock_batch.apply_async.call_args_list for pk in call.args[0][1]]
+        assert orphaned.pk in dispatched
+        assert in_flight.pk not in dispatched
+
+    def test_batch_takes_over_expired_claim(self, newsletter):
+        from spanza_journal_watch.newsletter.tasks import send_newsletter_batch
+
+        orphaned = Subscriber.objects.create(email="orphaned@example.com")
+        in_flight = Subscriber.objects.create(email="in-flight@example.com")
+        NewsletterDelivery.objects.create(
+            newsletter=newsletter,
+            subscriber=orphaned,
+            status=NewsletterDelivery.Status.SENDING,
+            claimed_at=timezone.now() - NewsletterDelivery.CLAIM_LEASE - datetime.timedelta(minutes=1),
+        )
+        NewsletterDelivery.objects.create(
+            newsletter=newsletter,
+            subscriber=in_flight,
+            status=NewsletterDelivery.Status.SENDING,
+            claimed_at=timezone.now(),
+        )
+
+        # The retried batch of the dead worker re-sends only the recipient whose claim expired.
+        send_newsletter_batch(newsletter.pk, [orphaned.pk, in_flight.pk], test_email=False)
+
+        assert [message.to for message in mail.outbox] == [["orphaned@example.com"]]
+        statuses = dict(
+            NewsletterDelivery.objects.filter(newsletter=newsletter).values_list("subscriber_id", "status")
+        )
+        assert statuses == {
+            orphaned.pk: NewsletterDelivery.Status.SENT,
+            in_flight.pk: NewsletterDelivery.Status.SENDING,
+        }
+
+    def test_batch_size_follows_send_rate(self, settings):
+        from spanza_journal_watch.newsletter.tasks import MAX_BATCH_SIZE, MIN_BATCH_SIZE, get_batch_size
+
+        settings.NEWSLETTER_BATCH_SECONDS = 10
+        assert get_batch_size(14.0) == 140
+        assert get_batch_size(0.1) == MIN_BATCH_SIZE
+        assert get_batch_size(1000.0) == MAX_BATCH_SIZE
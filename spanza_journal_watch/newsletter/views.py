@@ -8,6 +8,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
 from spanza_journal_watch.analytics.models import AnalyticsEvent
+from spanza_journal_watch.utils.cache import CACHE_TAG_SUBSCRIBERS, invalidate_cache_tags
 
 from .cookies import JW_SUB_COOKIE_NAME, set_subscribed_cookie
 from .forms import SubscriberForm
@@ -44,6 +45,7 @@ def _sync_exact_email_subscription_state(email, subscribed):
     subscribers = Subscriber.by_email(email)
     if subscribers.exists():
         subscribers.update(subscribed=subscribed, modified=timezone.now())
+        invalidate_cache_tags(CACHE_TAG_SUBSCRIBERS)
     return subscribers
 
 
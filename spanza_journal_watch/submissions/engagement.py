@@ -0,0 +1,109 @@
+"""Engagement-based tag scores for the sidebar and Explore page.
+
+Human AnalyticsEvent rows on active reviews (opens, engaged views, full-text
+clicks, shares) are folded a day at a time into ``TagEngagementDaily``, one row
+per curated tag. ``rebuild_day`` in analytics.rollups calls
+``rebuild_tag_engagement_day`` for every day it re-aggregates, so the table
+follows the same ingestion watermark and bot-downgrade sweeps as the analytics
+rollup. Scores over the trailing window are a SUM over those rows, refreshed
+into the cache by the rollup task rather than by page requests.
+
+A review's tags are read when its day is rolled up; retagging only affects
+days rebuilt afterwards.
+"""
+
+import datetime
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from spanza_journal_watch.analytics.models import AnalyticsEvent
+
+from .models import Review, Tag, TagEngagementDaily
+
+SHARE_EVENT_TYPES = [
+    AnalyticsEvent.EventType.REVIEW_SHARE_COPY_LINK,
+    AnalyticsEvent.EventType.REVIEW_SHARE_EMAIL,
+    AnalyticsEvent.EventType.REVIEW_SHARE_NATIVE,
+    AnalyticsEvent.EventType.REVIEW_SHARE_BLUESKY,
+    AnalyticsEvent.EventType.REVIEW_SHARE_X,
+    AnalyticsEvent.EventType.REVIEW_SHARE_FACEBOOK,
+]
+ENGAGEMENT_MEASURES = ("opens", "engaged", "full_text", "shares", "score")
+ENGAGEMENT_WINDOW_DAYS = 90
+
+CACHE_KEY = "tag_engagement_scores"
+# Refreshed by every analytics rollup run; the timeout only bounds staleness if the task stops.
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def rebuild_tag_engagement_day(day):
+    """Replace the TagEngagementDaily rows for ``day`` with a fresh aggregate of its events."""
+    qn = connection.ops.quote_name
+    start_ts = timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+    end_ts = timezone.make_aware(datetime.datetime.combine(day, datetime.time.max))
+    params = {
+        "day": day,
+        "start_ts": start_ts,
+        "end_ts": end_ts,
+        "review_type_id": ContentType.objects.get_for_model(Review).pk,
+        "open": AnalyticsEvent.EventType.REVIEW_OPEN,
+        "engaged": AnalyticsEvent.EventType.REVIEW_ENGAGED,
+        "full_text": AnalyticsEvent.EventType.REVIEW_FULL_TEXT_CLICK,
+        "shares": [str(event_type) for event_type in SHARE_EVENT_TYPES],
+    }
+    with transaction.atomic():
+        TagEngagementDaily.objects.filter(date=day).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {qn(TagEngagementDaily._meta.db_table)}
+                    (date, tag_id, opens, engaged, full_text, shares, score)
+                SELECT
+                    %(day)s, link.tag_id,
+                    SUM(events.opens), SUM(events.engaged), SUM(events.full_text), SUM(events.shares),
+                    SUM(events.opens + 3 * events.engaged + 4 * events.full_text + 5 * events.shares)
+                FROM (
+                    SELECT
+                        object_id,
+                        COUNT(*) FILTER (WHERE event_type = %(open)s) AS opens,
+                        COUNT(*) FILTER (WHERE event_type = %(engaged)s) AS engaged,
+                        COUNT(*) FILTER (WHERE event_type = %(full_text)s) AS full_text,
+                        COUNT(*) FILTER (WHERE event_type = ANY(%(shares)s)) AS shares
+                    FROM {qn(AnalyticsEvent._meta.db_table)}
+                    WHERE content_type_id = %(review_type_id)s
+                        AND object_id IS NOT NULL
+                        AND NOT automated
+                        AND timestamp >= %(start_ts)s AND timestamp <= %(end_ts)s
+                    GROUP BY object_id
+                ) events
+                JOIN {qn(Review._meta.db_table)} review ON review.id = events.object_id AND review.active
+                JOIN {qn(Tag.articles.through._meta.db_table)} link ON link.pubmedarticle_id = review.article_id
+                JOIN {qn(Tag._meta.db_table)} tag ON tag.id = link.tag_id AND tag.curated AND tag.active
+                GROUP BY link.tag_id
+                """,
+                params,
+            )
+            return cursor.rowcount
+
+
+def tag_scores(days=ENGAGEMENT_WINDOW_DAYS):
+    """Sum the daily rows of the last ``days`` days into ``{tag_id: {measure: total}}``."""
+    since = timezone.localdate() - datetime.timedelta(days=days)
+    rows = (
+        TagEngagementDaily.objects.filter(date__gte=since)
+        .values("tag_id")
+        .annotate(**{measure: Sum(measure) for measure in ENGAGEMENT_MEASURES})
+        .order_by()
+    )
+    return {row["tag_id"]: {measure: row[measure] for measure in ENGAGEMENT_MEASURES} for row in rows}
+
+
+def refresh_tag_scores():
+    """Recompute the cached window scores. Returns them."""
+    scores = tag_scores()
+    cache.set(CACHE_KEY, scores, CACHE_TIMEOUT)
+    return scores
@@ -0,0 +1,57 @@
+"""
+Store the pre-rendered HTML, plain text, excerpts and reading time on reviews.
+
+Usage:
+    # Render reviews that have no stored rendering yet
+    python manage.py backfill_review_rendering
+
+    # Re-render every review (e.g. after changing the Markdown or bleach config)
+    python manage.py backfill_review_rendering --all
+"""
+
+from django.core.management.base import BaseCommand
+
+from spanza_journal_watch.submissions.models import Review
+from spanza_journal_watch.utils.cache import CACHE_TAG_REVIEWS, invalidate_cache_tags
+
+
+class Command(BaseCommand):
+    help = "Pre-render review bodies into the stored HTML/text/excerpt columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            default=False,
+            help="Re-render every review, not only those without a stored rendering.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of reviews to update per query (default 200).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Review.objects.only("id", "body", *Review.RENDERED_BODY_FIELDS)
+        if not options["all"]:
+            queryset = queryset.filter(body_html="")
+
+        updated = 0
+        pending = []
+        for review in queryset.order_by("pk").iterator(chunk_size=batch_size):
+            review.render_body_fields()
+            pending.append(review)
+            if len(pending) >= batch_size:
+                Review.objects.bulk_update(pending, Review.RENDERED_BODY_FIELDS)
+                updated += len(pending)
+                pending = []
+        if pending:
+            Review.objects.bulk_update(pending, Review.RENDERED_BODY_FIELDS)
+            updated += len(pending)
+
+        if updated:
+            # bulk_update skips post_save, so invalidate cached pages ourselves.
+            invalidate_cache_tags(CACHE_TAG_REVIEWS)
+        self.stdout.write(self.style.SUCCESS(f"Rendered {updated} reviews."))
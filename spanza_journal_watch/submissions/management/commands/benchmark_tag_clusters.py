@@ -0,0 +1,100 @@
+"""
+Compare the SQL and Python tag similarity engines on a synthetic tag set.
+
+Usage:
+    # Default sizes: 200, 1000 and 3000 curated tags
+    python manage.py benchmark_tag_clusters
+
+    # Custom sizes
+    python manage.py benchmark_tag_clusters --sizes 500 5000
+
+Tags, articles and tag links are inserted inside a transaction that is rolled
+back afterwards, so the command leaves the database unchanged. It needs
+Postgres for the SQL engine.
+"""
+
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from spanza_journal_watch.backend.models import PubmedArticle
+from spanza_journal_watch.submissions.models import Tag
+from spanza_journal_watch.submissions.tag_clusters import SIMILARITY_THRESHOLD, compute_tag_clusters
+
+ARTICLES_PER_TAG = 20
+TAGS_PER_TOPIC = 6
+
+
+class Command(BaseCommand):
+    help = "Benchmark SQL vs Python tag co-occurrence clustering."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[200, 1000, 3000],
+            help="Curated tag counts to benchmark.",
+        )
+        parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD, help="Similarity threshold (0-1)")
+        parser.add_argument("--seed", type=int, default=1, help="Random seed for the synthetic tagging.")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The SQL engine needs Postgres.")
+
+        self.stdout.write(
+            f"{'tags':>7} {'links':>9} {'pairs':>8} {'clusters':>9} {'sql (s)':>9} {'python (s)':>11} {'speed-up':>9}"
+        )
+        for size in options["sizes"]:
+            with transaction.atomic():
+                # Existing curated tags would skew the comparison; hide them for this run.
+                Tag.objects.filter(curated=True).update(curated=False)
+                self._benchmark(size, options["threshold"], random.Random(options["seed"]))
+                transaction.set_rollback(True)
+        self.stdout.write(self.style.SUCCESS("Done; synthetic tags rolled back."))
+
+    def _benchmark(self, size, threshold, rng):
+        tags = Tag.objects.bulk_create(
+            Tag(text=f"benchmark tag {index}", slug=f"benchmark-tag-{index}", curated=True) for index in range(size)
+        )
+        articles = PubmedArticle.objects.bulk_create(
+            (PubmedArticle(title=f"Benchmark article {index}") for index in range(size * ARTICLES_PER_TAG)),
+            batch_size=5000,
+        )
+        links = self._links([tag.pk for tag in tags], [article.pk for article in articles], rng)
+        TagArticle = Tag.articles.through
+        TagArticle.objects.bulk_create(
+            (TagArticle(tag_id=tag_id, pubmedarticle_id=article_id) for tag_id, article_id in links),
+            batch_size=5000,
+        )
+
+        timings = {}
+        results = {}
+        for engine in ("sql", "python"):
+            started = time.perf_counter()
+            _, pairs, clusters = compute_tag_clusters(threshold, engine=engine, store=False)
+            timings[engine] = time.perf_counter() - started
+            results[engine] = (pairs.keys(), clusters)
+        if results["sql"] != results["python"]:
+            self.stderr.write(f"Engines disagree at {size} tags.")
+
+        pairs, clusters = results["sql"]
+        self.stdout.write(
+            f"{size:>7,} {len(links):>9,} {len(pairs):>8,} {len(clusters):>9,} {timings['sql']:>9.2f} "
+            f"{timings['python']:>11.2f} {timings['python'] / max(timings['sql'], 1e-9):>8.1f}x"
+        )
+
+    def _links(self, tag_ids, article_ids, rng):
+        """Tag each article with a few tags from one topic, plus the odd tag from anywhere."""
+        topics = [tag_ids[start : start + TAGS_PER_TOPIC] for start in range(0, len(tag_ids), TAGS_PER_TOPIC)]
+        links = set()
+        for article_id in article_ids:
+            topic = rng.choice(topics)
+            for tag_id in rng.sample(topic, min(len(topic), rng.randint(1, 3))):
+                links.add((tag_id, article_id))
+            if rng.random() < 0.3:
+                links.add((rng.choice(tag_ids), article_id))
+        return links
@@ -1,22 +1,24 @@
 """
 Compute tag co-occurrence clusters from article tagging data.
 
-Builds an adjacency graph of curated tags based on how often they appear
-together on articles, then identifies connected components as clusters.
-Results are stored in cache for use on the Explore page.
-"""
+Builds a graph of curated tags that often appear together on articles and
+caches its connected components as clusters for the Explore page. See
+submissions.tag_clusters for the similarity measure.
+
+Usage:
+    python manage.py compute_tag_clusters
 
-from collections import defaultdict
-from itertools import combinations
+    # Print clusters and pair similarities without caching
+    python manage.py compute_tag_clusters --dry-run
+
+    # Re-score only pairs involving tags whose articles changed
+    python manage.py compute_tag_clusters --tags 12 40
+"""
 
-from django.core.cache import cache
 from django.core.management.base import BaseCommand
 
 from spanza_journal_watch.submissions.models import Tag
-
-CACHE_KEY = "tag_clusters"
-CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
-SIMILARITY_THRESHOLD = 0.6
+from spanza_journal_watch.submissions.tag_clusters import SIMILARITY_THRESHOLD, compute_tag_clusters
 
 
 class Command(BaseCommand):
@@ -25,74 +27,47 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD, help="Similarity threshold (0-1)")
         parser.add_argument("--dry-run", action="store_true", help="Print clusters without caching")
+        parser.add_argument(
+            "--tags",
+            nargs="+",
+            type=int,
+            default=None,
+            help="Only re-score pairs involving these tag IDs, reusing the cached similarities for the rest.",
+        )
+        parser.add_argument("--engine", choices=["sql", "python"], default=None, help="Similarity engine")
 
     def handle(self, *args, **options):
         threshold = options["threshold"]
         dry_run = options["dry_run"]
 
-        # Fetch curated tags and their article sets
-        tags = Tag.objects.filter(active=True, curated=True)
-        tag_articles = {}
-        for tag in tags:
-            article_ids = set(tag.articles.values_list("id", flat=True))
-            if article_ids:
-                tag_articles[tag.id] = article_ids
-
-        self.stdout.write(f"Found {len(tag_articles)} curated tags with articles.")
-
-        # Compute pairwise similarity (overlap / min size)
-        adjacency = defaultdict(set)
-        pair_count = 0
-        for (a_id, a_articles), (b_id, b_articles) in combinations(tag_articles.items(), 2):
-            overlap = len(a_articles & b_articles)
-            if overlap == 0:
-                continue
-            min_size = min(len(a_articles), len(b_articles))
-            similarity = overlap / min_size
-            if similarity >= threshold:
-                adjacency[a_id].add(b_id)
-                adjacency[b_id].add(a_id)
-                pair_count += 1
-
-        self.stdout.write(f"Found {pair_count} tag pairs above threshold {threshold}.")
-
-        # Find connected components via BFS
-        visited = set()
-        clusters = []
-        for tag_id in tag_articles:
-            if tag_id in visited:
-                continue
-            component = set()
-            queue = [tag_id]
-            while queue:
-                current = queue.pop()
-                if current in visited:
-                    continue
-                visited.add(current)
-                component.add(current)
-                queue.extend(adjacency.get(current, set()) - visited)
-            if len(component) > 1:
-                clusters.append(sorted(component))
-
-        # Sort clusters by size descending
-        clusters.sort(key=len, reverse=True)
+        tag_sizes, pairs, clusters = compute_tag_clusters(
+            threshold, changed_tag_ids=options["tags"], engine=options["engine"], store=not dry_run
+        )
+        self.stdout.write(f"Found {len(tag_sizes)} curated tags with articles.")
+        self.stdout.write(f"Found {len(pairs)} tag pairs above threshold {threshold}.")
 
-        # Print results
-        tag_names = {t.id: t.text for t in tags}
+        tag_names = dict(Tag.objects.filter(pk__in=tag_sizes).values_list("id", "text"))
         self.stdout.write(f"\n{len(clusters)} clusters found:\n")
         for i, cluster in enumerate(clusters, 1):
             names = [tag_names.get(tid, str(tid)) for tid in cluster]
             self.stdout.write(f"  Cluster {i} ({len(cluster)} tags): {', '.join(names)}")
+            members = set(cluster)
+            cluster_pairs = sorted(
+                ((pair, score) for pair, score in pairs.items() if pair[0] in members),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            for (tag_a, tag_b), score in cluster_pairs:
+                self.stdout.write(f"      {score:.2f}  {tag_names.get(tag_a, tag_a)} ~ {tag_names.get(tag_b, tag_b)}")
 
         # Singletons
         clustered_ids = {tid for c in clusters for tid in c}
-        singletons = [tid for tid in tag_articles if tid not in clustered_ids]
+        singletons = [tid for tid in tag_sizes if tid not in clustered_ids]
         if singletons:
             names = [tag_names.get(tid, str(tid)) for tid in singletons]
             self.stdout.write(f"\n  Unclustered ({len(singletons)}): {', '.join(names)}")
 
         if not dry_run:
-            cache.set(CACHE_KEY, clusters, CACHE_TIMEOUT)
             self.stdout.write(self.style.SUCCESS(f"\nCached {len(clusters)} clusters."))
         else:
             self.stdout.write("\nDry run — not cached.")
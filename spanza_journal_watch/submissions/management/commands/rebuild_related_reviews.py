@@ -0,0 +1,27 @@
+"""
+Rebuild the precomputed related reviews for every PubMed article.
+
+The RelatedReview migration fills the table and signals keep it current as
+reviews and tags change; run this after bulk imports that bypass signals or
+after changing the ranking in submissions.related.
+
+Usage:
+    python manage.py rebuild_related_reviews
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from spanza_journal_watch.submissions.models import RelatedReview
+from spanza_journal_watch.submissions.related import rebuild_related_reviews
+from spanza_journal_watch.utils.cache import CACHE_TAG_ARTICLES, CACHE_TAG_REVIEWS, invalidate_cache_tags
+
+
+class Command(BaseCommand):
+    help = "Recompute the related reviews shown alongside articles and reviews."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_related_reviews()
+        invalidate_cache_tags(CACHE_TAG_ARTICLES, CACHE_TAG_REVIEWS)
+        self.stdout.write(self.style.SUCCESS(f"Stored {RelatedReview.objects.count()} related reviews."))
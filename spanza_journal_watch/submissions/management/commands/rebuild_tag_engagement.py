@@ -0,0 +1,41 @@
+"""
+Rebuild the per-tag daily engagement rows behind the tag scores.
+
+The TagEngagementDaily migration backfills the scoring window and the
+analytics rollup task keeps recent days current; run this after retagging
+reviews to recompute the whole window from the raw analytics events.
+
+Usage:
+    python manage.py rebuild_tag_engagement [--days 90]
+"""
+
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from spanza_journal_watch.submissions.engagement import (
+    ENGAGEMENT_WINDOW_DAYS,
+    rebuild_tag_engagement_day,
+    refresh_tag_scores,
+)
+
+
+class Command(BaseCommand):
+    help = "Recompute TagEngagementDaily for recent days and refresh the cached tag scores."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=ENGAGEMENT_WINDOW_DAYS,
+            help=f"Number of days back from today to rebuild (default {ENGAGEMENT_WINDOW_DAYS}).",
+        )
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        rows = 0
+        for offset in range(options["days"], -1, -1):
+            rows += rebuild_tag_engagement_day(today - datetime.timedelta(days=offset))
+        scores = refresh_tag_scores()
+        self.stdout.write(self.style.SUCCESS(f"Stored {rows} tag engagement rows; {len(scores)} tags scored."))
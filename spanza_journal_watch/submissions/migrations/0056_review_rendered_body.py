@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("submissions", "0055_issueslugredirect"),
+    ]
+
+    # Existing rows are filled by `manage.py backfill_review_rendering`; until then
+    # the Review getters fall back to rendering the Markdown body on the fly.
+    operations = [
+        migrations.AddField(
+            model_name="review",
+            name="body_html",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="body_text",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="body_excerpt",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="body_excerpt_long",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="review",
+            name="reading_time",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
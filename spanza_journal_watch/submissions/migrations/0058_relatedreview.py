@@ -0,0 +1,78 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_related_reviews(apps, schema_editor):
+    # Mirrors submissions.related.rebuild_related_reviews() as of this migration.
+    RelatedReview = apps.get_model("submissions", "RelatedReview")
+    Review = apps.get_model("submissions", "Review")
+    Tag = apps.get_model("submissions", "Tag")
+    qn = schema_editor.quote_name
+    tag_articles = qn(Tag.articles.through._meta.db_table)
+    schema_editor.execute(
+        f"""
+        WITH scored AS (
+            SELECT
+                source.pubmedarticle_id AS article_id,
+                review.id AS review_id,
+                COUNT(*) AS shared_tag_count,
+                ROW_NUMBER() OVER (
+                    PARTITION BY source.pubmedarticle_id
+                    ORDER BY COUNT(*) DESC, COALESCE(review.publish_date, review.created::date) DESC, review.id DESC
+                ) AS rank
+            FROM {tag_articles} source
+            JOIN {qn(Tag._meta.db_table)} tag ON tag.id = source.tag_id AND tag.curated AND tag.active
+            JOIN {tag_articles} candidate
+                ON candidate.tag_id = source.tag_id AND candidate.pubmedarticle_id <> source.pubmedarticle_id
+            JOIN {qn(Review._meta.db_table)} review
+                ON review.article_id = candidate.pubmedarticle_id AND review.active
+            GROUP BY source.pubmedarticle_id, review.id
+        )
+        INSERT INTO {qn(RelatedReview._meta.db_table)} (article_id, review_id, shared_tag_count, rank)
+        SELECT article_id, review_id, shared_tag_count, rank FROM scored WHERE rank <= %s
+        """,
+        params=[12],
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("backend", "0055_pubmedarticle_search_vector"),
+        ("submissions", "0057_schedule_flush_hit_counts"),
+    ]
+
+    # Populated here; afterwards signals keep it current (`manage.py rebuild_related_reviews` recomputes it).
+    operations = [
+        migrations.CreateModel(
+            name="RelatedReview",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("shared_tag_count", models.PositiveSmallIntegerField()),
+                ("rank", models.PositiveSmallIntegerField()),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_review_links",
+                        to="backend.pubmedarticle",
+                    ),
+                ),
+                (
+                    "review",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="submissions.review",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("article", "rank"),
+                "indexes": [models.Index(fields=["article", "rank"], name="submissions_relrev_rank_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("article", "review"), name="submissions_relrev_article_review_uniq")
+                ],
+            },
+        ),
+        migrations.RunPython(populate_related_reviews, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,110 @@
+import datetime
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+BACKFILL_DAYS = 90
+
+
+def backfill_tag_engagement(apps, schema_editor):
+    # Mirrors submissions.engagement.rebuild_tag_engagement_day() as of this migration,
+    # for the scoring window, so tag scores do not start from a single day of data.
+    AnalyticsEvent = apps.get_model("analytics", "AnalyticsEvent")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    Review = apps.get_model("submissions", "Review")
+    Tag = apps.get_model("submissions", "Tag")
+    TagEngagementDaily = apps.get_model("submissions", "TagEngagementDaily")
+
+    review_type = ContentType.objects.filter(app_label="submissions", model="review").first()
+    if review_type is None:
+        return
+    qn = schema_editor.quote_name
+    sql = f"""
+        INSERT INTO {qn(TagEngagementDaily._meta.db_table)}
+            (date, tag_id, opens, engaged, full_text, shares, score)
+        SELECT
+            %(day)s, link.tag_id,
+            SUM(events.opens), SUM(events.engaged), SUM(events.full_text), SUM(events.shares),
+            SUM(events.opens + 3 * events.engaged + 4 * events.full_text + 5 * events.shares)
+        FROM (
+            SELECT
+                object_id,
+                COUNT(*) FILTER (WHERE event_type = 'review_open') AS opens,
+                COUNT(*) FILTER (WHERE event_type = 'review_engaged') AS engaged,
+                COUNT(*) FILTER (WHERE event_type = 'review_full_text_click') AS full_text,
+                COUNT(*) FILTER (WHERE event_type = ANY(%(shares)s)) AS shares
+            FROM {qn(AnalyticsEvent._meta.db_table)}
+            WHERE content_type_id = %(review_type_id)s
+                AND object_id IS NOT NULL
+                AND NOT automated
+                AND timestamp >= %(start_ts)s AND timestamp <= %(end_ts)s
+            GROUP BY object_id
+        ) events
+        JOIN {qn(Review._meta.db_table)} review ON review.id = events.object_id AND review.active
+        JOIN {qn(Tag.articles.through._meta.db_table)} link ON link.pubmedarticle_id = review.article_id
+        JOIN {qn(Tag._meta.db_table)} tag ON tag.id = link.tag_id AND tag.curated AND tag.active
+        GROUP BY link.tag_id
+    """
+    shares = [
+        "review_share_copy_link",
+        "review_share_email",
+        "review_share_native",
+        "review_share_bluesky",
+        "review_share_x",
+        "review_share_facebook",
+    ]
+    today = timezone.localdate()
+    with schema_editor.connection.cursor() as cursor:
+        for offset in range(BACKFILL_DAYS, -1, -1):
+            day = today - datetime.timedelta(days=offset)
+            cursor.execute(
+                sql,
+                {
+                    "day": day,
+                    "start_ts": timezone.make_aware(datetime.datetime.combine(day, datetime.time.min)),
+                    "end_ts": timezone.make_aware(datetime.datetime.combine(day, datetime.time.max)),
+                    "review_type_id": review_type.pk,
+                    "shares": shares,
+                },
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0033_analyticsrollupstate_event_batch_id"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("submissions", "0058_relatedreview"),
+    ]
+
+    # Backfilled here for the scoring window; the analytics rollup task keeps
+    # recent days current.
+    operations = [
+        migrations.CreateModel(
+            name="TagEngagementDaily",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("opens", models.PositiveIntegerField(default=0)),
+                ("engaged", models.PositiveIntegerField(default=0)),
+                ("full_text", models.PositiveIntegerField(default=0)),
+                ("shares", models.PositiveIntegerField(default=0)),
+                ("score", models.PositiveIntegerField(default=0)),
+                (
+                    "tag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="engagement_days",
+                        to="submissions.tag",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-date", "-score"),
+                "constraints": [
+                    models.UniqueConstraint(fields=("date", "tag"), name="submissions_tag_engagement_day_uniq")
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_tag_engagement, migrations.RunPython.noop),
+    ]
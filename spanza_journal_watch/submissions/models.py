@@ -17,7 +17,7 @@ from django.contrib.postgres.search import (
 )
 from django.core.cache import cache
 from django.db import models
-from django.db.models import Q
+from django.db.models import DEFERRED, Q
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.html import strip_tags
@@ -25,7 +25,7 @@ from django.utils.text import slugify
 from markdownx.models import MarkdownxField
 from markdownx.utils import markdownify
 
-from spanza_journal_watch.utils.cache import get_content_cache_version
+from spanza_journal_watch.utils.cache import CACHE_TAG_ISSUES, CACHE_TAG_LAYOUT, get_cache_tags_version
 from spanza_journal_watch.utils.celerytasks import celery_resize_image
 from spanza_journal_watch.utils.functions import estimate_reading_time, get_unique_slug, shorten_text
 from spanza_journal_watch.utils.modelmethods import name_image
@@ -266,6 +266,16 @@ class Review(TimeStampedModel):
     )
     heading_tag_re = re.compile(r"<h[1-6]\b[^>]*>.*?</h[1-6]>", re.IGNORECASE | re.DOTALL)
 
+    # Rendered from body on save (see render_body_fields) so list pages, feeds
+    # and newsletters do no Markdown or bleach work per request.
+    body_html = models.TextField(blank=True, default="", editable=False)
+    body_text = models.TextField(blank=True, default="", editable=False)
+    body_excerpt = models.TextField(blank=True, default="", editable=False)
+    body_excerpt_long = models.TextField(blank=True, default="", editable=False)
+    reading_time = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    RENDERED_BODY_FIELDS = ("body_html", "body_text", "body_excerpt", "body_excerpt_long", "reading_time")
+
     class Meta:
         # Requires from django.contrib.postgres.operations import BtreeGinExtension in the migration
         indexes = [
@@ -274,16 +284,49 @@ class Review(TimeStampedModel):
             models.Index(fields=["active", "-publish_date"], name="submissions_active_91ec4a_idx"),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember which body the stored renderings belong to, so an unsaved
+        # edit to ``body`` is rendered live rather than served stale.
+        instance._rendered_body = instance.__dict__.get("body", DEFERRED)
+        return instance
+
+    def _has_current_rendering(self):
+        if not self.body_html:
+            return False
+        body = self.__dict__.get("body", DEFERRED)
+        rendered_body = getattr(self, "_rendered_body", DEFERRED)
+        return body is DEFERRED or rendered_body is DEFERRED or body == rendered_body
+
     def _render_markdown_body_html(self):
-        if not hasattr(self, "_markdown_html_cache"):
+        if self._has_current_rendering():
+            return self.body_html
+        if getattr(self, "_markdown_html_source", None) != self.body:
             self._markdown_html_cache = sanitize_markdown_html(markdownify(self.body))
+            self._markdown_html_source = self.body
         return self._markdown_html_cache
 
+    def render_body_fields(self):
+        """Recompute the stored renderings of ``body``."""
+        self.body_html = ""
+        html = self._render_markdown_body_html()
+        self.body_html = html
+        self._rendered_body = self.body
+        self.body_text = strip_tags(html).strip()
+        self.body_excerpt = shorten_text(
+            strip_tags(self.heading_tag_re.sub(" ", html)).strip(), self.TRUNCATED_BODY_LENGTH
+        )
+        self.body_excerpt_long = shorten_text(self.body_text, 500)
+        self.reading_time = estimate_reading_time(self.body)
+
     def get_markdown_body(self, strip=False):
         html = self._render_markdown_body_html()
         return html if not strip else strip_tags(html)
 
     def get_plain_body(self, exclude_headings=False):
+        if not exclude_headings and self._has_current_rendering():
+            return self.body_text
         html = self._render_markdown_body_html()
         if exclude_headings:
             html = self.heading_tag_re.sub(" ", html)
@@ -291,15 +334,21 @@ class Review(TimeStampedModel):
         return text
 
     def get_truncated_body(self):
+        if self._has_current_rendering():
+            return self.body_excerpt
         return shorten_text(self.get_plain_body(exclude_headings=True), self.TRUNCATED_BODY_LENGTH)
 
     def get_longer_truncated_plain_body(self):
+        if self._has_current_rendering():
+            return self.body_excerpt_long
         return shorten_text(self.get_plain_body(), 500)
 
     def get_absolute_url(self):
         return reverse("submissions:review_detail", kwargs={"slug": self.slug})
 
     def get_reading_time(self):
+        if self._has_current_rendering():
+            return self.reading_time
         return estimate_reading_time(self.body)
 
     def get_full_name(self):
@@ -310,6 +359,11 @@ class Review(TimeStampedModel):
         return self.publish_date if self.publish_date else self.issues.all()[0].date
 
     def get_hits(self):
+        from .hits import REVIEW_HITS_CACHE_TIMEOUT, review_hits_cache_key
+
+        return cache.get_or_set(review_hits_cache_key(self.id), self._count_hits, REVIEW_HITS_CACHE_TIMEOUT)
+
+    def _count_hits(self):
         from spanza_journal_watch.analytics.models import AnalyticsEvent
 
         object_id = self.id
@@ -340,6 +394,12 @@ class Review(TimeStampedModel):
         if not self.slug:
             self.slug = get_unique_slug(self, slugify(self.article.name))
 
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "body" in update_fields:
+            self.render_body_fields()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.RENDERED_BODY_FIELDS}
+
         # Perform an initial save
         super().save(*args, **kwargs)
 
@@ -411,7 +471,7 @@ class Review(TimeStampedModel):
             )
             .annotate(
                 headline=SearchHeadline(
-                    "body", search_query, max_fragments=3, fragment_delimiter=cls.HEADLINE_DELIMITER
+                    "body_text", search_query, max_fragments=3, fragment_delimiter=cls.HEADLINE_DELIMITER
                 ),
             )
             .order_by("-title_similarity", "-body_rank", "-author_similarity", "-created")
@@ -425,9 +485,11 @@ class Review(TimeStampedModel):
     def post_process_headlines(cls, results):
         """Convert search headline fragments to clean text with <mark> highlights.
 
-        If the headline contains no highlighted terms (no <b> tags from
-        SearchHeadline), clear it so the template falls back to the
-        truncated body instead of showing a random excerpt.
+        Headlines are cut from the stored plain-text ``body_text``, so no
+        Markdown rendering is needed here. If the headline contains no
+        highlighted terms (no <b> tags from SearchHeadline), clear it so the
+        template falls back to the truncated body instead of showing a random
+        excerpt.
         """
         for r in results:
             raw = r.headline or ""
@@ -436,12 +498,6 @@ class Review(TimeStampedModel):
                 continue
             # Protect search highlights by converting to placeholder
             text = raw.replace("<b>", "\x00MARK\x00").replace("</b>", "\x00/MARK\x00")
-            # Convert markdown to HTML, then strip all tags (except our placeholders)
-            html = markdownify(text)
-            html = cls.heading_tag_re.sub(" ", html)
-            text = strip_tags(html)
-            # Clean up whitespace and markdown artefacts
-            text = re.sub(r"(?m)(^|\n)\s{0,3}#{1,6}\s*", " ", text)
             text = text.replace(cls.HEADLINE_DELIMITER, " &hellip; ")
             text = re.sub(r"\s+", " ", text).strip()
             # Restore highlights as <mark> tags
@@ -452,6 +508,53 @@ class Review(TimeStampedModel):
         return self.article.get_truncated_name()
 
 
+class RelatedReview(models.Model):
+    """Materialised "related reviews" for an article: the top active reviews by
+    shared curated tags, then recency. Maintained by submissions.related."""
+
+    article = models.ForeignKey("backend.PubmedArticle", on_delete=models.CASCADE, related_name="related_review_links")
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name="+")
+    shared_tag_count = models.PositiveSmallIntegerField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["article", "review"], name="submissions_relrev_article_review_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["article", "rank"], name="submissions_relrev_rank_idx"),
+        ]
+        ordering = ("article", "rank")
+
+    def __str__(self):
+        return f"{self.article_id} -> review {self.review_id} ({self.shared_tag_count} shared)"
+
+
+class TagEngagementDaily(models.Model):
+    """Per-day engagement with each curated tag's active reviews, from human analytics events.
+
+    Rebuilt a day at a time alongside the analytics daily rollup; tag scores
+    sum the rows of the trailing window. See submissions.engagement.
+    """
+
+    date = models.DateField()
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="engagement_days")
+    opens = models.PositiveIntegerField(default=0)
+    engaged = models.PositiveIntegerField(default=0)
+    full_text = models.PositiveIntegerField(default=0)
+    shares = models.PositiveIntegerField(default=0)
+    score = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["date", "tag"], name="submissions_tag_engagement_day_uniq"),
+        ]
+        ordering = ("-date", "-score")
+
+    def __str__(self):
+        return f"{self.date} #{self.tag_id}: {self.score}"
+
+
 class Issue(TimeStampedModel):
     name = models.CharField(max_length=255, null=False, blank=False)
     date = models.DateField(null=True, blank=True)
@@ -550,9 +653,9 @@ class Issue(TimeStampedModel):
 
     def get_header_feature_article(self):
         PageHeader = apps.get_model("layout", "PageHeader")
-        cache_version = get_content_cache_version()
+        cache_version = get_cache_tags_version([CACHE_TAG_ISSUES, CACHE_TAG_LAYOUT])
         issue_key = self.slug or f"pk-{self.pk}"
-        cache_key = f"issue:header_feature_article:v{cache_version}:{issue_key}"
+        cache_key = f"issue:header_feature_article:{cache_version}:{issue_key}"
 
         def resolve_feature_article():
             headers = PageHeader.objects.filter(
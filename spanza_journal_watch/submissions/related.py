@@ -0,0 +1,185 @@
+"""Precomputed "related reviews" for PubMed articles.
+
+Each article's top ``RELATED_REVIEWS_PER_ARTICLE`` active reviews, ranked by
+the number of curated tags shared with the article and then by recency, are
+stored as ``RelatedReview`` rows. Pages read the ranked rows instead of
+scoring every candidate review per request; the signals in
+``submissions.signals`` rebuild the rows for the articles a change affects.
+"""
+
+import itertools
+
+from django.db import connection
+
+# Headroom over the largest list shown (4) for reviews of articles on the same page,
+# which are excluded after reading; a list still left short is scored live.
+RELATED_REVIEWS_PER_ARTICLE = 12
+REBUILD_BATCH_SIZE = 1000
+
+
+def _scored_sql(source_filter="", candidate_filter=""):
+    """Rank every active review sharing a curated tag with each source article."""
+    from .models import Review, Tag
+
+    qn = connection.ops.quote_name
+    tag_articles = qn(Tag.articles.through._meta.db_table)
+    return f"""
+        SELECT
+            source.pubmedarticle_id AS article_id,
+            review.id AS review_id,
+            COUNT(*) AS shared_tag_count,
+            ROW_NUMBER() OVER (
+                PARTITION BY source.pubmedarticle_id
+                ORDER BY COUNT(*) DESC, COALESCE(review.publish_date, review.created::date) DESC, review.id DESC
+            ) AS rank
+        FROM {tag_articles} source
+        JOIN {qn(Tag._meta.db_table)} tag ON tag.id = source.tag_id AND tag.curated AND tag.active
+        JOIN {tag_articles} candidate
+            ON candidate.tag_id = source.tag_id AND candidate.pubmedarticle_id <> source.pubmedarticle_id
+            {candidate_filter}
+        JOIN {qn(Review._meta.db_table)} review
+            ON review.article_id = candidate.pubmedarticle_id AND review.active
+        WHERE TRUE {source_filter}
+        GROUP BY source.pubmedarticle_id, review.id
+    """
+
+
+def _build_sql(restrict_sources):
+    from .models import RelatedReview
+
+    source_filter = "AND source.pubmedarticle_id = ANY(%s)" if restrict_sources else ""
+    return f"""
+        WITH scored AS ({_scored_sql(source_filter)})
+        INSERT INTO {connection.ops.quote_name(RelatedReview._meta.db_table)}
+            (article_id, review_id, shared_tag_count, rank)
+        SELECT article_id, review_id, shared_tag_count, rank FROM scored WHERE rank <= %s
+    """
+
+
+def rebuild_related_reviews(article_ids=None):
+    """Recompute the stored related reviews for ``article_ids``, or for every article when None."""
+    from .models import RelatedReview
+
+    if article_ids is None:
+        RelatedReview.objects.all().delete()
+        with connection.cursor() as cursor:
+            cursor.execute(_build_sql(restrict_sources=False), [RELATED_REVIEWS_PER_ARTICLE])
+        return
+
+    sql = _build_sql(restrict_sources=True)
+    for batch in itertools.batched(sorted(set(article_ids)), REBUILD_BATCH_SIZE):
+        RelatedReview.objects.filter(article_id__in=batch).delete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [list(batch), RELATED_REVIEWS_PER_ARTICLE])
+
+
+def affected_sources(candidate_article_ids):
+    """Articles whose related reviews may include reviews of ``candidate_article_ids``.
+
+    That is every other article sharing a curated tag with a candidate, plus
+    the articles currently listing one of its reviews (which covers tags that
+    were just removed).
+    """
+    from .models import RelatedReview, Tag
+
+    candidate_article_ids = list(candidate_article_ids)
+    if not candidate_article_ids:
+        return set()
+    qn = connection.ops.quote_name
+    tag_articles = qn(Tag.articles.through._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT DISTINCT other.pubmedarticle_id
+            FROM {tag_articles} candidate
+            JOIN {qn(Tag._meta.db_table)} tag ON tag.id = candidate.tag_id AND tag.curated AND tag.active
+            JOIN {tag_articles} other
+                ON other.tag_id = candidate.tag_id AND other.pubmedarticle_id <> candidate.pubmedarticle_id
+            WHERE candidate.pubmedarticle_id = ANY(%s)
+            """,
+            [candidate_article_ids],
+        )
+        sources = {row[0] for row in cursor.fetchall()}
+    sources.update(
+        RelatedReview.objects.filter(review__article_id__in=candidate_article_ids).values_list("article_id", flat=True)
+    )
+    return sources
+
+
+def refresh_related_reviews(article_ids=(), candidate_article_ids=()):
+    """Rebuild the related reviews touched by a change.
+
+    ``article_ids`` are articles whose own tags changed; ``candidate_article_ids``
+    are articles whose reviews changed. Tag changes on a reviewed article also
+    change it as a candidate for everyone else.
+    """
+    from .models import Review
+
+    article_ids = set(article_ids)
+    candidates = set(candidate_article_ids)
+    if article_ids:
+        candidates.update(
+            Review.objects.filter(article_id__in=article_ids, active=True).values_list("article_id", flat=True)
+        )
+    sources = article_ids | affected_sources(candidates)
+    if sources:
+        rebuild_related_reviews(sources)
+
+
+def related_reviews_by_article(article_ids, limit, exclude_article_ids=()):
+    """Map each article id to its top ``limit`` related reviews.
+
+    Reviews of ``exclude_article_ids`` are skipped, e.g. articles already shown
+    on the page; each review gets a ``shared_tag_count`` attribute. Lists are
+    read from the stored rows; one that the exclusions leave short while more
+    candidates exist past the stored top N is scored live instead.
+    """
+    from .models import RelatedReview
+
+    exclude_article_ids = set(exclude_article_ids)
+    links = (
+        RelatedReview.objects.filter(article_id__in=article_ids, review__active=True)
+        .select_related("review__article__journal", "review__author")
+        .order_by("article_id", "rank")
+    )
+    related = {article_id: [] for article_id in article_ids}
+    stored = dict.fromkeys(article_ids, 0)
+    for link in links:
+        stored[link.article_id] += 1
+        reviews = related[link.article_id]
+        if len(reviews) < limit and link.review.article_id not in exclude_article_ids:
+            link.review.shared_tag_count = link.shared_tag_count
+            reviews.append(link.review)
+
+    truncated = [
+        article_id
+        for article_id, reviews in related.items()
+        if len(reviews) < limit and stored[article_id] >= RELATED_REVIEWS_PER_ARTICLE
+    ]
+    if truncated:
+        related.update(_score_related_reviews(truncated, limit, exclude_article_ids))
+    return related
+
+
+def _score_related_reviews(article_ids, limit, exclude_article_ids):
+    from .models import Review
+
+    scored = _scored_sql(
+        source_filter="AND source.pubmedarticle_id = ANY(%s)",
+        candidate_filter="AND candidate.pubmedarticle_id <> ALL(%s)",
+    )
+    sql = f"""
+        WITH scored AS ({scored})
+        SELECT article_id, review_id, shared_tag_count FROM scored WHERE rank <= %s ORDER BY article_id, rank
+    """
+    with connection.cursor() as cursor:
+        # The candidate filter comes first in the statement, so its parameter does too.
+        cursor.execute(sql, [sorted(exclude_article_ids), list(article_ids), limit])
+        rows = cursor.fetchall()
+    reviews = Review.objects.select_related("article__journal", "author").in_bulk({row[1] for row in rows})
+    related = {article_id: [] for article_id in article_ids}
+    for article_id, review_id, shared_tag_count in rows:
+        review = reviews[review_id]
+        review.shared_tag_count = shared_tag_count
+        related[article_id].append(review)
+    return related
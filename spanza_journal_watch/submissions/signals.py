@@ -1,35 +1,148 @@
-from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from spanza_journal_watch.backend.models import PubmedArticle
-from spanza_journal_watch.utils.cache import bump_content_cache_version
+from spanza_journal_watch.utils.cache import (
+    CACHE_TAG_ARTICLES,
+    CACHE_TAG_ISSUES,
+    CACHE_TAG_REVIEWS,
+    CACHE_TAG_TAGS,
+    invalidate_cache_tags,
+)
 
 from .models import Author, Issue, Review, Tag
+from .related import affected_sources, rebuild_related_reviews, refresh_related_reviews
+
+
+def _articles_have_reviews(article_ids):
+    return Review.objects.filter(article_id__in=article_ids).exists()
 
 
 @receiver(post_save, sender=PubmedArticle)
 @receiver(post_delete, sender=PubmedArticle)
+def invalidate_cache_on_article_change(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    # Public pages only show reviewed articles, so PubMed ingestion of
+    # unreviewed articles leaves them warm.
+    if instance.pk is not None and _articles_have_reviews([instance.pk]):
+        invalidate_cache_tags(CACHE_TAG_ARTICLES, CACHE_TAG_REVIEWS, CACHE_TAG_TAGS)
+    else:
+        invalidate_cache_tags(CACHE_TAG_ARTICLES)
+
+
 @receiver(post_save, sender=Author)
 @receiver(post_delete, sender=Author)
-@receiver(post_save, sender=Issue)
-@receiver(post_delete, sender=Issue)
 @receiver(post_save, sender=Review)
 @receiver(post_delete, sender=Review)
+def invalidate_cache_on_review_change(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+    # Issue pages and tag review counts list reviews too.
+    invalidate_cache_tags(CACHE_TAG_REVIEWS, CACHE_TAG_ISSUES, CACHE_TAG_TAGS)
+
+
+@receiver(post_save, sender=Issue)
+@receiver(post_delete, sender=Issue)
+def invalidate_cache_on_issue_change(sender, **kwargs):
+    if kwargs.get("raw"):
+        return
+    # Review pages link to their issue.
+    invalidate_cache_tags(CACHE_TAG_ISSUES, CACHE_TAG_REVIEWS)
+
+
 @receiver(post_save, sender=Tag)
 @receiver(post_delete, sender=Tag)
-def invalidate_content_cache_on_model_change(sender, **kwargs):
+def invalidate_cache_on_tag_change(sender, **kwargs):
     if kwargs.get("raw"):
         return
-    bump_content_cache_version()
+    invalidate_cache_tags(CACHE_TAG_TAGS, CACHE_TAG_REVIEWS)
 
 
 @receiver(m2m_changed, sender=Issue.reviews.through)
-def invalidate_content_cache_on_issue_reviews_change(sender, action, **kwargs):
+def invalidate_cache_on_issue_reviews_change(sender, action, **kwargs):
     if action in {"post_add", "post_remove", "post_clear"}:
-        bump_content_cache_version()
+        invalidate_cache_tags(CACHE_TAG_ISSUES, CACHE_TAG_REVIEWS)
 
 
 @receiver(m2m_changed, sender=Tag.articles.through)
-def invalidate_content_cache_on_tag_articles_change(sender, action, **kwargs):
-    if action in {"post_add", "post_remove", "post_clear"}:
-        bump_content_cache_version()
+def invalidate_cache_on_tag_articles_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+    if reverse:
+        article_ids = [instance.pk]
+    elif pk_set is not None:
+        article_ids = pk_set
+    else:
+        # post_clear does not report which articles were removed.
+        article_ids = None
+
+    # Auto-tagging freshly ingested articles must not wipe the tag pages,
+    # which only list reviewed articles.
+    if article_ids is None or _articles_have_reviews(article_ids):
+        invalidate_cache_tags(CACHE_TAG_ARTICLES, CACHE_TAG_TAGS, CACHE_TAG_REVIEWS)
+    else:
+        invalidate_cache_tags(CACHE_TAG_ARTICLES)
+
+
+# Review fields that change where a review ranks as someone's related review.
+RELATED_REVIEW_FIELDS = {"active", "article", "article_id", "publish_date"}
+
+
+@receiver(post_save, sender=Review)
+def refresh_related_reviews_on_review_save(sender, instance, **kwargs):
+    if kwargs.get("raw"):
+        return
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not RELATED_REVIEW_FIELDS.intersection(update_fields):
+        return
+    refresh_related_reviews(candidate_article_ids=[instance.article_id])
+
+
+@receiver(pre_delete, sender=Review)
+def collect_related_reviews_on_review_delete(sender, instance, **kwargs):
+    # The listing rows and, when the article goes too, its tag links are gone by post_delete.
+    instance._related_review_sources = affected_sources([instance.article_id])
+
+
+@receiver(post_delete, sender=Review)
+def refresh_related_reviews_on_review_delete(sender, instance, **kwargs):
+    sources = getattr(instance, "_related_review_sources", None)
+    if sources:
+        rebuild_related_reviews(sources)
+
+
+@receiver(post_save, sender=Tag)
+def refresh_related_reviews_on_tag_save(sender, instance, created, **kwargs):
+    if kwargs.get("raw") or created:
+        return
+    # Only articles carrying the tag count it as shared.
+    rebuild_related_reviews(instance.articles.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=Tag)
+def collect_related_reviews_on_tag_delete(sender, instance, **kwargs):
+    instance._related_review_sources = list(instance.articles.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Tag)
+def refresh_related_reviews_on_tag_delete(sender, instance, **kwargs):
+    sources = getattr(instance, "_related_review_sources", None)
+    if sources:
+        rebuild_related_reviews(sources)
+
+
+@receiver(m2m_changed, sender=Tag.articles.through)
+def refresh_related_reviews_on_tag_articles_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        instance._related_review_sources = (
+            [instance.pk] if reverse else list(instance.articles.values_list("id", flat=True))
+        )
+        return
+    if action == "post_clear":
+        article_ids = getattr(instance, "_related_review_sources", ())
+    elif action in {"post_add", "post_remove"}:
+        article_ids = [instance.pk] if reverse else pk_set
+    else:
+        return
+    refresh_related_reviews(article_ids=article_ids)
@@ -0,0 +1,160 @@
+"""Tag co-occurrence clusters for the Explore page.
+
+Two curated tags are similar when the articles they share make up at least
+``SIMILARITY_THRESHOLD`` of the smaller tag (overlap / min size). Clusters
+are the connected components of the graph of similar tags; singletons are
+left out.
+
+On Postgres the "sql" engine computes every overlap in one self-join of the
+tag link table, which is the sparse product of the tag-article incidence
+matrix with its transpose, and returns only the pairs above the threshold.
+The "python" engine intersects the article sets of every pair of tags.
+
+The similar pairs are cached alongside the clusters, so a recompute limited
+to a few changed tags only re-scores the pairs involving them.
+"""
+
+from collections import defaultdict
+from itertools import combinations
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+
+from .models import Tag
+
+CACHE_KEY = "tag_clusters"
+SIMILARITIES_CACHE_KEY = "tag_clusters:similarities"
+CACHE_TIMEOUT = 60 * 60 * 24 * 7  # 1 week
+SIMILARITY_THRESHOLD = 0.6
+
+
+def _tag_link_tables():
+    qn = connection.ops.quote_name
+    return qn(Tag.articles.through._meta.db_table), qn(Tag._meta.db_table)
+
+
+def _tag_sizes():
+    """Article counts of the active curated tags that have articles, in one query."""
+    return dict(
+        Tag.articles.through.objects.filter(tag__active=True, tag__curated=True)
+        .values("tag_id")
+        .annotate(size=Count("pubmedarticle_id"))
+        .values_list("tag_id", "size")
+    )
+
+
+def _similar_pairs_sql(threshold, tag_ids=None):
+    tag_articles, tags = _tag_link_tables()
+    changed_filter = "AND (a.tag_id = ANY(%(tag_ids)s) OR b.tag_id = ANY(%(tag_ids)s))" if tag_ids else ""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH links AS (
+                SELECT link.tag_id, link.pubmedarticle_id
+                FROM {tag_articles} link
+                JOIN {tags} tag ON tag.id = link.tag_id AND tag.active AND tag.curated
+            ),
+            sizes AS (
+                SELECT tag_id, COUNT(*) AS size FROM links GROUP BY tag_id
+            ),
+            overlaps AS (
+                SELECT a.tag_id AS tag_a, b.tag_id AS tag_b, COUNT(*) AS overlap
+                FROM links a
+                JOIN links b ON b.pubmedarticle_id = a.pubmedarticle_id AND b.tag_id > a.tag_id
+                WHERE TRUE {changed_filter}
+                GROUP BY a.tag_id, b.tag_id
+            )
+            SELECT overlaps.tag_a, overlaps.tag_b, overlaps.overlap::float8 / LEAST(size_a.size, size_b.size)
+            FROM overlaps
+            JOIN sizes size_a ON size_a.tag_id = overlaps.tag_a
+            JOIN sizes size_b ON size_b.tag_id = overlaps.tag_b
+            WHERE overlaps.overlap::float8 / LEAST(size_a.size, size_b.size) >= %(threshold)s
+            """,
+            {"threshold": threshold, "tag_ids": list(tag_ids or ())},
+        )
+        return {(tag_a, tag_b): similarity for tag_a, tag_b, similarity in cursor.fetchall()}
+
+
+def _similar_pairs_python(threshold, tag_ids=None):
+    tag_articles = defaultdict(set)
+    links = Tag.articles.through.objects.filter(tag__active=True, tag__curated=True)
+    for tag_id, article_id in links.values_list("tag_id", "pubmedarticle_id"):
+        tag_articles[tag_id].add(article_id)
+
+    pairs = {}
+    for (a_id, a_articles), (b_id, b_articles) in combinations(sorted(tag_articles.items()), 2):
+        if tag_ids and a_id not in tag_ids and b_id not in tag_ids:
+            continue
+        overlap = len(a_articles & b_articles)
+        if overlap == 0:
+            continue
+        similarity = overlap / min(len(a_articles), len(b_articles))
+        if similarity >= threshold:
+            pairs[(a_id, b_id)] = similarity
+    return pairs
+
+
+def clustering_engine():
+    return "sql" if connection.vendor == "postgresql" else "python"
+
+
+def similar_tag_pairs(threshold=SIMILARITY_THRESHOLD, tag_ids=None, engine=None):
+    """Map ``(tag_a, tag_b)`` (``tag_a < tag_b``) to the similarity of each pair at or above ``threshold``.
+
+    With ``tag_ids``, only pairs involving one of those tags are scored.
+    """
+    if (engine or clustering_engine()) == "sql":
+        return _similar_pairs_sql(threshold, tag_ids)
+    return _similar_pairs_python(threshold, tag_ids)
+
+
+def connected_components(tag_ids, pairs):
+    """Group ``tag_ids`` linked by ``pairs`` into clusters of two or more, largest first."""
+    parent = {tag_id: tag_id for tag_id in tag_ids}
+
+    def find(tag_id):
+        while parent[tag_id] != tag_id:
+            parent[tag_id] = parent[parent[tag_id]]
+            tag_id = parent[tag_id]
+        return tag_id
+
+    for tag_a, tag_b in pairs:
+        root_a, root_b = find(tag_a), find(tag_b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    components = defaultdict(list)
+    for tag_id in sorted(parent):
+        components[find(tag_id)].append(tag_id)
+    clusters = [component for component in components.values() if len(component) > 1]
+    clusters.sort(key=len, reverse=True)
+    return clusters
+
+
+def compute_tag_clusters(threshold=SIMILARITY_THRESHOLD, changed_tag_ids=None, engine=None, store=True):
+    """Recompute the clusters, caching them and the similar pairs unless ``store`` is False.
+
+    With ``changed_tag_ids`` and cached pairs from a run at the same threshold,
+    only pairs involving the changed tags are re-scored.
+
+    Returns ``(tag_sizes, pairs, clusters)``.
+    """
+    tag_sizes = _tag_sizes()
+    cached = cache.get(SIMILARITIES_CACHE_KEY) if changed_tag_ids else None
+    if cached and cached["threshold"] == threshold:
+        changed = set(changed_tag_ids)
+        pairs = {
+            pair: similarity
+            for pair, similarity in cached["pairs"].items()
+            if changed.isdisjoint(pair) and pair[0] in tag_sizes and pair[1] in tag_sizes
+        }
+        pairs.update(similar_tag_pairs(threshold, tag_ids=changed, engine=engine))
+    else:
+        pairs = similar_tag_pairs(threshold, engine=engine)
+
+    clusters = connected_components(tag_sizes, pairs)
+    if store:
+        cache.set(CACHE_KEY, clusters, CACHE_TIMEOUT)
+        cache.set(SIMILARITIES_CACHE_KEY, {"threshold": threshold, "pairs": pairs}, CACHE_TIMEOUT)
+    return tag_sizes, pairs, clusters
@@ -0,0 +1,16 @@
+import logging
+
+from config.celery_app import app as celery_app
+
+from .hits import flush_hit_counts
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task
+def flush_hit_counts_task():
+    """Fold Redis-buffered page hits into ``Hit`` rows."""
+    flushed = flush_hit_counts()
+    if flushed:
+        logger.info("flush_hit_counts: flushed %d counter(s)", flushed)
+    return {"flushed": flushed}
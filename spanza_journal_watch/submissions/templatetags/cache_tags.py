@@ -0,0 +1,11 @@
+from django import template
+
+from spanza_journal_watch.utils.cache import get_cache_tags_version
+
+register = template.Library()
+
+
+@register.simple_tag
+def cache_tags_version(*tags):
+    """Version token for fragment caches: ``{% cache_tags_version "reviews" as version %}``."""
+    return get_cache_tags_version(tags)
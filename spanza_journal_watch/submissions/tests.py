@@ -1,12 +1,17 @@
 import datetime
+from io import StringIO
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 
 from spanza_journal_watch.analytics.models import AnalyticsEvent
+from spanza_journal_watch.analytics.rollups import refresh_rollups
 from spanza_journal_watch.backend.models import (
     PubmedArticle,
     PubmedArticleUserState,
@@ -14,9 +19,13 @@ from spanza_journal_watch.backend.models import (
     WatchedJournalArticle,
 )
 from spanza_journal_watch.layout.models import FeatureArticle, PageHeader
+from spanza_journal_watch.utils.tests.fake_redis import FakeRedis
 
-from .models import Author, Comment, Hit, Issue, Journal, Review, Tag
-from .templatetags.tag_scores import CACHE_KEY
+from .engagement import rebuild_tag_engagement_day
+from .hits import flush_hit_counts, record_hit
+from .models import Author, Comment, Hit, Issue, Journal, RelatedReview, Review, Tag, TagEngagementDaily
+from .related import RELATED_REVIEWS_PER_ARTICLE, related_reviews_by_article
+from .templatetags.tag_scores import CACHE_KEY, compute_tag_scores
 
 User = get_user_model()
 
@@ -213,6 +222,171 @@ class ReviewModelTest(TestCase):
         self.assertNotIn("<script", html)
         self.assertIn("<strong>Bold text</strong>", html)
 
+    def test_save_stores_rendered_body(self):
+        self.review.body = "# Heading\n\nSome **bold** copy.\n\n<script>alert('x')</script>"
+        self.review.save()
+        self.review.refresh_from_db()
+
+        self.assertIn("<strong>bold</strong>", self.review.body_html)
+        self.assertNotIn("<script", self.review.body_html)
+        self.assertEqual(self.review.body_text, self.review.get_plain_body())
+        self.assertNotIn("Heading", self.review.body_excerpt)
+        self.assertIn("Some bold copy.", self.review.body_excerpt)
+        self.assertGreaterEqual(self.review.reading_time, 1)
+
+    def test_save_with_body_update_fields_refreshes_rendering(self):
+        self.review.body = "Updated body"
+        self.review.save(update_fields=["body"])
+        self.review.refresh_from_db()
+
+        self.assertEqual(self.review.body_text, "Updated body")
+        self.assertEqual(self.review.get_truncated_body(), "Updated body")
+
+    def test_backfill_review_rendering_command(self):
+        Review.objects.filter(pk=self.review.pk).update(body_html="", body_text="", body_excerpt="")
+
+        call_command("backfill_review_rendering")
+
+        self.review.refresh_from_db()
+        self.assertEqual(self.review.body_text, "Test Body")
+        self.assertEqual(self.review.body_excerpt, "Test Body")
+
+
+class RelatedReviewTest(TestCase):
+    def setUp(self):
+        self.cardiac = Tag.objects.create(text="Cardiac", curated=True)
+        self.airway = Tag.objects.create(text="Airway", curated=True)
+        self.source = PubmedArticle.objects.create(title="Source Article")
+        self.source.tags.add(self.cardiac, self.airway)
+
+    def _reviewed_article(self, title, *tags, **review_fields):
+        article = PubmedArticle.objects.create(title=title)
+        article.tags.add(*tags)
+        review = Review.objects.create(article=article, body="Body", active=True, **review_fields)
+        return article, review
+
+    def test_ranked_by_shared_tags_then_recency(self):
+        _, older = self._reviewed_article("Older", self.cardiac, publish_date=datetime.date(2024, 1, 1))
+        _, newer = self._reviewed_article("Newer", self.cardiac, publish_date=datetime.date(2025, 1, 1))
+        _, both = self._reviewed_article("Both", self.cardiac, self.airway, publish_date=datetime.date(2023, 1, 1))
+
+        self.assertEqual(self.source.get_related_reviews(), [both, newer, older])
+        self.assertEqual(self.source.get_related_reviews()[0].shared_tag_count, 2)
+
+    def test_new_review_is_listed_for_articles_sharing_tags(self):
+        self.assertEqual(self.source.get_related_reviews(), [])
+
+        _, review = self._reviewed_article("Reviewed", self.cardiac)
+
+        self.assertEqual(self.source.get_related_reviews(), [review])
+
+    def test_deactivated_and_deleted_reviews_drop_out(self):
+        _, hidden = self._reviewed_article("Hidden", self.cardiac)
+        article, deleted = self._reviewed_article("Deleted", self.airway)
+
+        hidden.active = False
+        hidden.save()
+        article.delete()
+
+        self.assertEqual(self.source.get_related_reviews(), [])
+        self.assertFalse(RelatedReview.objects.filter(review_id=deleted.pk).exists())
+
+    def test_removing_a_shared_tag_refreshes_listings(self):
+        article, _ = self._reviewed_article("Untagged Later", self.cardiac)
+
+        article.tags.remove(self.cardiac)
+
+        self.assertEqual(self.source.get_related_reviews(), [])
+
+    def test_uncurating_a_tag_refreshes_listings(self):
+        self._reviewed_article("Uncurated", self.cardiac)
+
+        self.cardiac.curated = False
+        self.cardiac.save()
+
+        self.assertEqual(self.source.get_related_reviews(), [])
+
+    def test_page_articles_are_excluded(self):
+        other, _ = self._reviewed_article("On Page", self.cardiac)
+        _, off_page = self._reviewed_article("Off Page", self.cardiac)
+
+        related = related_reviews_by_article([self.source.pk], limit=4, exclude_article_ids=[self.source.pk, other.pk])
+
+        self.assertEqual(related[self.source.pk], [off_page])
+
+    def test_page_articles_filling_stored_rows_fall_back_to_live_scoring(self):
+        # Same-issue reviews share both tags, so they take every stored slot.
+        on_page = [
+            self._reviewed_article(f"On Page {n}", self.cardiac, self.airway)[0]
+            for n in range(RELATED_REVIEWS_PER_ARTICLE)
+        ]
+        _, off_page = self._reviewed_article("Off Page", self.cardiac, publish_date=datetime.date(2020, 1, 1))
+        self.assertEqual(RelatedReview.objects.filter(article=self.source).count(), RELATED_REVIEWS_PER_ARTICLE)
+
+        page_ids = [self.source.pk] + [article.pk for article in on_page]
+        related = related_reviews_by_article([self.source.pk], limit=4, exclude_article_ids=page_ids)
+
+        self.assertEqual(related[self.source.pk], [off_page])
+        self.assertEqual(related[self.source.pk][0].shared_tag_count, 1)
+
+    def test_rebuild_command(self):
+        _, review = self._reviewed_article("Rebuilt", self.cardiac)
+        RelatedReview.objects.all().delete()
+
+        call_command("rebuild_related_reviews", stdout=StringIO())
+
+        self.assertEqual(self.source.get_related_reviews(), [review])
+
+
+class TagEngagementTest(TestCase):
+    def setUp(self):
+        cache.delete(CACHE_KEY)
+        self.tag = Tag.objects.create(text="Obstetric anaesthesia", curated=True, active=True)
+        self.uncurated = Tag.objects.create(text="Uncurated engagement tag", active=True)
+        article = PubmedArticle.objects.create(title="Engagement Article")
+        article.tags.add(self.tag, self.uncurated)
+        self.review = Review.objects.create(article=article, body="Body", active=True)
+        self.review_type = ContentType.objects.get_for_model(Review)
+
+    def _event(self, event_type, days_ago=0, **fields):
+        AnalyticsEvent.objects.create(
+            event_type=event_type,
+            content_type=self.review_type,
+            object_id=self.review.pk,
+            timestamp=timezone.now() - datetime.timedelta(days=days_ago),
+            **fields,
+        )
+
+    def test_daily_rows_weight_human_events(self):
+        self._event(AnalyticsEvent.EventType.REVIEW_OPEN)
+        self._event(AnalyticsEvent.EventType.REVIEW_ENGAGED)
+        self._event(AnalyticsEvent.EventType.REVIEW_SHARE_EMAIL)
+        self._event(AnalyticsEvent.EventType.REVIEW_OPEN, automated=True)
+
+        rebuild_tag_engagement_day(timezone.localdate())
+
+        row = TagEngagementDaily.objects.get()
+        self.assertEqual(row.tag, self.tag)
+        self.assertEqual((row.opens, row.engaged, row.shares, row.score), (1, 1, 1, 1 + 3 + 5))
+
+    def test_scores_sum_the_window(self):
+        self._event(AnalyticsEvent.EventType.REVIEW_FULL_TEXT_CLICK, days_ago=2)
+        self._event(AnalyticsEvent.EventType.REVIEW_OPEN, days_ago=120)
+        call_command("rebuild_tag_engagement", "--days", "130", stdout=StringIO())
+
+        scores = compute_tag_scores()
+
+        self.assertEqual(scores, {self.tag.pk: {"opens": 0, "engaged": 0, "full_text": 1, "shares": 0, "score": 4}})
+        self.assertEqual(cache.get(CACHE_KEY), scores)
+
+    def test_analytics_rollup_refreshes_scores(self):
+        self._event(AnalyticsEvent.EventType.REVIEW_OPEN)
+        cache.set(CACHE_KEY, {}, 60)
+
+        refresh_rollups()
+
+        self.assertEqual(compute_tag_scores()[self.tag.pk]["score"], 1)
+
 
 class IssueModelTest(TestCase):
     def setUp(self):
@@ -277,6 +451,36 @@ class HitTestCase(TestCase):
     def test_get_count(self):
         self.assertEqual(Hit.get_count(self.article), self.hit.count)
 
+    def test_record_hit_buffers_in_redis_and_flush_adds_to_row(self):
+        client = FakeRedis()
+        with patch("spanza_journal_watch.submissions.hits.get_redis_client", return_value=client):
+            record_hit(self.article)
+            record_hit(self.article)
+            self.hit.refresh_from_db()
+            self.assertEqual(self.hit.count, 0)
+
+            self.assertEqual(flush_hit_counts(), 1)
+
+        self.hit.refresh_from_db()
+        self.assertEqual(self.hit.count, 2)
+        self.assertEqual(client.data, {})
+
+    def test_flush_creates_missing_hit_rows(self):
+        other = PubmedArticle.objects.create(title="Unseen Article")
+        client = FakeRedis()
+        with patch("spanza_journal_watch.submissions.hits.get_redis_client", return_value=client):
+            record_hit(other)
+            flush_hit_counts()
+
+        self.assertEqual(Hit.get_count(other), 1)
+
+    def test_record_hit_writes_directly_without_redis(self):
+        with patch("spanza_journal_watch.submissions.hits.get_redis_client", return_value=None):
+            record_hit(self.article)
+
+        self.hit.refresh_from_db()
+        self.assertEqual(self.hit.count, 1)
+
 
 class ReviewHumanHitsTestCase(TestCase):
     def setUp(self):
@@ -323,6 +527,21 @@ class ReviewHumanHitsTestCase(TestCase):
 
         self.assertEqual(self.review.get_hits(), 7)
 
+    def test_get_hits_is_cached_until_hits_are_flushed(self):
+        hit = Hit.objects.create(content_object=self.review, count=3)
+        self.assertEqual(self.review.get_hits(), 3)
+
+        client = FakeRedis()
+        with patch("spanza_journal_watch.submissions.hits.get_redis_client", return_value=client):
+            record_hit(self.review)
+            with self.assertNumQueries(0):
+                self.assertEqual(self.review.get_hits(), 3)
+            flush_hit_counts()
+
+        hit.refresh_from_db()
+        self.assertEqual(hit.count, 4)
+        self.assertEqual(self.review.get_hits(), 4)
+
 
 class JournalBrowserTestCase(TestCase):
     def setUp(self):
@@ -402,3 +621,16 @@ class JournalBrowserTestCase(TestCase):
         state = PubmedArticleUserState.objects.get(user=self.user, article=self.article)
         self.assertIsNotNone(state.starred_at)
         self.assertIsNotNone(state.recommended_at)
+
+    def test_journal_search_matches_prefixes_across_indexed_fields(self):
+        url = reverse("submissions:journal_search")
+
+        title_prefix = self.client.get(url, {"q": "regional anaesth"})
+        mesh_prefix = self.client.get(url, {"q": "analges"})
+        pmid_prefix = self.client.get(url, {"q": "987654"})
+        no_match = self.client.get(url, {"q": "cardiopulmonary"})
+
+        self.assertContains(title_prefix, "Regional anaesthesia in children")
+        self.assertContains(mesh_prefix, "Regional anaesthesia in children")
+        self.assertContains(pmid_prefix, "Regional anaesthesia in children")
+        self.assertEqual(no_match.context["results"], [])
@@ -2,10 +2,11 @@
 Tests for submissions/signals.py cache invalidation.
 
 Covers:
-1. post_save on content models bumps cache version
-2. post_delete on content models bumps cache version
-3. M2M changes (Issue.reviews, Tag.articles) bump cache version
-4. raw=True (fixture loading) does NOT bump cache version
+1. post_save on content models invalidates the cache tags they affect
+2. post_delete on content models invalidates the cache tags they affect
+3. M2M changes (Issue.reviews, Tag.articles) invalidate cache tags
+4. Unreviewed PubMed articles only invalidate the articles tag
+5. raw=True (fixture loading) does NOT invalidate anything
 """
 
 from unittest.mock import patch
@@ -14,6 +15,13 @@ import pytest
 
 from spanza_journal_watch.backend.models import PubmedArticle
 from spanza_journal_watch.submissions.models import Author, Issue, Review, Tag
+from spanza_journal_watch.utils.cache import (
+    CACHE_TAG_ARTICLES,
+    CACHE_TAG_ISSUES,
+    CACHE_TAG_REVIEWS,
+    CACHE_TAG_TAGS,
+    get_cache_tags_version,
+)
 
 pytestmark = pytest.mark.django_db
 
@@ -27,99 +35,130 @@ def _clear_cache():
     cache.clear()
 
 
-BUMP_PATH = "spanza_journal_watch.submissions.signals.bump_content_cache_version"
+INVALIDATE_PATH = "spanza_journal_watch.submissions.signals.invalidate_cache_tags"
+
+
+def _invalidated_tags(mock_invalidate):
+    return {tag for call in mock_invalidate.call_args_list for tag in call.args}
 
 
 class TestCacheInvalidationOnSave:
-    def test_tag_save_bumps_cache(self, _clear_cache):
-        with patch(BUMP_PATH) as mock_bump:
+    def test_tag_save_invalidates_tags(self, _clear_cache):
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             Tag.objects.create(text="Signal Test Tag", active=True)
-        mock_bump.assert_called()
+        assert CACHE_TAG_TAGS in _invalidated_tags(mock_invalidate)
 
-    def test_author_save_bumps_cache(self, _clear_cache):
-        with patch(BUMP_PATH) as mock_bump:
+    def test_author_save_invalidates_reviews(self, _clear_cache):
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             Author.objects.create(name="Signal Test Author")
-        mock_bump.assert_called()
+        assert CACHE_TAG_REVIEWS in _invalidated_tags(mock_invalidate)
 
-    def test_issue_save_bumps_cache(self, _clear_cache):
-        with patch(BUMP_PATH) as mock_bump:
+    def test_issue_save_invalidates_issues(self, _clear_cache):
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             Issue.objects.create(name="Signal Test Issue", body="body")
-        mock_bump.assert_called()
+        assert CACHE_TAG_ISSUES in _invalidated_tags(mock_invalidate)
 
-    def test_review_save_bumps_cache(self, _clear_cache):
+    def test_review_save_invalidates_reviews(self, _clear_cache):
         article = PubmedArticle.objects.create(title="Signal Test Article")
-        with patch(BUMP_PATH) as mock_bump:
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             Review.objects.create(article=article, body="body", slug="signal-test-review")
-        mock_bump.assert_called()
+        assert {CACHE_TAG_REVIEWS, CACHE_TAG_ISSUES, CACHE_TAG_TAGS} <= _invalidated_tags(mock_invalidate)
 
-    def test_pubmed_article_save_bumps_cache(self, _clear_cache):
-        with patch(BUMP_PATH) as mock_bump:
+    def test_unreviewed_article_save_only_invalidates_articles(self, _clear_cache):
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             PubmedArticle.objects.create(title="Signal PubMed Article")
-        mock_bump.assert_called()
+        assert _invalidated_tags(mock_invalidate) == {CACHE_TAG_ARTICLES}
+
+    def test_reviewed_article_save_invalidates_reviews(self, _clear_cache):
+        article = PubmedArticle.objects.create(title="Reviewed PubMed Article")
+        Review.objects.create(article=article, body="body", slug="reviewed-pubmed-article")
+        with patch(INVALIDATE_PATH) as mock_invalidate:
+            article.save()
+        assert {CACHE_TAG_ARTICLES, CACHE_TAG_REVIEWS} <= _invalidated_tags(mock_invalidate)
 
 
 class TestCacheInvalidationOnDelete:
-    def test_tag_delete_bumps_cache(self, _clear_cache):
+    def test_tag_delete_invalidates_tags(self, _clear_cache):
         tag = Tag.objects.create(text="Delete Signal Tag", active=True)
-        with patch(BUMP_PATH) as mock_bump:
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             tag.delete()
-        mock_bump.assert_called()
+        assert CACHE_TAG_TAGS in _invalidated_tags(mock_invalidate)
 
-    def test_author_delete_bumps_cache(self, _clear_cache):
+    def test_author_delete_invalidates_reviews(self, _clear_cache):
         author = Author.objects.create(name="Delete Signal Author")
-        with patch(BUMP_PATH) as mock_bump:
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             author.delete()
-        mock_bump.assert_called()
+        assert CACHE_TAG_REVIEWS in _invalidated_tags(mock_invalidate)
 
 
 class TestCacheInvalidationOnM2MChange:
-    def test_issue_reviews_add_bumps_cache(self, _clear_cache):
+    def test_issue_reviews_add_invalidates_issues(self, _clear_cache):
         article = PubmedArticle.objects.create(title="M2M Article")
         review = Review.objects.create(article=article, body="body", slug="m2m-review")
         issue = Issue.objects.create(name="M2M Issue", body="body")
-        with patch(BUMP_PATH) as mock_bump:
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             issue.reviews.add(review)
-        mock_bump.assert_called()
+        assert CACHE_TAG_ISSUES in _invalidated_tags(mock_invalidate)
 
-    def test_issue_reviews_remove_bumps_cache(self, _clear_cache):
+    def test_issue_reviews_remove_invalidates_issues(self, _clear_cache):
         article = PubmedArticle.objects.create(title="M2M Remove Article")
         review = Review.objects.create(article=article, body="body", slug="m2m-remove-review")
         issue = Issue.objects.create(name="M2M Remove Issue", body="body")
         issue.reviews.add(review)
-        with patch(BUMP_PATH) as mock_bump:
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             issue.reviews.remove(review)
-        mock_bump.assert_called()
-
-    def test_tag_articles_add_bumps_cache(self, _clear_cache):
-        tag = Tag.objects.create(text="M2M Tag", active=True)
-        article = PubmedArticle.objects.create(title="M2M Tag Article")
-        with patch(BUMP_PATH) as mock_bump:
-            tag.articles.add(article)
-        mock_bump.assert_called()
+        assert CACHE_TAG_ISSUES in _invalidated_tags(mock_invalidate)
 
-    def test_issue_reviews_clear_bumps_cache(self, _clear_cache):
+    def test_issue_reviews_clear_invalidates_issues(self, _clear_cache):
         article = PubmedArticle.objects.create(title="M2M Clear Article")
         review = Review.objects.create(article=article, body="body", slug="m2m-clear-review")
         issue = Issue.objects.create(name="M2M Clear Issue", body="body")
         issue.reviews.add(review)
-        with patch(BUMP_PATH) as mock_bump:
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             issue.reviews.clear()
-        mock_bump.assert_called()
+        assert CACHE_TAG_ISSUES in _invalidated_tags(mock_invalidate)
+
+    def test_tag_reviewed_article_invalidates_tags(self, _clear_cache):
+        tag = Tag.objects.create(text="M2M Tag", active=True)
+        article = PubmedArticle.objects.create(title="M2M Tag Article")
+        Review.objects.create(article=article, body="body", slug="m2m-tag-review")
+        with patch(INVALIDATE_PATH) as mock_invalidate:
+            tag.articles.add(article)
+        assert CACHE_TAG_TAGS in _invalidated_tags(mock_invalidate)
+
+    def test_tag_unreviewed_article_only_invalidates_articles(self, _clear_cache):
+        tag = Tag.objects.create(text="M2M Ingest Tag", active=True)
+        article = PubmedArticle.objects.create(title="M2M Ingest Article")
+        with patch(INVALIDATE_PATH) as mock_invalidate:
+            article.tags.add(tag)
+        assert _invalidated_tags(mock_invalidate) == {CACHE_TAG_ARTICLES}
+
+
+class TestIngestionKeepsPagesWarm:
+    def test_unreviewed_article_save_keeps_review_tags_version(self, _clear_cache):
+        before = get_cache_tags_version([CACHE_TAG_REVIEWS, CACHE_TAG_ISSUES, CACHE_TAG_TAGS])
+        PubmedArticle.objects.create(title="Ingested Article")
+        assert get_cache_tags_version([CACHE_TAG_REVIEWS, CACHE_TAG_ISSUES, CACHE_TAG_TAGS]) == before
+
+    def test_unreviewed_article_save_changes_articles_version(self, _clear_cache):
+        before = get_cache_tags_version([CACHE_TAG_ARTICLES])
+        PubmedArticle.objects.create(title="Ingested Journal Article")
+        assert get_cache_tags_version([CACHE_TAG_ARTICLES]) != before
 
 
-class TestRawSaveSkipsBump:
-    def test_raw_save_does_not_bump(self, _clear_cache):
-        """When loading fixtures (raw=True), signals should not bump cache."""
+class TestRawSaveSkipsInvalidation:
+    def test_raw_save_does_not_invalidate(self, _clear_cache):
+        """When loading fixtures (raw=True), signals should not invalidate the cache."""
         from django.db.models.signals import post_save
 
-        with patch(BUMP_PATH) as mock_bump:
+        with patch(INVALIDATE_PATH) as mock_invalidate:
             # Simulate a raw save by sending the signal directly
             tag = Tag(text="Raw Tag", active=True)
             tag.save()
-            mock_bump.reset_mock()
+            mock_invalidate.reset_mock()
 
             # Now send signal with raw=True
             post_save.send(sender=Tag, instance=tag, raw=True, created=False)
 
-        # The raw=True call should not have triggered a bump
-        mock_bump.assert_not_called()
+        # The raw=True call should not have triggered an invalidation
+        mock_invalidate.assert_not_called()
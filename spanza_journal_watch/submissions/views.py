@@ -1,9 +1,11 @@
 import datetime
 import json
+import re
 from urllib.parse import urlencode
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.core.cache import cache
 from django.db.models import Count, Exists, F, IntegerField, OuterRef, Prefetch, Q, Subquery, Value, Window
 from django.db.models.functions import Coalesce, RowNumber
@@ -29,13 +31,20 @@ from spanza_journal_watch.backend.models import (
     WatchedJournalArticle,
     can_recommend_pubmed_articles,
 )
-from spanza_journal_watch.backend.pubmed_cache import article_matches_topic, article_metadata_list, shift_month
+from spanza_journal_watch.backend.pubmed_cache import shift_month
+from spanza_journal_watch.backend.topics import article_metadata_list
 from spanza_journal_watch.layout.models import PageHeader
-from spanza_journal_watch.utils.cache import get_content_cache_version
+from spanza_journal_watch.utils.cache import (
+    ALL_CACHE_TAGS,
+    CACHE_TAG_REVIEWS,
+    CACHE_TAG_TAGS,
+    get_cache_tags_version,
+)
 from spanza_journal_watch.utils.functions import get_domain_url, shorten_text
 from spanza_journal_watch.utils.mixins import AnonymousCacheMixin, HitMixin, HtmxMixin, SidebarMixin
 
 from .models import Author, CuratedCollection, HealthService, Issue, IssueSlugRedirect, Review, Tag
+from .related import related_reviews_by_article
 from .templatetags.tag_scores import compute_tag_scores
 
 # ---------------------------------------------------------------------------
@@ -72,25 +81,6 @@ JOURNAL_SECTIONS = [
     ("Letters", "letters", {"Letter"}),
 ]
 
-_PAEDIATRIC_MESH_TERMS = {
-    "Pediatrics",
-    "Infant",
-    "Infant, Newborn",
-    "Child",
-    "Child, Preschool",
-    "Adolescent",
-}
-_PAEDIATRIC_TEXT_TERMS = {
-    "pediatric",
-    "paediatric",
-    "child",
-    "children",
-    "infant",
-    "newborn",
-    "neonat",
-    "adolescent",
-}
-
 IGNORED_PUBLICATION_TYPES = {
     "Journal Article",
     "Research Support, Non-U.S. Gov't",
@@ -126,7 +116,6 @@ def _group_articles_by_section(rows):
     publication_types, with title-based heuristics as a fallback for articles
     that PubMed only tags as "Journal Article".  Empty sections are omitted.
     """
-    import re
 
     # Title patterns that indicate correspondence (Comment/Reply at end of title)
     _correspondence_re = re.compile(r":\s*(Comment|Reply|Response|Correspondence|Authors?\s*Reply)\.?\s*$", re.I)
@@ -952,9 +941,8 @@ class SearchView(AnonymousCacheMixin, BaseBreadcrumbMixin, SidebarMixin, HtmxMix
             }
         )
 
-        cache_version = get_content_cache_version()
-        year_options_key = f"search_year_options:v{cache_version}"
-        tag_options_key = f"search_tag_options:v{cache_version}"
+        year_options_key = f"search_year_options:{get_cache_tags_version([CACHE_TAG_REVIEWS])}"
+        tag_options_key = f"search_tag_options:{get_cache_tags_version([CACHE_TAG_TAGS, CACHE_TAG_REVIEWS])}"
 
         context["year_options"] = cache.get_or_set(
             year_options_key,
@@ -1261,12 +1249,12 @@ def _journal_browser_context(request):
     ).exists()
 
     # --- Fetch articles for this journal + month ---
+    month_links = WatchedJournalArticle.objects.filter(
+        publication_month=selected_month,
+        watched_journal_id=selected_journal_id,
+    )
     article_links = (
-        WatchedJournalArticle.objects.filter(
-            publication_month=selected_month,
-            watched_journal_id=selected_journal_id,
-        )
-        .select_related("article", "watched_journal")
+        month_links.select_related("article", "watched_journal")
         .annotate(
             recommendation_count=Count(
                 "article__user_states",
@@ -1282,6 +1270,18 @@ def _journal_browser_context(request):
         .order_by("-article__publication_date", "-article__publication_month", "article__title")
     )
 
+    # --- Parse filter state from query params, falling back to session, then default on ---
+    filter_paediatric = request.GET.get("paediatric", request.session.get("jw_filter_paediatric", "1")) == "1"
+    filter_has_abstract = request.GET.get("has_abstract", request.session.get("jw_filter_has_abstract", "1")) == "1"
+    request.session["jw_filter_paediatric"] = "1" if filter_paediatric else "0"
+    request.session["jw_filter_has_abstract"] = "1" if filter_has_abstract else "0"
+
+    # Server-side filters run in SQL on the precomputed topic columns.
+    if filter_paediatric:
+        article_links = article_links.filter(article__topic_paediatric=True)
+    if filter_has_abstract:
+        article_links = article_links.exclude(article__abstract="")
+
     article_links = list(article_links)
     user_state_map = {}
     if request.user.is_authenticated:
@@ -1306,43 +1306,24 @@ def _journal_browser_context(request):
         for rev in reviewed:
             review_map.setdefault(rev.article_id, rev)
 
-    # --- Parse filter state from query params, falling back to session, then default on ---
-    filter_paediatric = request.GET.get("paediatric", request.session.get("jw_filter_paediatric", "1")) == "1"
-    filter_has_abstract = request.GET.get("has_abstract", request.session.get("jw_filter_has_abstract", "1")) == "1"
-    request.session["jw_filter_paediatric"] = "1" if filter_paediatric else "0"
-    request.session["jw_filter_has_abstract"] = "1" if filter_has_abstract else "0"
-
     rows = []
-    total_unfiltered = 0
     seen_article_ids = set()
     for link in article_links:
         if link.article_id in seen_article_ids:
             continue
         seen_article_ids.add(link.article_id)
-        total_unfiltered += 1
         link.user_state = user_state_map.get(link.article_id)
         link.session_starred = link.article_id in session_starred_ids
         link.publication_types = article_metadata_list(link.article, "publication_types")
         link.mesh_terms = article_metadata_list(link.article, "mesh_terms")
         link.keywords = article_metadata_list(link.article, "keywords")
-        link.is_paediatric = article_matches_topic(
-            link.article,
-            mesh_terms=_PAEDIATRIC_MESH_TERMS,
-            text_terms=_PAEDIATRIC_TEXT_TERMS,
-        )
+        link.is_paediatric = link.article.topic_paediatric
         link.review = review_map.get(link.article_id)
         if request.user.is_authenticated:
             state = user_state_map.get(link.article_id)
             link.full_text_read = bool(state and state.full_text_clicked_at)
         else:
             link.full_text_read = link.article_id in session_fulltext_ids
-
-        # Apply server-side filters
-        if filter_paediatric and not link.is_paediatric:
-            continue
-        if filter_has_abstract and not link.article.abstract:
-            continue
-
         rows.append(link)
 
     sections = _group_articles_by_section(rows)
@@ -1363,115 +1344,32 @@ def _journal_browser_context(request):
         "session_starred_ids": session_starred_ids,
         "filter_paediatric": filter_paediatric,
         "filter_has_abstract": filter_has_abstract,
-        "all_filtered_out": total_unfiltered > 0 and len(rows) == 0,
+        "all_filtered_out": not rows and month_links.exists(),
         "hidden_journal_count": sum(1 for j in active_journals if j.shelf_hidden),
     }
 
 
 def _attach_related_reviews(rows):
-    """Batch-attach related reviews to all journal browser articles based on shared curated tags.
+    """Attach up to two precomputed related reviews to each journal browser row.
 
-    Uses two queries total (tag links + candidate reviews) instead of one per row.
+    Reviews of articles already listed on the page are skipped.
     """
     if not rows:
         return
-
-    article_ids = [r.article_id for r in rows]
-
-    # 1) Fetch curated tag IDs per article in one query
-    tag_links = Tag.objects.filter(curated=True, active=True, articles__id__in=article_ids).values_list(
-        "articles__id", "id"
-    )
-    article_tag_map: dict[int, set[int]] = {}
-    all_tag_ids: set[int] = set()
-    for article_id, tag_id in tag_links:
-        article_tag_map.setdefault(article_id, set()).add(tag_id)
-        all_tag_ids.add(tag_id)
-
-    if not all_tag_ids:
-        for row in rows:
-            row.related_reviews = []
-        return
-
-    # 2) Fetch all candidate related reviews in one query, excluding current page articles
-    article_id_set = set(article_ids)
-    TagArticle = Tag.articles.through
-    candidate_reviews = list(
-        Review.objects.filter(active=True)
-        .filter(Exists(TagArticle.objects.filter(pubmedarticle_id=OuterRef("article_id"), tag_id__in=all_tag_ids)))
-        .exclude(article_id__in=article_id_set)
-        .select_related("article__journal", "author")
-        .prefetch_related("article__tags")
-    )
-
-    # Build review → tag_id set lookup from prefetched tags
-    review_tag_map: dict[int, set[int]] = {}
-    for review in candidate_reviews:
-        review_tag_map[review.pk] = {t.pk for t in review.article.tags.all()}
-
-    # 3) Distribute reviews to rows based on shared tag overlap
+    article_ids = [row.article_id for row in rows]
+    related = related_reviews_by_article(article_ids, limit=2, exclude_article_ids=article_ids)
     for row in rows:
-        row_tag_ids = article_tag_map.get(row.article_id, set())
-        if not row_tag_ids:
-            row.related_reviews = []
-            continue
-
-        scored = []
-        for review in candidate_reviews:
-            shared = len(review_tag_map.get(review.pk, set()) & row_tag_ids)
-            if shared:
-                scored.append((shared, review))
-        scored.sort(key=lambda x: (-x[0], -(x[1].publish_date or datetime.date.min).toordinal()))
-        row.related_reviews = [review for _, review in scored[:2]]
+        row.related_reviews = related[row.article_id]
 
 
 def _attach_related_reviews_to_issue_page(reviews):
-    """Batch-attach related reviews to issue detail page reviews (same pattern as journal browser)."""
+    """Attach up to four precomputed related reviews to each review on an issue page."""
     if not reviews:
         return
-
-    article_ids = [r.article_id for r in reviews]
-
-    tag_links = Tag.objects.filter(curated=True, active=True, articles__id__in=article_ids).values_list(
-        "articles__id", "id"
-    )
-    article_tag_map: dict[int, set[int]] = {}
-    all_tag_ids: set[int] = set()
-    for article_id, tag_id in tag_links:
-        article_tag_map.setdefault(article_id, set()).add(tag_id)
-        all_tag_ids.add(tag_id)
-
-    if not all_tag_ids:
-        for review in reviews:
-            review.related_reviews = []
-        return
-
-    article_id_set = set(article_ids)
-    TagArticle = Tag.articles.through
-    candidate_reviews = list(
-        Review.objects.filter(active=True)
-        .filter(Exists(TagArticle.objects.filter(pubmedarticle_id=OuterRef("article_id"), tag_id__in=all_tag_ids)))
-        .exclude(article_id__in=article_id_set)
-        .select_related("article__journal", "author")
-        .prefetch_related("article__tags")
-    )
-
-    review_tag_map: dict[int, set[int]] = {}
-    for candidate in candidate_reviews:
-        review_tag_map[candidate.pk] = {t.pk for t in candidate.article.tags.all()}
-
+    article_ids = [review.article_id for review in reviews]
+    related = related_reviews_by_article(article_ids, limit=4, exclude_article_ids=article_ids)
     for review in reviews:
-        row_tag_ids = article_tag_map.get(review.article_id, set())
-        if not row_tag_ids:
-            review.related_reviews = []
-            continue
-        scored = []
-        for candidate in candidate_reviews:
-            shared = len(review_tag_map.get(candidate.pk, set()) & row_tag_ids)
-            if shared:
-                scored.append((shared, candidate))
-        scored.sort(key=lambda x: (-x[0], -(x[1].publish_date or datetime.date.min).toordinal()))
-        review.related_reviews = [r for _, r in scored[:4]]
+        review.related_reviews = related[review.article_id]
 
 
 def _journal_article_actions_context(request, article):
@@ -1496,6 +1394,8 @@ def _journal_article_actions_context(request, article):
 
 class JournalListView(AnonymousCacheMixin, TemplateView):
     template_name = "submissions/journal_list.html"
+    # The journal browser lists unreviewed PubMed articles as well.
+    cache_tags = ALL_CACHE_TAGS
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -1658,30 +1558,38 @@ def journal_article_toggle_recommend(request, article_id):
     return redirect(request.POST.get("next") or reverse("submissions:journal_list"))
 
 
+def _prefix_search_query(query):
+    """AND of prefix terms, so each keystroke matches partially typed words."""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return SearchQuery(" & ".join(f"{word}:*" for word in words), search_type="raw")
+
+
 def journal_search(request):
-    """Live search across all journals, rendered in the search drawer."""
+    """Live search across all journals, rendered in the search drawer.
+
+    Matches go through the weighted ``PubmedArticle.search_vector`` GIN index
+    (plus PMID/DOI prefixes) and are ranked, so latency stays flat as the
+    cache grows; recommendation counts are only computed for the shown rows.
+    """
     query = (request.GET.get("q") or "").strip()
     journal_filter = request.GET.get("journal") or ""
     active_journals = list(WatchedJournal.objects.filter(active=True).order_by("name"))
 
     results = []
-    if len(query) >= 2:
+    search_query = _prefix_search_query(query) if len(query) >= 2 else None
+    if search_query is not None:
+        match = Q(article__search_vector=search_query)
+        if query.isdigit():
+            match |= Q(article__pmid__startswith=query)
+        elif query.startswith("10."):
+            match |= Q(article__doi__startswith=query.lower())
         qs = (
             WatchedJournalArticle.objects.select_related("article", "watched_journal")
-            .annotate(
-                recommendation_count=Count(
-                    "article__user_states",
-                    filter=Q(article__user_states__recommended_at__isnull=False),
-                    distinct=True,
-                )
-            )
-            .filter(
-                Q(article__title__icontains=query)
-                | Q(article__abstract__icontains=query)
-                | Q(article__doi__icontains=query)
-                | Q(article__pmid__icontains=query)
-            )
-            .order_by("-article__publication_date", "-article__publication_month", "article__title")
+            .filter(match)
+            .annotate(rank=SearchRank(F("article__search_vector"), search_query))
+            .order_by("-rank", "-article__publication_date", "-article__publication_month", "article__title")
         )
         if journal_filter and str(journal_filter).isdigit():
             qs = qs.filter(watched_journal_id=int(journal_filter))
@@ -1695,6 +1603,15 @@ def journal_search(request):
             if len(results) >= 50:
                 break
 
+        recommendation_counts = dict(
+            PubmedArticleUserState.objects.filter(article_id__in=seen, recommended_at__isnull=False)
+            .values("article_id")
+            .annotate(c=Count("id"))
+            .values_list("article_id", "c")
+        )
+        for link in results:
+            link.recommendation_count = recommendation_counts.get(link.article_id, 0)
+
     context = {
         "query": query,
         "results": results,
@@ -1,5 +1,7 @@
 from django.conf import settings
 
+from spanza_journal_watch.utils.cache import CACHE_TAG_SUBSCRIBERS, cached_context_value
+
 
 def allauth_settings(request):
     """Expose some settings from django-allauth in templates."""
@@ -11,9 +13,11 @@ def allauth_settings(request):
     if request.user.is_authenticated:
         from spanza_journal_watch.newsletter.models import Subscriber
 
-        ctx["user_is_subscribed"] = Subscriber.objects.filter(
-            email__iexact=request.user.email,
-            subscribed=True,
-        ).exists()
+        email = request.user.email
+        ctx["user_is_subscribed"] = cached_context_value(
+            f"user_is_subscribed:{request.user.pk}:{email.lower()}",
+            [CACHE_TAG_SUBSCRIBERS],
+            lambda: Subscriber.objects.filter(email__iexact=email, subscribed=True).exists(),
+        )
 
     return ctx
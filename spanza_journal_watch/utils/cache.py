@@ -1,6 +1,33 @@
+import logging
+
+from django.conf import settings
 from django.core.cache import cache
 
+logger = logging.getLogger(__name__)
+
 CONTENT_CACHE_VERSION_KEY = "content_cache_version"
+CACHE_TAG_KEY_PREFIX = "cachetag:"
+
+# Dependency tags for cached pages and fragments. Each tag has its own version
+# counter; a cache key folds in the versions of the tags its content depends
+# on, so invalidating a tag only misses the entries that declared it.
+CACHE_TAG_REVIEWS = "reviews"  # Reviews and anything shown with them (authors, reviewed articles)
+CACHE_TAG_ISSUES = "issues"
+CACHE_TAG_TAGS = "tags"  # Tags and tag membership of reviewed articles
+CACHE_TAG_LAYOUT = "layout"  # Homepage, feature articles, page headers
+CACHE_TAG_ARTICLES = "articles"  # Any PubMed article, reviewed or not (journal browser)
+
+PUBLIC_PAGE_CACHE_TAGS = (CACHE_TAG_REVIEWS, CACHE_TAG_ISSUES, CACHE_TAG_TAGS, CACHE_TAG_LAYOUT)
+ALL_CACHE_TAGS = (*PUBLIC_PAGE_CACHE_TAGS, CACHE_TAG_ARTICLES)
+
+# Tags for values cached by the template context processors.
+CACHE_TAG_PERMISSIONS = "permissions"  # User/group permission assignments
+CACHE_TAG_ISSUE_CONTRIBUTORS = "issue_contributors"
+CACHE_TAG_INBOX = "inbox"
+CACHE_TAG_PREFERENCES = "preferences"  # BackendPreference
+CACHE_TAG_SUBSCRIBERS = "subscribers"
+
+CONTEXT_CACHE_TIMEOUT = 60 * 30
 
 
 def get_content_cache_version():
@@ -12,8 +39,74 @@ def get_content_cache_version():
 
 
 def bump_content_cache_version():
+    """Invalidate every tagged cache entry at once.
+
+    Prefer invalidate_cache_tags(); this is the global fallback for changes
+    that cannot be attributed to specific tags.
+    """
     try:
         return cache.incr(CONTENT_CACHE_VERSION_KEY)
     except ValueError:
         cache.set(CONTENT_CACHE_VERSION_KEY, 2, timeout=None)
         return 2
+
+
+def get_cache_tags_version(tags):
+    """Return a token for the current versions of ``tags``, for use in cache keys.
+
+    The token also carries the global content version, so
+    bump_content_cache_version() still invalidates everything.
+    """
+    tags = sorted(set(tags))
+    tag_keys = [f"{CACHE_TAG_KEY_PREFIX}{tag}" for tag in tags]
+    versions = cache.get_many([CONTENT_CACHE_VERSION_KEY, *tag_keys])
+
+    content_version = versions.get(CONTENT_CACHE_VERSION_KEY)
+    if content_version is None:
+        content_version = get_content_cache_version()
+    parts = [f"v{content_version}"]
+    for tag, tag_key in zip(tags, tag_keys, strict=True):
+        version = versions.get(tag_key)
+        if version is None:
+            cache.add(tag_key, 1, timeout=None)
+            version = 1
+        parts.append(f"{tag}{version}")
+    return ".".join(parts)
+
+
+def cached_context_value(name, tags, compute):
+    """Return ``compute()`` cached under the current versions of ``tags``.
+
+    Used by context processors so editorial pages and HTMX partials do not
+    re-run the same lookups on every render.
+    """
+    return cache.get_or_set(f"ctx:{name}:{get_cache_tags_version(tags)}", compute, CONTEXT_CACHE_TIMEOUT)
+
+
+def invalidate_cache_tags(*tags):
+    """Bump the version of each tag so entries depending on it miss."""
+    for tag in set(tags):
+        tag_key = f"{CACHE_TAG_KEY_PREFIX}{tag}"
+        try:
+            cache.incr(tag_key)
+        except ValueError:
+            cache.set(tag_key, 2, timeout=None)
+
+
+def get_redis_client():
+    """Return the raw Redis client behind the default cache, or None.
+
+    Callers use this for atomic list/counter operations the cache API lacks,
+    and fall back to a synchronous database path when it returns None (e.g.
+    LocMem/Dummy caches in tests and local development).
+    """
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if not backend.startswith("django_redis."):
+        return None
+    from django_redis import get_redis_connection
+
+    try:
+        return get_redis_connection("default")
+    except Exception:
+        logger.warning("Redis client unavailable", exc_info=True)
+        return None
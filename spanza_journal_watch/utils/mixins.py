@@ -1,27 +1,92 @@
+import hashlib
+import time
+import zlib
+
 from django.conf import settings
 from django.core.cache import cache
 from django.db.models import Count
-from django.http import HttpResponse
+from django.http import HttpResponse, HttpResponseNotModified
 from django.template.loader import render_to_string
+from django.utils.http import parse_etags
 
 from spanza_journal_watch.analytics.utils import is_probable_automated_event
 from spanza_journal_watch.newsletter.cookies import has_subscribed_cookie
-from spanza_journal_watch.submissions.models import Hit, Issue, Tag
-from spanza_journal_watch.utils.cache import get_content_cache_version
+from spanza_journal_watch.submissions.hits import record_hit
+from spanza_journal_watch.submissions.models import Issue, Tag
+from spanza_journal_watch.utils.cache import (
+    CACHE_TAG_ISSUES,
+    CACHE_TAG_REVIEWS,
+    CACHE_TAG_TAGS,
+    PUBLIC_PAGE_CACHE_TAGS,
+    get_cache_tags_version,
+)
+
+# Response headers kept in page cache entries; everything else (cookies, Vary,
+# per-request headers) is re-added by middleware or dropped.
+CACHED_RESPONSE_HEADERS = ("Content-Type", "Content-Language", "HX-Trigger", "X-Robots-Tag")
+
+
+def _page_cache_entry(response):
+    """Serialise a rendered response as a compact cache entry with a strong ETag."""
+    body = response.content
+    return {
+        "etag": f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+        "headers": {name: response[name] for name in CACHED_RESPONSE_HEADERS if response.has_header(name)},
+        "body": zlib.compress(body),
+    }
+
+
+def _etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return etag in etags or "*" in etags
+
+
+def _not_modified_response(etag):
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    return response
+
+
+def _response_from_page_cache_entry(request, entry):
+    if _etag_matches(request, entry["etag"]):
+        return _not_modified_response(entry["etag"])
+    response = HttpResponse(zlib.decompress(entry["body"]))
+    for name, value in entry["headers"].items():
+        response[name] = value
+    response["ETag"] = entry["etag"]
+    return response
 
 
 class AnonymousCacheMixin:
     """Cache rendered responses for anonymous GET requests.
 
     Uses Redis with a key derived from the URL, HX-Request header, and the
-    content cache version (bumped on publish) so cached pages are automatically
-    invalidated when content changes.
+    versions of the cache tags the page depends on (``cache_tags``), so a page
+    is invalidated only when content it shows changes.
+
+    Entries hold the zlib-compressed body, a few headers and a strong ETag
+    (see _page_cache_entry). The ETag is also stored on its own, so a matching
+    If-None-Match is answered with 304 without fetching the body.
+
+    On a miss only one worker renders the page (a short cache lock guards the
+    key). Concurrent requests get the previous rendering, which is kept for
+    ANONYMOUS_CACHE_STALE_GRACE seconds past its timeout, or wait briefly for
+    the new one. A hot page invalidated by a publish therefore costs one
+    render, not one per request.
 
     Views that include HitMixin should be aware that hit counters only fire on
     cache misses.
     """
 
     anonymous_cache_timeout = 300  # 5 minutes
+    cache_tags = PUBLIC_PAGE_CACHE_TAGS
+    # How long a request without a stale copy waits for another worker's render
+    # before rendering itself.
+    anonymous_cache_wait = 2.0
+    anonymous_cache_poll_interval = 0.05
 
     def dispatch(self, request, *args, **kwargs):
         if request.method != "GET" or request.user.is_authenticated:
@@ -37,22 +102,60 @@ class AnonymousCacheMixin:
 
         is_htmx = request.headers.get("HX-Request") == "true"
         sub_flag = int(has_subscribed_cookie(request))
-        version = get_content_cache_version()
-        cache_key = f"page:v{version}:{request.get_full_path()}:htmx={is_htmx}:sub={sub_flag}"
-
-        response = cache.get(cache_key)
-        if response is not None:
-            return response
-
-        response = super().dispatch(request, *args, **kwargs)
-        if hasattr(response, "render"):
-            response.render()
-
-        if response.status_code == 200:
-            cache.set(cache_key, response, self.anonymous_cache_timeout)
+        page_key = hashlib.blake2b(
+            f"{request.get_full_path()}:htmx={is_htmx}:sub={sub_flag}".encode(), digest_size=16
+        ).hexdigest()
+        version = get_cache_tags_version(self.cache_tags)
+        cache_key = f"page:{version}:{page_key}"
+        etag_key = f"page:etag:{version}:{page_key}"
+        stale_key = f"page:stale:{page_key}"
+        lock_key = f"page:lock:{version}:{page_key}"
+
+        if "If-None-Match" in request.headers:
+            etag = cache.get(etag_key)
+            if etag is not None and _etag_matches(request, etag):
+                return _not_modified_response(etag)
+
+        entry = cache.get(cache_key)
+        if entry is not None:
+            return _response_from_page_cache_entry(request, entry)
+
+        locked = cache.add(lock_key, 1, settings.ANONYMOUS_CACHE_LOCK_TIMEOUT)
+        if not locked:
+            # Another worker is rendering this page.
+            entry = cache.get(stale_key)
+            if entry is None:
+                entry = self._wait_for_cached_page(cache_key)
+            if entry is not None:
+                return _response_from_page_cache_entry(request, entry)
+
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+
+            if response.status_code == 200:
+                entry = _page_cache_entry(response)
+                cache.set_many({cache_key: entry, etag_key: entry["etag"]}, self.anonymous_cache_timeout)
+                cache.set(stale_key, entry, self.anonymous_cache_timeout + settings.ANONYMOUS_CACHE_STALE_GRACE)
+                response["ETag"] = entry["etag"]
+                if _etag_matches(request, entry["etag"]):
+                    return _not_modified_response(entry["etag"])
+        finally:
+            if locked:
+                cache.delete(lock_key)
 
         return response
 
+    def _wait_for_cached_page(self, cache_key):
+        deadline = time.monotonic() + self.anonymous_cache_wait
+        while time.monotonic() < deadline:
+            time.sleep(self.anonymous_cache_poll_interval)
+            entry = cache.get(cache_key)
+            if entry is not None:
+                return entry
+        return None
+
 
 class HtmxMixin:
     """
@@ -79,7 +182,7 @@ class HitMixin:
     """
     Takes the obj and stores it in the session
     in the form of {obj.model_name: obj.id}
-    If an obj.id is not present, call Hit.update_page_count
+    If an obj.id is not present, count a hit (buffered in Redis, see submissions.hits)
     """
 
     def get_object(self, **kwargs):
@@ -95,7 +198,7 @@ class HitMixin:
         viewed_objects = self.request.session.get(model_str, [])
 
         if obj.id not in viewed_objects:
-            Hit.update_page_count(obj)
+            record_hit(obj)
             viewed_objects.append(obj.id)
 
         self.request.session[model_str] = viewed_objects
@@ -114,10 +217,11 @@ class SidebarMixin:
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        cache_version = get_content_cache_version()
+        issues_version = get_cache_tags_version([CACHE_TAG_ISSUES])
+        tags_version = get_cache_tags_version([CACHE_TAG_TAGS, CACHE_TAG_REVIEWS])
 
-        issues_cache_key = f"sidebar_issues:v{cache_version}:n{self.number_of_sidebar_issues}"
-        tags_cache_key = f"sidebar_tags:v{cache_version}:n{self.number_of_tags}"
+        issues_cache_key = f"sidebar_issues:{issues_version}:n{self.number_of_sidebar_issues}"
+        tags_cache_key = f"sidebar_tags:{tags_version}:n{self.number_of_tags}"
 
         context["sidebar_issues"] = cache.get_or_set(
             issues_cache_key,
@@ -0,0 +1,144 @@
+"""Minimal in-memory stand-in for the Redis client returned by get_redis_client.
+
+Only implements the commands the code under test uses.
+"""
+
+import uuid
+
+from redis.exceptions import LockError, LockNotOwnedError
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        results = [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+        self._calls = []
+        return results
+
+
+class FakeLock:
+    """Token lock like redis-py's Lock, without expiry."""
+
+    def __init__(self, client, name):
+        self._client = client
+        self.name = name
+        self.token = None
+
+    def acquire(self, blocking=None):
+        token = uuid.uuid4().hex.encode()
+        if not self._client.set(self.name, token, nx=True):
+            return False
+        self.token = token
+        return True
+
+    def owned(self):
+        return self.token is not None and self._client.get(self.name) == self.token
+
+    def reacquire(self):
+        if not self.owned():
+            raise LockNotOwnedError("Cannot reacquire a lock that's no longer owned")
+        return True
+
+    def release(self):
+        owned = self.owned()
+        token, self.token = self.token, None
+        if token is None:
+            raise LockError("Cannot release an unlocked lock")
+        if not owned:
+            raise LockNotOwnedError("Cannot release a lock that's no longer owned")
+        self._client.delete(self.name)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def lock(self, name, timeout=None, blocking=True):
+        return FakeLock(self, name)
+
+    # Lists
+    def rpush(self, key, *values):
+        items = self.data.setdefault(key, [])
+        items.extend(v.encode() if isinstance(v, str) else v for v in values)
+        return len(items)
+
+    def lpush(self, key, *values):
+        items = self.data.setdefault(key, [])
+        for value in values:
+            items.insert(0, value.encode() if isinstance(value, str) else value)
+        return len(items)
+
+    def lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        end = len(items) if end == -1 else end + 1
+        return list(items[start:end])
+
+    def ltrim(self, key, start, end):
+        items = self.data.get(key, [])
+        if start < 0:
+            start = max(0, len(items) + start)
+        end = len(items) if end == -1 else end + 1
+        self.data[key] = items[start:end]
+        return True
+
+    def llen(self, key):
+        return len(self.data.get(key, []))
+
+    def lmove(self, src, dst, wherefrom="LEFT", whereto="RIGHT"):
+        items = self.data.get(src, [])
+        if not items:
+            return None
+        value = items.pop(0 if wherefrom == "LEFT" else -1)
+        if not items:
+            del self.data[src]
+        target = self.data.setdefault(dst, [])
+        target.insert(0 if whereto == "LEFT" else len(target), value)
+        return value
+
+    # Hashes
+    def hincrby(self, key, field, amount=1):
+        values = self.data.setdefault(key, {})
+        field = field.encode() if isinstance(field, str) else field
+        values[field] = values.get(field, 0) + amount
+        return values[field]
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    # Strings
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def incr(self, key, amount=1):
+        self.data[key] = int(self.data.get(key, 0)) + amount
+        return self.data[key]
+
+    # Keys
+    def exists(self, *keys):
+        return sum(1 for key in keys if key in self.data)
+
+    def rename(self, src, dst):
+        self.data[dst] = self.data.pop(src)
+        return True
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
@@ -4,15 +4,20 @@ Tests for spanza_journal_watch.utils.cache.
 Covers:
 1. get_content_cache_version — cold start initialises to 1, subsequent calls return current
 2. bump_content_cache_version — increments existing, bootstraps when key missing
+3. get_cache_tags_version / invalidate_cache_tags — per-tag versions in cache keys
 """
 
 from django.core.cache import cache
 from django.test import TestCase, override_settings
 
 from spanza_journal_watch.utils.cache import (
+    CACHE_TAG_ISSUES,
+    CACHE_TAG_REVIEWS,
     CONTENT_CACHE_VERSION_KEY,
     bump_content_cache_version,
+    get_cache_tags_version,
     get_content_cache_version,
+    invalidate_cache_tags,
 )
 
 
@@ -54,3 +59,35 @@ class TestBumpContentCacheVersion(TestCase):
         bump_content_cache_version()
         bump_content_cache_version()
         assert cache.get(CONTENT_CACHE_VERSION_KEY) == 3
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TestCacheTags(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_version_is_stable_until_invalidated(self):
+        assert get_cache_tags_version([CACHE_TAG_REVIEWS]) == get_cache_tags_version([CACHE_TAG_REVIEWS])
+
+    def test_tag_order_does_not_matter(self):
+        assert get_cache_tags_version([CACHE_TAG_REVIEWS, CACHE_TAG_ISSUES]) == get_cache_tags_version(
+            [CACHE_TAG_ISSUES, CACHE_TAG_REVIEWS]
+        )
+
+    def test_invalidating_a_tag_only_changes_dependent_versions(self):
+        reviews_before = get_cache_tags_version([CACHE_TAG_REVIEWS])
+        issues_before = get_cache_tags_version([CACHE_TAG_ISSUES])
+
+        invalidate_cache_tags(CACHE_TAG_REVIEWS)
+
+        assert get_cache_tags_version([CACHE_TAG_REVIEWS]) != reviews_before
+        assert get_cache_tags_version([CACHE_TAG_ISSUES]) == issues_before
+
+    def test_invalidate_bootstraps_missing_tag(self):
+        invalidate_cache_tags(CACHE_TAG_ISSUES)
+        assert get_cache_tags_version([CACHE_TAG_ISSUES]) != "v1.issues1"
+
+    def test_content_version_bump_invalidates_every_tag(self):
+        before = get_cache_tags_version([CACHE_TAG_ISSUES])
+        bump_content_cache_version()
+        assert get_cache_tags_version([CACHE_TAG_ISSUES]) != before
@@ -0,0 +1,136 @@
+"""
+Tests for spanza_journal_watch.utils.mixins.AnonymousCacheMixin.
+
+Covers:
+1. Fresh hits are served from the cache without rendering
+2. While another worker holds the regeneration lock, the previous rendering is served
+3. Without a stale copy, a request waits for the lock holder, then renders itself
+4. The lock is released after rendering, including when the view raises
+5. Entries are compressed and carry a strong ETag; If-None-Match gets a 304
+"""
+
+import hashlib
+import zlib
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.views import View
+
+from spanza_journal_watch.utils.cache import CACHE_TAG_REVIEWS, get_cache_tags_version, invalidate_cache_tags
+from spanza_journal_watch.utils.mixins import AnonymousCacheMixin
+
+
+class CountingView(AnonymousCacheMixin, View):
+    cache_tags = (CACHE_TAG_REVIEWS,)
+    anonymous_cache_wait = 0.2
+    anonymous_cache_poll_interval = 0.01
+    renders = 0
+
+    def get(self, request):
+        type(self).renders += 1
+        return HttpResponse(f"render {type(self).renders}")
+
+
+class FailingView(CountingView):
+    def get(self, request):
+        raise RuntimeError("boom")
+
+
+def _page_key(path):
+    return hashlib.blake2b(f"{path}:htmx=False:sub=0".encode(), digest_size=16).hexdigest()
+
+
+def _lock_key(path):
+    return f"page:lock:{get_cache_tags_version([CACHE_TAG_REVIEWS])}:{_page_key(path)}"
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    ANONYMOUS_CACHE_STALE_GRACE=60,
+    ANONYMOUS_CACHE_LOCK_TIMEOUT=5,
+)
+class TestAnonymousCacheMixin(TestCase):
+    def setUp(self):
+        cache.clear()
+        CountingView.renders = 0
+        self.factory = RequestFactory()
+
+    def _get(self, view=CountingView, path="/page/", **headers):
+        request = self.factory.get(path, headers=headers)
+        request.user = AnonymousUser()
+        return view.as_view()(request)
+
+    def test_second_request_is_served_from_cache(self):
+        self._get()
+        response = self._get()
+
+        assert CountingView.renders == 1
+        assert response.content == b"render 1"
+
+    def test_serves_previous_rendering_while_another_worker_regenerates(self):
+        self._get()
+        invalidate_cache_tags(CACHE_TAG_REVIEWS)
+        lock_key = _lock_key("/page/")
+        cache.add(lock_key, 1, 5)  # another worker is rendering
+
+        response = self._get()
+
+        assert CountingView.renders == 1
+        assert response.content == b"render 1"
+
+    def test_lock_holder_renders_after_invalidation(self):
+        self._get()
+        invalidate_cache_tags(CACHE_TAG_REVIEWS)
+
+        response = self._get()
+
+        assert CountingView.renders == 2
+        assert response.content == b"render 2"
+
+    def test_waits_then_renders_when_no_stale_copy_exists(self):
+        lock_key = _lock_key("/cold/")
+        cache.add(lock_key, 1, 5)
+
+        response = self._get(path="/cold/")
+
+        assert CountingView.renders == 1
+        assert response.content == b"render 1"
+
+    def test_lock_is_released_when_view_raises(self):
+        lock_key = _lock_key("/page/")
+
+        with self.assertRaises(RuntimeError):
+            self._get(view=FailingView)
+
+        assert cache.get(lock_key) is None
+
+    def test_cached_entry_is_compressed_with_etag(self):
+        response = self._get()
+
+        entry = cache.get(f"page:{get_cache_tags_version([CACHE_TAG_REVIEWS])}:{_page_key('/page/')}")
+        assert zlib.decompress(entry["body"]) == b"render 1"
+        assert entry["headers"]["Content-Type"].startswith("text/html")
+        assert response["ETag"] == entry["etag"]
+        assert self._get()["ETag"] == entry["etag"]
+
+    def test_matching_if_none_match_returns_304(self):
+        etag = self._get()["ETag"]
+
+        response = self._get(if_none_match=etag)
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response["ETag"] == etag
+        assert CountingView.renders == 1
+
+    def test_stale_if_none_match_returns_full_response(self):
+        etag = self._get()["ETag"]
+        invalidate_cache_tags(CACHE_TAG_REVIEWS)
+
+        response = self._get(if_none_match=etag)
+
+        assert response.status_code == 200
+        assert response.content == b"render 2"
+        assert response["ETag"] != etag
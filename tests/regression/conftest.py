@@ -26,6 +26,12 @@ def regression_baseline(django_db_setup, django_db_blocker):
             MeshTagMapping.objects.all().delete()
             Tag.objects.all().delete()
             call_command("loaddata", fixture_name, verbosity=0)
+            # loaddata bypasses PubmedArticle.save() and Review.save(), which
+            # classify topics and pre-render review bodies, and the raw saves
+            # skip the signals that maintain related reviews.
+            call_command("backfill_article_topics", "--all", verbosity=0)
+            call_command("backfill_review_rendering", "--all", verbosity=0)
+            call_command("rebuild_related_reviews", verbosity=0)
 
         latest_homepage = Homepage.objects.filter(publication_ready=True).order_by("-created").first()
         Homepage.CURRENT_HOMEPAGE = latest_homepage